@@ -41,6 +41,14 @@ class Settings(BaseSettings):
     A2A_MESSAGE_TTL_SECONDS: int = 300
     A2A_MAX_MESSAGE_SIZE: int = 1048576  # 1MB
     
+    # Session history replayed to the model: newest messages within the token
+    # budget, preceded by a cached running summary of everything older
+    SESSION_HISTORY_TOKEN_BUDGET: int = 4000
+    SESSION_HISTORY_MAX_MESSAGES: int = 50
+    SESSION_SUMMARY_ENABLED: bool = True
+    SESSION_SUMMARY_MODEL: str = "gemini-1.5-flash"
+    SESSION_SUMMARY_MAX_TOKENS: int = 500
+    
     # Service URLs
     ORCHESTRATOR_URL: str = "http://localhost:8001"
     TOOLS_URL: str = "http://localhost:8003"
@@ -157,6 +157,7 @@ class AgentSession(Base):
     user_id: Mapped[Optional[str]] = mapped_column(String(255))
     
     # Session data
+    # Legacy whole-history array; turns are now appended to agent_session_messages
     conversation_history: Mapped[List[Dict[str, Any]]] = mapped_column(JSON, default=list)
     context: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON)
     session_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON)
@@ -166,6 +167,27 @@ class AgentSession(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    
+    # Append-only history bookkeeping: last allocated message seq and the
+    # running summary of every message up to summary_through_seq
+    message_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    summary: Mapped[Optional[str]] = mapped_column(Text)
+    summary_through_seq: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    summary_token_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class AgentSessionMessage(Base):
+    """One conversation message of an agent session, appended in seq order"""
+    __tablename__ = "agent_session_messages"
+    
+    session_id: Mapped[str] = mapped_column(
+        String, ForeignKey("agent_sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    role: Mapped[str] = mapped_column(String(50), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    token_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
 # Database setup
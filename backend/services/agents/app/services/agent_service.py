@@ -10,19 +10,29 @@ import asyncio
 import logging
 import uuid
 
-from ..core.database import Agent, AgentExecution, AgentSession, A2AMessage, AgentStatus, AgentType, AIProvider
+from ..core import database
+from ..core.database import (
+    Agent, AgentExecution, AgentSession, AgentSessionMessage, A2AMessage, AgentStatus, AgentType, AIProvider
+)
 from ..core.config import get_settings
 from .gemini_service import gemini_service
 
 logger = logging.getLogger(__name__)
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) used for history budgeting"""
+    return len(text) // 4 + 4
+
+
 class AgentService:
     """Service for managing agents and their execution"""
     
     def __init__(self):
         self.settings = get_settings()
         self.running_executions: Dict[str, asyncio.Task] = {}
+        # At most one summary refresh per session runs at a time
+        self.summary_refreshes: Dict[str, asyncio.Task] = {}
     
     async def list_agents(
         self,
@@ -486,37 +496,216 @@ Focus on teamwork and achieving collective goals."""
         return base_capabilities + type_capabilities.get(agent_type, [])
     
     async def _get_conversation_history(self, db: AsyncSession, session_id: str) -> List[Dict[str, Any]]:
-        """Get conversation history from session"""
+        """Get the history to replay for a session.
+
+        Returns the newest messages that fit SESSION_HISTORY_TOKEN_BUDGET,
+        starting on a user turn, preceded by the session's running summary of
+        everything older. Only the window is read, not the whole session.
+        """
         
         result = await db.execute(
-            select(AgentSession).where(AgentSession.id == session_id)
+            select(
+                AgentSession.summary,
+                AgentSession.summary_through_seq,
+                AgentSession.summary_token_count
+            ).where(AgentSession.id == session_id)
         )
-        session = result.scalar_one_or_none()
+        session = result.one_or_none()
+        if session is None:
+            return []
         
-        if session and session.conversation_history:
-            return session.conversation_history
+        budget = self.settings.SESSION_HISTORY_TOKEN_BUDGET
+        if session.summary:
+            budget -= session.summary_token_count
         
-        return []
+        result = await db.execute(
+            select(
+                AgentSessionMessage.role,
+                AgentSessionMessage.content,
+                AgentSessionMessage.token_count,
+                AgentSessionMessage.created_at
+            )
+            .where(
+                AgentSessionMessage.session_id == session_id,
+                AgentSessionMessage.seq > session.summary_through_seq
+            )
+            .order_by(AgentSessionMessage.seq.desc())
+            .limit(self.settings.SESSION_HISTORY_MAX_MESSAGES)
+        )
+        
+        window = []
+        for message in result:
+            if window and message.token_count > budget:
+                break
+            budget -= message.token_count
+            window.append(message)
+        window.reverse()
+        
+        # Replay whole turns only
+        start = next((i for i, message in enumerate(window) if message.role == "user"), len(window))
+        
+        history = []
+        if session.summary:
+            history.append({"role": "system", "content": f"Summary of the earlier conversation:\n{session.summary}"})
+        history.extend(
+            {"role": message.role, "content": message.content, "timestamp": message.created_at.isoformat()}
+            for message in window[start:]
+        )
+        return history
     
     async def _update_session(self, db: AsyncSession, session_id: str, user_message: str, agent_response: str):
-        """Update session with new conversation turn"""
+        """Append a conversation turn to the session.
+
+        The seq range is reserved with one atomic counter update, so concurrent
+        turns never overwrite each other and nothing already stored is rewritten.
+        """
         
+        now = datetime.utcnow()
         result = await db.execute(
-            select(AgentSession).where(AgentSession.id == session_id)
+            update(AgentSession)
+            .where(AgentSession.id == session_id)
+            .values(message_count=AgentSession.message_count + 2, updated_at=now)
+            .returning(AgentSession.message_count)
         )
-        session = result.scalar_one_or_none()
+        last_seq = result.scalar_one_or_none()
+        if last_seq is None:
+            await db.rollback()
+            return
+        
+        db.add_all([
+            AgentSessionMessage(
+                session_id=session_id,
+                seq=last_seq - 1,
+                role="user",
+                content=user_message,
+                token_count=estimate_tokens(user_message),
+                created_at=now
+            ),
+            AgentSessionMessage(
+                session_id=session_id,
+                seq=last_seq,
+                role="assistant",
+                content=agent_response,
+                token_count=estimate_tokens(agent_response),
+                created_at=now
+            )
+        ])
+        await db.commit()
         
-        if session:
-            if not session.conversation_history:
-                session.conversation_history = []
-            
-            session.conversation_history.extend([
-                {"role": "user", "content": user_message, "timestamp": datetime.utcnow().isoformat()},
-                {"role": "assistant", "content": agent_response, "timestamp": datetime.utcnow().isoformat()}
-            ])
-            
-            session.updated_at = datetime.utcnow()
-            await db.commit()
+        if self.settings.SESSION_SUMMARY_ENABLED:
+            self._schedule_summary_refresh(session_id)
+    
+    def _schedule_summary_refresh(self, session_id: str):
+        """Refresh the session summary in the background.
+
+        The turn does not wait for the LLM call; history keeps using the
+        previous summary until the new one is committed. A refresh already
+        running for the session covers this turn, so none is started.
+        """
+        
+        running = self.summary_refreshes.get(session_id)
+        if running is not None and not running.done():
+            return
+        
+        task = asyncio.create_task(self._run_summary_refresh(session_id))
+        self.summary_refreshes[session_id] = task
+        
+        def _forget(finished: asyncio.Task):
+            if self.summary_refreshes.get(session_id) is finished:
+                del self.summary_refreshes[session_id]
+        
+        task.add_done_callback(_forget)
+    
+    async def _run_summary_refresh(self, session_id: str):
+        """Run one summary refresh on its own database session"""
+        
+        if database.SessionLocal is None:
+            return
+        try:
+            async with database.SessionLocal() as db:
+                await self._refresh_session_summary(db, session_id)
+        except Exception as e:
+            logger.warning(f"Failed to refresh summary for session {session_id}: {e}")
+    
+    async def _refresh_session_summary(self, db: AsyncSession, session_id: str):
+        """Fold the oldest unsummarized turns into the running summary once they overflow the budget.
+
+        Folding stops when the rest fits in half the budget (and half the
+        message cap), so the summary is regenerated every few turns rather
+        than on every one.
+        """
+        
+        result = await db.execute(
+            select(AgentSession.summary, AgentSession.summary_through_seq)
+            .where(AgentSession.id == session_id)
+        )
+        session = result.one_or_none()
+        if session is None:
+            return
+        
+        result = await db.execute(
+            select(
+                AgentSessionMessage.seq,
+                AgentSessionMessage.role,
+                AgentSessionMessage.content,
+                AgentSessionMessage.token_count
+            )
+            .where(
+                AgentSessionMessage.session_id == session_id,
+                AgentSessionMessage.seq > session.summary_through_seq
+            )
+            .order_by(AgentSessionMessage.seq)
+        )
+        messages = result.all()
+        
+        budget = self.settings.SESSION_HISTORY_TOKEN_BUDGET
+        max_messages = self.settings.SESSION_HISTORY_MAX_MESSAGES
+        remaining_tokens = sum(message.token_count for message in messages)
+        if remaining_tokens <= budget and len(messages) <= max_messages:
+            return
+        
+        folded = []
+        for message in messages:
+            remaining = len(messages) - len(folded)
+            fits = remaining_tokens <= budget // 2 and remaining <= max_messages // 2
+            # Stop at a user message so the kept window starts on a whole turn
+            if fits and message.role == "user":
+                break
+            folded.append(message)
+            remaining_tokens -= message.token_count
+        if not folded:
+            return
+        
+        transcript = "\n".join(f"{message.role}: {message.content}" for message in folded)
+        prompt = (
+            "Update the running summary of a conversation with the new messages below. "
+            "Keep facts, decisions, open questions and user preferences; drop pleasantries.\n\n"
+            f"Current summary:\n{session.summary or '(none)'}\n\n"
+            f"New messages:\n{transcript}\n\n"
+            "Updated summary:"
+        )
+        response = await gemini_service.generate_response(
+            prompt=prompt,
+            model_name=self.settings.SESSION_SUMMARY_MODEL,
+            custom_config={"temperature": 0.2, "max_output_tokens": self.settings.SESSION_SUMMARY_MAX_TOKENS}
+        )
+        summary = response["content"].strip()
+        
+        # Only the first of concurrent summarizers for the same range wins
+        await db.execute(
+            update(AgentSession)
+            .where(
+                AgentSession.id == session_id,
+                AgentSession.summary_through_seq == session.summary_through_seq
+            )
+            .values(
+                summary=summary,
+                summary_through_seq=folded[-1].seq,
+                summary_token_count=estimate_tokens(summary)
+            )
+        )
+        await db.commit()
+        logger.info(f"Summarized session {session_id} through message {folded[-1].seq}")
     
     async def _update_execution_status(
         self,
@@ -0,0 +1,13 @@
+"""
+Test configuration for the Agents service
+Puts the service root on sys.path so ``app`` imports the same way it does
+when the service runs (``uvicorn app.main:app``).
+"""
+
+import sys
+from pathlib import Path
+
+SERVICE_ROOT = Path(__file__).resolve().parent.parent
+
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVICE_ROOT))
@@ -0,0 +1,177 @@
+"""
+Session history tests: the replay window and summary folding against SQLite
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("google.generativeai")
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.database import AgentSession, AgentSessionMessage, Base
+from app.services import agent_service as agent_service_module
+from app.services.agent_service import AgentService, estimate_tokens
+
+SESSION = "s1"
+# estimate_tokens gives 13 for a 36 character message
+MESSAGE = "x" * 36
+
+
+@pytest.fixture
+def sessionmaker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'agents.db'}", poolclass=NullPool)
+
+    async def setup():
+        async with engine.begin() as conn:
+            # Only the history tables; the rest of the schema references tables owned by other services
+            await conn.run_sync(Base.metadata.create_all, tables=[AgentSession.__table__, AgentSessionMessage.__table__])
+        async with async_sessionmaker(engine)() as db:
+            db.add(AgentSession(id=SESSION, agent_id="a1"))
+            await db.commit()
+
+    asyncio.run(setup())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def _service(**settings):
+    service = AgentService()
+    service.settings = service.settings.model_copy(update={"SESSION_SUMMARY_ENABLED": False, **settings})
+    return service
+
+
+async def _add_turns(service, sessionmaker, count):
+    async with sessionmaker() as db:
+        for n in range(count):
+            await service._update_session(db, SESSION, f"{n:03d}" + MESSAGE[3:], MESSAGE)
+
+
+async def _session(sessionmaker):
+    async with sessionmaker() as db:
+        return (await db.execute(select(AgentSession).where(AgentSession.id == SESSION))).scalar_one()
+
+
+class _Summarizer:
+    """Stands in for gemini_service; both calls wait until the other has started"""
+
+    def __init__(self, expected_calls=1):
+        self.prompts = []
+        self.expected_calls = expected_calls
+        self.all_started = asyncio.Event()
+
+    async def generate_response(self, prompt, model_name=None, custom_config=None):
+        self.prompts.append(prompt)
+        n = len(self.prompts)
+        if n == self.expected_calls:
+            self.all_started.set()
+        await self.all_started.wait()
+        # Later callers answer later, so the first one commits first
+        await asyncio.sleep(0.05 * (n - 1))
+        return {"content": f"summary {n}"}
+
+
+def test_window_fits_budget_and_starts_on_a_user_turn(sessionmaker):
+    assert estimate_tokens(MESSAGE) == 13
+    service = _service(SESSION_HISTORY_TOKEN_BUDGET=70, SESSION_HISTORY_MAX_MESSAGES=50)
+
+    async def run():
+        await _add_turns(service, sessionmaker, 5)
+        async with sessionmaker() as db:
+            return await service._get_conversation_history(db, SESSION)
+
+    history = asyncio.run(run())
+    # Five newest messages fit (65 tokens), but the oldest of them is an assistant reply
+    assert [m["role"] for m in history] == ["user", "assistant", "user", "assistant"]
+    assert history[0]["content"].startswith("003")
+    assert sum(estimate_tokens(m["content"]) for m in history) <= 70
+
+
+def test_window_respects_message_cap(sessionmaker):
+    service = _service(SESSION_HISTORY_TOKEN_BUDGET=10000, SESSION_HISTORY_MAX_MESSAGES=3)
+
+    async def run():
+        await _add_turns(service, sessionmaker, 5)
+        async with sessionmaker() as db:
+            return await service._get_conversation_history(db, SESSION)
+
+    history = asyncio.run(run())
+    assert [m["role"] for m in history] == ["user", "assistant"]
+    assert history[0]["content"].startswith("004")
+
+
+def test_summary_prefixes_the_window_and_uses_its_budget(sessionmaker):
+    service = _service(SESSION_HISTORY_TOKEN_BUDGET=70, SESSION_HISTORY_MAX_MESSAGES=50)
+
+    async def run():
+        await _add_turns(service, sessionmaker, 5)
+        async with sessionmaker() as db:
+            session = (await db.execute(select(AgentSession).where(AgentSession.id == SESSION))).scalar_one()
+            session.summary, session.summary_through_seq, session.summary_token_count = "earlier", 2, 30
+            await db.commit()
+            return await service._get_conversation_history(db, SESSION)
+
+    history = asyncio.run(run())
+    assert history[0] == {"role": "system", "content": "Summary of the earlier conversation:\nearlier"}
+    # 40 tokens left: the newest three messages, trimmed to start on a user turn
+    assert [m["role"] for m in history[1:]] == ["user", "assistant"]
+    assert history[1]["content"].startswith("004")
+
+
+def test_refresh_folds_to_half_the_budget_on_a_turn_boundary(sessionmaker, monkeypatch):
+    summarizer = _Summarizer()
+    monkeypatch.setattr(agent_service_module, "gemini_service", summarizer)
+    service = _service(SESSION_HISTORY_TOKEN_BUDGET=100, SESSION_HISTORY_MAX_MESSAGES=50)
+
+    async def run():
+        await _add_turns(service, sessionmaker, 10)
+        async with sessionmaker() as db:
+            await service._refresh_session_summary(db, SESSION)
+        return await _session(sessionmaker)
+
+    session = asyncio.run(run())
+    # 20 messages of 13 tokens: keeping at most 50 tokens leaves 3, cut back to a whole turn
+    assert session.summary_through_seq == 18
+    assert session.summary == "summary 1"
+    assert session.summary_token_count == estimate_tokens("summary 1")
+    assert "000" in summarizer.prompts[0] and "009" not in summarizer.prompts[0]
+
+
+def test_refresh_within_budget_does_nothing(sessionmaker, monkeypatch):
+    summarizer = _Summarizer()
+    monkeypatch.setattr(agent_service_module, "gemini_service", summarizer)
+    service = _service(SESSION_HISTORY_TOKEN_BUDGET=1000)
+
+    async def run():
+        await _add_turns(service, sessionmaker, 3)
+        async with sessionmaker() as db:
+            await service._refresh_session_summary(db, SESSION)
+        return await _session(sessionmaker)
+
+    assert asyncio.run(run()).summary_through_seq == 0
+    assert summarizer.prompts == []
+
+
+def test_concurrent_refreshes_apply_once(sessionmaker, monkeypatch):
+    summarizer = _Summarizer(expected_calls=2)
+    monkeypatch.setattr(agent_service_module, "gemini_service", summarizer)
+    service = _service(SESSION_HISTORY_TOKEN_BUDGET=100, SESSION_HISTORY_MAX_MESSAGES=50)
+
+    async def refresh():
+        async with sessionmaker() as db:
+            await service._refresh_session_summary(db, SESSION)
+
+    async def run():
+        await _add_turns(service, sessionmaker, 10)
+        await asyncio.gather(refresh(), refresh())
+        return await _session(sessionmaker)
+
+    session = asyncio.run(run())
+    assert len(summarizer.prompts) == 2
+    # The slower refresh summarized the same range and must not overwrite the first
+    assert (session.summary, session.summary_through_seq) == ("summary 1", 18)
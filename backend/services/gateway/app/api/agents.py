@@ -9,6 +9,7 @@ from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 from ..core.database import get_database
 from ..core.config import get_settings
+from ..services.metadata_catalog import metadata_catalog
 import json
 import httpx
 import logging
@@ -290,6 +291,7 @@ async def create_agent(agent_data: AgentCreate, db: AsyncSession = Depends(get_d
             }
         )
         await db.commit()
+        await metadata_catalog.publish_change("agents")
         
         return {
             "id": agent_id,
@@ -373,6 +375,7 @@ async def update_agent(agent_id: str, agent_data: AgentUpdate, db: AsyncSession
         
         await db.execute(text(query), update_params)
         await db.commit()
+        await metadata_catalog.publish_change("agents")
         
         # Fetch and return updated agent
         result = await db.execute(
@@ -430,6 +433,7 @@ async def delete_agent(agent_id: str, db: AsyncSession = Depends(get_database)):
             {"agent_id": agent_id}
         )
         await db.commit()
+        await metadata_catalog.publish_change("agents")
         
         return {"message": "Agent deleted successfully"}
         
@@ -2,11 +2,12 @@
 API endpoints for chat interface metadata (workflows, agents, tools)
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
 from typing import List, Optional, Dict, Any
 from ...core.database import get_database
+from ...services.metadata_catalog import metadata_catalog
 import json
 import logging
 
@@ -69,149 +70,191 @@ async def get_default_workflow():
         logger.error(f"Error getting default workflow: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get default workflow: {str(e)}")
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+
 @router.get("/chat-options")
-async def get_chat_metadata_options(db: AsyncSession = Depends(get_database)):
-    """Get all metadata options for chat interface (workflows, agents, tools)"""
+async def get_chat_metadata_options(
+    db: AsyncSession = Depends(get_database),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get all metadata options for chat interface (workflows, agents, tools)
+
+    Served from the in-memory catalog; send the returned ETag as
+    If-None-Match to get a 304 while the catalog is unchanged.
+    """
     try:
-        # Get workflows with A2A capabilities
-        workflows_query = await db.execute(
-            text("""
-                SELECT name, display_name, description, category, version, status,
-                       dns_name, health_url, url, capabilities, tags, project_tags,
-                       execution_count, success_rate, is_public, timeout_seconds,
-                       default_input_modes, default_output_modes
-                FROM workflow_definitions 
-                WHERE status = 'active' OR status = 'published'
-                ORDER BY display_name
-            """)
-        )
-        workflows = workflows_query.fetchall()
-        
-        # Get active agents with A2A capabilities
-        agents_query = await db.execute(
-            text("""
-                SELECT name, display_name, description, category, status,
-                       dns_name, health_url, url, a2a_enabled, a2a_address,
-                       ai_provider, model_name, capabilities, tags, project_tags,
-                       execution_count, success_rate, default_input_modes, default_output_modes
-                FROM agents 
-                WHERE status = 'active' AND a2a_enabled = true
-                ORDER BY display_name
-            """)
-        )
-        agents = agents_query.fetchall()
-        
-        # Get active tools
-        tools_query = await db.execute(
-            text("""
-                SELECT name, display_name, description, category, type, version, status,
-                       dns_name, health_url, tags, execution_count, success_rate,
-                       capabilities, default_input_modes, default_output_modes
-                FROM tool_templates 
-                WHERE is_active = true
-                ORDER BY display_name
-            """)
-        )
-        tools = tools_query.fetchall()
-        
-        # Get default workflow
-        default_workflow = await get_default_workflow()
-        
-        # Format workflows
-        workflows_result = [default_workflow]  # Add default workflow first
-        for workflow in workflows:
-            workflows_result.append({
-                "id": workflow.name,
-                "name": workflow.name,
-                "display_name": workflow.display_name,
-                "description": workflow.description,
-                "category": workflow.category,
-                "version": workflow.version,
-                "status": workflow.status,
-                "dns_name": workflow.dns_name,
-                "health_url": workflow.health_url,
-                "url": workflow.url,
-                "capabilities": safe_json_parse(workflow.capabilities),
-                "tags": workflow.tags or [],
-                "project_tags": workflow.project_tags or [],
-                "execution_count": workflow.execution_count or 0,
-                "success_rate": float(workflow.success_rate) if workflow.success_rate else None,
-                "is_public": workflow.is_public,
-                "timeout_seconds": workflow.timeout_seconds,
-                "input_modes": workflow.default_input_modes or ["text"],
-                "output_modes": workflow.default_output_modes or ["text"],
-                "type": "workflow"
-            })
-        
-        # Format agents
-        agents_result = []
-        for agent in agents:
-            agents_result.append({
-                "id": agent.name,
-                "name": agent.name,
-                "display_name": agent.display_name,
-                "description": agent.description,
-                "category": agent.category,
-                "status": agent.status,
-                "dns_name": agent.dns_name,
-                "health_url": agent.health_url,
-                "url": agent.url,
-                "a2a_address": agent.a2a_address,
-                "ai_provider": agent.ai_provider,
-                "model_name": agent.model_name,
-                "capabilities": safe_json_parse(agent.capabilities),
-                "tags": agent.tags or [],
-                "project_tags": agent.project_tags or [],
-                "execution_count": agent.execution_count or 0,
-                "success_rate": float(agent.success_rate) if agent.success_rate else None,
-                "input_modes": agent.default_input_modes or ["text"],
-                "output_modes": agent.default_output_modes or ["text"],
-                "type": "agent"
-            })
-        
-        # Format tools
-        tools_result = []
-        for tool in tools:
-            tools_result.append({
-                "id": tool.name,
-                "name": tool.name,
-                "display_name": tool.display_name,
-                "description": tool.description,
-                "category": tool.category,
-                "tool_type": tool.type,
-                "version": tool.version,
-                "status": tool.status,
-                "dns_name": tool.dns_name,
-                "health_url": tool.health_url,
-                "capabilities": safe_json_parse(tool.capabilities),
-                "tags": tool.tags or [],
-                "execution_count": tool.execution_count or 0,
-                "success_rate": float(tool.success_rate) if tool.success_rate else None,
-                "input_modes": tool.default_input_modes or ["text"],
-                "output_modes": tool.default_output_modes or ["text"],
-                "type": "tool"
-            })
-        
-        return {
-            "workflows": workflows_result,
-            "agents": agents_result,
-            "tools": tools_result,
-            "summary": {
-                "total_workflows": len(workflows_result),
-                "total_agents": len(agents_result),
-                "total_tools": len(tools_result),
-                "categories": {
-                    "workflows": list(set([w.get("category") for w in workflows_result if w.get("category")])),
-                    "agents": list(set([a.get("category") for a in agents_result if a.get("category")])),
-                    "tools": list(set([t.get("category") for t in tools_result if t.get("category")]))
-                }
-            }
-        }
-        
+        snapshot = await metadata_catalog.get(lambda: load_chat_metadata_options(db))
     except Exception as e:
         logger.error(f"Error getting chat metadata options: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get metadata options: {str(e)}")
 
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "no-cache",
+        "X-Catalog-Version": str(snapshot.version)
+    }
+    if etag_matches(if_none_match, snapshot.etag):
+        metadata_catalog.stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+@router.get("/catalog/stats")
+async def get_metadata_catalog_stats():
+    """Get hit/reload counters and the current version of the metadata catalog cache"""
+    return metadata_catalog.get_stats()
+
+
+@router.post("/catalog/invalidate")
+async def invalidate_metadata_catalog():
+    """Force the metadata catalog to reload on the next read, on every gateway replica"""
+    await metadata_catalog.publish_change("api")
+    return {"status": "invalidated"}
+
+
+async def load_chat_metadata_options(db: AsyncSession) -> Dict[str, Any]:
+    """Query and format the chat metadata catalog from the registry tables"""
+    # Get workflows with A2A capabilities
+    workflows_query = await db.execute(
+        text("""
+            SELECT name, display_name, description, category, version, status,
+                   dns_name, health_url, url, capabilities, tags, project_tags,
+                   execution_count, success_rate, is_public, timeout_seconds,
+                   default_input_modes, default_output_modes
+            FROM workflow_definitions 
+            WHERE status = 'active' OR status = 'published'
+            ORDER BY display_name
+        """)
+    )
+    workflows = workflows_query.fetchall()
+    
+    # Get active agents with A2A capabilities
+    agents_query = await db.execute(
+        text("""
+            SELECT name, display_name, description, category, status,
+                   dns_name, health_url, url, a2a_enabled, a2a_address,
+                   ai_provider, model_name, capabilities, tags, project_tags,
+                   execution_count, success_rate, default_input_modes, default_output_modes
+            FROM agents 
+            WHERE status = 'active' AND a2a_enabled = true
+            ORDER BY display_name
+        """)
+    )
+    agents = agents_query.fetchall()
+    
+    # Get active tools
+    tools_query = await db.execute(
+        text("""
+            SELECT name, display_name, description, category, type, version, status,
+                   dns_name, health_url, tags, execution_count, success_rate,
+                   capabilities, default_input_modes, default_output_modes
+            FROM tool_templates 
+            WHERE is_active = true
+            ORDER BY display_name
+        """)
+    )
+    tools = tools_query.fetchall()
+    
+    # Get default workflow
+    default_workflow = await get_default_workflow()
+    
+    # Format workflows
+    workflows_result = [default_workflow]  # Add default workflow first
+    for workflow in workflows:
+        workflows_result.append({
+            "id": workflow.name,
+            "name": workflow.name,
+            "display_name": workflow.display_name,
+            "description": workflow.description,
+            "category": workflow.category,
+            "version": workflow.version,
+            "status": workflow.status,
+            "dns_name": workflow.dns_name,
+            "health_url": workflow.health_url,
+            "url": workflow.url,
+            "capabilities": safe_json_parse(workflow.capabilities),
+            "tags": workflow.tags or [],
+            "project_tags": workflow.project_tags or [],
+            "execution_count": workflow.execution_count or 0,
+            "success_rate": float(workflow.success_rate) if workflow.success_rate else None,
+            "is_public": workflow.is_public,
+            "timeout_seconds": workflow.timeout_seconds,
+            "input_modes": workflow.default_input_modes or ["text"],
+            "output_modes": workflow.default_output_modes or ["text"],
+            "type": "workflow"
+        })
+    
+    # Format agents
+    agents_result = []
+    for agent in agents:
+        agents_result.append({
+            "id": agent.name,
+            "name": agent.name,
+            "display_name": agent.display_name,
+            "description": agent.description,
+            "category": agent.category,
+            "status": agent.status,
+            "dns_name": agent.dns_name,
+            "health_url": agent.health_url,
+            "url": agent.url,
+            "a2a_address": agent.a2a_address,
+            "ai_provider": agent.ai_provider,
+            "model_name": agent.model_name,
+            "capabilities": safe_json_parse(agent.capabilities),
+            "tags": agent.tags or [],
+            "project_tags": agent.project_tags or [],
+            "execution_count": agent.execution_count or 0,
+            "success_rate": float(agent.success_rate) if agent.success_rate else None,
+            "input_modes": agent.default_input_modes or ["text"],
+            "output_modes": agent.default_output_modes or ["text"],
+            "type": "agent"
+        })
+    
+    # Format tools
+    tools_result = []
+    for tool in tools:
+        tools_result.append({
+            "id": tool.name,
+            "name": tool.name,
+            "display_name": tool.display_name,
+            "description": tool.description,
+            "category": tool.category,
+            "tool_type": tool.type,
+            "version": tool.version,
+            "status": tool.status,
+            "dns_name": tool.dns_name,
+            "health_url": tool.health_url,
+            "capabilities": safe_json_parse(tool.capabilities),
+            "tags": tool.tags or [],
+            "execution_count": tool.execution_count or 0,
+            "success_rate": float(tool.success_rate) if tool.success_rate else None,
+            "input_modes": tool.default_input_modes or ["text"],
+            "output_modes": tool.default_output_modes or ["text"],
+            "type": "tool"
+        })
+    
+    return {
+        "workflows": workflows_result,
+        "agents": agents_result,
+        "tools": tools_result,
+        "summary": {
+            "total_workflows": len(workflows_result),
+            "total_agents": len(agents_result),
+            "total_tools": len(tools_result),
+            "categories": {
+                "workflows": sorted({w["category"] for w in workflows_result if w.get("category")}),
+                "agents": sorted({a["category"] for a in agents_result if a.get("category")}),
+                "tools": sorted({t["category"] for t in tools_result if t.get("category")})
+            }
+        }
+    }
+
 
 @router.get("/workflow/{workflow_name}/routing")
 async def get_workflow_routing_info(workflow_name: str, db: AsyncSession = Depends(get_database)):
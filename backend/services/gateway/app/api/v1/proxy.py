@@ -3,10 +3,12 @@ Proxy service for routing requests to backend services
 """
 
 from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 import httpx
+import importlib.util
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Optional, Union
 
 from ...core.config import get_settings
 from ...core.dependencies import get_current_user, get_optional_user
@@ -15,6 +17,32 @@ from ...models.user import User
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Connection-scoped headers that must not be forwarded by a proxy (RFC 7230 6.1)
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+}
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def request_body(request: Request) -> Optional[AsyncIterator[bytes]]:
+    """Stream of the incoming body, or None when the request has none
+    
+    Without a body nothing is sent upstream, so a bodyless GET is not
+    forwarded with ``Transfer-Encoding: chunked``.
+    """
+    content_length = request.headers.get("content-length")
+    if "transfer-encoding" not in request.headers and (content_length is None or content_length == "0"):
+        return None
+    return request.stream()
+
 
 class ProxyService:
     """Service for proxying requests to backend microservices"""
@@ -30,6 +58,33 @@ class ProxyService:
             "workflow": self.settings.WORKFLOW_URL,
             "observability": self.settings.OBSERVABILITY_URL,
         }
+        self.service_timeouts = self.settings.get_proxy_service_timeouts()
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+    
+    def get_client(self, service: str) -> httpx.AsyncClient:
+        """Return the long-lived, keep-alive client for an upstream service"""
+        client = self._clients.get(service)
+        if client is None or client.is_closed:
+            read_timeout = self.service_timeouts.get(service, self.settings.PROXY_DEFAULT_TIMEOUT)
+            client = httpx.AsyncClient(
+                base_url=self.service_urls[service],
+                timeout=httpx.Timeout(read_timeout, connect=self.settings.PROXY_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=self.settings.PROXY_MAX_CONNECTIONS,
+                    max_keepalive_connections=self.settings.PROXY_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=self.settings.PROXY_KEEPALIVE_EXPIRY
+                ),
+                # HTTP/2 is negotiated via ALPN, so it only applies to https upstreams
+                http2=self.settings.PROXY_HTTP2 and HTTP2_AVAILABLE
+            )
+            self._clients[service] = client
+        return client
+    
+    async def aclose(self):
+        """Close all upstream connection pools"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
     
     async def proxy_request(
         self,
@@ -38,15 +93,21 @@ class ProxyService:
         method: str,
         headers: Dict[str, str],
         params: Dict[str, Any] = None,
-        body: bytes = None,
+        body: Optional[Union[bytes, AsyncIterator[bytes]]] = None,
         user: User = None
-    ) -> Response:
-        """Proxy request to backend service"""
+    ) -> StreamingResponse:
+        """Proxy request to backend service, streaming both bodies"""
         
         if service not in self.service_urls:
             raise HTTPException(status_code=404, detail="Service not found")
         
-        target_url = f"{self.service_urls[service]}/api{path}"
+        target_path = f"/api{path}"
+        
+        # Drop headers that describe the client->gateway hop
+        headers = {
+            key: value for key, value in headers.items()
+            if key.lower() not in HOP_BY_HOP_HEADERS and key.lower() != "host"
+        }
         
         # Add user context to headers
         if user:
@@ -57,29 +118,37 @@ class ProxyService:
         # Remove authorization header to avoid conflicts
         headers.pop("authorization", None)
         
+        client = self.get_client(service)
+        
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.request(
-                    method=method,
-                    url=target_url,
-                    headers=headers,
-                    params=params,
-                    content=body
-                )
-                
-                # Return response with original headers and status
-                return Response(
-                    content=response.content,
-                    status_code=response.status_code,
-                    headers=dict(response.headers)
-                )
-                
+            upstream_request = client.build_request(
+                method=method,
+                url=target_path,
+                headers=headers,
+                params=params,
+                content=body
+            )
+            response = await client.send(upstream_request, stream=True)
         except httpx.TimeoutException:
-            logger.error(f"Timeout proxying request to {service}: {target_url}")
+            logger.error(f"Timeout proxying request to {service}: {target_path}")
             raise HTTPException(status_code=504, detail="Service timeout")
         except httpx.RequestError as e:
             logger.error(f"Error proxying request to {service}: {e}")
             raise HTTPException(status_code=502, detail="Service unavailable")
+        
+        response_headers = {
+            key: value for key, value in response.headers.items()
+            if key.lower() not in HOP_BY_HOP_HEADERS
+        }
+        
+        # Raw bytes keep the upstream content-encoding/content-length valid;
+        # the connection returns to the pool once the body is consumed
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers=response_headers,
+            background=BackgroundTask(response.aclose)
+        )
 
 
 proxy_service = ProxyService()
@@ -101,7 +170,7 @@ async def proxy_orchestrator(
         method=request.method,
         headers=dict(request.headers),
         params=dict(request.query_params),
-        body=await request.body(),
+        body=request_body(request),
         user=user
     )
 
@@ -122,7 +191,7 @@ async def proxy_agents(
         method=request.method,
         headers=dict(request.headers),
         params=dict(request.query_params),
-        body=await request.body(),
+        body=request_body(request),
         user=user
     )
 
@@ -143,7 +212,7 @@ async def proxy_tools(
         method=request.method,
         headers=dict(request.headers),
         params=dict(request.query_params),
-        body=await request.body(),
+        body=request_body(request),
         user=user
     )
 
@@ -164,7 +233,7 @@ async def proxy_rag(
         method=request.method,
         headers=dict(request.headers),
         params=dict(request.query_params),
-        body=await request.body(),
+        body=request_body(request),
         user=user
     )
 
@@ -185,7 +254,7 @@ async def proxy_sqltool(
         method=request.method,
         headers=dict(request.headers),
         params=dict(request.query_params),
-        body=await request.body(),
+        body=request_body(request),
         user=user
     )
 
@@ -206,7 +275,7 @@ async def proxy_workflow(
         method=request.method,
         headers=dict(request.headers),
         params=dict(request.query_params),
-        body=await request.body(),
+        body=request_body(request),
         user=user
     )
 
@@ -227,6 +296,6 @@ async def proxy_observability(
         method=request.method,
         headers=dict(request.headers),
         params=dict(request.query_params),
-        body=await request.body(),
+        body=request_body(request),
         user=user
     )
@@ -2,7 +2,7 @@
 Configuration settings for the AgenticAI Gateway Service
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 import os
@@ -114,6 +114,30 @@ class Settings(BaseSettings):
     WORKFLOW_URL: str = "http://localhost:8006"  # Alias for WORKFLOW_ENGINE_URL
     OBSERVABILITY_URL: str = "http://localhost:8007"
     
+    # Service proxy connection pooling
+    PROXY_MAX_CONNECTIONS: int = 100
+    PROXY_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    PROXY_KEEPALIVE_EXPIRY: float = 30.0
+    PROXY_CONNECT_TIMEOUT: float = 5.0
+    PROXY_DEFAULT_TIMEOUT: float = 30.0
+    PROXY_SERVICE_TIMEOUTS: str = "rag=120,sqltool=300,workflow=120"
+    PROXY_HTTP2: bool = True
+    
+    # Chat metadata catalog cache
+    METADATA_CATALOG_INVALIDATION: str = "postgres"  # postgres | redis | none
+    METADATA_CATALOG_CHANNEL: str = "metadata_catalog_changed"
+    METADATA_CATALOG_TTL_SECONDS: float = 300.0  # safety net if a notification is missed
+    
+    # Shared LLM/embedding clients
+    MODEL_REGISTRY_RECORD_TTL_SECONDS: float = 60.0  # unified_models rows; changes also notify
+    MODEL_REGISTRY_NEGATIVE_TTL_SECONDS: float = 5.0  # confirmed "no such row" results
+    MODEL_REGISTRY_MAX_CONNECTIONS: int = 100
+    MODEL_REGISTRY_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    MODEL_REGISTRY_KEEPALIVE_EXPIRY: float = 60.0
+    MODEL_REGISTRY_CONNECT_TIMEOUT: float = 10.0
+    MODEL_REGISTRY_REQUEST_TIMEOUT: float = 120.0
+    MODEL_REGISTRY_WARMUP: bool = True
+    
     # Default Admin User
     DEFAULT_ADMIN_EMAIL: str = "admin@agenticai.com"
     DEFAULT_ADMIN_PASSWORD: str = "secret123"
@@ -138,6 +162,15 @@ class Settings(BaseSettings):
             return [header.strip() for header in self.CORS_ALLOW_HEADERS.split(",") if header.strip()]
         return self.CORS_ALLOW_HEADERS if isinstance(self.CORS_ALLOW_HEADERS, list) else []
 
+    def get_proxy_service_timeouts(self) -> Dict[str, float]:
+        """Get per-service proxy read timeouts as a mapping"""
+        timeouts = {}
+        for item in self.PROXY_SERVICE_TIMEOUTS.split(","):
+            if "=" in item:
+                service, seconds = item.split("=", 1)
+                timeouts[service.strip()] = float(seconds)
+        return timeouts
+
     def get_allowed_extensions(self) -> List[str]:
         """Get allowed extensions as a list"""
         if isinstance(self.ALLOWED_EXTENSIONS, str):
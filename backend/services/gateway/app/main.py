@@ -13,9 +13,13 @@ import traceback
 from contextlib import asynccontextmanager
 
 from .core.config import get_settings
+from .core import database
 from .core.database import init_db
 from .api.v1.auth import router as auth_router
-from .api.v1.proxy import router as proxy_router
+from .api.v1.proxy import router as proxy_router, proxy_service
+from .services.metadata_catalog import metadata_catalog
+from .services.model_registry import model_registry
+from .services.langgraph_model_service import LangGraphModelService
 from .api.v1.health import router as health_router
 from .api.v1.projects import router as projects_router
 from .api.v1.notification import router as notification_router
@@ -58,10 +62,24 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         raise
     
+    # Start listening for registry changes that invalidate the metadata catalog
+    await metadata_catalog.start()
+    
+    # Build the default model clients now so the first chat request skips connection setup
+    if settings.MODEL_REGISTRY_WARMUP:
+        try:
+            async with database.async_session_local() as session:
+                await LangGraphModelService(session).warm_up()
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {e}")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down API Gateway...")
+    await metadata_catalog.stop()
+    await model_registry.close()
+    await proxy_service.aclose()
 
 
 def create_application() -> FastAPI:
@@ -31,6 +31,8 @@ except ImportError:
     BaseLanguageModel = None
     Embeddings = None
 
+from .model_registry import model_registry
+
 logger = logging.getLogger(__name__)
 
 class ModelProvider(str, Enum):
@@ -95,6 +97,7 @@ class LangGraphModelService:
     
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
+        # Instances are shared process-wide through model_registry; this maps the ones this service resolved
         self.model_instances: Dict[str, Union[BaseLanguageModel, Embeddings]] = {}
         self.default_llm_id: Optional[str] = None
         self.default_embedding_id: Optional[str] = None
@@ -305,7 +308,7 @@ class LangGraphModelService:
             
             # Initialize model instance for testing
             if model_record["model_type"] == ModelType.LLM.value:
-                model_instance = await self._create_llm_instance(model_record)
+                model_instance = await model_registry.get_instance(model_record, self._create_llm_instance)
                 # Test with a simple prompt
                 if LANGCHAIN_AVAILABLE and model_instance:
                     try:
@@ -316,7 +319,7 @@ class LangGraphModelService:
                 else:
                     return {"success": True, "response": "Mock test successful", "status": "healthy"}
             else:
-                model_instance = await self._create_embedding_instance(model_record)
+                model_instance = await model_registry.get_instance(model_record, self._create_embedding_instance)
                 # Test with a simple text embedding
                 if LANGCHAIN_AVAILABLE and model_instance:
                     try:
@@ -402,7 +405,7 @@ class LangGraphModelService:
         if model_id in self.model_instances:
             return self.model_instances[model_id]
         
-        model_record = await self._get_model_record(model_id)
+        model_record = await self._get_cached_model_record(model_id)
         if not model_record:
             return None
         
@@ -436,7 +439,9 @@ class LangGraphModelService:
                 top_p=config.get("top_p", 1.0),
                 frequency_penalty=config.get("frequency_penalty", 0.0),
                 presence_penalty=config.get("presence_penalty", 0.0),
-                stop=config.get("stop_sequences", []) or None
+                stop=config.get("stop_sequences", []) or None,
+                http_client=model_registry.http_client,
+                http_async_client=model_registry.http_async_client
             )
         except Exception as e:
             logger.error(f"Error creating OpenAI LLM: {str(e)}")
@@ -459,6 +464,8 @@ class LangGraphModelService:
                 top_p=config.get("top_p", 1.0),
                 frequency_penalty=config.get("frequency_penalty", 0.0),
                 presence_penalty=config.get("presence_penalty", 0.0),
+                http_client=model_registry.http_client,
+                http_async_client=model_registry.http_async_client,
             )
         except Exception as e:
             logger.error(f"Error creating Azure OpenAI LLM: {str(e)}")
@@ -519,6 +526,8 @@ class LangGraphModelService:
                 base_url=model_record.get("api_endpoint"),
                 dimensions=config.get("dimensions"),
                 chunk_size=config.get("batch_size", 1000),
+                http_client=model_registry.http_client,
+                http_async_client=model_registry.http_async_client,
             )
         except Exception as e:
             logger.error(f"Error creating OpenAI embedding: {str(e)}")
@@ -538,6 +547,8 @@ class LangGraphModelService:
                 api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
                 dimensions=config.get("dimensions"),
                 chunk_size=config.get("batch_size", 1000),
+                http_client=model_registry.http_client,
+                http_async_client=model_registry.http_async_client,
             )
         except Exception as e:
             logger.error(f"Error creating Azure OpenAI embedding: {str(e)}")
@@ -578,11 +589,11 @@ class LangGraphModelService:
     async def _initialize_llm_model(self, model_id: str) -> bool:
         """Initialize an LLM model instance"""
         try:
-            model_record = await self._get_model_record(model_id)
+            model_record = await self._get_cached_model_record(model_id)
             if not model_record:
                 return False
             
-            model_instance = await self._create_llm_instance(model_record)
+            model_instance = await model_registry.get_instance(model_record, self._create_llm_instance)
             if model_instance:
                 self.model_instances[model_id] = model_instance
                 logger.info(f"Initialized LLM model: {model_id}")
@@ -597,11 +608,11 @@ class LangGraphModelService:
     async def _initialize_embedding_model(self, model_id: str) -> bool:
         """Initialize an embedding model instance"""
         try:
-            model_record = await self._get_model_record(model_id)
+            model_record = await self._get_cached_model_record(model_id)
             if not model_record:
                 return False
             
-            model_instance = await self._create_embedding_instance(model_record)
+            model_instance = await model_registry.get_instance(model_record, self._create_embedding_instance)
             if model_instance:
                 self.model_instances[model_id] = model_instance
                 logger.info(f"Initialized embedding model: {model_id}")
@@ -700,6 +711,7 @@ class LangGraphModelService:
             
             await self.db_session.execute(stmt, insert_data)
             await self.db_session.commit()
+            await model_registry.publish_change(model_record.get("id"))
             
             logger.info(f"Stored model record: {model_record['id']}")
             
@@ -759,6 +771,13 @@ class LangGraphModelService:
             
         except Exception as e:
             logger.error(f"Error getting model record {model_id}: {str(e)}")
+            raise
+
+    async def _get_cached_model_record(self, model_id: str) -> Optional[Dict[str, Any]]:
+        """Get a model record through the process-wide row cache (None if missing or unreadable)"""
+        try:
+            return await model_registry.get_record(f"id:{model_id}", lambda: self._get_model_record(model_id))
+        except Exception:
             return None
 
     async def _list_model_records(
@@ -846,6 +865,7 @@ class LangGraphModelService:
             stmt = text("DELETE FROM unified_models WHERE id = :model_id")
             await self.db_session.execute(stmt, {"model_id": model_id})
             await self.db_session.commit()
+            await model_registry.publish_change(model_id)
             
             logger.info(f"Deleted model record: {model_id}")
             
@@ -859,7 +879,17 @@ class LangGraphModelService:
     # ============================================================================
 
     async def get_default_llm(self) -> Optional[Dict[str, Any]]:
-        """Get the default LLM model from database"""
+        """Get the default LLM model, cached process-wide until unified_models changes"""
+        try:
+            record = await model_registry.get_record("default:llm", self._load_default_llm)
+        except Exception:
+            return None
+        if record:
+            self.default_llm_id = record["id"]
+        return record
+
+    async def _load_default_llm(self) -> Optional[Dict[str, Any]]:
+        """Load the default LLM model from database"""
         try:
             stmt = text("""
                 SELECT id, name, display_name, provider, model_type, api_endpoint, api_key_encrypted,
@@ -873,7 +903,6 @@ class LangGraphModelService:
             row = result.fetchone()
             
             if row:
-                self.default_llm_id = str(row.id)
                 return {
                     "id": str(row.id),
                     "name": row.name,
@@ -893,10 +922,20 @@ class LangGraphModelService:
             
         except Exception as e:
             logger.error(f"Error getting default LLM: {str(e)}")
-            return None
+            raise
 
     async def get_default_embedding(self) -> Optional[Dict[str, Any]]:
-        """Get the default embedding model from database"""
+        """Get the default embedding model, cached process-wide until unified_models changes"""
+        try:
+            record = await model_registry.get_record("default:embedding", self._load_default_embedding)
+        except Exception:
+            return None
+        if record:
+            self.default_embedding_id = record["id"]
+        return record
+
+    async def _load_default_embedding(self) -> Optional[Dict[str, Any]]:
+        """Load the default embedding model from database"""
         try:
             stmt = text("""
                 SELECT id, name, display_name, provider, model_type, api_endpoint, api_key_encrypted,
@@ -910,7 +949,6 @@ class LangGraphModelService:
             row = result.fetchone()
             
             if row:
-                self.default_embedding_id = str(row.id)
                 return {
                     "id": str(row.id),
                     "name": row.name,
@@ -931,7 +969,7 @@ class LangGraphModelService:
             
         except Exception as e:
             logger.error(f"Error getting default embedding model: {str(e)}")
-            return None
+            raise
 
     async def set_default_llm(self, model_id: str) -> Dict[str, Any]:
         """Set a model as the default LLM"""
@@ -956,6 +994,7 @@ class LangGraphModelService:
             
             await self.db_session.execute(stmt, {"model_id": model_id})
             await self.db_session.commit()
+            await model_registry.publish_change()
             
             self.default_llm_id = model_id
             logger.info(f"Set default LLM to: {model_id}")
@@ -990,6 +1029,7 @@ class LangGraphModelService:
             
             await self.db_session.execute(stmt, {"model_id": model_id})
             await self.db_session.commit()
+            await model_registry.publish_change()
             
             self.default_embedding_id = model_id
             logger.info(f"Set default embedding model to: {model_id}")
@@ -1001,6 +1041,12 @@ class LangGraphModelService:
             logger.error(f"Error setting default embedding model {model_id}: {str(e)}")
             return {"success": False, "error": str(e)}
 
+    async def warm_up(self) -> None:
+        """Build the default LLM and embedding instances before the first request needs them"""
+        for model in (await self.get_default_llm(), await self.get_default_embedding()):
+            if model and await self.get_model_instance(model["id"]) is not None:
+                logger.info(f"Warmed up model {model['display_name']} ({model['provider']})")
+
     def get_health_status(self) -> Dict[str, Any]:
         """Get health status of the model service"""
         return {
@@ -1009,6 +1055,7 @@ class LangGraphModelService:
             "default_llm_id": self.default_llm_id,
             "default_embedding_id": self.default_embedding_id,
             "langchain_available": LANGCHAIN_AVAILABLE,
+            "model_registry": model_registry.get_stats(),
             "supported_providers": [provider.value for provider in ModelProvider],
             "timestamp": datetime.utcnow().isoformat()
         }
\ No newline at end of file
@@ -0,0 +1,221 @@
+"""
+Chat metadata catalog cache
+
+Keeps the workflows/agents/tools catalog served by ``/metadata/chat-options``
+in memory as pre-serialized JSON with a content-hash ETag. The catalog is
+marked stale when the registries change, announced either through Postgres
+LISTEN/NOTIFY (triggers from migration 0004) or a Redis pub/sub channel, and
+reloaded once on the next read. Other caches keyed on registry tables (the
+model registry) subscribe to the same notifications with ``add_change_listener``.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import asyncpg
+import redis.asyncio as redis
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CatalogLoader = Callable[[], Awaitable[Dict[str, Any]]]
+ChangeListener = Callable[[str], None]
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """An immutable, serialized version of the catalog"""
+    version: int
+    etag: str
+    body: bytes
+    loaded_at: float
+
+
+class MetadataCatalog:
+    """Versioned in-memory catalog with change-notified invalidation"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.mode = self.settings.METADATA_CATALOG_INVALIDATION.lower()
+        self.channel = self.settings.METADATA_CATALOG_CHANNEL
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._stale = True
+        self._version = 0
+        self._reload_lock = asyncio.Lock()
+        self._listener_task: Optional[asyncio.Task] = None
+        self._redis: Optional[redis.Redis] = None
+        self._change_listeners: List[ChangeListener] = []
+        self.stats = {"hits": 0, "reloads": 0, "invalidations": 0, "not_modified": 0}
+
+    def is_fresh(self) -> bool:
+        snapshot = self._snapshot
+        return (
+            snapshot is not None
+            and not self._stale
+            and time.monotonic() - snapshot.loaded_at < self.settings.METADATA_CATALOG_TTL_SECONDS
+        )
+
+    async def get(self, loader: CatalogLoader) -> CatalogSnapshot:
+        """Return the current snapshot, reloading it with ``loader`` if stale.
+
+        Concurrent readers of a stale catalog wait on a single reload instead
+        of each running the catalog queries.
+        """
+        if self.is_fresh():
+            self.stats["hits"] += 1
+            return self._snapshot
+
+        async with self._reload_lock:
+            if self.is_fresh():
+                self.stats["hits"] += 1
+                return self._snapshot
+
+            # Clear the flag first so a notification arriving mid-load marks the result stale again
+            self._stale = False
+            try:
+                payload = await loader()
+            except Exception:
+                self._stale = True
+                raise
+            self._snapshot = self._build_snapshot(payload)
+            self.stats["reloads"] += 1
+            return self._snapshot
+
+    def _build_snapshot(self, payload: Dict[str, Any]) -> CatalogSnapshot:
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        if self._snapshot is None or self._snapshot.etag != etag:
+            self._version += 1
+            logger.info(f"Metadata catalog loaded: version {self._version}, etag {etag}")
+        return CatalogSnapshot(
+            version=self._version,
+            etag=etag,
+            body=body,
+            loaded_at=time.monotonic()
+        )
+
+    def invalidate(self, reason: str = "manual") -> None:
+        """Mark the catalog stale; the next read reloads it"""
+        self._stale = True
+        self.stats["invalidations"] += 1
+        logger.debug(f"Metadata catalog invalidated ({reason})")
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Call ``listener`` with the source (usually a table name) of every change notification"""
+        self._change_listeners.append(listener)
+
+    def _on_change(self, source: str) -> None:
+        self.invalidate(source)
+        for listener in self._change_listeners:
+            try:
+                listener(source)
+            except Exception as e:
+                logger.warning(f"Metadata catalog change listener failed: {e}")
+
+    async def publish_change(self, source: str = "gateway") -> None:
+        """Invalidate locally and tell other gateway replicas the registries changed.
+
+        In ``postgres`` mode the table triggers already notify every listener,
+        so only ``redis`` mode publishes explicitly.
+        """
+        self.invalidate(source)
+        if self.mode != "redis":
+            return
+        try:
+            await self._get_redis().publish(self.channel, source)
+        except Exception as e:
+            logger.warning(f"Failed to publish metadata catalog change: {e}")
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(self.settings.REDIS_URL)
+        return self._redis
+
+    async def start(self) -> None:
+        """Start the change listener for the configured invalidation mode"""
+        if self.mode == "postgres":
+            self._listener_task = asyncio.create_task(self._listen_postgres())
+        elif self.mode == "redis":
+            self._listener_task = asyncio.create_task(self._listen_redis())
+        else:
+            logger.info("Metadata catalog invalidation disabled; relying on TTL only")
+
+    async def stop(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+            self._listener_task = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen_postgres(self) -> None:
+        dsn = self.settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        backoff = 1.0
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: closed.set())
+                await conn.add_listener(
+                    self.channel, lambda _conn, _pid, _channel, payload: self._on_change(payload)
+                )
+                # Changes made while disconnected were not delivered
+                self._on_change("listener connected")
+                backoff = 1.0
+                logger.info(f"Listening for metadata catalog changes on Postgres channel '{self.channel}'")
+                await closed.wait()
+                logger.warning("Metadata catalog listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Metadata catalog listener error: {e}; retrying in {backoff:.0f}s")
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _listen_redis(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = self._get_redis().pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                self._on_change("listener connected")
+                backoff = 1.0
+                logger.info(f"Listening for metadata catalog changes on Redis channel '{self.channel}'")
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        data = message.get("data")
+                        self._on_change(data.decode() if isinstance(data, bytes) else str(data))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Metadata catalog listener error: {e}; retrying in {backoff:.0f}s")
+            finally:
+                await pubsub.aclose()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            **self.stats,
+            "mode": self.mode,
+            "version": snapshot.version if snapshot else 0,
+            "etag": snapshot.etag if snapshot else None,
+            "stale": not self.is_fresh(),
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 1) if snapshot else None
+        }
+
+
+# Global catalog instance
+metadata_catalog = MetadataCatalog()
@@ -0,0 +1,238 @@
+"""
+Process-wide model client registry
+
+LangChain model objects and the provider SDK clients inside them are expensive
+to build: each one opens its own HTTP connection pool, so constructing them per
+request meant a fresh TCP/TLS handshake to the provider on almost every call.
+The registry keeps one instance per model configuration (keyed by a hash of
+the fields that affect the client), hands every instance the same pooled
+``httpx`` clients, and caches ``unified_models`` rows so resolving the default
+model does not hit the database each time.
+
+Cached rows are dropped when ``unified_models`` changes. Notifications arrive
+through the metadata catalog listener (Postgres trigger from migration 0005 or
+the Redis channel), with a TTL as the safety net. A changed row hashes
+differently, so the next lookup builds a new instance and the stale one is
+released.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from ..core.config import get_settings
+from .metadata_catalog import metadata_catalog
+
+logger = logging.getLogger(__name__)
+
+RecordLoader = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+InstanceFactory = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Row fields that change the constructed client; anything else (pricing, metrics) does not
+CONFIG_HASH_FIELDS = ("provider", "model_type", "name", "api_endpoint", "api_key", "model_config")
+
+MODELS_TABLE = "unified_models"
+
+# Marks "not cached" so a cached confirmed miss (None) can be told apart
+_MISSING = object()
+
+
+def config_hash(model_record: Dict[str, Any]) -> str:
+    """Stable hash of the parts of a model row that affect its client"""
+    payload = {field: model_record.get(field) for field in CONFIG_HASH_FIELDS}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ModelRegistry:
+    """Shared model instances, HTTP pools and model row cache for the gateway process"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._instances: Dict[str, Any] = {}
+        self._model_hashes: Dict[str, str] = {}
+        self._records: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}  # key -> (expires_at, row)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+        self.stats = {
+            "instance_hits": 0,
+            "instances_created": 0,
+            "instances_released": 0,
+            "record_hits": 0,
+            "record_loads": 0,
+            "invalidations": 0,
+        }
+        metadata_catalog.add_change_listener(self._on_registry_change)
+
+    # ------------------------------------------------------------------
+    # Shared HTTP pools
+    # ------------------------------------------------------------------
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.settings.MODEL_REGISTRY_MAX_CONNECTIONS,
+            max_keepalive_connections=self.settings.MODEL_REGISTRY_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=self.settings.MODEL_REGISTRY_KEEPALIVE_EXPIRY,
+        )
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            self.settings.MODEL_REGISTRY_REQUEST_TIMEOUT,
+            connect=self.settings.MODEL_REGISTRY_CONNECT_TIMEOUT,
+        )
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """Pooled sync client passed to LangChain models as ``http_client``"""
+        if self._http_client is None:
+            self._http_client = httpx.Client(limits=self._limits(), timeout=self._timeout())
+        return self._http_client
+
+    @property
+    def http_async_client(self) -> httpx.AsyncClient:
+        """Pooled async client passed to LangChain models as ``http_async_client``"""
+        if self._http_async_client is None:
+            self._http_async_client = httpx.AsyncClient(limits=self._limits(), timeout=self._timeout())
+        return self._http_async_client
+
+    # ------------------------------------------------------------------
+    # Model rows
+    # ------------------------------------------------------------------
+
+    async def get_record(self, key: str, loader: RecordLoader) -> Optional[Dict[str, Any]]:
+        """Return the cached row for ``key``, loading it once with ``loader`` when missing or expired.
+
+        A ``None`` from the loader is a confirmed miss and is cached for the
+        shorter negative TTL. Loaders must raise on database errors; those
+        propagate to the caller and are never cached.
+        """
+        record = self._cached_record(key)
+        if record is not _MISSING:
+            return record
+
+        async with self._lock(f"record:{key}"):
+            record = self._cached_record(key)
+            if record is not _MISSING:
+                return record
+            record = await loader()
+            ttl = (
+                self.settings.MODEL_REGISTRY_RECORD_TTL_SECONDS if record is not None
+                else self.settings.MODEL_REGISTRY_NEGATIVE_TTL_SECONDS
+            )
+            self._records[key] = (time.monotonic() + ttl, record)
+            self.stats["record_loads"] += 1
+            return record
+
+    def _cached_record(self, key: str) -> Any:
+        cached = self._records.get(key)
+        if cached is None or time.monotonic() >= cached[0]:
+            return _MISSING
+        self.stats["record_hits"] += 1
+        return cached[1]
+
+    # ------------------------------------------------------------------
+    # Model instances
+    # ------------------------------------------------------------------
+
+    async def get_instance(self, model_record: Dict[str, Any], factory: InstanceFactory) -> Optional[Any]:
+        """Return the shared instance for this row's configuration, building it once"""
+        digest = config_hash(model_record)
+        instance = self._instances.get(digest)
+        if instance is None:
+            async with self._lock(f"instance:{digest}"):
+                instance = self._instances.get(digest)
+                if instance is None:
+                    instance = await factory(model_record)
+                    if instance is None:
+                        return None
+                    self._instances[digest] = instance
+                    self.stats["instances_created"] += 1
+                    logger.info(f"Created model instance for {model_record.get('name')} ({model_record.get('provider')})")
+        else:
+            self.stats["instance_hits"] += 1
+
+        model_id = model_record.get("id")
+        if model_id:
+            previous = self._model_hashes.get(model_id)
+            self._model_hashes[model_id] = digest
+            if previous and previous != digest:
+                self._release(previous)
+        return instance
+
+    def peek_instance(self, model_id: str) -> Optional[Any]:
+        """Instance last built for ``model_id`` without touching the database"""
+        digest = self._model_hashes.get(model_id)
+        return self._instances.get(digest) if digest else None
+
+    def _release(self, digest: str) -> None:
+        # Rows with identical configuration share an instance; keep it while any still refers to it
+        if digest in self._model_hashes.values():
+            return
+        if self._instances.pop(digest, None) is not None:
+            self.stats["instances_released"] += 1
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, model_id: Optional[str] = None) -> None:
+        """Drop cached rows, and the instance of ``model_id`` if given.
+
+        All rows are dropped because the ``default:*`` entries may point at any model.
+        """
+        self._records.clear()
+        if model_id:
+            digest = self._model_hashes.pop(model_id, None)
+            if digest:
+                self._release(digest)
+        self.stats["invalidations"] += 1
+
+    async def publish_change(self, model_id: Optional[str] = None) -> None:
+        """Invalidate locally and notify other gateway replicas through the catalog channel"""
+        self.invalidate(model_id)
+        await metadata_catalog.publish_change(MODELS_TABLE)
+
+    def _on_registry_change(self, source: str) -> None:
+        # Instances stay: a changed row hashes differently on its next lookup
+        if source in (MODELS_TABLE, "listener connected"):
+            self._records.clear()
+            self.stats["invalidations"] += 1
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def close(self) -> None:
+        self._instances.clear()
+        self._model_hashes.clear()
+        self._records.clear()
+        if self._http_async_client is not None:
+            await self._http_async_client.aclose()
+            self._http_async_client = None
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "instances": len(self._instances),
+            "models": len(self._model_hashes),
+            "cached_records": len(self._records),
+        }
+
+
+# Global registry instance
+model_registry = ModelRegistry()
@@ -0,0 +1,129 @@
+"""
+Metadata catalog tests: ETag revalidation, change notifications and single-flight reloads
+"""
+
+import asyncio
+
+import pytest
+
+for module in ("httpx", "fastapi", "asyncpg", "redis", "pydantic_settings", "email_validator"):
+    pytest.importorskip(module)
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import metadata
+from app.core.database import get_database
+from app.services.metadata_catalog import MetadataCatalog
+
+
+class _Loader:
+    """Returns the current catalog payload and counts how often it was queried"""
+
+    def __init__(self, payload, delay=0.0):
+        self.payload = payload
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, db=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return dict(self.payload)
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    catalog = MetadataCatalog()
+    monkeypatch.setattr(metadata, "metadata_catalog", catalog)
+    return catalog
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    loader = _Loader({"agents": ["a"], "tools": [], "workflows": []})
+    monkeypatch.setattr(metadata, "load_chat_metadata_options", loader)
+    return loader
+
+
+@pytest.fixture
+def client(catalog, loader):
+    app = FastAPI()
+    app.include_router(metadata.router)
+    app.dependency_overrides[get_database] = lambda: None
+    return TestClient(app)
+
+
+def test_matching_if_none_match_returns_304_without_body(client, catalog, loader):
+    first = client.get("/metadata/chat-options")
+    assert first.status_code == 200
+    assert first.json() == {"agents": ["a"], "tools": [], "workflows": []}
+    etag = first.headers["etag"]
+
+    second = client.get("/metadata/chat-options", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert client.get("/metadata/chat-options", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get("/metadata/chat-options", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert loader.calls == 1
+    assert catalog.stats["not_modified"] == 2
+
+
+def test_change_notification_produces_new_etag(client, catalog, loader):
+    heard = []
+    catalog.add_change_listener(heard.append)
+    etag = client.get("/metadata/chat-options").headers["etag"]
+
+    loader.payload = {**loader.payload, "agents": ["a", "b"]}
+    # Still served from memory until a change is announced
+    assert client.get("/metadata/chat-options", headers={"If-None-Match": etag}).status_code == 304
+
+    catalog._on_change("agents")
+    response = client.get("/metadata/chat-options", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["agents"] == ["a", "b"]
+    assert response.headers["x-catalog-version"] == "2"
+    assert heard == ["agents"]
+
+
+def test_reload_with_unchanged_content_keeps_etag(catalog):
+    loader = _Loader({"agents": []})
+
+    async def run():
+        first = await catalog.get(loader)
+        catalog.invalidate("test")
+        return first, await catalog.get(loader)
+
+    first, second = asyncio.run(run())
+    assert loader.calls == 2
+    assert (second.etag, second.version) == (first.etag, first.version)
+
+
+def test_concurrent_reads_after_invalidation_reload_once(catalog):
+    loader = _Loader({"agents": []}, delay=0.05)
+
+    async def run():
+        await catalog.get(loader)
+        catalog.invalidate("test")
+        return await asyncio.gather(*(catalog.get(loader) for _ in range(10)))
+
+    snapshots = asyncio.run(run())
+    assert loader.calls == 2
+    assert len({snapshot.etag for snapshot in snapshots}) == 1
+    assert catalog.stats["reloads"] == 2
+
+
+def test_failed_reload_stays_stale(catalog):
+    async def failing():
+        raise RuntimeError("database down")
+
+    loader = _Loader({"agents": []})
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await catalog.get(failing)
+        return await catalog.get(loader)
+
+    assert asyncio.run(run()).body == b'{"agents":[]}'
+    assert loader.calls == 1
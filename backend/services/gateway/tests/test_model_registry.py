@@ -0,0 +1,69 @@
+"""
+Model registry row cache tests: negative caching and loader failures
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+for module in ("httpx", "asyncpg", "redis", "pydantic_settings"):
+    pytest.importorskip(module)
+
+from app.services import model_registry as model_registry_module
+from app.services.model_registry import ModelRegistry
+
+ROW = {"id": "m1", "name": "gpt", "provider": "openai"}
+
+
+class _Loader:
+    """Returns the queued results in order; exceptions are raised"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = ModelRegistry()
+    monkeypatch.setattr(registry.settings, "MODEL_REGISTRY_RECORD_TTL_SECONDS", 60.0)
+    monkeypatch.setattr(registry.settings, "MODEL_REGISTRY_NEGATIVE_TTL_SECONDS", 5.0)
+    return registry
+
+
+def test_found_row_is_cached(registry):
+    loader = _Loader(ROW)
+    assert asyncio.run(registry.get_record("id:m1", loader)) == ROW
+    assert asyncio.run(registry.get_record("id:m1", loader)) == ROW
+    assert loader.calls == 1
+
+
+def test_loader_error_is_not_cached(registry):
+    loader = _Loader(ConnectionError("database unavailable"), ROW)
+    with pytest.raises(ConnectionError):
+        asyncio.run(registry.get_record("default:llm", loader))
+    assert asyncio.run(registry.get_record("default:llm", loader)) == ROW
+    assert loader.calls == 2
+
+
+def test_miss_expires_after_negative_ttl(registry, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(model_registry_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    loader = _Loader(None, ROW)
+
+    assert asyncio.run(registry.get_record("default:llm", loader)) is None
+    now[0] += 4.0
+    assert asyncio.run(registry.get_record("default:llm", loader)) is None
+    assert loader.calls == 1
+
+    now[0] += 2.0
+    assert asyncio.run(registry.get_record("default:llm", loader)) == ROW
+    assert loader.calls == 2
@@ -0,0 +1,82 @@
+"""
+Gateway proxy tests: request bodies forwarded upstream
+"""
+
+import asyncio
+
+import pytest
+
+for module in ("httpx", "fastapi", "pydantic_settings", "email_validator", "jose", "passlib", "psutil", "tenacity"):
+    pytest.importorskip(module)
+
+import httpx
+from starlette.requests import Request
+
+from app.api.v1.proxy import ProxyService, request_body
+
+
+def _request(method, headers, chunks=(b"",)):
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": n < len(chunks) - 1}
+        for n, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": "/",
+        "query_string": b"",
+        "headers": [(name.encode(), value.encode()) for name, value in headers.items()],
+    }
+    return Request(scope, receive)
+
+
+def _forward(request):
+    sent = []
+
+    async def handler(upstream_request):
+        sent.append((upstream_request.headers, await upstream_request.aread()))
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        service = ProxyService()
+        service._clients["tools"] = httpx.AsyncClient(
+            base_url="http://tools", transport=httpx.MockTransport(handler)
+        )
+        response = await service.proxy_request(
+            service="tools",
+            path="/items",
+            method=request.method,
+            headers=dict(request.headers),
+            body=request_body(request)
+        )
+        await response.background()
+        await service.aclose()
+
+    asyncio.run(run())
+    return sent[0]
+
+
+def test_bodyless_get_is_forwarded_without_a_body():
+    headers, body = _forward(_request("GET", {"accept": "application/json"}))
+    assert body == b""
+    assert "transfer-encoding" not in headers
+    assert headers.get("content-length") in (None, "0")
+
+
+def test_request_body_is_streamed_upstream():
+    payload = b'{"name": "x"}'
+    request = _request("POST", {"content-type": "application/json", "content-length": str(len(payload))},
+                       chunks=(payload[:5], payload[5:]))
+    headers, body = _forward(request)
+    assert body == payload
+    assert headers["content-length"] == str(len(payload))
+
+
+def test_chunked_request_body_is_forwarded():
+    request = _request("POST", {"transfer-encoding": "chunked"}, chunks=(b"ab", b"cd"))
+    assert request_body(request) is not None
+    assert _forward(request)[1] == b"abcd"
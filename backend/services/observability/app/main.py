@@ -2,22 +2,25 @@
 Observability Service - Monitoring, metrics, and tracing
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import PlainTextResponse
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Dict, Any, List, Optional, Union
 import logging
 import asyncio
 import time
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
 import json
 import os
+import zlib
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 from contextlib import asynccontextmanager
 import httpx
 
+from .telemetry_store import LogStore, TraceStore, naive_utc
+from .metric_store import MetricStore, ROLLUP_RESOLUTIONS, metric_point
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -112,6 +115,12 @@ class LogEntry(BaseModel):
     trace_id: Optional[str] = None
     span_id: Optional[str] = None
 
+    @field_validator('timestamp')
+    @classmethod
+    def validate_timestamp(cls, v):
+        # Stored and compared as naive UTC, like the utcnow default
+        return naive_utc(v)
+
 class TraceSpan(BaseModel):
     trace_id: str
     span_id: str
@@ -125,6 +134,11 @@ class TraceSpan(BaseModel):
     tags: Dict[str, str] = Field(default_factory=dict)
     logs: List[Dict[str, Any]] = Field(default_factory=list)
 
+    @field_validator('start_time', 'end_time')
+    @classmethod
+    def validate_times(cls, v):
+        return naive_utc(v)
+
 class HealthStatus(BaseModel):
     service: str
     status: str  # healthy, unhealthy, unknown
@@ -133,11 +147,16 @@ class HealthStatus(BaseModel):
     error_message: Optional[str] = None
 
 # In-memory storage (in production, use proper time-series DB)
-metrics_storage: Dict[str, deque] = defaultdict(lambda: deque(maxlen=10000))
-logs_storage: deque = deque(maxlen=50000)
-traces_storage: Dict[str, List[TraceSpan]] = defaultdict(list)
+metrics_storage = MetricStore()
+logs_storage = LogStore()
+traces_storage = TraceStore()
 health_storage: Dict[str, HealthStatus] = {}
 
+# Upper bound on a (decompressed) batch ingest body
+MAX_BATCH_BYTES = int(os.getenv("OBSERVABILITY_MAX_BATCH_BYTES", str(32 * 1024 * 1024)))
+# Per-item validation errors echoed back in a batch response
+MAX_BATCH_ERRORS = 10
+
 # Service discovery
 MONITORED_SERVICES = {
     "gateway": "http://localhost:8000",
@@ -215,7 +234,8 @@ async def health_check():
         },
         "monitored_services": service_status,
         "storage_stats": {
-            "metrics_points": sum(len(q) for q in metrics_storage.values()),
+            "metrics_points": metrics_storage.total_points(),
+            "metric_label_sets": metrics_storage.label_set_count(),
             "log_entries": len(logs_storage),
             "active_traces": len(traces_storage)
         }
@@ -256,16 +276,10 @@ async def record_metric(
 ):
     """Record a custom metric"""
     
-    if timestamp is None:
-        timestamp = datetime.utcnow()
-    
-    metric_point = MetricPoint(
-        timestamp=timestamp,
-        value=value,
-        labels=labels or {}
-    )
-    
-    metrics_storage[name].append(metric_point)
+    try:
+        metrics_storage.add(name, value, labels, timestamp)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {"message": f"Metric '{name}' recorded successfully"}
 
@@ -275,26 +289,25 @@ async def get_metric(
     metric_name: str,
     start_time: Optional[datetime] = None,
     end_time: Optional[datetime] = None,
-    limit: int = 1000
+    limit: int = 1000,
+    resolution: str = Query("raw", description="raw, 1m, 5m or 1h")
 ):
-    """Get metric data"""
+    """Get metric data
+    
+    ``raw`` returns the newest ``limit`` points in the range; the rollup
+    resolutions return count/sum/min/max/avg buckets instead.
+    """
     
     if metric_name not in metrics_storage:
         raise HTTPException(status_code=404, detail=f"Metric '{metric_name}' not found")
+    if resolution != "raw" and resolution not in ROLLUP_RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported resolution '{resolution}'")
     
-    points = list(metrics_storage[metric_name])
-    
-    # Apply time filters
-    if start_time:
-        points = [p for p in points if p.timestamp >= start_time]
-    if end_time:
-        points = [p for p in points if p.timestamp <= end_time]
-    
-    # Apply limit
-    points = points[-limit:]
+    points = metrics_storage.query(metric_name, start_time, end_time, limit, resolution)
     
     return {
         "metric_name": metric_name,
+        "resolution": resolution,
         "points": points,
         "count": len(points)
     }
@@ -304,17 +317,7 @@ async def get_metric(
 async def list_metrics():
     """List all available metrics"""
     
-    metrics_info = {}
-    
-    for name, points in metrics_storage.items():
-        if points:
-            latest = points[-1]
-            metrics_info[name] = {
-                "latest_value": latest.value,
-                "latest_timestamp": latest.timestamp,
-                "point_count": len(points),
-                "labels": latest.labels
-            }
+    metrics_info = metrics_storage.summaries()
     
     return {
         "metrics": metrics_info,
@@ -322,11 +325,133 @@ async def list_metrics():
     }
 
 
+async def read_batch(request: Request) -> List[Any]:
+    """Decode a batch body: NDJSON or a JSON array, optionally gzip-compressed
+    
+    Both the request body and the decompressed payload are limited to
+    ``MAX_BATCH_BYTES``.
+    """
+    
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_BATCH_BYTES:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_BYTES} bytes")
+    
+    # Read in chunks so a body without (or with a false) Content-Length is cut off early
+    received = bytearray()
+    async for chunk in request.stream():
+        received.extend(chunk)
+        if len(received) > MAX_BATCH_BYTES:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_BYTES} bytes")
+    body = bytes(received)
+    
+    if request.headers.get("content-encoding", "").lower() == "gzip" or body[:2] == b"\x1f\x8b":
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = decompressor.decompress(body, MAX_BATCH_BYTES + 1)
+        except zlib.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid gzip body: {e}")
+    if len(body) > MAX_BATCH_BYTES:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_BYTES} bytes")
+    
+    try:
+        if "ndjson" in request.headers.get("content-type", ""):
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        items = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch body: {e}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Batch body must be a JSON array or NDJSON")
+    return items
+
+
+def batch_result(accepted: int, errors: List[str]) -> Dict[str, Any]:
+    return {
+        "accepted": accepted,
+        "rejected": len(errors),
+        "errors": errors[:MAX_BATCH_ERRORS]
+    }
+
+
+@app.post("/metrics/batch")
+async def record_metrics_batch(request: Request):
+    """Record many metric points in one request
+    
+    Items are ``{"name", "value", "labels"?, "timestamp"?}`` with the
+    timestamp as ISO-8601 or epoch seconds. Send NDJSON
+    (``application/x-ndjson``) or a JSON array, optionally gzip-encoded.
+    
+    Every item is validated before any is stored, so a request either fails
+    as a whole or stores exactly the accepted items.
+    """
+    
+    points, errors = [], []
+    for n, item in enumerate(await read_batch(request)):
+        try:
+            timestamp = item.get("timestamp")
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp)
+            ts, value, labels = metric_point(item["value"], item.get("labels"), timestamp)
+            points.append((str(item["name"]), value, labels, ts))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            errors.append(f"item {n}: {e!r}")
+    
+    for name, value, labels, ts in points:
+        metrics_storage.add(name, value, labels, ts)
+    
+    return batch_result(len(points), errors)
+
+
+@app.post("/logs/batch")
+async def record_logs_batch(request: Request):
+    """Record many log entries in one request (NDJSON or JSON array, optionally gzip-encoded)
+    
+    Every item is validated before any is stored, so a request either fails
+    as a whole or stores exactly the accepted items.
+    """
+    
+    entries, errors = [], []
+    for n, item in enumerate(await read_batch(request)):
+        try:
+            entries.append(LogEntry.model_validate(item))
+        except ValueError as e:
+            errors.append(f"item {n}: {e}")
+    
+    for entry in entries:
+        logs_storage.add(entry)
+    
+    return batch_result(len(entries), errors)
+
+
+@app.post("/traces/batch")
+async def record_traces_batch(request: Request):
+    """Record many trace spans in one request (NDJSON or JSON array, optionally gzip-encoded)
+    
+    Every item is validated before any is stored, so a request either fails
+    as a whole or stores exactly the accepted items.
+    """
+    
+    spans, errors = [], []
+    for n, item in enumerate(await read_batch(request)):
+        try:
+            span = TraceSpan.model_validate(item)
+        except ValueError as e:
+            errors.append(f"item {n}: {e}")
+            continue
+        if span.end_time and span.start_time:
+            span.duration_ms = (span.end_time - span.start_time).total_seconds() * 1000
+        spans.append(span)
+    
+    for span in spans:
+        traces_storage.add_span(span)
+    
+    return batch_result(len(spans), errors)
+
+
 @app.post("/logs")
 async def record_log(log_entry: LogEntry):
     """Record a log entry"""
     
-    logs_storage.append(log_entry)
+    logs_storage.add(log_entry)
     
     return {"message": "Log entry recorded successfully"}
 
@@ -340,25 +465,20 @@ async def get_logs(
     limit: int = 1000,
     search: Optional[str] = None
 ):
-    """Get log entries"""
-    
-    logs = list(logs_storage)
-    
-    # Apply filters
-    if service:
-        logs = [log for log in logs if log.service == service]
-    if level:
-        logs = [log for log in logs if log.level.lower() == level.lower()]
-    if start_time:
-        logs = [log for log in logs if log.timestamp >= start_time]
-    if end_time:
-        logs = [log for log in logs if log.timestamp <= end_time]
-    if search:
-        logs = [log for log in logs if search.lower() in log.message.lower()]
-    
-    # Sort by timestamp (newest first) and apply limit
-    logs.sort(key=lambda x: x.timestamp, reverse=True)
-    logs = logs[:limit]
+    """Get log entries, newest first
+    
+    Filters are answered from per-segment indexes; ``search`` matches a
+    case-insensitive substring of the message.
+    """
+    
+    logs = logs_storage.query(
+        service=service,
+        level=level,
+        start_time=start_time,
+        end_time=end_time,
+        search=search,
+        limit=limit
+    )
     
     return {
         "logs": logs,
@@ -375,7 +495,7 @@ async def record_trace_span(span: TraceSpan):
     if span.end_time and span.start_time:
         span.duration_ms = (span.end_time - span.start_time).total_seconds() * 1000
     
-    traces_storage[span.trace_id].append(span)
+    traces_storage.add_span(span)
     
     return {"message": f"Trace span recorded for trace {span.trace_id}"}
 
@@ -384,35 +504,19 @@ async def record_trace_span(span: TraceSpan):
 async def get_trace(trace_id: str):
     """Get all spans for a trace"""
     
-    if trace_id not in traces_storage:
+    trace = traces_storage.get(trace_id)
+    if trace is None:
         raise HTTPException(status_code=404, detail=f"Trace '{trace_id}' not found")
     
-    spans = traces_storage[trace_id]
-    
-    # Sort by start time
-    spans.sort(key=lambda x: x.start_time)
-    
-    # Calculate total trace duration
-    if spans:
-        start_time = min(span.start_time for span in spans)
-        end_times = [span.end_time for span in spans if span.end_time]
-        end_time = max(end_times) if end_times else None
-        
-        total_duration_ms = None
-        if end_time:
-            total_duration_ms = (end_time - start_time).total_seconds() * 1000
-    else:
-        start_time = None
-        end_time = None
-        total_duration_ms = None
-    
+    # Spans are kept ordered by start time and the summary is maintained on ingest
     return {
         "trace_id": trace_id,
-        "spans": spans,
-        "span_count": len(spans),
-        "start_time": start_time,
-        "end_time": end_time,
-        "total_duration_ms": total_duration_ms
+        "spans": trace.spans,
+        "span_count": len(trace.spans),
+        "start_time": trace.start_time,
+        "end_time": trace.end_time,
+        "total_duration_ms": trace.total_duration_ms,
+        "dropped_spans": trace.dropped_spans
     }
 
 
@@ -423,48 +527,9 @@ async def list_traces(
     status: Optional[str] = None,
     limit: int = 100
 ):
-    """List traces"""
+    """List traces, newest first"""
     
-    traces = []
-    
-    for trace_id, spans in traces_storage.items():
-        if not spans:
-            continue
-        
-        # Apply filters
-        if service and not any(span.service == service for span in spans):
-            continue
-        if operation and not any(span.operation == operation for span in spans):
-            continue
-        if status and not any(span.status == status for span in spans):
-            continue
-        
-        # Calculate trace summary
-        start_time = min(span.start_time for span in spans)
-        end_times = [span.end_time for span in spans if span.end_time]
-        end_time = max(end_times) if end_times else None
-        
-        total_duration_ms = None
-        if end_time:
-            total_duration_ms = (end_time - start_time).total_seconds() * 1000
-        
-        services = list(set(span.service for span in spans))
-        operations = list(set(span.operation for span in spans))
-        
-        traces.append({
-            "trace_id": trace_id,
-            "span_count": len(spans),
-            "services": services,
-            "operations": operations,
-            "start_time": start_time,
-            "end_time": end_time,
-            "total_duration_ms": total_duration_ms,
-            "status": "error" if any(span.status == "error" for span in spans) else "ok"
-        })
-    
-    # Sort by start time (newest first) and apply limit
-    traces.sort(key=lambda x: x["start_time"] or datetime.min, reverse=True)
-    traces = traces[:limit]
+    traces = traces_storage.query(service=service, operation=operation, status=status, limit=limit)
     
     return {
         "traces": traces,
@@ -524,14 +589,13 @@ async def get_dashboard_stats():
     total_services = len(MONITORED_SERVICES)
     
     # Recent activity
-    recent_logs = len([log for log in logs_storage if log.timestamp > datetime.utcnow() - timedelta(hours=1)])
-    recent_traces = len([tid for tid, spans in traces_storage.items() 
-                        if spans and any(span.start_time > datetime.utcnow() - timedelta(hours=1) for span in spans)])
+    one_hour_ago = datetime.utcnow() - timedelta(hours=1)
+    recent_logs = logs_storage.count_since(one_hour_ago)
+    recent_traces = traces_storage.count_since(one_hour_ago)
     
     # Error rates
-    error_logs = len([log for log in logs_storage if log.level.lower() in ["error", "critical"]])
-    error_traces = len([tid for tid, spans in traces_storage.items() 
-                       if spans and any(span.status == "error" for span in spans)])
+    error_logs = logs_storage.count_levels(["error", "critical"])
+    error_traces = traces_storage.count_status("error")
     
     return {
         "services": {
@@ -551,9 +615,11 @@ async def get_dashboard_stats():
             "error_rate": (error_logs / len(logs_storage) * 100) if logs_storage else 0
         },
         "storage": {
-            "metrics_points": sum(len(q) for q in metrics_storage.values()),
+            "metrics_points": metrics_storage.total_points(),
             "log_entries": len(logs_storage),
-            "trace_count": len(traces_storage)
+            "trace_count": len(traces_storage),
+            "logs": logs_storage.get_stats(),
+            "traces": traces_storage.get_stats()
         }
     }
 
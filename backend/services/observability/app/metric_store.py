@@ -0,0 +1,320 @@
+"""
+Columnar metric storage
+Each series keeps raw points in chunked ``array`` columns (epoch seconds,
+values, interned label-set ids) instead of one Pydantic object per float, plus
+count/sum/min/max rollups at 1m, 5m and 1h. Time-range queries binary-search
+the chunk boundaries and the timestamp column.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+from array import array
+from collections import Counter, deque
+from datetime import datetime, timezone
+import bisect
+import math
+import os
+
+METRIC_SERIES_CAPACITY = int(os.getenv("METRIC_SERIES_CAPACITY", "10000"))
+METRIC_CHUNK_SIZE = int(os.getenv("METRIC_CHUNK_SIZE", "1024"))
+METRIC_ROLLUP_CAPACITY = int(os.getenv("METRIC_ROLLUP_CAPACITY", "1440"))
+
+ROLLUP_RESOLUTIONS = {"1m": 60, "5m": 300, "1h": 3600}
+
+# Epoch seconds that ``from_epoch`` can turn back into a datetime
+MIN_EPOCH = datetime(1, 1, 2, tzinfo=timezone.utc).timestamp()
+MAX_EPOCH = datetime(9999, 12, 30, tzinfo=timezone.utc).timestamp()
+
+
+def to_epoch(timestamp: datetime) -> float:
+    """Epoch seconds; naive datetimes are taken as UTC like ``datetime.utcnow()``"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def from_epoch(seconds: float) -> datetime:
+    """Naive UTC datetime, matching what the service has always returned"""
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+
+
+def metric_point(
+    value: Any,
+    labels: Optional[Dict[str, Any]] = None,
+    timestamp: Optional[Union[datetime, float]] = None
+) -> Tuple[float, float, Dict[str, str]]:
+    """Convert and check one point, returning ``(ts, value, labels)``
+    
+    Raises ``ValueError`` or ``TypeError`` for anything the store could not
+    serve back later: non-finite values, timestamps outside the datetime
+    range and labels that are not a mapping.
+    """
+    if timestamp is None:
+        ts = datetime.now(timezone.utc).timestamp()
+    elif isinstance(timestamp, datetime):
+        ts = to_epoch(timestamp)
+    else:
+        ts = float(timestamp)
+    if not MIN_EPOCH <= ts <= MAX_EPOCH:
+        raise ValueError(f"timestamp {timestamp!r} is out of range")
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"value {value!r} is not finite")
+    if labels is None:
+        labels = {}
+    elif not isinstance(labels, dict):
+        raise TypeError(f"labels must be an object, not {type(labels).__name__}")
+    return ts, value, {str(key): str(label) for key, label in labels.items()}
+
+
+class _Chunk:
+    __slots__ = ("timestamps", "values", "label_ids")
+
+    def __init__(self):
+        self.timestamps = array("d")
+        self.values = array("d")
+        self.label_ids = array("I")
+
+    def insert(self, index: int, ts: float, value: float, label_id: int) -> None:
+        self.timestamps.insert(index, ts)
+        self.values.insert(index, value)
+        self.label_ids.insert(index, label_id)
+
+    def append(self, ts: float, value: float, label_id: int) -> None:
+        self.timestamps.append(ts)
+        self.values.append(value)
+        self.label_ids.append(label_id)
+
+
+class _Rollup:
+    """Fixed-resolution buckets stored as parallel arrays, oldest first"""
+
+    __slots__ = ("resolution", "starts", "counts", "sums", "mins", "maxs")
+
+    def __init__(self, resolution: int):
+        self.resolution = resolution
+        self.starts = array("d")
+        self.counts = array("L")
+        self.sums = array("d")
+        self.mins = array("d")
+        self.maxs = array("d")
+
+    def add(self, ts: float, value: float) -> None:
+        start = ts - ts % self.resolution
+        if self.starts and start == self.starts[-1]:
+            i = len(self.starts) - 1
+        elif not self.starts or start > self.starts[-1]:
+            self._insert(len(self.starts), start, value)
+            return
+        else:
+            i = bisect.bisect_left(self.starts, start)
+            if i == len(self.starts) or self.starts[i] != start:
+                if i == 0 and len(self.starts) >= METRIC_ROLLUP_CAPACITY:
+                    return  # older than the retained window
+                self._insert(i, start, value)
+                return
+
+        self.counts[i] += 1
+        self.sums[i] += value
+        if value < self.mins[i]:
+            self.mins[i] = value
+        if value > self.maxs[i]:
+            self.maxs[i] = value
+
+    def _insert(self, i: int, start: float, value: float) -> None:
+        self.starts.insert(i, start)
+        self.counts.insert(i, 1)
+        self.sums.insert(i, value)
+        self.mins.insert(i, value)
+        self.maxs.insert(i, value)
+        if len(self.starts) > METRIC_ROLLUP_CAPACITY:
+            for column in (self.starts, self.counts, self.sums, self.mins, self.maxs):
+                del column[0]
+
+    def query(self, start: Optional[float], end: Optional[float], limit: int) -> List[Dict[str, Any]]:
+        lo = bisect.bisect_left(self.starts, start - start % self.resolution) if start is not None else 0
+        hi = bisect.bisect_right(self.starts, end) if end is not None else len(self.starts)
+        lo = max(lo, hi - limit)
+        return [
+            {
+                "timestamp": from_epoch(self.starts[i]),
+                "count": self.counts[i],
+                "sum": self.sums[i],
+                "min": self.mins[i],
+                "max": self.maxs[i],
+                "avg": self.sums[i] / self.counts[i]
+            }
+            for i in range(lo, hi)
+        ]
+
+
+class MetricSeries:
+    """Bounded raw points for one metric name plus its rollups"""
+
+    def __init__(self, store: "MetricStore"):
+        self._store = store
+        self.chunks: deque = deque([_Chunk()])
+        self.size = 0
+        self.rollups = {name: _Rollup(seconds) for name, seconds in ROLLUP_RESOLUTIONS.items()}
+
+    def add(self, ts: float, value: float, label_id: int) -> None:
+        last = self.chunks[-1]
+        if not last.timestamps or ts >= last.timestamps[-1]:
+            if len(last.timestamps) >= METRIC_CHUNK_SIZE:
+                last = _Chunk()
+                self.chunks.append(last)
+            last.append(ts, value, label_id)
+        else:
+            # Late point: insert into the chunk covering its timestamp to keep columns sorted
+            firsts = [chunk.timestamps[0] for chunk in self.chunks]
+            chunk = self.chunks[max(bisect.bisect_right(firsts, ts) - 1, 0)]
+            chunk.insert(bisect.bisect_right(chunk.timestamps, ts), ts, value, label_id)
+        self.size += 1
+
+        # Drop whole chunks once the rest still holds the full capacity
+        while len(self.chunks) > 1 and self.size - len(self.chunks[0].timestamps) >= METRIC_SERIES_CAPACITY:
+            evicted = self.chunks.popleft()
+            self.size -= len(evicted.timestamps)
+            self._store._release_labels(evicted.label_ids)
+
+        for rollup in self.rollups.values():
+            rollup.add(ts, value)
+
+    def latest(self) -> Optional[Tuple[float, float, int]]:
+        last = self.chunks[-1]
+        if not last.timestamps:
+            return None
+        return last.timestamps[-1], last.values[-1], last.label_ids[-1]
+
+    def query(self, start: Optional[float], end: Optional[float], limit: int) -> List[Dict[str, Any]]:
+        """Newest ``limit`` raw points within [start, end], returned oldest first"""
+        if limit <= 0:
+            return []
+        slices = []
+        remaining = limit
+        for chunk in reversed(self.chunks):
+            ts = chunk.timestamps
+            if not ts:
+                continue
+            if end is not None and ts[0] > end:
+                continue
+            if start is not None and ts[-1] < start:
+                break
+            lo = bisect.bisect_left(ts, start) if start is not None else 0
+            hi = bisect.bisect_right(ts, end) if end is not None else len(ts)
+            lo = max(lo, hi - remaining)
+            if hi > lo:
+                slices.append((chunk, lo, hi))
+                remaining -= hi - lo
+                if remaining == 0:
+                    break
+
+        labels = self._store.labels
+        points = []
+        for chunk, lo, hi in reversed(slices):
+            for i in range(lo, hi):
+                points.append({
+                    "timestamp": from_epoch(chunk.timestamps[i]),
+                    "value": chunk.values[i],
+                    "labels": labels[chunk.label_ids[i]]
+                })
+        return points
+
+
+class MetricStore:
+    """All metric series, keyed by name, with a shared label-set intern table
+
+    Label sets are reference-counted by the points that use them and their
+    ids are reused once the last such point is evicted, so high-cardinality
+    labels stay bounded by the retained points.
+    """
+
+    def __init__(self):
+        self.series: Dict[str, MetricSeries] = {}
+        self.labels: List[Optional[Dict[str, str]]] = []
+        self._label_ids: Dict[Tuple[Tuple[str, str], ...], int] = {}
+        self._label_refs: List[int] = []
+        self._free_label_ids: List[int] = []
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.series
+
+    def _intern_labels(self, labels: Optional[Dict[str, str]]) -> int:
+        """Id of the label set, counting one more point that uses it"""
+        key = tuple(sorted((labels or {}).items()))
+        label_id = self._label_ids.get(key)
+        if label_id is None:
+            if self._free_label_ids:
+                label_id = self._free_label_ids.pop()
+                self.labels[label_id] = dict(key)
+                self._label_refs[label_id] = 0
+            else:
+                label_id = len(self.labels)
+                self.labels.append(dict(key))
+                self._label_refs.append(0)
+            self._label_ids[key] = label_id
+        self._label_refs[label_id] += 1
+        return label_id
+
+    def _release_labels(self, label_ids: Iterable[int]) -> None:
+        """Drop the references of evicted points, freeing unused label sets"""
+        for label_id, count in Counter(label_ids).items():
+            self._label_refs[label_id] -= count
+            if self._label_refs[label_id] == 0:
+                del self._label_ids[tuple(sorted(self.labels[label_id].items()))]
+                self.labels[label_id] = None
+                self._free_label_ids.append(label_id)
+
+    def label_set_count(self) -> int:
+        return len(self._label_ids)
+
+    def add(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict[str, str]] = None,
+        timestamp: Optional[Union[datetime, float]] = None
+    ) -> None:
+        """Record a point; ``timestamp`` may be a datetime or epoch seconds
+        
+        The point is checked with ``metric_point`` before anything is stored,
+        so a rejected point leaves no series or label set behind.
+        """
+        ts, value, labels = metric_point(value, labels, timestamp)
+        label_id = self._intern_labels(labels)
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = MetricSeries(self)
+        series.add(ts, value, label_id)
+
+    def query(
+        self,
+        name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 1000,
+        resolution: str = "raw"
+    ) -> List[Dict[str, Any]]:
+        series = self.series[name]
+        start = to_epoch(start_time) if start_time else None
+        end = to_epoch(end_time) if end_time else None
+        if resolution == "raw":
+            return series.query(start, end, limit)
+        return series.rollups[resolution].query(start, end, limit)
+
+    def summaries(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for name, series in self.series.items():
+            latest = series.latest()
+            if latest is None:
+                continue
+            ts, value, label_id = latest
+            result[name] = {
+                "latest_value": value,
+                "latest_timestamp": from_epoch(ts),
+                "point_count": series.size,
+                "labels": self.labels[label_id]
+            }
+        return result
+
+    def total_points(self) -> int:
+        return sum(series.size for series in self.series.values())
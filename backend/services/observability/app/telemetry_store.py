@@ -0,0 +1,546 @@
+"""
+Bounded, indexed in-memory telemetry store
+Logs and trace spans are kept in time-partitioned segments arranged as a ring.
+A segment is sealed after TELEMETRY_SEGMENT_SECONDS or once it is full, and the
+oldest segment is dropped together with its indexes when the ring is full, so
+memory stays flat under sustained ingest. Every segment carries its own
+secondary indexes, which makes eviction O(1) and lets queries touch only the
+postings that can match.
+
+Queries walk the segments newest first. A segment whose entries arrived in
+timestamp order yields its newest matches by walking arrival order backwards
+and stops at ``limit``; once late entries have arrived it picks the newest
+``limit`` of its matches by timestamp instead.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Iterator
+from collections import deque
+from datetime import datetime, timezone
+from itertools import islice
+import bisect
+import heapq
+import os
+import re
+import time
+
+TELEMETRY_SEGMENT_SECONDS = float(os.getenv("TELEMETRY_SEGMENT_SECONDS", "300"))
+LOG_SEGMENT_MAX_ENTRIES = int(os.getenv("LOG_SEGMENT_MAX_ENTRIES", "5000"))
+LOG_MAX_SEGMENTS = int(os.getenv("LOG_MAX_SEGMENTS", "10"))
+TRACE_SEGMENT_MAX_TRACES = int(os.getenv("TRACE_SEGMENT_MAX_TRACES", "1000"))
+TRACE_MAX_SEGMENTS = int(os.getenv("TRACE_MAX_SEGMENTS", "10"))
+# Spans beyond this are dropped so a runaway trace cannot grow without bound
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "500"))
+
+_TOKEN_RE = re.compile(r"\w+")
+# Token substrings up to this length are indexed for substring search
+GRAM_SIZE = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens used by the inverted log index"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def naive_utc(timestamp: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC datetime, so aware and ``datetime.utcnow()`` timestamps compare"""
+    if timestamp is None or timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def search_terms(search: str) -> List[Tuple[str, str]]:
+    """Index lookups that every message containing ``search`` must satisfy.
+
+    A word at the start of the search may be the end of a longer word in the
+    message, and one at the end may be its beginning, so those are matched as
+    suffix, prefix or (for a single word) substring; words in between are
+    whole tokens.
+    """
+    lowered = search.lower()
+    terms = []
+    for match in _TOKEN_RE.finditer(lowered):
+        open_start = match.start() == 0
+        open_end = match.end() == len(lowered)
+        if open_start and open_end:
+            mode = "contains"
+        elif open_start:
+            mode = "suffix"
+        elif open_end:
+            mode = "prefix"
+        else:
+            mode = "exact"
+        terms.append((match.group(), mode))
+    return terms
+
+
+def token_grams(token: str) -> set:
+    """Distinct substrings of ``token`` of length 1 to GRAM_SIZE"""
+    return {
+        token[i:i + n]
+        for n in range(1, GRAM_SIZE + 1)
+        for i in range(len(token) - n + 1)
+    }
+
+
+def _contains(postings: List[int], position: int) -> bool:
+    i = bisect.bisect_left(postings, position)
+    return i < len(postings) and postings[i] == position
+
+
+def _newest_first(alternatives: List[List[int]]) -> Iterator[int]:
+    """Positions in any of the sorted posting lists, descending, without duplicates"""
+    if len(alternatives) == 1:
+        yield from reversed(alternatives[0])
+        return
+    previous = None
+    for position in heapq.merge(*(reversed(p) for p in alternatives), reverse=True):
+        if position != previous:
+            yield position
+            previous = position
+
+
+def _intersect_newest_first(groups: List[List[List[int]]]) -> Iterator[int]:
+    """Positions in every group, newest first
+
+    A group is a list of sorted posting lists, any of which satisfies it. The
+    smallest group is walked lazily; the others are probed by bisection.
+    """
+    groups = sorted(groups, key=lambda group: sum(len(p) for p in group))
+    driver, others = groups[0], groups[1:]
+    for position in _newest_first(driver):
+        if all(any(_contains(p, position) for p in group) for group in others):
+            yield position
+
+
+class _LogSegment:
+    """One partition of the log ring with its own service, level and token indexes"""
+
+    def __init__(self):
+        self.created = time.monotonic()
+        self.entries: List[Any] = []
+        self.by_service: Dict[str, List[int]] = {}
+        self.by_level: Dict[str, List[int]] = {}
+        self.by_token: Dict[str, List[int]] = {}
+        # Short substrings of the vocabulary, so substring lookups touch only tokens that share them
+        self.by_gram: Dict[str, List[str]] = {}
+        self.min_ts: Optional[datetime] = None
+        self.max_ts: Optional[datetime] = None
+        # True while every entry arrived no older than the ones before it
+        self.in_order = True
+
+    def is_sealed(self) -> bool:
+        return (
+            len(self.entries) >= LOG_SEGMENT_MAX_ENTRIES
+            or time.monotonic() - self.created >= TELEMETRY_SEGMENT_SECONDS
+        )
+
+    def add(self, entry: Any) -> None:
+        entry.timestamp = naive_utc(entry.timestamp)
+        position = len(self.entries)
+        self.entries.append(entry)
+        self.by_service.setdefault(entry.service, []).append(position)
+        self.by_level.setdefault(entry.level.lower(), []).append(position)
+        for token in set(tokenize(entry.message)):
+            postings = self.by_token.get(token)
+            if postings is None:
+                postings = self.by_token[token] = []
+                for gram in token_grams(token):
+                    self.by_gram.setdefault(gram, []).append(token)
+            postings.append(position)
+
+        if self.max_ts is not None and entry.timestamp < self.max_ts:
+            self.in_order = False
+        if self.min_ts is None or entry.timestamp < self.min_ts:
+            self.min_ts = entry.timestamp
+        if self.max_ts is None or entry.timestamp > self.max_ts:
+            self.max_ts = entry.timestamp
+
+    def _term_postings(self, term: str, mode: str) -> List[List[int]]:
+        """Posting lists of the tokens matching ``term``; an entry needs to be in any one"""
+        if mode == "exact":
+            postings = self.by_token.get(term)
+            return [postings] if postings else []
+        if len(term) <= GRAM_SIZE:
+            # The term is itself an indexed gram, so these tokens all contain it
+            tokens = self.by_gram.get(term, [])
+        else:
+            # Every token containing the term holds all its grams; verify the rarest gram's tokens
+            grams = [self.by_gram.get(term[i:i + GRAM_SIZE], []) for i in range(len(term) - GRAM_SIZE + 1)]
+            tokens = [token for token in min(grams, key=len) if term in token]
+        if mode == "prefix":
+            tokens = [token for token in tokens if token.startswith(term)]
+        elif mode == "suffix":
+            tokens = [token for token in tokens if token.endswith(term)]
+        return [self.by_token[token] for token in tokens]
+
+    def candidates(
+        self,
+        service: Optional[str],
+        level: Optional[str],
+        terms: List[Tuple[str, str]]
+    ) -> Iterable[int]:
+        """Positions matching the indexed filters, newest arrival first"""
+        groups = []
+        if service:
+            groups.append([self.by_service.get(service, [])])
+        if level:
+            groups.append([self.by_level.get(level.lower(), [])])
+        for term, mode in terms:
+            groups.append(self._term_postings(term, mode))
+
+        if not groups:
+            return range(len(self.entries) - 1, -1, -1)
+        if any(not any(group) for group in groups):
+            return ()
+        return _intersect_newest_first(groups)
+
+
+class LogStore:
+    """Ring of time-partitioned log segments"""
+
+    def __init__(self, max_segments: int = LOG_MAX_SEGMENTS):
+        self.segments: deque = deque()
+        self.max_segments = max_segments
+        self.total = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return self.total
+
+    def add(self, entry: Any) -> None:
+        if not self.segments or self.segments[-1].is_sealed():
+            self.segments.append(_LogSegment())
+            if len(self.segments) > self.max_segments:
+                dropped = self.segments.popleft()
+                self.total -= len(dropped.entries)
+                self.evicted += len(dropped.entries)
+        self.segments[-1].add(entry)
+        self.total += 1
+
+    def query(
+        self,
+        service: Optional[str] = None,
+        level: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        search: Optional[str] = None,
+        limit: int = 1000
+    ) -> List[Any]:
+        """Matching entries, newest first.
+
+        ``search`` matches a case-insensitive substring of the message; the
+        token index narrows the candidates first (see ``search_terms``).
+        Timestamps are compared as naive UTC. Each segment contributes its
+        newest ``limit`` matches, and segments whose time range cannot
+        improve a full result set are skipped. Index lookups touch only the
+        postings of matching tokens; a segment that received late entries is
+        scanned over all of its candidates, so the cost is bounded by the
+        matches in the segments visited rather than by the retention.
+        """
+        if limit <= 0:
+            return []
+        search_lower = search.lower() if search else None
+        terms = search_terms(search) if search else []
+        start_time, end_time = naive_utc(start_time), naive_utc(end_time)
+
+        results: List[Any] = []
+        threshold: Optional[datetime] = None
+        for segment in reversed(self.segments):
+            if not segment.entries:
+                continue
+            if start_time and segment.max_ts < start_time:
+                continue
+            if end_time and segment.min_ts > end_time:
+                continue
+            if threshold is not None and segment.max_ts < threshold:
+                continue
+
+            check_time = bool(
+                (start_time and segment.min_ts < start_time) or (end_time and segment.max_ts > end_time)
+            )
+            matches = self._matches(segment, service, level, terms, search_lower, start_time, end_time, check_time)
+            if segment.in_order:
+                # Arrival order is timestamp order, so the newest arrivals are the newest entries
+                results.extend(islice(matches, limit))
+            else:
+                results.extend(heapq.nlargest(limit, matches, key=lambda e: e.timestamp))
+
+            if len(results) >= limit:
+                results.sort(key=lambda e: e.timestamp, reverse=True)
+                del results[limit:]
+                threshold = results[-1].timestamp
+
+        results.sort(key=lambda e: e.timestamp, reverse=True)
+        return results[:limit]
+
+    @staticmethod
+    def _matches(
+        segment: _LogSegment,
+        service: Optional[str],
+        level: Optional[str],
+        terms: List[Tuple[str, str]],
+        search_lower: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        check_time: bool
+    ) -> Iterator[Any]:
+        """Entries of one segment passing every filter, newest arrival first"""
+        for position in segment.candidates(service, level, terms):
+            entry = segment.entries[position]
+            if check_time:
+                if start_time and entry.timestamp < start_time:
+                    continue
+                if end_time and entry.timestamp > end_time:
+                    continue
+            if search_lower and search_lower not in entry.message.lower():
+                continue
+            yield entry
+
+    def count_since(self, since: datetime) -> int:
+        since = naive_utc(since)
+        count = 0
+        for segment in self.segments:
+            if not segment.entries or segment.max_ts < since:
+                continue
+            if segment.min_ts >= since:
+                count += len(segment.entries)
+            else:
+                count += sum(1 for entry in segment.entries if entry.timestamp >= since)
+        return count
+
+    def count_levels(self, levels: Iterable[str]) -> int:
+        levels = [level.lower() for level in levels]
+        return sum(
+            len(segment.by_level.get(level, ()))
+            for segment in self.segments
+            for level in levels
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": self.total,
+            "segments": len(self.segments),
+            "max_segments": self.max_segments,
+            "segment_max_entries": LOG_SEGMENT_MAX_ENTRIES,
+            "evicted": self.evicted
+        }
+
+
+class TraceSummary:
+    """Spans of one trace plus the summary fields, maintained as spans arrive"""
+
+    __slots__ = (
+        "trace_id", "spans", "services", "operations", "statuses",
+        "start_time", "end_time", "dropped_spans"
+    )
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List[Any] = []  # ordered by start_time
+        self.services: Dict[str, None] = {}
+        self.operations: Dict[str, None] = {}
+        self.statuses: Dict[str, None] = {}
+        self.start_time: Optional[datetime] = None
+        self.end_time: Optional[datetime] = None
+        self.dropped_spans = 0
+
+    def add(self, span: Any) -> bool:
+        if len(self.spans) >= TRACE_MAX_SPANS:
+            self.dropped_spans += 1
+            return False
+        bisect.insort(self.spans, span, key=lambda s: s.start_time)
+        self.services[span.service] = None
+        self.operations[span.operation] = None
+        self.statuses[span.status] = None
+        if self.start_time is None or span.start_time < self.start_time:
+            self.start_time = span.start_time
+        if span.end_time and (self.end_time is None or span.end_time > self.end_time):
+            self.end_time = span.end_time
+        return True
+
+    @property
+    def total_duration_ms(self) -> Optional[float]:
+        if self.start_time is None or self.end_time is None:
+            return None
+        return (self.end_time - self.start_time).total_seconds() * 1000
+
+    @property
+    def status(self) -> str:
+        return "error" if "error" in self.statuses else "ok"
+
+    def to_summary(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_count": len(self.spans),
+            "services": list(self.services),
+            "operations": list(self.operations),
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "total_duration_ms": self.total_duration_ms,
+            "status": self.status
+        }
+
+
+class _TraceSegment:
+    """One partition of the trace ring; indexes map values to trace ids in arrival order"""
+
+    def __init__(self):
+        self.created = time.monotonic()
+        self.traces: Dict[str, TraceSummary] = {}
+        self.by_service: Dict[str, Dict[str, None]] = {}
+        self.by_operation: Dict[str, Dict[str, None]] = {}
+        self.by_status: Dict[str, Dict[str, None]] = {}
+        self.min_ts: Optional[datetime] = None
+        self.max_ts: Optional[datetime] = None
+        self.span_count = 0
+        # True while traces arrived in start_time order and kept their place in it
+        self.in_order = True
+
+    def is_sealed(self) -> bool:
+        return (
+            len(self.traces) >= TRACE_SEGMENT_MAX_TRACES
+            or time.monotonic() - self.created >= TELEMETRY_SEGMENT_SECONDS
+        )
+
+    def add(self, span: Any) -> TraceSummary:
+        summary = self.traces.get(span.trace_id)
+        if summary is None:
+            if self.max_ts is not None and span.start_time < self.max_ts:
+                self.in_order = False
+            summary = self.traces[span.trace_id] = TraceSummary(span.trace_id)
+        previous_start = summary.start_time
+        if summary.add(span):
+            if previous_start is not None and summary.start_time < previous_start:
+                # An earlier span moved the trace back; only the first trace keeps its place for sure
+                if summary is not next(iter(self.traces.values())):
+                    self.in_order = False
+            self.span_count += 1
+            self.by_service.setdefault(span.service, {})[span.trace_id] = None
+            self.by_operation.setdefault(span.operation, {})[span.trace_id] = None
+            self.by_status.setdefault(span.status, {})[span.trace_id] = None
+            if self.min_ts is None or span.start_time < self.min_ts:
+                self.min_ts = span.start_time
+            if self.max_ts is None or span.start_time > self.max_ts:
+                self.max_ts = span.start_time
+        return summary
+
+    def candidates(
+        self,
+        service: Optional[str],
+        operation: Optional[str],
+        status: Optional[str]
+    ) -> Iterable[str]:
+        """Trace ids matching every given filter, newest arrival first"""
+        indexes = []
+        if service:
+            indexes.append(self.by_service.get(service, {}))
+        if operation:
+            indexes.append(self.by_operation.get(operation, {}))
+        if status:
+            indexes.append(self.by_status.get(status, {}))
+
+        if not indexes:
+            return reversed(self.traces)
+        indexes.sort(key=len)
+        shortest, others = indexes[0], indexes[1:]
+        return (trace_id for trace_id in reversed(shortest) if all(trace_id in other for other in others))
+
+
+class TraceStore:
+    """Ring of time-partitioned trace segments with per-trace summaries"""
+
+    def __init__(self, max_segments: int = TRACE_MAX_SEGMENTS):
+        self.segments: deque = deque()
+        self.max_segments = max_segments
+        # Spans of a known trace always land in the segment that holds it
+        self._locator: Dict[str, _TraceSegment] = {}
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._locator)
+
+    def __contains__(self, trace_id: str) -> bool:
+        return trace_id in self._locator
+
+    def add_span(self, span: Any) -> TraceSummary:
+        span.start_time = naive_utc(span.start_time)
+        span.end_time = naive_utc(span.end_time)
+        segment = self._locator.get(span.trace_id)
+        if segment is None:
+            if not self.segments or self.segments[-1].is_sealed():
+                self._rotate()
+            segment = self._locator[span.trace_id] = self.segments[-1]
+        return segment.add(span)
+
+    def _rotate(self) -> None:
+        self.segments.append(_TraceSegment())
+        if len(self.segments) > self.max_segments:
+            dropped = self.segments.popleft()
+            for trace_id in dropped.traces:
+                self._locator.pop(trace_id, None)
+            self.evicted += len(dropped.traces)
+
+    def get(self, trace_id: str) -> Optional[TraceSummary]:
+        segment = self._locator.get(trace_id)
+        return segment.traces.get(trace_id) if segment else None
+
+    def query(
+        self,
+        service: Optional[str] = None,
+        operation: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Summaries of traces with any span matching each filter, newest first"""
+        if limit <= 0:
+            return []
+
+        matches: List[TraceSummary] = []
+        threshold: Optional[datetime] = None
+        for segment in reversed(self.segments):
+            if not segment.traces:
+                continue
+            if threshold is not None and segment.max_ts < threshold:
+                continue
+            found = (segment.traces[trace_id] for trace_id in segment.candidates(service, operation, status))
+            if segment.in_order:
+                matches.extend(islice(found, limit))
+            else:
+                matches.extend(heapq.nlargest(limit, found, key=lambda t: t.start_time))
+            if len(matches) >= limit:
+                matches.sort(key=lambda t: t.start_time, reverse=True)
+                del matches[limit:]
+                threshold = matches[-1].start_time
+
+        matches.sort(key=lambda t: t.start_time, reverse=True)
+        return [summary.to_summary() for summary in matches[:limit]]
+
+    def count_since(self, since: datetime) -> int:
+        since = naive_utc(since)
+        count = 0
+        for segment in self.segments:
+            if not segment.traces or segment.max_ts < since:
+                continue
+            if segment.min_ts >= since:
+                count += len(segment.traces)
+            else:
+                # Original semantics: any span of the trace started within the window
+                count += sum(
+                    1 for summary in segment.traces.values()
+                    if summary.spans[-1].start_time >= since
+                )
+        return count
+
+    def count_status(self, status: str) -> int:
+        return sum(len(segment.by_status.get(status, ())) for segment in self.segments)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "traces": len(self._locator),
+            "spans": sum(segment.span_count for segment in self.segments),
+            "segments": len(self.segments),
+            "max_segments": self.max_segments,
+            "segment_max_traces": TRACE_SEGMENT_MAX_TRACES,
+            "max_spans_per_trace": TRACE_MAX_SPANS,
+            "evicted_traces": self.evicted
+        }
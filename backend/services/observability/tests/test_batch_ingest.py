@@ -0,0 +1,114 @@
+"""
+Batch ingest endpoint tests: validation before storage and body size limits
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("prometheus_client")
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.metric_store import MetricStore
+from app.telemetry_store import LogStore, TraceStore
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "logs_storage", LogStore())
+    monkeypatch.setattr(main, "traces_storage", TraceStore())
+    return TestClient(main.app)
+
+
+def _ndjson(items):
+    return "\n".join(json.dumps(item) for item in items).encode()
+
+
+def _post(client, path, items):
+    return client.post(path, content=_ndjson(items), headers={"content-type": "application/x-ndjson"})
+
+
+def test_log_batch_mixing_aware_and_naive_timestamps(client):
+    response = _post(client, "/logs/batch", [
+        {"level": "info", "service": "api", "message": "first"},
+        {"timestamp": "2026-01-01T12:00:00Z", "level": "info", "service": "api", "message": "aware"},
+        {"timestamp": "2026-01-01T12:00:01", "level": "info", "service": "api", "message": "naive"},
+    ])
+    assert response.status_code == 200
+    assert response.json()["accepted"] == 3
+    assert client.get("/logs").json()["count"] == 3
+
+
+def test_log_batch_stores_only_valid_items(client):
+    response = _post(client, "/logs/batch", [
+        {"level": "info", "service": "api", "message": "ok"},
+        {"level": "info", "message": "missing service"},
+        {"level": "warn", "service": "api", "message": "also ok"},
+    ])
+    assert response.json()["accepted"] == 2
+    assert response.json()["rejected"] == 1
+    assert len(main.logs_storage) == 2
+
+
+def test_trace_batch_mixing_aware_and_naive_times(client):
+    response = _post(client, "/traces/batch", [
+        {"trace_id": "t1", "span_id": "a", "service": "api", "operation": "op",
+         "start_time": "2026-01-01T12:00:00Z", "end_time": "2026-01-01T12:00:01"},
+        {"trace_id": "t1", "span_id": "b", "service": "api", "operation": "op",
+         "start_time": "2026-01-01T12:00:00.500000"},
+        {"trace_id": "t2", "span_id": "c", "service": "api", "operation": "op"},
+    ])
+    assert response.json()["accepted"] == 2
+    assert response.json()["rejected"] == 1
+    assert client.get("/traces/t1").json()["total_duration_ms"] == 1000
+
+
+def test_oversized_batch_rejected_by_content_length(client, monkeypatch):
+    monkeypatch.setattr(main, "MAX_BATCH_BYTES", 64)
+    body = _ndjson([{"level": "info", "service": "api", "message": "x" * 100}])
+    response = client.post("/logs/batch", content=body, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 413
+    assert len(main.logs_storage) == 0
+
+
+def test_oversized_chunked_batch_rejected(client, monkeypatch):
+    monkeypatch.setattr(main, "MAX_BATCH_BYTES", 64)
+    chunks = [_ndjson([{"level": "info", "service": "api", "message": "x" * 20}]) + b"\n"] * 10
+    # A generator body is sent with chunked encoding and no Content-Length
+    response = client.post("/logs/batch", content=iter(chunks), headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 413
+    assert len(main.logs_storage) == 0
+
+
+@pytest.fixture
+def metrics_client(monkeypatch):
+    monkeypatch.setattr(main, "metrics_storage", MetricStore())
+    return TestClient(main.app)
+
+
+def test_metric_batch_stores_only_valid_items(metrics_client):
+    response = _post(metrics_client, "/metrics/batch", [
+        {"name": "m", "value": 1, "timestamp": 1767268800},
+        {"name": "m", "value": 2, "timestamp": "2026-01-01T12:00:01Z", "labels": {"host": "a"}},
+        {"name": "m", "value": "not a number"},
+        {"value": 3},
+    ])
+    assert response.json()["accepted"] == 2
+    assert response.json()["rejected"] == 2
+    points = metrics_client.get("/metrics/m").json()["points"]
+    assert [p["value"] for p in points] == [1, 2]
+    assert points[1]["labels"] == {"host": "a"}
+
+
+def test_metric_batch_rejects_unservable_points(metrics_client):
+    response = _post(metrics_client, "/metrics/batch", [
+        {"name": "huge", "value": 1, "timestamp": 1e20},
+        {"name": "listed", "value": 1, "timestamp": [1]},
+        {"name": "labelled", "value": 1, "labels": ["a"]},
+    ])
+    assert response.json() == {"accepted": 0, "rejected": 3, "errors": response.json()["errors"]}
+    assert metrics_client.get("/metrics").json() == {"metrics": {}, "total_metrics": 0}
+    assert metrics_client.get("/metrics/huge").status_code == 404
@@ -0,0 +1,121 @@
+"""
+Metric store tests: ordering, chunk eviction, rollups, range queries and point validation
+"""
+
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import metric_store
+from app.metric_store import MetricStore, metric_point, to_epoch
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+T0 = to_epoch(NOW)
+
+
+def test_out_of_order_points_are_returned_sorted():
+    store = MetricStore()
+    for offset in (0, 2, 1, 4, 3):
+        store.add("m", offset, timestamp=T0 + offset)
+
+    assert [p["value"] for p in store.query("m")] == [0, 1, 2, 3, 4]
+    assert store.summaries()["m"]["latest_value"] == 4
+
+
+def test_late_point_lands_in_the_covering_chunk(monkeypatch):
+    monkeypatch.setattr(metric_store, "METRIC_CHUNK_SIZE", 2)
+    store = MetricStore()
+    for offset in (0, 10, 20, 30):
+        store.add("m", offset, timestamp=T0 + offset)
+    store.add("m", 15, timestamp=T0 + 15)
+
+    assert [p["value"] for p in store.query("m")] == [0, 10, 15, 20, 30]
+
+
+def test_whole_chunks_evicted_past_capacity(monkeypatch):
+    monkeypatch.setattr(metric_store, "METRIC_CHUNK_SIZE", 4)
+    monkeypatch.setattr(metric_store, "METRIC_SERIES_CAPACITY", 8)
+    store = MetricStore()
+    for i in range(20):
+        store.add("m", i, timestamp=T0 + i)
+
+    values = [p["value"] for p in store.query("m")]
+    assert len(values) >= 8
+    assert values == list(range(20 - len(values), 20))
+    assert store.total_points() == len(values)
+
+
+def test_range_query_and_limit():
+    store = MetricStore()
+    for i in range(10):
+        store.add("m", i, {"host": "a"}, NOW + timedelta(seconds=i))
+
+    points = store.query("m", NOW + timedelta(seconds=3), NOW + timedelta(seconds=6))
+    assert [p["value"] for p in points] == [3, 4, 5, 6]
+    assert points[0]["timestamp"] == NOW + timedelta(seconds=3)
+    assert points[0]["labels"] == {"host": "a"}
+    # The newest points win when the limit cuts the range
+    assert [p["value"] for p in store.query("m", limit=2)] == [8, 9]
+
+
+def test_rollups_aggregate_per_bucket():
+    store = MetricStore()
+    for i, value in enumerate([1, 5, 3]):
+        store.add("m", value, timestamp=T0 + i)
+    store.add("m", 10, timestamp=T0 + 60)
+
+    buckets = store.query("m", resolution="1m")
+    assert [(b["count"], b["min"], b["max"], b["sum"]) for b in buckets] == [(3, 1, 5, 9), (1, 10, 10, 10)]
+    assert buckets[0]["avg"] == 3
+    assert store.query("m", resolution="1h")[0]["count"] == 4
+
+
+@pytest.mark.parametrize("timestamp", [1e20, -1e20, math.inf, math.nan])
+def test_out_of_range_timestamp_rejected_without_a_series(timestamp):
+    store = MetricStore()
+    with pytest.raises(ValueError):
+        store.add("m", 1, timestamp=timestamp)
+    assert "m" not in store
+    assert store.summaries() == {}
+
+
+@pytest.mark.parametrize("kwargs", [{"timestamp": [1]}, {"labels": ["a"]}, {"labels": "a=b"}])
+def test_bad_timestamp_or_labels_leave_no_series(kwargs):
+    store = MetricStore()
+    with pytest.raises((TypeError, ValueError)):
+        store.add("m", 1, **kwargs)
+    assert "m" not in store
+    assert store.labels == []
+
+
+def test_metric_point_rejects_non_finite_values():
+    with pytest.raises(ValueError):
+        metric_point(math.inf)
+    assert metric_point(1, {"code": 200}, T0) == (T0, 1.0, {"code": "200"})
+
+
+def test_label_sets_are_released_with_evicted_chunks(monkeypatch):
+    monkeypatch.setattr(metric_store, "METRIC_CHUNK_SIZE", 4)
+    monkeypatch.setattr(metric_store, "METRIC_SERIES_CAPACITY", 8)
+    store = MetricStore()
+    for i in range(200):
+        store.add("m", i, {"request_id": str(i)}, T0 + i)
+
+    # Only label sets of retained points are kept, and freed ids are reused
+    assert store.label_set_count() == store.total_points()
+    assert len(store.labels) <= 16
+    points = store.query("m")
+    assert [p["labels"]["request_id"] for p in points] == [str(int(p["value"])) for p in points]
+
+
+def test_shared_label_set_survives_partial_eviction(monkeypatch):
+    monkeypatch.setattr(metric_store, "METRIC_CHUNK_SIZE", 2)
+    monkeypatch.setattr(metric_store, "METRIC_SERIES_CAPACITY", 2)
+    store = MetricStore()
+    store.add("a", 1, {"host": "x"}, T0)
+    for i in range(10):
+        store.add("b", i, {"host": "x"}, T0 + i)
+
+    assert store.query("a")[0]["labels"] == {"host": "x"}
+    assert store.label_set_count() == 1
@@ -0,0 +1,102 @@
+"""
+Log and trace store tests: timestamp normalization and substring search
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.telemetry_store import LogStore, TraceStore, search_terms
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _log(message, timestamp=NOW, service="api", level="info"):
+    return SimpleNamespace(timestamp=timestamp, service=service, level=level, message=message)
+
+
+def _span(trace_id, start_time, end_time=None, span_id="s1"):
+    return SimpleNamespace(
+        trace_id=trace_id, span_id=span_id, service="api", operation="op",
+        status="ok", start_time=start_time, end_time=end_time
+    )
+
+
+def test_logs_mix_aware_and_naive_timestamps():
+    store = LogStore()
+    store.add(_log("naive", NOW))
+    store.add(_log("aware", datetime(2026, 1, 1, 14, 0, 1, tzinfo=timezone(timedelta(hours=2)))))
+    store.add(_log("naive again", NOW + timedelta(seconds=2)))
+
+    assert len(store) == 3
+    assert [e.message for e in store.query()] == ["naive again", "aware", "naive"]
+    assert [e.message for e in store.query(start_time=(NOW + timedelta(seconds=1)).replace(tzinfo=timezone.utc))] == [
+        "naive again", "aware"
+    ]
+    assert store.count_since(NOW.replace(tzinfo=timezone.utc)) == 3
+
+
+def test_traces_mix_aware_and_naive_timestamps():
+    store = TraceStore()
+    store.add_span(_span("t1", NOW, NOW + timedelta(seconds=1)))
+    store.add_span(_span("t1", NOW.replace(tzinfo=timezone.utc), span_id="s2"))
+    store.add_span(_span("t2", (NOW + timedelta(seconds=5)).replace(tzinfo=timezone.utc)))
+
+    assert [t["trace_id"] for t in store.query()] == ["t2", "t1"]
+    assert store.get("t1").total_duration_ms == 1000
+    assert store.count_since(NOW) == 2
+
+
+@pytest.mark.parametrize("search, expected", [
+    ("ror", ["Connection error", "Errors: none"]),
+    ("ed to", ["Failed to connect"]),
+    ("error", ["Connection error", "Errors: none"]),
+    ("errors:", ["Errors: none"]),
+    ("ion err", ["Connection error"]),
+    ("to conn", ["Failed to connect"]),
+    (": ", ["Errors: none"]),
+    ("timeout", []),
+])
+def test_search_matches_substrings(search, expected):
+    store = LogStore()
+    for n, message in enumerate(["Failed to connect", "Connection error", "Errors: none"]):
+        store.add(_log(message, NOW + timedelta(seconds=n)))
+    assert sorted(e.message for e in store.query(search=search)) == sorted(expected)
+
+
+def test_search_terms_mark_open_ends():
+    assert search_terms("ror") == [("ror", "contains")]
+    assert search_terms("ed to conn") == [("ed", "suffix"), ("to", "exact"), ("conn", "prefix")]
+    assert search_terms(" to ") == [("to", "exact")]
+
+
+def test_late_log_batch_does_not_displace_newer_entries():
+    store = LogStore()
+    for second in range(10, 15):
+        store.add(_log(f"m{second}", NOW + timedelta(seconds=second)))
+    for second in range(1, 4):
+        store.add(_log(f"m{second}", NOW + timedelta(seconds=second)))
+
+    assert [e.message for e in store.query(limit=3)] == ["m14", "m13", "m12"]
+    assert [e.message for e in store.query(search="m", limit=2)] == ["m14", "m13"]
+    assert [e.message for e in store.query(end_time=NOW + timedelta(seconds=5), limit=2)] == ["m3", "m2"]
+
+
+def test_late_trace_does_not_displace_newer_traces():
+    store = TraceStore()
+    for second in range(10, 15):
+        store.add_span(_span(f"t{second}", NOW + timedelta(seconds=second)))
+    store.add_span(_span("t1", NOW + timedelta(seconds=1)))
+
+    assert [t["trace_id"] for t in store.query(limit=3)] == ["t14", "t13", "t12"]
+
+
+def test_trace_moved_back_by_an_earlier_span():
+    store = TraceStore()
+    store.add_span(_span("a", NOW + timedelta(seconds=10)))
+    store.add_span(_span("b", NOW + timedelta(seconds=20)))
+    # The root span of "b" started before "a"
+    store.add_span(_span("b", NOW + timedelta(seconds=5), span_id="root"))
+
+    assert [t["trace_id"] for t in store.query(limit=1)] == ["a"]
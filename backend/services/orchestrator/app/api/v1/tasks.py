@@ -7,8 +7,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any
 
 from ...core.database import get_db
+from ...services.task_queue import TaskQueue, QueueFullError
 
 router = APIRouter()
+task_queue = TaskQueue()
 
 
 @router.get("/")
@@ -23,21 +25,45 @@ async def list_tasks(db: AsyncSession = Depends(get_db)):
     }
 
 
-@router.post("/")
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
 async def create_task(
     task_data: Dict[str, Any],
+    priority: str = "normal",
     db: AsyncSession = Depends(get_db)
 ):
-    """Create a new task"""
+    """Enqueue a task for the worker pool"""
+    
+    if "type" not in task_data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Task must include a 'type'")
+    
+    try:
+        task_id = await task_queue.enqueue_task(task_data, priority=priority)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except QueueFullError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     
-    # Placeholder implementation
     return {
-        "id": f"task_{task_data.get('type', 'unknown')}",
-        "status": "created",
-        "message": "Task creation not yet implemented"
+        "id": task_id,
+        "status": "queued",
+        "priority": priority
     }
 
 
+@router.get("/queue/stats")
+async def get_queue_stats():
+    """Queue depth per priority lane plus delayed and dead-lettered counts"""
+    
+    return await task_queue.get_queue_depths()
+
+
+@router.get("/queue/dead-letters")
+async def list_dead_letters(count: int = 50):
+    """Most recent dead-lettered tasks"""
+    
+    return {"dead_letters": await task_queue.list_dead_letters(count)}
+
+
 @router.get("/{task_id}")
 async def get_task(
     task_id: str,
@@ -45,12 +71,10 @@ async def get_task(
 ):
     """Get task details"""
     
-    # Placeholder implementation
-    return {
-        "id": task_id,
-        "status": "unknown",
-        "message": "Task details not yet implemented"
-    }
+    task = await task_queue.get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    return task
 
 
 @router.post("/{task_id}/execute")
@@ -73,11 +97,14 @@ async def cancel_task(
     task_id: str,
     db: AsyncSession = Depends(get_db)
 ):
-    """Cancel a task"""
+    """Cancel a queued task; running tasks are not interrupted"""
     
-    # Placeholder implementation
+    if not await task_queue.cancel_task(task_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Task {task_id} is not queued (status: {await task_queue.get_task_status(task_id)})"
+        )
     return {
         "task_id": task_id,
-        "status": "cancelled",
-        "message": "Task cancellation not yet implemented"
+        "status": "cancelled"
     }
@@ -48,12 +48,30 @@ class Settings(BaseSettings):
     TASK_RETRY_ATTEMPTS: int = 3
     TASK_TIMEOUT_SECONDS: int = 300  # 5 minutes
     
+    # Redis streams task queue (see app/services/task_queue.py and app/worker.py)
+    TASK_QUEUE_PREFIX: str = "orchestrator:tasks"
+    TASK_QUEUE_GROUP: str = "orchestrator-workers"
+    TASK_QUEUE_PRIORITIES: List[str] = ["high", "normal", "low"]
+    TASK_QUEUE_VISIBILITY_TIMEOUT_SECONDS: float = 300.0
+    TASK_QUEUE_RETRY_BACKOFF_SECONDS: float = 2.0
+    TASK_QUEUE_RETRY_BACKOFF_MAX_SECONDS: float = 300.0
+    TASK_QUEUE_MAX_STREAM_LENGTH: int = 100000
+    TASK_QUEUE_STATUS_TTL_SECONDS: int = 86400
+    TASK_WORKER_CONCURRENCY: int = 4
+    TASK_QUEUE_METRICS_INTERVAL_SECONDS: float = 15.0
+    
+    # Multi-agent plan execution
+    ORCHESTRATION_MAX_CONCURRENCY: int = 5
+    ORCHESTRATION_AGENT_TIMEOUT_SECONDS: float = 120.0
+    ORCHESTRATION_PLAN_TIMEOUT_SECONDS: float = 300.0
+    
     # A2A Protocol configuration
     A2A_PROTOCOL_VERSION: str = "1.0"
     A2A_MESSAGE_TTL_SECONDS: int = 300
     A2A_MAX_RETRIES: int = 3
     
     # Observability
+    OBSERVABILITY_URL: str = "http://localhost:8008"
     ENABLE_TRACING: bool = True
     JAEGER_ENDPOINT: str = "http://localhost:14268/api/traces"
     
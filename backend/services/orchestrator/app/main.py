@@ -38,6 +38,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Orchestrator service...")
+    await tasks.task_queue.close()
 
 
 def create_application() -> FastAPI:
@@ -6,13 +6,13 @@ Based on https://github.com/a2aproject/a2a-samples/tree/main/samples/python/host
 import asyncio
 import httpx
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set, Tuple, Callable, Awaitable
 import json
 import uuid
 from datetime import datetime
 
 from ..models.a2a_models import (
-    A2AAgentCard, A2AMessage, A2ATask, A2ATaskRequest, A2AMessagePart, A2APartType,
+    A2AAgentCard, A2AMessage, A2ATask, A2ATaskRequest, A2ATaskStatus, A2AMessagePart, A2APartType,
     TaskState, Role, RemoteAgentInfo, OrchestrationContext, OrchestrationPlan,
     OrchestrationResult, A2AAgentCardBuilder
 )
@@ -190,10 +190,15 @@ class A2AOrchestratorAgent:
         plan: OrchestrationPlan,
         stream: bool = False
     ):
-        """Execute an orchestration plan"""
+        """
+        Execute an orchestration plan
+        
+        Steps run concurrently as soon as their dependencies have completed,
+        bounded by ORCHESTRATION_MAX_CONCURRENCY. Each agent call has its own
+        timeout and any steps still running at the plan deadline are cancelled.
+        """
         
         start_time = datetime.utcnow()
-        results = []
         
         # Create session context
         context = OrchestrationContext(
@@ -210,42 +215,35 @@ class A2AOrchestratorAgent:
                     yield result
                 return  # End generator
             else:
-                # Execute steps (simplified parallel execution)
-                tasks = []
-                for step in plan.steps:
+                step_results: Dict[str, A2ATask] = {}
+                
+                async def run_step(step_id: str, step: Dict[str, Any]) -> A2ATask:
+                    message = self.remote_agents.create_text_message(
+                        text=step["query"],
+                        context_id=plan.session_id
+                    )
+                    task_result = await self.remote_agents.send_message_to_agent(
+                        agent_name=step["agent"],
+                        message=message,
+                        session_id=plan.session_id,
+                        context_id=plan.session_id
+                    )
+                    step_results[step_id] = task_result
+                    context.active_tasks[task_result.id] = task_result
+                    return task_result
+                
+                async def on_error(step_id: str, step: Dict[str, Any], error: BaseException) -> None:
                     agent_name = step["agent"]
-                    query = step["query"]
-                    
-                    if agent_name in self.available_agents:
-                        message = self.remote_agents.create_text_message(
-                            text=query,
-                            context_id=plan.session_id
-                        )
-                        
-                        task = self.remote_agents.send_message_to_agent(
-                            agent_name=agent_name,
-                            message=message,
-                            session_id=plan.session_id,
-                            context_id=plan.session_id
-                        )
-                        tasks.append((agent_name, task))
+                    logger.error(f"Error executing task with {agent_name}: {error!r}")
+                    step_results[step_id] = A2ATask(
+                        id=f"error_{agent_name}_{uuid.uuid4()}",
+                        status=A2ATaskStatus(state=TaskState.failed, error=str(error) or repr(error))
+                    )
                 
-                # Wait for all tasks to complete
-                for agent_name, task_coroutine in tasks:
-                    try:
-                        task_result = await task_coroutine
-                        results.append(task_result)
-                        context.active_tasks[task_result.id] = task_result
-                        
-                    except Exception as e:
-                        logger.error(f"Error executing task with {agent_name}: {e}")
-                        # Create error task
-                        from ..models.a2a_models import A2ATaskStatus
-                        error_task = A2ATask(
-                            id=f"error_{agent_name}_{uuid.uuid4()}",
-                            status=A2ATaskStatus(state=TaskState.failed, error=str(e))
-                        )
-                        results.append(error_task)
+                step_ids = await self._run_plan_steps(plan, run_step, on_error)
+                
+                # Keep results in plan order regardless of completion order
+                results = [step_results[step_id] for step_id in step_ids if step_id in step_results]
                 
                 # Create summary
                 summary = await self._create_summary(results, plan.query)
@@ -280,38 +278,184 @@ class A2AOrchestratorAgent:
                 del self.active_sessions[plan.session_id]
     
     async def _execute_plan_streaming(self, plan: OrchestrationPlan, context: OrchestrationContext):
-        """Execute plan with streaming results"""
+        """Execute plan with streaming results, interleaving chunks from all agents as they arrive"""
+        
+        events: asyncio.Queue = asyncio.Queue()
+        done = object()
         
-        for step in plan.steps:
+        async def run_step(step_id: str, step: Dict[str, Any]) -> None:
             agent_name = step["agent"]
-            query = step["query"]
-            
-            if agent_name in self.available_agents:
-                message = self.remote_agents.create_text_message(
-                    text=query,
-                    context_id=plan.session_id
+            message = self.remote_agents.create_text_message(
+                text=step["query"],
+                context_id=plan.session_id
+            )
+            async for chunk in self.remote_agents.send_message_to_agent_stream(
+                agent_name=agent_name,
+                message=message,
+                session_id=plan.session_id,
+                context_id=plan.session_id
+            ):
+                await events.put({
+                    "agent": agent_name,
+                    "type": "chunk",
+                    "data": chunk
+                })
+        
+        async def on_error(step_id: str, step: Dict[str, Any], error: BaseException) -> None:
+            await events.put({
+                "agent": step["agent"],
+                "type": "error",
+                "error": str(error) or repr(error)
+            })
+        
+        async def run_plan() -> None:
+            try:
+                await self._run_plan_steps(plan, run_step, on_error)
+            finally:
+                await events.put(done)
+        
+        runner = asyncio.create_task(run_plan())
+        try:
+            while True:
+                event = await events.get()
+                if event is done:
+                    break
+                yield event
+            # Surface unexpected scheduler errors
+            await runner
+        finally:
+            # The consumer may stop early; don't leave agent calls running
+            if not runner.done():
+                runner.cancel()
+                try:
+                    await runner
+                except asyncio.CancelledError:
+                    pass
+    
+    def _build_step_graph(self, plan: OrchestrationPlan) -> Dict[str, Tuple[Dict[str, Any], Set[str]]]:
+        """
+        Map step ids to (step, dependency ids)
+        
+        A step's id is its "id" key or, failing that, its agent name. Dependencies
+        come from the step's "dependencies" list and ``plan.dependencies``.
+        """
+        
+        graph: Dict[str, Tuple[Dict[str, Any], Set[str]]] = {}
+        for index, step in enumerate(plan.steps):
+            step_id = step.get("id") or step["agent"]
+            if step_id in graph:
+                step_id = f"{step_id}#{index}"
+            graph[step_id] = (step, set(step.get("dependencies", [])))
+        
+        for step_id, (step, dependencies) in graph.items():
+            dependencies.update(plan.dependencies.get(step_id, []))
+            unknown = dependencies - graph.keys()
+            if unknown:
+                logger.warning(f"Plan {plan.id} step {step_id} has unknown dependencies {sorted(unknown)}; ignoring them")
+                dependencies -= unknown
+        
+        return graph
+    
+    async def _run_plan_steps(
+        self,
+        plan: OrchestrationPlan,
+        run_step: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+        on_error: Callable[[str, Dict[str, Any], BaseException], Awaitable[None]]
+    ) -> List[str]:
+        """
+        Run plan steps concurrently in dependency order
+        
+        ``run_step`` is started for each step once all of its dependencies have
+        succeeded; a step whose dependency failed is reported through
+        ``on_error`` without running. Returns the step ids in plan order.
+        """
+        
+        graph = self._build_step_graph(plan)
+        semaphore = asyncio.Semaphore(self.settings.ORCHESTRATION_MAX_CONCURRENCY)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.settings.ORCHESTRATION_PLAN_TIMEOUT_SECONDS
+        
+        succeeded: Dict[str, bool] = {}
+        pending: Dict[str, Tuple[Dict[str, Any], Set[str]]] = {}
+        running: Dict[asyncio.Task, str] = {}
+        
+        for step_id, (step, dependencies) in graph.items():
+            if step["agent"] in self.available_agents:
+                pending[step_id] = (step, dependencies)
+            else:
+                # Unknown agents are skipped, as before; they don't block dependents
+                logger.warning(f"Agent {step['agent']} not available; skipping step {step_id}")
+                succeeded[step_id] = True
+        
+        async def execute(step_id: str, step: Dict[str, Any]) -> Any:
+            async with semaphore:
+                timeout = step.get("timeout") or self.settings.ORCHESTRATION_AGENT_TIMEOUT_SECONDS
+                try:
+                    return await asyncio.wait_for(run_step(step_id, step), timeout)
+                except asyncio.TimeoutError:
+                    raise asyncio.TimeoutError(f"Agent {step['agent']} timed out after {timeout}s")
+        
+        try:
+            while pending or running:
+                # Start every step whose dependencies are satisfied; fail those
+                # whose dependencies failed (which may unblock further failures)
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for step_id, (step, dependencies) in list(pending.items()):
+                        if any(succeeded.get(dep) is False for dep in dependencies):
+                            del pending[step_id]
+                            succeeded[step_id] = False
+                            await on_error(step_id, step, RuntimeError("Skipped because a dependency failed"))
+                            progressed = True
+                        elif all(succeeded.get(dep) for dep in dependencies):
+                            del pending[step_id]
+                            running[asyncio.create_task(execute(step_id, step))] = step_id
+                
+                if not running:
+                    # Whatever is left waits on itself
+                    for step_id, (step, _) in pending.items():
+                        succeeded[step_id] = False
+                        await on_error(step_id, step, RuntimeError("Circular step dependencies"))
+                    break
+                
+                finished, _ = await asyncio.wait(
+                    running, timeout=max(0.0, deadline - loop.time()), return_when=asyncio.FIRST_COMPLETED
                 )
                 
-                try:
-                    async for chunk in self.remote_agents.send_message_to_agent(
-                        agent_name=agent_name,
-                        message=message,
-                        session_id=plan.session_id,
-                        context_id=plan.session_id,
-                        stream=True
-                    ):
-                        yield {
-                            "agent": agent_name,
-                            "type": "chunk",
-                            "data": chunk
-                        }
-                        
-                except Exception as e:
-                    yield {
-                        "agent": agent_name,
-                        "type": "error",
-                        "error": str(e)
-                    }
+                if not finished:
+                    # Plan deadline reached: cancel stragglers and fail whatever has not run
+                    logger.warning(f"Plan {plan.id} exceeded its deadline; cancelling {len(running)} running steps")
+                    for task in running:
+                        task.cancel()
+                    await asyncio.gather(*running, return_exceptions=True)
+                    plan_timeout = asyncio.TimeoutError("Orchestration plan deadline exceeded")
+                    for task, step_id in running.items():
+                        succeeded[step_id] = False
+                        await on_error(step_id, graph[step_id][0], plan_timeout)
+                    for step_id, (step, _) in pending.items():
+                        succeeded[step_id] = False
+                        await on_error(step_id, step, plan_timeout)
+                    running.clear()
+                    pending.clear()
+                    break
+                
+                for task in finished:
+                    step_id = running.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        succeeded[step_id] = False
+                        await on_error(step_id, graph[step_id][0], error)
+                    else:
+                        result = task.result()
+                        succeeded[step_id] = not (
+                            isinstance(result, A2ATask) and result.status.state == TaskState.failed
+                        )
+        finally:
+            for task in running:
+                task.cancel()
+        
+        return list(graph.keys())
     
     async def _create_summary(self, results: List[A2ATask], original_query: str) -> str:
         """Create a summary of orchestration results"""
@@ -5,9 +5,10 @@ Agent service for orchestrator - communicates with agents service
 import httpx
 from typing import Dict, Any, Optional, List
 import logging
-from datetime import datetime
 
 from ..core.config import get_settings
+# The durable queue lives in task_queue; re-exported for existing imports
+from .task_queue import TaskQueue  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
@@ -160,27 +161,3 @@ class AgentService:
         except httpx.RequestError as e:
             logger.error(f"Error sending A2A message: {e}")
             raise Exception(f"A2A communication error: {e}")
-
-
-class TaskQueue:
-    """Simple task queue implementation using Redis"""
-    
-    def __init__(self):
-        self.settings = get_settings()
-        # Note: This is a simplified implementation
-        # In production, use Celery, RQ, or similar
-    
-    async def enqueue_task(self, task_data: Dict[str, Any]) -> str:
-        """Enqueue a task for processing"""
-        
-        # Simplified implementation
-        # In production, integrate with Redis/Celery
-        task_id = f"task_{datetime.utcnow().timestamp()}"
-        logger.info(f"Enqueued task {task_id}")
-        return task_id
-    
-    async def get_task_status(self, task_id: str) -> str:
-        """Get task status"""
-        
-        # Simplified implementation
-        return "completed"
@@ -1,54 +1,445 @@
 """
 Task queue implementation for workflow orchestration
+
+Durable work queue on Redis streams:
+
+- one stream per priority lane, consumed through a shared consumer group so
+  any number of worker processes can pull from it
+- messages a worker has not acknowledged within the visibility timeout are
+  reclaimed by another worker (XAUTOCLAIM)
+- failures are retried with exponential backoff through a delayed sorted set,
+  and tasks that exhaust their attempts go to a dead-letter stream
+- per-task status is kept in a hash with a TTL
+- acknowledged messages are deleted, so a lane only holds waiting and
+  in-flight tasks; it is never trimmed, and new tasks are refused while a
+  lane is at capacity
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
+import json
 import logging
+import random
+import time
+import uuid
+
+import redis.asyncio as redis
 
 from ..core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+class QueueFullError(RuntimeError):
+    """Raised by ``enqueue_task`` when a priority lane is at capacity"""
+
+
+@dataclass
+class QueuedTask:
+    """A task delivered to a worker"""
+    task_id: str
+    task_type: str
+    payload: Dict[str, Any]
+    priority: str
+    attempt: int
+    max_attempts: int
+    enqueued_at: float
+    message_id: str
+    stream: str
+
+    @property
+    def wait_seconds(self) -> float:
+        return max(0.0, time.time() - self.enqueued_at)
+
+
+@dataclass
+class QueueStats:
+    """Latency observations since the last metrics export"""
+    wait_seconds: List[float] = field(default_factory=list)
+    processing_seconds: List[float] = field(default_factory=list)
+    completed: int = 0
+    failed: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+    reclaimed: int = 0
+
+    def reset(self) -> "QueueStats":
+        snapshot = QueueStats(
+            self.wait_seconds, self.processing_seconds, self.completed,
+            self.failed, self.retried, self.dead_lettered, self.reclaimed
+        )
+        self.wait_seconds, self.processing_seconds = [], []
+        self.completed = self.failed = self.retried = self.dead_lettered = self.reclaimed = 0
+        return snapshot
+
+
 class TaskQueue:
-    """Simple task queue implementation using Redis"""
-    
-    def __init__(self):
+    """Redis streams task queue with priorities, retries and a dead-letter stream"""
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
         self.settings = get_settings()
-        # Note: This is a simplified implementation
-        # In production, use Celery, RQ, or similar
-    
-    async def enqueue_task(self, task_data: Dict[str, Any]) -> str:
-        """Enqueue a task for processing"""
-        
-        # Simplified implementation
-        # In production, integrate with Redis/Celery
-        task_id = f"task_{datetime.utcnow().timestamp()}"
-        logger.info(f"Enqueued task {task_id}")
+        self.redis = redis_client or redis.from_url(self.settings.REDIS_URL, decode_responses=True)
+        self.prefix = self.settings.TASK_QUEUE_PREFIX
+        self.group = self.settings.TASK_QUEUE_GROUP
+        self.priorities = list(self.settings.TASK_QUEUE_PRIORITIES)
+        self.visibility_timeout_ms = int(self.settings.TASK_QUEUE_VISIBILITY_TIMEOUT_SECONDS * 1000)
+        self.stats = QueueStats()
+        self._groups_ready = False
+
+    # Keys
+
+    def stream_key(self, priority: str) -> str:
+        return f"{self.prefix}:stream:{priority}"
+
+    @property
+    def delayed_key(self) -> str:
+        return f"{self.prefix}:delayed"
+
+    @property
+    def dead_letter_key(self) -> str:
+        return f"{self.prefix}:dead"
+
+    def status_key(self, task_id: str) -> str:
+        return f"{self.prefix}:task:{task_id}"
+
+    async def _ensure_groups(self) -> None:
+        """Create the consumer group on every lane (idempotent)"""
+        if self._groups_ready:
+            return
+        for priority in self.priorities:
+            try:
+                await self.redis.xgroup_create(self.stream_key(priority), self.group, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self._groups_ready = True
+
+    # Producer API
+
+    async def enqueue_task(
+        self,
+        task_data: Dict[str, Any],
+        priority: str = "normal",
+        task_id: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> str:
+        """Enqueue a task for processing
+
+        ``task_data`` must contain a ``type`` naming the worker handler; the
+        whole dict is passed to that handler. Raises ``QueueFullError`` when
+        the lane already holds ``TASK_QUEUE_MAX_STREAM_LENGTH`` waiting and
+        in-flight tasks.
+        """
+
+        if priority not in self.priorities:
+            raise ValueError(f"Unknown priority '{priority}'; expected one of {self.priorities}")
+
+        await self._ensure_groups()
+        # Soft limit: concurrent producers may overshoot it by a few tasks
+        if await self.redis.xlen(self.stream_key(priority)) >= self.settings.TASK_QUEUE_MAX_STREAM_LENGTH:
+            raise QueueFullError(f"Task queue lane '{priority}' is full")
+        task_id = task_id or f"task_{uuid.uuid4()}"
+        max_attempts = max_attempts or self.settings.TASK_RETRY_ATTEMPTS
+        now = time.time()
+
+        await self._set_status(task_id, {
+            "status": "queued",
+            "task_type": task_data.get("type", "unknown"),
+            "priority": priority,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "enqueued_at": now
+        })
+        await self._add_to_stream(priority, {
+            "task_id": task_id,
+            "task_type": task_data.get("type", "unknown"),
+            "payload": json.dumps(task_data),
+            "max_attempts": max_attempts,
+            "enqueued_at": now
+        })
+
+        logger.info(f"Enqueued task {task_id} ({priority})")
         return task_id
-    
+
+    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Full status record of a task, or None if unknown or expired"""
+
+        record = await self.redis.hgetall(self.status_key(task_id))
+        if not record:
+            return None
+        if "result" in record:
+            record["result"] = json.loads(record["result"])
+        return {"task_id": task_id, **record}
+
     async def get_task_status(self, task_id: str) -> str:
         """Get task status"""
-        
-        # Simplified implementation
-        return "completed"
-    
-    async def dequeue_task(self) -> Dict[str, Any]:
-        """Dequeue next task for processing"""
-        
-        # Simplified implementation
-        # In production, get from Redis queue
-        return {}
-    
-    async def complete_task(self, task_id: str, result: Dict[str, Any]) -> None:
+
+        return await self.redis.hget(self.status_key(task_id), "status") or "unknown"
+
+    async def cancel_task(self, task_id: str) -> bool:
+        """Mark a queued task as cancelled; workers skip it when it is delivered"""
+
+        status = await self.get_task_status(task_id)
+        if status not in ("queued", "retrying"):
+            return False
+        await self._set_status(task_id, {"status": "cancelled"})
+        return True
+
+    # Consumer API
+
+    async def dequeue_task(self, consumer: str, block_ms: int = 5000) -> Optional[QueuedTask]:
+        """Dequeue next task for processing
+
+        Lanes are drained in priority order. Messages abandoned by crashed
+        workers are reclaimed first, then new messages are read; if every lane
+        is empty this blocks for up to ``block_ms``. When the blocking read
+        returns messages from several lanes, the highest-priority one is
+        delivered and the others are handed back to their lanes.
+        """
+
+        await self._ensure_groups()
+        await self.promote_delayed()
+
+        for priority in self.priorities:
+            task = await self._reclaim(priority, consumer)
+            if task is not None:
+                return task
+
+        for priority in self.priorities:
+            response = await self.redis.xreadgroup(
+                self.group, consumer, {self.stream_key(priority): ">"}, count=1
+            )
+            if response:
+                return await self._to_task(response[0][0], *response[0][1][0])
+
+        # count=1 applies per stream, so several lanes can deliver at once
+        response = await self.redis.xreadgroup(
+            self.group, consumer, {self.stream_key(p): ">" for p in self.priorities},
+            count=1, block=block_ms
+        )
+        if not response:
+            return None
+        lanes = {self.stream_key(p): n for n, p in enumerate(self.priorities)}
+        entries = sorted(
+            ((stream, *messages[0]) for stream, messages in response if messages),
+            key=lambda entry: lanes.get(entry[0], len(lanes))
+        )
+        for stream, message_id, fields in entries[1:]:
+            await self._requeue(stream, message_id, fields)
+        return await self._to_task(*entries[0]) if entries else None
+
+    async def heartbeat(self, task: QueuedTask, consumer: str) -> None:
+        """Reset the visibility timeout of a long-running task"""
+
+        await self.redis.xclaim(
+            task.stream, self.group, consumer, min_idle_time=0, message_ids=[task.message_id], justid=True
+        )
+
+    async def complete_task(self, task: QueuedTask, result: Dict[str, Any], processing_seconds: float = 0.0) -> None:
         """Mark task as completed"""
-        
-        # Simplified implementation
-        logger.info(f"Task {task_id} completed")
-    
-    async def fail_task(self, task_id: str, error: str) -> None:
-        """Mark task as failed"""
-        
-        # Simplified implementation
-        logger.error(f"Task {task_id} failed: {error}")
+
+        await self._ack(task)
+        await self._set_status(task.task_id, {
+            "status": "completed",
+            "completed_at": time.time(),
+            "result": json.dumps(result, default=str)
+        })
+        self.stats.completed += 1
+        self.stats.processing_seconds.append(processing_seconds)
+        logger.info(f"Task {task.task_id} completed")
+
+    async def fail_task(self, task: QueuedTask, error: str, processing_seconds: float = 0.0) -> None:
+        """Mark task as failed; retry with backoff or dead-letter it"""
+
+        self.stats.failed += 1
+        self.stats.processing_seconds.append(processing_seconds)
+
+        if task.attempt < task.max_attempts:
+            delay = self.retry_delay(task.attempt)
+            envelope = {
+                "priority": task.priority,
+                "fields": {
+                    "task_id": task.task_id,
+                    "task_type": task.task_type,
+                    "payload": json.dumps(task.payload),
+                    "max_attempts": task.max_attempts,
+                    "enqueued_at": task.enqueued_at
+                }
+            }
+            await self.redis.zadd(self.delayed_key, {json.dumps(envelope): time.time() + delay})
+            await self._ack(task)
+            await self._set_status(task.task_id, {"status": "retrying", "error": error, "retry_at": time.time() + delay})
+            self.stats.retried += 1
+            logger.warning(f"Task {task.task_id} failed (attempt {task.attempt}/{task.max_attempts}); retrying in {delay:.1f}s: {error}")
+        else:
+            await self._dead_letter(task, error)
+
+    def retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+
+        ceiling = min(
+            self.settings.TASK_QUEUE_RETRY_BACKOFF_MAX_SECONDS,
+            self.settings.TASK_QUEUE_RETRY_BACKOFF_SECONDS * (2 ** max(0, attempt - 1))
+        )
+        return random.uniform(ceiling / 2, ceiling)
+
+    async def promote_delayed(self) -> int:
+        """Move retries whose backoff has elapsed back onto their lane"""
+
+        due = await self.redis.zrangebyscore(self.delayed_key, "-inf", time.time(), start=0, num=100)
+        promoted = 0
+        for member in due:
+            # ZREM succeeds for exactly one worker, so each retry is promoted once
+            if not await self.redis.zrem(self.delayed_key, member):
+                continue
+            envelope = json.loads(member)
+            await self._add_to_stream(envelope["priority"], envelope["fields"])
+            promoted += 1
+        return promoted
+
+    # Metrics
+
+    async def get_queue_depths(self) -> Dict[str, Any]:
+        """Waiting and in-flight counts per lane, plus delayed and dead-lettered totals"""
+
+        await self._ensure_groups()
+        lanes = {}
+        for priority in self.priorities:
+            waiting, pending = 0, 0
+            for group in await self.redis.xinfo_groups(self.stream_key(priority)):
+                if group["name"] == self.group:
+                    pending = group.get("pending", 0)
+                    lag = group.get("lag")
+                    waiting = lag if lag is not None else max(0, await self.redis.xlen(self.stream_key(priority)) - pending)
+            lanes[priority] = {"waiting": waiting, "in_flight": pending}
+
+        return {
+            "lanes": lanes,
+            "delayed": await self.redis.zcard(self.delayed_key),
+            "dead_lettered": await self.redis.xlen(self.dead_letter_key)
+        }
+
+    async def collect_metrics(self, consumer: str) -> List[Dict[str, Any]]:
+        """Metric points (name, value, labels) for export to the observability service"""
+
+        depths = await self.get_queue_depths()
+        stats = self.stats.reset()
+        points = []
+
+        for priority, lane in depths["lanes"].items():
+            points.append({"name": "task_queue_depth", "value": lane["waiting"], "labels": {"priority": priority}})
+            points.append({"name": "task_queue_in_flight", "value": lane["in_flight"], "labels": {"priority": priority}})
+        points.append({"name": "task_queue_delayed", "value": depths["delayed"], "labels": {}})
+        points.append({"name": "task_queue_dead_lettered", "value": depths["dead_lettered"], "labels": {}})
+
+        worker_labels = {"consumer": consumer}
+        for name in ("completed", "failed", "retried", "dead_lettered", "reclaimed"):
+            points.append({"name": f"task_queue_{name}_count", "value": getattr(stats, name), "labels": worker_labels})
+        for name, samples in (("wait", stats.wait_seconds), ("processing", stats.processing_seconds)):
+            if samples:
+                points.append({"name": f"task_queue_{name}_seconds_avg", "value": sum(samples) / len(samples), "labels": worker_labels})
+                points.append({"name": f"task_queue_{name}_seconds_max", "value": max(samples), "labels": worker_labels})
+        return points
+
+    async def list_dead_letters(self, count: int = 50) -> List[Dict[str, Any]]:
+        """Most recent dead-lettered tasks"""
+
+        entries = await self.redis.xrevrange(self.dead_letter_key, count=count)
+        return [{"id": message_id, **fields} for message_id, fields in entries]
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    # Internals
+
+    async def _add_to_stream(self, priority: str, fields: Dict[str, Any]) -> str:
+        # No MAXLEN: trimming drops the oldest entries whether or not they were delivered
+        return await self.redis.xadd(
+            self.stream_key(priority),
+            {key: str(value) for key, value in fields.items()}
+        )
+
+    async def _requeue(self, stream: str, message_id: str, fields: Dict[str, str]) -> None:
+        """Hand an undelivered message back to its lane without spending an attempt
+
+        A copy is appended to the lane and the original acknowledged in one
+        MULTI, so the message is neither lost nor left pending until the
+        visibility timeout. It moves to the back of its lane.
+        """
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(stream, fields)
+            pipe.xack(stream, self.group, message_id)
+            pipe.xdel(stream, message_id)
+            await pipe.execute()
+
+    async def _reclaim(self, priority: str, consumer: str) -> Optional[QueuedTask]:
+        """Take over one message whose consumer exceeded the visibility timeout"""
+
+        response = await self.redis.xautoclaim(
+            self.stream_key(priority), self.group, consumer,
+            min_idle_time=self.visibility_timeout_ms, start_id="0-0", count=1
+        )
+        claimed = response[1] if response else []
+        # Entries deleted while pending come back as None
+        claimed = [entry for entry in claimed if entry and entry[1]]
+        if not claimed:
+            return None
+        self.stats.reclaimed += 1
+        message_id, fields = claimed[0]
+        logger.warning(f"Reclaimed task {fields.get('task_id')} after visibility timeout")
+        return await self._to_task(self.stream_key(priority), message_id, fields)
+
+    async def _to_task(self, stream: str, message_id: str, fields: Dict[str, str]) -> Optional[QueuedTask]:
+        task_id = fields["task_id"]
+        priority = stream.rsplit(":", 1)[-1]
+        # Every delivery counts, so a task that keeps crashing workers ends in the DLQ
+        attempt = await self.redis.hincrby(self.status_key(task_id), "attempts", 1)
+        task = QueuedTask(
+            task_id=task_id,
+            task_type=fields.get("task_type", "unknown"),
+            payload=json.loads(fields.get("payload") or "{}"),
+            priority=priority,
+            attempt=attempt,
+            max_attempts=int(fields.get("max_attempts") or self.settings.TASK_RETRY_ATTEMPTS),
+            enqueued_at=float(fields.get("enqueued_at") or time.time()),
+            message_id=message_id,
+            stream=stream
+        )
+
+        if await self.get_task_status(task_id) == "cancelled":
+            await self._ack(task)
+            return None
+        if task.attempt > task.max_attempts:
+            await self._dead_letter(task, "Exceeded delivery attempts")
+            return None
+
+        self.stats.wait_seconds.append(task.wait_seconds)
+        await self._set_status(task_id, {"status": "running", "started_at": time.time()})
+        return task
+
+    async def _ack(self, task: QueuedTask) -> None:
+        await self.redis.xack(task.stream, self.group, task.message_id)
+        await self.redis.xdel(task.stream, task.message_id)
+
+    async def _dead_letter(self, task: QueuedTask, error: str) -> None:
+        # Dead letters are only listed, never consumed, so trimming the oldest loses no work
+        await self.redis.xadd(self.dead_letter_key, {
+            "task_id": task.task_id,
+            "task_type": task.task_type,
+            "priority": task.priority,
+            "payload": json.dumps(task.payload),
+            "attempts": str(task.attempt),
+            "error": error,
+            "failed_at": datetime.utcnow().isoformat()
+        }, maxlen=self.settings.TASK_QUEUE_MAX_STREAM_LENGTH, approximate=True)
+        await self._ack(task)
+        await self._set_status(task.task_id, {"status": "dead_lettered", "error": error, "completed_at": time.time()})
+        self.stats.dead_lettered += 1
+        logger.error(f"Task {task.task_id} dead-lettered after {task.attempt} attempts: {error}")
+
+    async def _set_status(self, task_id: str, fields: Dict[str, Any]) -> None:
+        key = self.status_key(task_id)
+        await self.redis.hset(key, mapping={k: str(v) for k, v in fields.items()})
+        await self.redis.expire(key, self.settings.TASK_QUEUE_STATUS_TTL_SECONDS)
@@ -0,0 +1,178 @@
+"""
+Task worker for the Orchestrator service
+
+Consumes the Redis streams task queue. Run one or more of these per node,
+alongside or separate from the API process:
+
+    python -m app.worker
+
+Every worker joins the same consumer group, so capacity scales by adding
+processes or containers.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Dict, Any, Callable, Awaitable, Optional
+
+import httpx
+
+from .core.config import get_settings
+from .services.agent_service import AgentService
+from .services.task_queue import TaskQueue, QueuedTask
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+TaskHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class TaskWorker:
+    """Pulls tasks from the queue and runs them with bounded concurrency"""
+
+    def __init__(
+        self,
+        queue: Optional[TaskQueue] = None,
+        concurrency: Optional[int] = None,
+        consumer_name: Optional[str] = None
+    ):
+        self.settings = get_settings()
+        self.queue = queue or TaskQueue()
+        self.concurrency = concurrency or self.settings.TASK_WORKER_CONCURRENCY
+        self.consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self.agent_service = AgentService()
+        self.handlers: Dict[str, TaskHandler] = {}
+        self._stopping = asyncio.Event()
+
+        self.register_handler("agent_task", self._handle_agent_task)
+        self.register_handler("tool_call", self._handle_tool_call)
+        self.register_handler("a2a_message", self._handle_a2a_message)
+
+    def register_handler(self, task_type: str, handler: TaskHandler) -> None:
+        """Register the coroutine that processes tasks of ``task_type``"""
+        self.handlers[task_type] = handler
+
+    async def _handle_agent_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.agent_service.execute_task(
+            agent_id=task_data["agent_id"],
+            task_data=task_data.get("task_data", {}),
+            context=task_data.get("context")
+        )
+
+    async def _handle_tool_call(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.agent_service.execute_tool(
+            tool_name=task_data["tool_name"],
+            parameters=task_data.get("parameters", {}),
+            context=task_data.get("context")
+        )
+
+    async def _handle_a2a_message(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.agent_service.send_a2a_message(
+            from_agent_id=task_data["from_agent_id"],
+            to_agent_id=task_data["to_agent_id"],
+            message_type=task_data["message_type"],
+            payload=task_data.get("payload", {}),
+            correlation_id=task_data.get("correlation_id")
+        )
+
+    async def run(self) -> None:
+        """Run consumer loops and the metrics exporter until stopped"""
+
+        logger.info(f"Task worker {self.consumer_name} starting with concurrency {self.concurrency}")
+        loops = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        loops.append(asyncio.create_task(self._export_metrics()))
+
+        await self._stopping.wait()
+        logger.info(f"Task worker {self.consumer_name} draining...")
+
+        # Consumers finish their current task; unacknowledged work is reclaimed by other workers
+        await asyncio.gather(*loops, return_exceptions=True)
+        await self.queue.close()
+        logger.info(f"Task worker {self.consumer_name} stopped")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def _consume(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                task = await self.queue.dequeue_task(self.consumer_name, block_ms=2000)
+            except Exception as e:
+                logger.error(f"Error dequeuing task: {e}")
+                await asyncio.sleep(1)
+                continue
+            if task is not None:
+                await self._process(task)
+
+    async def _process(self, task: QueuedTask) -> None:
+        handler = self.handlers.get(task.task_type)
+        if handler is None:
+            await self.queue.fail_task(task, f"No handler registered for task type '{task.task_type}'")
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(task))
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(handler(task.payload), self.settings.TASK_TIMEOUT_SECONDS)
+        except Exception as e:
+            error = str(e) or repr(e)
+            logger.error(f"Task {task.task_id} ({task.task_type}) failed: {error}")
+            await self.queue.fail_task(task, error, time.perf_counter() - started)
+        else:
+            await self.queue.complete_task(task, result, time.perf_counter() - started)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, task: QueuedTask) -> None:
+        """Keep a long task's visibility timeout from expiring while it runs"""
+
+        interval = self.settings.TASK_QUEUE_VISIBILITY_TIMEOUT_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.queue.heartbeat(task, self.consumer_name)
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for task {task.task_id}: {e}")
+
+    async def _export_metrics(self) -> None:
+        """Periodically push queue depth and latency metrics to the observability service"""
+
+        url = f"{self.settings.OBSERVABILITY_URL}/metrics/batch"
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            while not self._stopping.is_set():
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), self.settings.TASK_QUEUE_METRICS_INTERVAL_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                try:
+                    points = await self.queue.collect_metrics(self.consumer_name)
+                    await client.post(url, json=[
+                        {
+                            "name": point["name"],
+                            "value": point["value"],
+                            "labels": {"service": "orchestrator", **point["labels"]}
+                        }
+                        for point in points
+                    ])
+                except Exception as e:
+                    logger.warning(f"Failed to export task queue metrics: {e}")
+
+
+async def main() -> None:
+    worker = TaskWorker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+"""
+Orchestration plan scheduler tests with stub agents: concurrency, dependencies, failures and deadlines
+"""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("httpx")
+
+import httpx
+
+from app.models.a2a_models import (
+    A2AAgentCard, A2ATask, A2ATaskStatus, OrchestrationPlan, RemoteAgentInfo, TaskState
+)
+from app.services.a2a_orchestrator import A2AOrchestratorAgent
+
+
+class _Agents:
+    """Stands in for RemoteAgentConnections; records when each agent ran"""
+
+    def __init__(self, delays, failing=(), chunks=3):
+        self.delays = delays
+        self.failing = set(failing)
+        self.chunks = chunks
+        self.started = {}
+        self.finished = {}
+        self.cancelled = set()
+
+    def create_text_message(self, text, context_id=None):
+        return text
+
+    async def send_message_to_agent(self, agent_name, message, session_id=None, context_id=None):
+        self.started[agent_name] = time.monotonic()
+        try:
+            await asyncio.sleep(self.delays[agent_name])
+        except asyncio.CancelledError:
+            self.cancelled.add(agent_name)
+            raise
+        self.finished[agent_name] = time.monotonic()
+        if agent_name in self.failing:
+            raise RuntimeError(f"{agent_name} failed")
+        return A2ATask(id=f"task_{agent_name}", status=A2ATaskStatus(state=TaskState.completed))
+
+    async def send_message_to_agent_stream(self, agent_name, message, session_id=None, context_id=None):
+        for n in range(self.chunks):
+            await asyncio.sleep(self.delays[agent_name])
+            yield f"{agent_name}-{n}"
+
+
+def _plan(*steps):
+    return OrchestrationPlan(session_id="s1", query="q", steps=[
+        {"agent": agent, "query": "q", "dependencies": list(dependencies)} for agent, dependencies in steps
+    ])
+
+
+def _run(agents, plan, stream=False, **settings):
+    async def run():
+        async with httpx.AsyncClient() as client:
+            orchestrator = A2AOrchestratorAgent(http_client=client)
+            orchestrator.settings = orchestrator.settings.model_copy(update=settings)
+            orchestrator.remote_agents = agents
+            for name in agents.delays:
+                card = A2AAgentCard(name=name, description="stub", url=f"http://{name}")
+                orchestrator.available_agents[name] = RemoteAgentInfo(
+                    name=name, description="stub", url=card.url, card=card
+                )
+            started = time.monotonic()
+            outputs = [output async for output in orchestrator.execute_orchestration_plan(plan, stream=stream)]
+            return outputs, time.monotonic() - started
+
+    return asyncio.run(run())
+
+
+def _states(result):
+    return [(task.id, task.status.state) for task in result.results]
+
+
+def test_independent_steps_run_concurrently():
+    agents = _Agents({"A": 0.3, "B": 0.3})
+    (result,), elapsed = _run(agents, _plan(("A", ()), ("B", ())))
+
+    assert _states(result) == [("task_A", TaskState.completed), ("task_B", TaskState.completed)]
+    # Close to the slowest step, not the sum of both
+    assert elapsed < 0.5
+
+
+def test_concurrency_cap_limits_parallel_steps():
+    agents = _Agents({"A": 0.2, "B": 0.2})
+    _, elapsed = _run(agents, _plan(("A", ()), ("B", ())), ORCHESTRATION_MAX_CONCURRENCY=1)
+
+    assert elapsed >= 0.4
+
+
+def test_dependent_step_waits_for_its_dependency():
+    agents = _Agents({"A": 0.2, "B": 0.01})
+    (result,), _ = _run(agents, _plan(("B", ("A",)), ("A", ())))
+
+    assert agents.started["B"] >= agents.finished["A"]
+    # Results keep plan order, not completion order
+    assert [task.id for task in result.results] == ["task_B", "task_A"]
+
+
+def test_failed_dependency_skips_dependents():
+    agents = _Agents({"A": 0.01, "B": 0.01, "C": 0.01}, failing={"A"})
+    (result,), _ = _run(agents, _plan(("A", ()), ("B", ("A",)), ("C", ())))
+
+    assert "B" not in agents.started
+    states = {task.id.split("_")[1]: task for task in result.results}
+    assert states["A"].status.state == TaskState.failed
+    assert "dependency failed" in states["B"].status.error
+    assert states["C"].status.state == TaskState.completed
+    assert result.status == TaskState.completed
+
+
+def test_cycle_is_reported_as_failed():
+    agents = _Agents({"A": 0.01, "B": 0.01})
+    (result,), _ = _run(agents, _plan(("A", ("B",)), ("B", ("A",))))
+
+    assert agents.started == {}
+    assert [task.status.error for task in result.results] == ["Circular step dependencies"] * 2
+    assert result.status == TaskState.failed
+
+
+def test_plan_deadline_cancels_stragglers():
+    agents = _Agents({"A": 0.01, "B": 5.0, "C": 0.01})
+    (result,), elapsed = _run(
+        agents, _plan(("A", ()), ("B", ()), ("C", ("B",))), ORCHESTRATION_PLAN_TIMEOUT_SECONDS=0.2
+    )
+
+    assert elapsed < 1.0
+    assert agents.cancelled == {"B"}
+    assert "C" not in agents.started
+    errors = [task.status.error for task in result.results]
+    assert errors[0] is None
+    assert errors[1:] == ["Orchestration plan deadline exceeded"] * 2
+
+
+def test_step_timeout_fails_only_that_step():
+    agents = _Agents({"A": 5.0, "B": 0.01})
+    (result,), elapsed = _run(agents, _plan(("A", ()), ("B", ())), ORCHESTRATION_AGENT_TIMEOUT_SECONDS=0.1)
+
+    assert elapsed < 1.0
+    assert "timed out" in result.results[0].status.error
+    assert result.results[1].status.state == TaskState.completed
+
+
+def test_streaming_interleaves_agents():
+    agents = _Agents({"A": 0.05, "B": 0.07})
+    events, _ = _run(agents, _plan(("A", ()), ("B", ())), stream=True)
+
+    order = [event["agent"] for event in events]
+    assert sorted(event["data"] for event in events) == ["A-0", "A-1", "A-2", "B-0", "B-1", "B-2"]
+    # Chunks from B arrive before A has finished
+    assert order.index("B") < len(order) - 1 - order[::-1].index("A")
@@ -0,0 +1,118 @@
+"""
+Redis streams task queue tests: enqueue, claim, ack, requeue, retries and reclaim
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.services.task_queue import QueueFullError, TaskQueue
+
+
+def _queue(**settings):
+    queue = TaskQueue(fakeredis.FakeAsyncRedis(decode_responses=True))
+    queue.settings = queue.settings.model_copy(update=settings)
+    return queue
+
+
+def test_enqueue_claim_and_ack():
+    queue = _queue()
+
+    async def run():
+        task_id = await queue.enqueue_task({"type": "echo", "x": 1})
+        assert await queue.get_task_status(task_id) == "queued"
+
+        task = await queue.dequeue_task("w1", block_ms=10)
+        assert (task.task_id, task.payload, task.attempt) == (task_id, {"type": "echo", "x": 1}, 1)
+        assert await queue.get_task_status(task_id) == "running"
+        assert (await queue.get_queue_depths())["lanes"]["normal"] == {"waiting": 0, "in_flight": 1}
+
+        await queue.complete_task(task, {"ok": True})
+        assert (await queue.get_task(task_id))["result"] == {"ok": True}
+        assert await queue.redis.xlen(queue.stream_key("normal")) == 0
+        assert await queue.dequeue_task("w1", block_ms=10) is None
+
+    asyncio.run(run())
+
+
+def test_higher_priority_lane_is_claimed_first():
+    queue = _queue()
+
+    async def run():
+        low = await queue.enqueue_task({"type": "echo"}, priority="low")
+        high = await queue.enqueue_task({"type": "echo"}, priority="high")
+        assert (await queue.dequeue_task("w1", block_ms=10)).task_id == high
+        assert (await queue.dequeue_task("w1", block_ms=10)).task_id == low
+
+    asyncio.run(run())
+
+
+def test_requeue_hands_message_back_without_losing_it():
+    queue = _queue()
+
+    async def run():
+        task_id = await queue.enqueue_task({"type": "echo"}, priority="low")
+        stream = queue.stream_key("low")
+        response = await queue.redis.xreadgroup(queue.group, "w1", {stream: ">"}, count=1)
+        message_id, fields = response[0][1][0]
+
+        await queue._requeue(stream, message_id, fields)
+        assert (await queue.get_queue_depths())["lanes"]["low"] == {"waiting": 1, "in_flight": 0}
+        task = await queue.dequeue_task("w2", block_ms=10)
+        assert task.task_id == task_id and task.message_id != message_id
+
+    asyncio.run(run())
+
+
+def test_abandoned_message_is_reclaimed_by_another_worker():
+    queue = _queue()
+
+    async def run():
+        task_id = await queue.enqueue_task({"type": "echo"})
+        first = await queue.dequeue_task("crashed", block_ms=10)
+        # Still within the visibility timeout: nobody else gets it
+        assert await queue.dequeue_task("w2", block_ms=10) is None
+
+        queue.visibility_timeout_ms = 0
+        second = await queue.dequeue_task("w2", block_ms=10)
+        assert (second.task_id, second.message_id, second.attempt) == (task_id, first.message_id, 2)
+        assert queue.stats.reclaimed == 1
+
+    asyncio.run(run())
+
+
+def test_failed_task_retries_then_dead_letters():
+    queue = _queue(TASK_QUEUE_RETRY_BACKOFF_SECONDS=0.0, TASK_QUEUE_RETRY_BACKOFF_MAX_SECONDS=0.0)
+
+    async def run():
+        task_id = await queue.enqueue_task({"type": "echo"}, max_attempts=2)
+        await queue.fail_task(await queue.dequeue_task("w1", block_ms=10), "boom")
+        assert await queue.get_task_status(task_id) == "retrying"
+
+        retry = await queue.dequeue_task("w1", block_ms=10)
+        assert retry.attempt == 2
+        await queue.fail_task(retry, "boom again")
+        assert await queue.get_task_status(task_id) == "dead_lettered"
+        assert [entry["task_id"] for entry in await queue.list_dead_letters()] == [task_id]
+
+    asyncio.run(run())
+
+
+def test_full_lane_refuses_new_tasks_and_keeps_pending_ones():
+    queue = _queue(TASK_QUEUE_MAX_STREAM_LENGTH=2)
+
+    async def run():
+        first = await queue.enqueue_task({"type": "echo"})
+        second = await queue.enqueue_task({"type": "echo"})
+        with pytest.raises(QueueFullError):
+            await queue.enqueue_task({"type": "echo"})
+        # Other lanes are unaffected
+        await queue.enqueue_task({"type": "echo"}, priority="low")
+
+        claimed = [(await queue.dequeue_task("w1", block_ms=10)).task_id for _ in range(2)]
+        assert claimed == [first, second]
+
+    asyncio.run(run())
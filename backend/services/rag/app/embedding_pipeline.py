@@ -0,0 +1,266 @@
+"""
+Batched embedding pipeline for document ingestion
+Groups chunks into provider-sized batches, embeds a bounded number of batches
+concurrently through pooled provider clients and hands each batch to a single
+multi-row write.
+"""
+
+from typing import Dict, Any, AsyncIterator, List, Optional, Set, Tuple, Callable, Awaitable
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+import httpx
+import openai
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "128"))
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+
+PROVIDER_MAX_CONNECTIONS = int(os.getenv("PROVIDER_MAX_CONNECTIONS", "100"))
+PROVIDER_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PROVIDER_MAX_KEEPALIVE_CONNECTIONS", "20"))
+PROVIDER_KEEPALIVE_EXPIRY = float(os.getenv("PROVIDER_KEEPALIVE_EXPIRY", "60"))
+PROVIDER_CONNECT_TIMEOUT = float(os.getenv("PROVIDER_CONNECT_TIMEOUT", "10"))
+PROVIDER_REQUEST_TIMEOUT = float(os.getenv("PROVIDER_REQUEST_TIMEOUT", "120"))
+
+# OpenAI rejects embedding requests with more than 2048 inputs
+PROVIDER_MAX_BATCH_SIZE = {
+    "OpenAI": 2048,
+}
+
+EmbedBatchFn = Callable[[List[str]], Awaitable[Tuple[List[List[float]], int]]]
+WriteBatchFn = Callable[[int, List[str], List[List[float]]], Awaitable[None]]
+
+
+class ProviderClientPool:
+    """Process-wide cache of provider SDK clients keyed by provider and configuration.
+
+    Every OpenAI client shares one ``httpx`` connection pool, so keep-alive
+    connections (and their TLS sessions) to the provider are reused across
+    clients, requests and ingestion batches.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, ...], Any] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._genai_key: Optional[str] = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=PROVIDER_MAX_CONNECTIONS,
+                    max_keepalive_connections=PROVIDER_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=PROVIDER_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(PROVIDER_REQUEST_TIMEOUT, connect=PROVIDER_CONNECT_TIMEOUT)
+            )
+        return self._http_client
+
+    def get_openai_client(self, api_key: str, base_url: Optional[str] = None) -> openai.AsyncOpenAI:
+        """Return the shared AsyncOpenAI client for this key and endpoint"""
+        key = ("OpenAI", api_key, base_url or "")
+        client = self._clients.get(key)
+        if client is None:
+            client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self.http_client)
+            self._clients[key] = client
+        return client
+
+    def get_gemini_model(self, api_key: str, model_name: str) -> Any:
+        """Return a cached Gemini model; ``genai.configure`` is global, so it is only re-run when the key changes"""
+        if genai is None:
+            raise RuntimeError("google-generativeai is not installed")
+        if self._genai_key != api_key:
+            genai.configure(api_key=api_key)
+            self._genai_key = api_key
+            # Models built under the previous key would keep using it
+            self._clients = {k: v for k, v in self._clients.items() if k[0] != "Google"}
+        key = ("Google", api_key, model_name)
+        model = self._clients.get(key)
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            self._clients[key] = model
+        return model
+
+    def retain(self, api_keys: Set[str]) -> None:
+        """Drop clients for keys that are no longer configured after a model reload"""
+        stale = [key for key in self._clients if key[1] not in api_keys]
+        for key in stale:
+            del self._clients[key]
+        if stale:
+            logger.info(f"Released {len(stale)} provider clients for removed credentials")
+
+    async def warm_up(self, urls: List[str]) -> None:
+        """Open pooled connections to provider endpoints so the first request skips the TLS handshake"""
+        async def connect(url: str) -> None:
+            try:
+                await self.http_client.head(url)
+            except Exception as e:
+                logger.debug(f"Provider warm-up request to {url} failed: {e}")
+
+        await asyncio.gather(*(connect(url) for url in urls))
+
+    def get_stats(self) -> Dict[str, Any]:
+        providers: Dict[str, int] = {}
+        for key in self._clients:
+            providers[key[0]] = providers.get(key[0], 0) + 1
+        return {"clients": len(self._clients), "by_provider": providers}
+
+    async def close(self) -> None:
+        """Release all pooled clients and close the shared connection pool"""
+        self._clients.clear()
+        if self._http_client is not None:
+            try:
+                await self._http_client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing provider connection pool: {e}")
+            self._http_client = None
+
+
+@dataclass
+class IngestionStats:
+    """Throughput figures for a single ingestion run"""
+    chunks: int = 0
+    embedded_chunks: int = 0
+    failed_chunks: int = 0
+    tokens: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.embedded_chunks / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chunks": self.chunks,
+            "embedded_chunks": self.embedded_chunks,
+            "failed_chunks": self.failed_chunks,
+            "tokens": self.tokens,
+            "batches": self.batches,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "chunks_per_second": round(self.chunks_per_second, 2),
+            "tokens_per_second": round(self.tokens_per_second, 2),
+        }
+
+
+class EmbeddingPipeline:
+    """Embeds chunks in batches with bounded concurrency and serialized writes"""
+
+    def __init__(self, batch_size: int = EMBEDDING_BATCH_SIZE, max_concurrency: int = EMBEDDING_MAX_CONCURRENCY):
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+
+    def batch_size_for(self, provider: Optional[str]) -> int:
+        """Clamp the configured batch size to the provider's request limit"""
+        limit = PROVIDER_MAX_BATCH_SIZE.get(provider or "", self.batch_size)
+        return min(self.batch_size, limit)
+
+    async def run(
+        self,
+        chunks: List[str],
+        embed_batch: EmbedBatchFn,
+        write_batch: WriteBatchFn,
+        provider: Optional[str] = None
+    ) -> IngestionStats:
+        """Embed and persist all chunks; returns throughput statistics.
+
+        ``embed_batch`` receives a list of texts and returns their embeddings plus
+        the number of tokens consumed. ``write_batch`` receives the index of the
+        first chunk in the batch, the texts and their embeddings. Writes are
+        serialized because they usually share one database session.
+        """
+        async def iterate() -> AsyncIterator[str]:
+            for chunk in chunks:
+                yield chunk
+
+        return await self.run_stream(iterate(), embed_batch, write_batch, provider)
+
+    async def run_stream(
+        self,
+        chunks: AsyncIterator[str],
+        embed_batch: EmbedBatchFn,
+        write_batch: WriteBatchFn,
+        provider: Optional[str] = None
+    ) -> IngestionStats:
+        """Like ``run`` but consumes chunks as they are produced.
+
+        At most ``max_concurrency`` batches are in flight; the producer waits for
+        a free slot before pulling more chunks, which bounds memory by the window
+        rather than the document size.
+        """
+        stats = IngestionStats()
+        size = self.batch_size_for(provider)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        write_lock = asyncio.Lock()
+        tasks: Set[asyncio.Task] = set()
+        started = time.perf_counter()
+
+        async def process(start: int, batch: List[str]) -> None:
+            try:
+                try:
+                    embeddings, tokens = await embed_batch(batch)
+                except Exception as e:
+                    logger.error(f"Error embedding chunks {start}-{start + len(batch) - 1}: {e}")
+                    stats.failed_chunks += len(batch)
+                    return
+
+                async with write_lock:
+                    try:
+                        await write_batch(start, batch, embeddings)
+                    except Exception as e:
+                        logger.error(f"Error writing chunks {start}-{start + len(batch) - 1}: {e}")
+                        stats.failed_chunks += len(batch)
+                        return
+
+                stats.embedded_chunks += len(batch)
+                stats.tokens += tokens
+                stats.batches += 1
+            finally:
+                semaphore.release()
+
+        async def dispatch(start: int, batch: List[str]) -> None:
+            await semaphore.acquire()
+            task = asyncio.create_task(process(start, batch))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        batch: List[str] = []
+        batch_start = 0
+        try:
+            async for chunk in chunks:
+                batch.append(chunk)
+                stats.chunks += 1
+                if len(batch) >= size:
+                    await dispatch(batch_start, batch)
+                    batch_start += len(batch)
+                    batch = []
+            if batch:
+                await dispatch(batch_start, batch)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        stats.elapsed_seconds = time.perf_counter() - started
+        return stats
+
+
+# Global instances
+provider_client_pool = ProviderClientPool()
+embedding_pipeline = EmbeddingPipeline()
@@ -0,0 +1,138 @@
+"""
+Hybrid lexical + vector retrieval
+Full-text search over a generated ``content_tsv`` column (GIN indexed) and
+reciprocal-rank fusion of the lexical and ANN result lists, so exact
+identifiers, SKUs and error codes are found even when embeddings miss them.
+"""
+
+from typing import Dict, Any, List, Optional, Sequence
+import json
+import logging
+import os
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Must match the configuration used in the generated column expression
+TEXT_SEARCH_CONFIG = os.getenv("TEXT_SEARCH_CONFIG", "english")
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+# Each leg fetches this many times the requested results before fusion
+HYBRID_CANDIDATE_MULTIPLIER = int(os.getenv("HYBRID_CANDIDATE_MULTIPLIER", "4"))
+
+TEXT_SEARCH_INDEX_NAME = "idx_document_embeddings_content_tsv"
+
+
+async def ensure_text_search_index(engine: AsyncEngine) -> Dict[str, Any]:
+    """Add the generated tsvector column and its GIN index if missing.
+
+    Adding a stored generated column rewrites the table under an exclusive
+    lock, so run this during a maintenance window on large tables. The index
+    itself is built CONCURRENTLY.
+    """
+    config_literal = "'" + TEXT_SEARCH_CONFIG.replace("'", "''") + "'"
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        exists = (await conn.execute(text("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'document_embeddings' AND column_name = 'content_tsv'
+        """))).scalar() is not None
+
+        if not exists:
+            await conn.execute(text(f"""
+                ALTER TABLE document_embeddings
+                ADD COLUMN content_tsv tsvector
+                GENERATED ALWAYS AS (to_tsvector({config_literal}::regconfig, coalesce(content, ''))) STORED
+            """))
+
+        await conn.execute(text(f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS {TEXT_SEARCH_INDEX_NAME}
+            ON document_embeddings USING gin (content_tsv)
+        """))
+
+    logger.info(f"Text search column ready on document_embeddings (config={TEXT_SEARCH_CONFIG})")
+    return {
+        "column": "content_tsv",
+        "index_name": TEXT_SEARCH_INDEX_NAME,
+        "config": TEXT_SEARCH_CONFIG,
+        "status": "exists" if exists else "created"
+    }
+
+
+async def lexical_search(
+    session: AsyncSession,
+    query: str,
+    namespace: str,
+    limit: int,
+    metadata_filter: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Full-text search ranked by ``ts_rank_cd``.
+
+    ``websearch_to_tsquery`` accepts free text, quoted phrases and ``-term``
+    exclusions without raising on syntax errors.
+    """
+    params: Dict[str, Any] = {
+        "query": query,
+        "config": TEXT_SEARCH_CONFIG,
+        "namespace": namespace,
+        "limit": limit
+    }
+
+    filter_sql = ""
+    for n, (key, value) in enumerate((metadata_filter or {}).items()):
+        filter_sql += f" AND metadata->>:filter_key_{n} = :filter_value_{n}"
+        params[f"filter_key_{n}"] = key
+        params[f"filter_value_{n}"] = str(value)
+
+    result = await session.execute(text(f"""
+        SELECT id, document_id, content, metadata,
+               ts_rank_cd(content_tsv, q) AS rank
+        FROM document_embeddings, websearch_to_tsquery(CAST(:config AS regconfig), :query) q
+        WHERE namespace = :namespace AND content_tsv @@ q{filter_sql}
+        ORDER BY rank DESC
+        LIMIT :limit
+    """), params)
+
+    rows = []
+    for row in result:
+        metadata = row[3]
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata)
+        rows.append({
+            "id": str(row[0]),
+            "document_id": row[1],
+            "content": row[2],
+            "metadata": metadata or {},
+            "lexical_rank": float(row[4])
+        })
+    return rows
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[List[Dict[str, Any]]],
+    weights: Sequence[float],
+    limit: int,
+    key: str = "id",
+    k: int = HYBRID_RRF_K
+) -> List[Dict[str, Any]]:
+    """Fuse ranked result lists with weighted reciprocal-rank fusion.
+
+    Each item scores ``sum(weight / (k + rank))`` over the lists it appears in.
+    Fields from every list are merged into one dict and the fused score is
+    stored under ``fusion_score``.
+    """
+    fused: Dict[Any, Dict[str, Any]] = {}
+    for results, weight in zip(ranked_lists, weights):
+        if weight <= 0:
+            continue
+        for rank, item in enumerate(results, start=1):
+            entry = fused.get(item[key])
+            if entry is None:
+                entry = fused[item[key]] = {**item, "fusion_score": 0.0}
+            else:
+                for field, value in item.items():
+                    entry.setdefault(field, value)
+            entry["fusion_score"] += weight / (k + rank)
+
+    return sorted(fused.values(), key=lambda item: item["fusion_score"], reverse=True)[:limit]
@@ -0,0 +1,116 @@
+"""
+Streaming ingestion helpers
+Spools uploads to disk in bounded blocks, extracts text page by page and chunks
+it with a generator, so peak memory depends on the window size rather than the
+document size.
+"""
+
+from typing import AsyncIterator, Optional
+import codecs
+import logging
+import os
+from pathlib import Path
+import aiofiles
+from fastapi import UploadFile
+
+from .document_extraction import extraction_pool
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_BLOCK_SIZE = int(os.getenv("UPLOAD_BLOCK_SIZE", str(1024 * 1024)))
+PDF_PAGE_WINDOW = int(os.getenv("PDF_PAGE_WINDOW", "20"))
+# Uploads larger than this are ingested in streaming mode unless told otherwise
+STREAMING_INGEST_THRESHOLD = int(os.getenv("STREAMING_INGEST_THRESHOLD", str(20 * 1024 * 1024)))
+
+
+async def spool_upload(file: UploadFile, file_path: Path, block_size: int = UPLOAD_BLOCK_SIZE) -> int:
+    """Copy an upload to disk block by block; returns the number of bytes written"""
+    size = 0
+    async with aiofiles.open(file_path, 'wb') as f:
+        while True:
+            block = await file.read(block_size)
+            if not block:
+                break
+            await f.write(block)
+            size += len(block)
+    return size
+
+
+async def iter_text_file(file_path: Path, block_size: int = UPLOAD_BLOCK_SIZE) -> AsyncIterator[str]:
+    """Yield decoded UTF-8 text from a file in bounded blocks"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    async with aiofiles.open(file_path, 'rb') as f:
+        while True:
+            block = await f.read(block_size)
+            if not block:
+                break
+            yield decoder.decode(block)
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+async def iter_document_text(file_path: Path, file_extension: str) -> AsyncIterator[str]:
+    """Yield a document's text incrementally: PDFs page by page, text files block by block"""
+    if file_extension == ".pdf":
+        async for page_text in extraction_pool.iter_pdf_pages(file_path, window=PDF_PAGE_WINDOW):
+            yield page_text + "\n"
+    elif file_extension in [".docx", ".doc"]:
+        # python-docx always loads the whole package; only the chunking streams
+        yield await extraction_pool.extract_docx_text(file_path)
+    else:
+        async for block in iter_text_file(file_path):
+            yield block
+
+
+def _chunk_end(text: str, start: int, chunk_size: int) -> int:
+    """End of the chunk starting at ``start``, preferring sentence then word boundaries"""
+    end = min(start + chunk_size, len(text))
+    if end < len(text):
+        sentence_end = max(text.rfind('.', start, end), text.rfind('?', start, end), text.rfind('!', start, end))
+        if sentence_end > start:
+            return sentence_end + 1
+        last_space = text.rfind(' ', start, end)
+        if last_space > start:
+            return last_space
+    return end
+
+
+async def iter_chunks(
+    blocks: AsyncIterator[str],
+    chunk_size: int = 1000,
+    overlap: int = 200,
+    preview: Optional[list] = None
+) -> AsyncIterator[str]:
+    """Generator counterpart of ``chunk_text`` over a stream of text blocks.
+
+    A chunk is only cut once more than ``chunk_size`` characters are buffered,
+    so boundaries are chosen exactly as in whole-text chunking (minus the
+    run of overlapping tail fragments ``chunk_text`` emits). If ``preview``
+    is a list, the first chunk is appended to it for the upload response.
+    """
+    buffer = ""
+    async for block in blocks:
+        buffer += block
+        start = 0
+        while len(buffer) - start > chunk_size:
+            end = _chunk_end(buffer, start, chunk_size)
+            chunk = buffer[start:end].strip()
+            if chunk:
+                if preview is not None and not preview:
+                    preview.append(chunk)
+                yield chunk
+            start = max(start + 1, end - overlap)
+        buffer = buffer[start:]
+
+    start = 0
+    while start < len(buffer):
+        end = _chunk_end(buffer, start, chunk_size)
+        chunk = buffer[start:end].strip()
+        if chunk:
+            if preview is not None and not preview:
+                preview.append(chunk)
+            yield chunk
+        if end >= len(buffer):
+            break
+        start = max(start + 1, end - overlap)
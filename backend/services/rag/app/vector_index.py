@@ -0,0 +1,205 @@
+"""
+ANN index management and index-friendly search for PGVector
+Maintains per-namespace partial HNSW/IVFFlat indexes on document_embeddings and
+runs ``ORDER BY embedding <=> :q LIMIT k`` queries that can use them.
+"""
+
+from typing import Dict, Any, List, Optional
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine
+from sqlalchemy import text
+from .vector_storage import to_db_vector, vector_cast, cosine_ops
+
+logger = logging.getLogger(__name__)
+
+VECTOR_INDEX_METHOD = os.getenv("VECTOR_INDEX_METHOD", "hnsw")
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "40"))
+IVFFLAT_PROBES = int(os.getenv("IVFFLAT_PROBES", "10"))
+
+INDEX_METHODS = ("hnsw", "ivfflat")
+INDEX_NAME_PREFIX = "idx_document_embeddings_ann_"
+
+
+class VectorIndexManager:
+    """Builds per-namespace ANN indexes and executes index-backed searches"""
+
+    def __init__(self, method: str = VECTOR_INDEX_METHOD):
+        if method not in INDEX_METHODS:
+            raise ValueError(f"Unsupported vector index method: {method}")
+        self.method = method
+
+    @staticmethod
+    def index_name(namespace: str) -> str:
+        """Deterministic, identifier-safe index name for a namespace"""
+        slug = re.sub(r"[^a-z0-9_]", "_", namespace.lower())[:32]
+        digest = hashlib.sha1(namespace.encode("utf-8")).hexdigest()[:8]
+        return f"{INDEX_NAME_PREFIX}{slug}_{digest}"
+
+    async def list_indexes(self, session: AsyncSession) -> List[Dict[str, Any]]:
+        """List the ANN indexes managed by this service"""
+        result = await session.execute(text("""
+            SELECT i.indexname, i.indexdef, pg_relation_size(c.oid) AS size_bytes
+            FROM pg_indexes i
+            JOIN pg_class c ON c.relname = i.indexname
+            WHERE i.tablename = 'document_embeddings' AND i.indexname LIKE :prefix
+            ORDER BY i.indexname
+        """), {"prefix": f"{INDEX_NAME_PREFIX}%"})
+
+        indexes = []
+        for row in result:
+            method = "hnsw" if "USING hnsw" in row[1] else "ivfflat"
+            match = re.search(r"WHERE \(+namespace\)?::text = '((?:[^']|'')*)'", row[1])
+            indexes.append({
+                "name": row[0],
+                "namespace": match.group(1).replace("''", "'") if match else None,
+                "method": method,
+                "size_bytes": row[2],
+                "definition": row[1]
+            })
+        return indexes
+
+    async def build_index(
+        self,
+        engine: AsyncEngine,
+        namespace: str,
+        method: Optional[str] = None,
+        rebuild: bool = False,
+        m: int = HNSW_M,
+        ef_construction: int = HNSW_EF_CONSTRUCTION,
+        lists: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Create (or rebuild) the partial ANN index for a namespace.
+
+        Uses CREATE INDEX CONCURRENTLY so searches and ingestion keep running
+        while the index is built; that requires an autocommit connection.
+        """
+        method = method or self.method
+        if method not in INDEX_METHODS:
+            raise ValueError(f"Unsupported vector index method: {method}")
+
+        name = self.index_name(namespace)
+        # Namespace is embedded in the index predicate, so it must be a literal
+        namespace_literal = "'" + namespace.replace("'", "''") + "'"
+
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+            if method == "ivfflat" and lists is None:
+                count = (await conn.execute(
+                    text("SELECT COUNT(*) FROM document_embeddings WHERE namespace = :namespace"),
+                    {"namespace": namespace}
+                )).scalar() or 0
+                # pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond
+                lists = max(1, count // 1000) if count <= 1_000_000 else int(math.sqrt(count))
+
+            if method == "hnsw":
+                with_clause = f"WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+            else:
+                with_clause = f"WITH (lists = {int(lists)})"
+
+            if rebuild:
+                await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+            await conn.execute(text(f"""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS {name}
+                ON document_embeddings USING {method} (embedding {cosine_ops()})
+                {with_clause}
+                WHERE namespace = {namespace_literal}
+            """))
+            await conn.execute(text("ANALYZE document_embeddings"))
+
+        logger.info(f"Built {method} index {name} for namespace {namespace}")
+        return {
+            "namespace": namespace,
+            "index_name": name,
+            "method": method,
+            "parameters": {"m": m, "ef_construction": ef_construction} if method == "hnsw" else {"lists": lists},
+            "status": "rebuilt" if rebuild else "built"
+        }
+
+    async def drop_index(self, engine: AsyncEngine, namespace: str) -> Dict[str, Any]:
+        """Drop the ANN index for a namespace"""
+        name = self.index_name(namespace)
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        return {"namespace": namespace, "index_name": name, "status": "dropped"}
+
+    async def search(
+        self,
+        session: AsyncSession,
+        query_embedding: List[float],
+        namespace: str,
+        limit: int,
+        similarity_threshold: Optional[float] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Nearest-neighbour search ordered by cosine distance.
+
+        The threshold is applied after the index scan, so fewer than ``limit``
+        rows may be returned. ``ef_search``/``probes`` trade recall for latency.
+        """
+        # Tunables only apply to the current transaction; SET does not take bind params
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search or HNSW_EF_SEARCH)}"))
+        await session.execute(text(f"SET LOCAL ivfflat.probes = {int(probes or IVFFLAT_PROBES)}"))
+        # Plan per execution so the bound namespace can match a partial index predicate
+        await session.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+
+        params: Dict[str, Any] = {
+            "query_embedding": to_db_vector(query_embedding),
+            "namespace": namespace,
+            "limit": limit
+        }
+
+        filter_sql = ""
+        for n, (key, value) in enumerate((metadata_filter or {}).items()):
+            filter_sql += f" AND metadata->>:filter_key_{n} = :filter_value_{n}"
+            params[f"filter_key_{n}"] = key
+            params[f"filter_value_{n}"] = str(value)
+
+        threshold_sql = ""
+        if similarity_threshold is not None:
+            threshold_sql = "WHERE nearest.similarity > :similarity_threshold"
+            params["similarity_threshold"] = similarity_threshold
+
+        query_vector = vector_cast("query_embedding")
+        result = await session.execute(text(f"""
+            SELECT id, document_id, content, similarity, metadata
+            FROM (
+                SELECT id, document_id, content, metadata,
+                       1 - (embedding <=> {query_vector}) AS similarity
+                FROM document_embeddings
+                WHERE namespace = :namespace{filter_sql}
+                ORDER BY embedding <=> {query_vector}
+                LIMIT :limit
+            ) nearest
+            {threshold_sql}
+            ORDER BY similarity DESC
+        """), params)
+
+        rows = []
+        for row in result:
+            metadata = row[4]
+            if isinstance(metadata, str):
+                metadata = json.loads(metadata)
+            rows.append({
+                "id": str(row[0]),
+                "document_id": row[1],
+                "content": row[2],
+                "similarity": float(row[3]),
+                "metadata": metadata or {}
+            })
+        return rows
+
+
+# Global index manager instance
+vector_index_manager = VectorIndexManager()
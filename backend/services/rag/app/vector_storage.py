@@ -0,0 +1,203 @@
+"""
+Native pgvector storage for embeddings
+Registers the asyncpg binary codecs for vector/halfvec, converts embeddings to
+their wire format and migrates JSON-encoded embedding columns online.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple, Union
+import asyncio
+import logging
+import os
+import re
+import numpy as np
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# "vector" stores float32 components; "halfvec" stores float16 at half the size
+VECTOR_STORAGE_TYPE = os.getenv("VECTOR_STORAGE_TYPE", "vector")
+VECTOR_STORAGE_TYPES = ("vector", "halfvec")
+MIGRATION_BATCH_SIZE = int(os.getenv("EMBEDDING_MIGRATION_BATCH_SIZE", "1000"))
+
+if VECTOR_STORAGE_TYPE not in VECTOR_STORAGE_TYPES:
+    raise ValueError(f"Unsupported VECTOR_STORAGE_TYPE: {VECTOR_STORAGE_TYPE}")
+
+
+def register_vector_codec(engine: AsyncEngine) -> None:
+    """Install the pgvector binary codecs on every new asyncpg connection"""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.run_async(register_vector)
+
+
+def to_db_vector(embedding: Union[List[float], np.ndarray]) -> np.ndarray:
+    """Convert an embedding to the array type the binary codec encodes"""
+    dtype = np.float16 if VECTOR_STORAGE_TYPE == "halfvec" else np.float32
+    return np.asarray(embedding, dtype=dtype)
+
+
+def vector_cast(param: str) -> str:
+    """SQL expression casting a bind parameter to the storage vector type"""
+    return f"CAST(:{param} AS {VECTOR_STORAGE_TYPE})"
+
+
+def cosine_ops() -> str:
+    """Operator class for cosine-distance indexes on the storage type"""
+    return f"{VECTOR_STORAGE_TYPE}_cosine_ops"
+
+
+async def get_embedding_column_type(engine: AsyncEngine) -> str:
+    """Current SQL type of document_embeddings.embedding, e.g. 'vector(1536)'"""
+    async with engine.connect() as conn:
+        result = await conn.execute(text("""
+            SELECT format_type(a.atttypid, a.atttypmod)
+            FROM pg_attribute a
+            WHERE a.attrelid = 'document_embeddings'::regclass
+            AND a.attname = 'embedding' AND NOT a.attisdropped
+        """))
+        return result.scalar()
+
+
+async def _embedding_indexes(conn) -> List[Tuple[int, str, str]]:
+    """(oid, name, definition) of every index on document_embeddings.embedding"""
+    result = await conn.execute(text("""
+        SELECT i.indexrelid::bigint, c.relname, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = 'document_embeddings'::regclass
+        AND a.attname = 'embedding' AND NOT a.attisdropped
+        ORDER BY c.relname
+    """))
+    return [(row[0], row[1], row[2]) for row in result]
+
+
+def _native_index_sql(definition: str, native_name: str) -> Optional[str]:
+    """Rewrite an ANN index definition for the shadow column, or None if it is not one"""
+    sql, replaced = re.subn(
+        r"\(embedding (?:vector|halfvec)_(\w+_ops)\)",
+        lambda m: f"(embedding_native {VECTOR_STORAGE_TYPE}_{m.group(1)})",
+        definition
+    )
+    if replaced != 1 or not re.search(r" USING (hnsw|ivfflat) ", sql):
+        return None
+    return re.sub(r"^CREATE INDEX \S+ ON", f"CREATE INDEX CONCURRENTLY {native_name} ON", sql)
+
+
+async def migrate_embedding_column(
+    engine: AsyncEngine,
+    dimensions: int = 1536,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+    drop_legacy: bool = False
+) -> Dict[str, Any]:
+    """Convert document_embeddings.embedding to the native storage type online.
+
+    A trigger keeps the shadow column in step with every insert or update of
+    ``embedding`` while existing rows are copied in small committed batches
+    using ``FOR UPDATE SKIP LOCKED``, so readers and writers are never blocked
+    for long. ANN indexes on the legacy column are rebuilt concurrently on the
+    shadow column before the short final transaction swaps the columns. The
+    legacy column is only dropped when all of its indexes were rebuilt.
+    """
+    target_type = f"{VECTOR_STORAGE_TYPE}({int(dimensions)})"
+    current_type = await get_embedding_column_type(engine)
+    if current_type == target_type:
+        return {"status": "up_to_date", "column_type": current_type, "migrated_rows": 0}
+
+    legacy_column = "embedding_" + re.sub(r"[^a-z0-9]", "_", current_type.lower()).strip("_")
+    convert_sql = f"""
+        UPDATE document_embeddings
+        SET embedding_native = CAST(CAST(embedding AS text) AS {target_type})
+        WHERE id IN (
+            SELECT id FROM document_embeddings
+            WHERE embedding_native IS NULL AND embedding IS NOT NULL
+            ORDER BY id
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+    """
+
+    async with engine.begin() as conn:
+        await conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        # Adding a nullable column without a default is a catalog-only change
+        await conn.execute(text(
+            f"ALTER TABLE document_embeddings ADD COLUMN IF NOT EXISTS embedding_native {target_type}"
+        ))
+        # Writes made while the backfill runs go straight to the shadow column too
+        await conn.execute(text(f"""
+            CREATE OR REPLACE FUNCTION document_embeddings_sync_native() RETURNS trigger AS $$
+            BEGIN
+                NEW.embedding_native := CAST(CAST(NEW.embedding AS text) AS {target_type});
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+        """))
+        await conn.execute(text(
+            "DROP TRIGGER IF EXISTS trg_document_embeddings_sync_native ON document_embeddings"
+        ))
+        await conn.execute(text("""
+            CREATE TRIGGER trg_document_embeddings_sync_native
+            BEFORE INSERT OR UPDATE OF embedding ON document_embeddings
+            FOR EACH ROW EXECUTE FUNCTION document_embeddings_sync_native()
+        """))
+
+    migrated = 0
+    while True:
+        async with engine.begin() as conn:
+            result = await conn.execute(text(convert_sql), {"batch_size": batch_size})
+        if result.rowcount == 0:
+            break
+        migrated += result.rowcount
+        logger.info(f"Migrated {migrated} embeddings to {target_type}")
+        # Yield between batches so the service keeps serving requests
+        await asyncio.sleep(0)
+
+    # Build the replacement ANN indexes before the swap so searches never lose them
+    rebuilt_indexes: List[Tuple[str, str]] = []
+    unrebuilt_indexes: List[str] = []
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for oid, name, definition in await _embedding_indexes(conn):
+            native_name = f"idx_document_embeddings_native_{oid}"
+            create_sql = _native_index_sql(definition, native_name)
+            if create_sql is None:
+                unrebuilt_indexes.append(name)
+                continue
+            # An interrupted earlier run can leave an invalid index behind
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {native_name}"))
+            await conn.execute(text(create_sql))
+            rebuilt_indexes.append((name, native_name))
+            logger.info(f"Rebuilt index {name} on the {target_type} column")
+
+    drop_legacy = drop_legacy and not unrebuilt_indexes
+    async with engine.begin() as conn:
+        await conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+        await conn.execute(text("LOCK TABLE document_embeddings IN ACCESS EXCLUSIVE MODE"))
+        await conn.execute(text("DROP TRIGGER trg_document_embeddings_sync_native ON document_embeddings"))
+        await conn.execute(text("DROP FUNCTION document_embeddings_sync_native()"))
+        await conn.execute(text(f"ALTER TABLE document_embeddings RENAME COLUMN embedding TO {legacy_column}"))
+        await conn.execute(text("ALTER TABLE document_embeddings RENAME COLUMN embedding_native TO embedding"))
+        if drop_legacy:
+            await conn.execute(text(f"ALTER TABLE document_embeddings DROP COLUMN {legacy_column}"))
+        # The rebuilt indexes take over the original names, which searches and POST /indexes rely on
+        for name, native_name in rebuilt_indexes:
+            if not drop_legacy:
+                legacy_name = native_name.replace("_native_", "_legacy_")
+                await conn.execute(text(f"ALTER INDEX {name} RENAME TO {legacy_name}"))
+            await conn.execute(text(f"ALTER INDEX {native_name} RENAME TO {name}"))
+
+    logger.info(f"Embedding column migrated from {current_type} to {target_type} ({migrated} rows)")
+    if unrebuilt_indexes:
+        logger.warning(f"Kept {legacy_column}: indexes {unrebuilt_indexes} could not be rebuilt on the new column")
+    return {
+        "status": "migrated",
+        "previous_type": current_type,
+        "column_type": target_type,
+        "migrated_rows": migrated,
+        "legacy_column": None if drop_legacy else legacy_column,
+        "rebuilt_indexes": [name for name, _ in rebuilt_indexes],
+        "unrebuilt_indexes": unrebuilt_indexes
+    }
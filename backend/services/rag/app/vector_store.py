@@ -11,6 +11,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 import numpy as np
 from .config import rag_config
+from .vector_index import vector_index_manager
+from .vector_storage import to_db_vector
+from .embedding_cache import embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -161,7 +164,7 @@ class VectorStore:
                 await db.execute(query, {
                     "document_id": doc_id,
                     "content": doc,
-                    "embedding": json.dumps(embedding),  # Store as JSON for now
+                    "embedding": to_db_vector(embedding),
                     "metadata": json.dumps(metadata),
                     "namespace": namespace
                 })
@@ -186,62 +189,32 @@ class VectorStore:
         n_results: int, 
         similarity_threshold: Optional[float] = None,
         metadata_filter: Optional[Dict[str, Any]] = None,
-        db: AsyncSession = None
+        db: AsyncSession = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Search for similar documents"""
         try:
-            # Get query embedding
-            query_embedding = await self.get_embedding(query, db)
+            # Get query embedding (repeated queries skip the provider call)
+            await rag_config.refresh_if_needed(db)
+            query_embedding = await embedding_cache.get_or_compute(
+                rag_config.get_embedding_model_name(), query, lambda: self.get_embedding(query, db)
+            )
             
             # Use configured similarity threshold if not provided
             if similarity_threshold is None:
                 similarity_threshold = rag_config.get_similarity_threshold()
             
-            # Build the search query
-            base_query = """
-                SELECT 
-                    id, document_id, content, metadata,
-                    cosine_similarity(embedding::vector, :query_embedding::vector) as similarity
-                FROM document_embeddings 
-                WHERE namespace = :namespace
-                AND cosine_similarity(embedding::vector, :query_embedding::vector) > :similarity_threshold
-            """
-            
-            # Add metadata filter if provided
-            if metadata_filter:
-                # Simple implementation - could be enhanced for complex filters
-                filter_conditions = []
-                for key, value in metadata_filter.items():
-                    filter_conditions.append(f"metadata->>'{key}' = '{value}'")
-                if filter_conditions:
-                    base_query += " AND " + " AND ".join(filter_conditions)
-            
-            base_query += """
-                ORDER BY similarity DESC
-                LIMIT :n_results
-            """
-            
-            query_stmt = text(base_query)
-            result = await db.execute(query_stmt, {
-                "query_embedding": json.dumps(query_embedding),
-                "namespace": namespace,
-                "similarity_threshold": similarity_threshold,
-                "n_results": n_results
-            })
-            
-            rows = result.fetchall()
-            
-            search_results = []
-            for row in rows:
-                search_results.append({
-                    "id": str(row[0]),
-                    "document_id": row[1],
-                    "content": row[2],
-                    "metadata": json.loads(row[3]) if row[3] else {},
-                    "similarity": float(row[4])
-                })
-            
-            return search_results
+            return await vector_index_manager.search(
+                db,
+                query_embedding,
+                namespace=namespace,
+                limit=n_results,
+                similarity_threshold=similarity_threshold,
+                metadata_filter=metadata_filter,
+                ef_search=ef_search,
+                probes=probes
+            )
             
         except Exception as e:
             logger.error(f"Error in similarity search: {e}")
@@ -0,0 +1,70 @@
+"""
+Document extraction pool tests
+Jobs use builtins (``time.sleep``, ``os.getpid``) so they unpickle in the
+spawned workers without importing test code.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.document_extraction import DocumentExtractionPool, ExtractionTimeoutError
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_result_and_errors_come_back_from_worker():
+    async def scenario():
+        pool = DocumentExtractionPool(max_workers=1, timeout_seconds=30, memory_limit_mb=0)
+        try:
+            assert await pool.submit(len, "abc") == 3
+            with pytest.raises(ValueError):
+                await pool.submit(int, "not a number")
+            # The worker survives a job that raised
+            assert await pool.submit(len, "ab") == 2
+        finally:
+            pool.shutdown()
+
+    _run(scenario())
+
+
+def test_timeout_starts_when_a_worker_picks_the_job_up():
+    async def scenario():
+        pool = DocumentExtractionPool(max_workers=1, timeout_seconds=30, memory_limit_mb=0)
+        try:
+            await pool.submit(len, "")  # start the worker outside the timed section
+            # Each job fits its budget, but the second waits behind the first
+            results = await asyncio.gather(
+                pool.submit(time.sleep, 0.8, timeout=1.5),
+                pool.submit(time.sleep, 0.8, timeout=1.5),
+            )
+            assert results == [None, None]
+        finally:
+            pool.shutdown()
+
+    _run(scenario())
+
+
+def test_timeout_kills_only_the_offending_worker():
+    async def scenario():
+        pool = DocumentExtractionPool(max_workers=2, timeout_seconds=30, memory_limit_mb=0)
+        try:
+            pids = set(await asyncio.gather(pool.submit(os.getpid), pool.submit(os.getpid)))
+            slow = pool.submit(time.sleep, 30, timeout=0.5)
+            healthy = pool.submit(time.sleep, 1.5, timeout=10)
+            slow_result, healthy_result = await asyncio.gather(slow, healthy, return_exceptions=True)
+
+            assert isinstance(slow_result, ExtractionTimeoutError)
+            assert healthy_result is None
+
+            # One of the original workers is still serving jobs
+            surviving = set(await asyncio.gather(pool.submit(os.getpid), pool.submit(os.getpid)))
+            assert len(pids & surviving) == 1
+        finally:
+            pool.shutdown()
+
+    _run(scenario())
@@ -2,14 +2,18 @@
 SQL Tool Service - Database query execution and schema introspection
 """
 
-from fastapi import FastAPI, HTTPException, Query, Body
+from fastapi import FastAPI, HTTPException, Query, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Union, Literal, AsyncIterator
 import logging
 import asyncio
 from datetime import datetime
 import json
+import os
+import time
+from contextlib import aclosing
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
@@ -18,6 +22,14 @@ import asyncpg
 import aiomysql
 import aiosqlite
 
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+from .sql_statements import is_row_returning
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,10 +49,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Streaming query limits
+STREAM_BATCH_SIZE = int(os.getenv("SQLTOOL_STREAM_BATCH_SIZE", "5000"))
+STREAM_MAX_ROWS = int(os.getenv("SQLTOOL_STREAM_MAX_ROWS", "1000000"))
+# Rows an Arrow stream reads before fixing its schema from their value types
+ARROW_SCHEMA_LOOKAHEAD_ROWS = int(os.getenv("SQLTOOL_ARROW_SCHEMA_LOOKAHEAD_ROWS", "5000"))
+
+# Schema cache: trusted for SCHEMA_CHECK_INTERVAL, then revalidated with a catalog fingerprint
+SCHEMA_CACHE_TTL = float(os.getenv("SQLTOOL_SCHEMA_CACHE_TTL", "3600"))
+SCHEMA_CHECK_INTERVAL = float(os.getenv("SQLTOOL_SCHEMA_CHECK_INTERVAL", "30"))
+
+# Cheap catalog queries whose result changes on DDL (see get_schema_fingerprint)
+SCHEMA_FINGERPRINT_QUERIES = {
+    "postgresql": """
+        SELECT md5(
+            coalesce((SELECT string_agg(c.oid::text || ':' || c.xmin::text || ':' || c.relfilenode::text, ',' ORDER BY c.oid)
+                      FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                      WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'v', 'm', 'p', 'f')), '')
+            || '|' ||
+            coalesce((SELECT string_agg(a.attrelid::text || '.' || a.attnum::text || ':' || a.xmin::text, ',' ORDER BY a.attrelid, a.attnum)
+                      FROM pg_attribute a
+                      JOIN pg_class c ON c.oid = a.attrelid
+                      JOIN pg_namespace n ON n.oid = c.relnamespace
+                      WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'v', 'm', 'p', 'f') AND a.attnum > 0), '')
+            || '|' ||
+            coalesce((SELECT string_agg(co.oid::text || ':' || co.xmin::text, ',' ORDER BY co.oid)
+                      FROM pg_constraint co JOIN pg_namespace n ON n.oid = co.connamespace
+                      WHERE n.nspname = current_schema()), '')
+        )
+    """,
+    "sqlite": "PRAGMA schema_version",
+    "mysql": """
+        SELECT CONCAT_WS(':',
+            (SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()),
+            (SELECT MAX(CREATE_TIME) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()),
+            (SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE()))
+    """,
+}
+
 # Database connection registry
 db_engines: Dict[str, Any] = {}
 db_sessions: Dict[str, Any] = {}
 
+# Per-connection schema cache entries: result, fingerprint, loaded_at, checked_at
+schema_cache: Dict[str, Dict[str, Any]] = {}
+schema_cache_locks: Dict[str, asyncio.Lock] = {}
+
 # Pydantic models
 class DatabaseConnection(BaseModel):
     name: str = Field(..., description="Unique connection name")
@@ -58,6 +112,11 @@ class SQLQuery(BaseModel):
     params: Optional[Dict[str, Any]] = Field(None, description="Query parameters")
     limit: Optional[int] = Field(1000, description="Maximum rows to return")
 
+class StreamingSQLQuery(SQLQuery):
+    limit: Optional[int] = Field(None, description=f"Maximum rows to stream (capped at {STREAM_MAX_ROWS})")
+    format: Literal["ndjson", "arrow"] = Field("ndjson", description="ndjson or arrow (Arrow IPC stream)")
+    batch_size: int = Field(STREAM_BATCH_SIZE, ge=1, le=100000, description="Rows fetched per cursor round trip")
+
 class QueryResult(BaseModel):
     success: bool
     data: Optional[List[Dict[str, Any]]] = None
@@ -138,6 +197,7 @@ async def root():
         "endpoints": {
             "connections": "/connections",
             "query": "/query",
+            "query_stream": "/query/stream",
             "schema": "/schema",
             "health": "/health",
             "docs": "/docs"
@@ -229,6 +289,8 @@ async def delete_connection(connection_name: str):
         # Remove from registries
         del db_engines[connection_name]
         del db_sessions[connection_name]
+        schema_cache.pop(connection_name, None)
+        schema_cache_locks.pop(connection_name, None)
         
         logger.info(f"Deleted database connection: {connection_name}")
         
@@ -244,31 +306,28 @@ async def delete_connection(connection_name: str):
 
 @app.post("/query", response_model=QueryResult)
 async def execute_query(query_request: SQLQuery):
-    """Execute SQL query"""
+    """Execute SQL query
+    
+    Reads run on a server-side cursor, so at most ``limit`` rows are ever
+    fetched from the database. Use ``/query/stream`` for large result sets.
+    """
     
     start_time = asyncio.get_event_loop().time()
+    params = query_request.params or {}
+    limit = query_request.limit or 1000
     
     try:
         engine = await get_database_engine(query_request.connection_name)
         
         async with engine.begin() as conn:
-            # Execute query with parameters
-            if query_request.params:
-                result = await conn.execute(text(query_request.query), query_request.params)
-            else:
-                result = await conn.execute(text(query_request.query))
+            columns, rows, rowcount = await conn.run_sync(_run_query, query_request.query, params, limit)
             
-            # Fetch results for SELECT queries
-            if query_request.query.strip().upper().startswith('SELECT'):
-                rows = result.fetchmany(query_request.limit or 1000)
-                columns = list(result.keys()) if rows else []
-                data = [dict(row._mapping) for row in rows]
+            if rows is not None:
+                data = [dict(zip(columns, row)) for row in rows]
                 row_count = len(data)
             else:
-                # For INSERT, UPDATE, DELETE
                 data = None
-                columns = None
-                row_count = result.rowcount
+                row_count = rowcount
             
             execution_time = (asyncio.get_event_loop().time() - start_time) * 1000
             
@@ -291,68 +350,393 @@ async def execute_query(query_request: SQLQuery):
         )
 
 
+def _run_query(sync_conn, query: str, params: Dict[str, Any], limit: int):
+    """Run a statement on a server-side cursor (runs on a sync connection)
+    
+    Whether the statement yields rows is taken from the executed result, so
+    data-modifying CTEs and RETURNING clauses are handled like the driver
+    reports them. Returns ``(columns, rows, rowcount)``; ``rows`` is None for
+    statements without a result set.
+    """
+    
+    result = sync_conn.execute(text(query), params, execution_options={"stream_results": True})
+    if not result.returns_rows and sync_conn.dialect.driver == "asyncpg":
+        # asyncpg's server-side cursor only binds the statement and runs it on
+        # the first fetch, so a statement without result columns has not run yet
+        result.close()
+        result = sync_conn.execute(text(query), params)
+    if not result.returns_rows:
+        return None, None, result.rowcount
+    try:
+        return list(result.keys()), result.fetchmany(limit), None
+    finally:
+        result.close()
+
+
+@app.post("/query/stream")
+async def stream_query(query_request: StreamingSQLQuery, request: Request):
+    """Stream a query result from a server-side cursor
+    
+    ``ndjson`` sends a header line with the columns, one JSON array per row
+    and a footer with the row count (or an error line). ``arrow`` sends an
+    Arrow IPC stream of record batches; the first batch is fetched before the
+    response starts, so a failing query gets an HTTP error, and a failure
+    after that aborts the response without the end-of-stream marker. The
+    cursor is closed and the query abandoned as soon as the client
+    disconnects. The query runs in a read-only transaction, so statements
+    that pass the row-returning check but write (``WITH d AS (DELETE ...
+    RETURNING *) SELECT ...``, ``EXPLAIN ANALYZE DELETE ...``) fail instead
+    of streaming rows that are then rolled back.
+    """
+    
+    if not is_row_returning(query_request.query):
+        raise HTTPException(status_code=400, detail="Only row-returning statements can be streamed")
+    if query_request.format == "arrow" and not ARROW_AVAILABLE:
+        raise HTTPException(status_code=400, detail="Arrow output requires pyarrow to be installed")
+    
+    engine = await get_database_engine(query_request.connection_name)
+    max_rows = min(query_request.limit or STREAM_MAX_ROWS, STREAM_MAX_ROWS)
+    
+    if query_request.format == "arrow":
+        # Arrow has no in-band error frame, so surface query errors before the 200 is sent
+        state = {"row_count": 0, "truncated": False, "cancelled": False}
+        batches = _iter_batches(engine, query_request, max_rows, request, state)
+        try:
+            first_batch = await anext(batches, None)
+        except Exception as e:
+            await batches.aclose()
+            logger.error(f"Streaming query failed before the first batch: {e}")
+            status_code = 400 if isinstance(e, sa.exc.DBAPIError) else 500
+            raise HTTPException(status_code=status_code, detail=f"Query failed: {str(e)}")
+        body = _stream_arrow(batches, first_batch, state)
+        media_type = "application/vnd.apache.arrow.stream"
+    else:
+        body = _stream_ndjson(engine, query_request, max_rows, request)
+        media_type = "application/x-ndjson"
+    
+    return StreamingResponse(body, media_type=media_type)
+
+
+async def _iter_batches(
+    engine,
+    query_request: StreamingSQLQuery,
+    max_rows: int,
+    request: Request,
+    state: Dict[str, Any]
+) -> AsyncIterator[List[Any]]:
+    """Yield row batches from a server-side cursor until ``max_rows`` or client disconnect.
+    
+    ``state`` receives ``columns`` before the first batch and ``row_count``
+    and ``truncated`` as the stream progresses.
+    """
+    
+    async with engine.connect() as conn:
+        await _begin_read_only(conn)
+        try:
+            result = await conn.stream(text(query_request.query), query_request.params or {})
+        except BaseException:
+            await _end_read_only(conn)
+            raise
+        try:
+            state["columns"] = list(result.keys())
+            while state["row_count"] < max_rows:
+                if await request.is_disconnected():
+                    state["cancelled"] = True
+                    logger.info(f"Client disconnected after {state['row_count']} rows; cancelling query")
+                    return
+                rows = await result.fetchmany(min(query_request.batch_size, max_rows - state["row_count"]))
+                if not rows:
+                    return
+                state["row_count"] += len(rows)
+                yield rows
+            state["truncated"] = bool(await result.fetchmany(1))
+        finally:
+            # Closing the connection rolls back the read-only transaction
+            await result.close()
+            await _end_read_only(conn)
+
+
+async def _begin_read_only(conn) -> None:
+    """Make the connection's next transaction read-only before the query runs"""
+    
+    if conn.dialect.name == "sqlite":
+        # SQLite has no read-only transactions; query_only is per connection and reset afterwards
+        await conn.exec_driver_sql("PRAGMA query_only = ON")
+    else:
+        # PostgreSQL applies it to the transaction just begun, MySQL to the next one
+        await conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+async def _end_read_only(conn) -> None:
+    if conn.dialect.name == "sqlite":
+        await conn.rollback()
+        await conn.exec_driver_sql("PRAGMA query_only = OFF")
+
+
+async def _stream_ndjson(
+    engine,
+    query_request: StreamingSQLQuery,
+    max_rows: int,
+    request: Request
+) -> AsyncIterator[bytes]:
+    start_time = asyncio.get_event_loop().time()
+    state = {"row_count": 0, "truncated": False, "cancelled": False}
+    header_sent = False
+    try:
+        # aclosing releases the cursor immediately if this generator is cancelled
+        async with aclosing(_iter_batches(engine, query_request, max_rows, request, state)) as batches:
+            async for rows in batches:
+                if not header_sent:
+                    yield (json.dumps({"type": "header", "columns": state["columns"]}) + "\n").encode()
+                    header_sent = True
+                yield "".join(json.dumps(list(row), default=str) + "\n" for row in rows).encode()
+        if not header_sent:
+            yield (json.dumps({"type": "header", "columns": state.get("columns", [])}) + "\n").encode()
+        yield (json.dumps({
+            "type": "footer",
+            "row_count": state["row_count"],
+            "truncated": state["truncated"],
+            "execution_time_ms": (asyncio.get_event_loop().time() - start_time) * 1000
+        }) + "\n").encode()
+    except Exception as e:
+        logger.error(f"Streaming query failed after {state['row_count']} rows: {e}")
+        yield (json.dumps({"type": "error", "error": str(e), "row_count": state["row_count"]}) + "\n").encode()
+
+
+def _arrow_batch(columns: List[str], rows: List[Any], schema: Optional["pa.Schema"] = None) -> "pa.RecordBatch":
+    """Build a record batch positionally, so duplicate column names stay separate columns.
+    
+    Without ``schema`` each column's type is inferred from its values; with
+    it, inferred arrays are cast to the declared field types.
+    """
+    
+    arrays = []
+    for i in range(len(columns)):
+        array = pa.array([row[i] for row in rows])
+        if schema is not None and array.type != schema.field(i).type:
+            array = array.cast(schema.field(i).type)
+        arrays.append(array)
+    if schema is not None:
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+    return pa.RecordBatch.from_arrays(arrays, names=columns)
+
+
+def _arrow_schema(batches: List["pa.RecordBatch"], final: bool) -> "pa.Schema":
+    """Unify inferred batch schemas, promoting null and narrower numeric types.
+    
+    Unless the stream has ended (``final``), columns that are still NULL in
+    every row are declared as strings so later values can be cast to them.
+    """
+    
+    # Unify by position; unify_schemas rejects duplicate names such as "SELECT t.x, u.x"
+    positional = [str(i) for i in range(batches[0].num_columns)]
+    unified = pa.unify_schemas(
+        [pa.schema([(name, field.type) for name, field in zip(positional, batch.schema)]) for batch in batches],
+        promote_options="permissive"
+    )
+    fields = []
+    for name, field in zip(batches[0].schema.names, unified):
+        field_type = field.type
+        if not final and pa.types.is_null(field_type):
+            field_type = pa.string()
+        fields.append(pa.field(name, field_type))
+    return pa.schema(fields)
+
+
+async def _stream_arrow(
+    batches: AsyncIterator[List[Any]],
+    first_batch: Optional[List[Any]],
+    state: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """Serialize already-started cursor batches as an Arrow IPC stream.
+    
+    The IPC schema cannot change once sent, so the first
+    ARROW_SCHEMA_LOOKAHEAD_ROWS rows are held back and the schema is the
+    promoted union of their inferred types: ints mixed with floats become
+    floats, and columns NULL in all of those rows are sent as strings. A complete
+    stream ends with the end-of-stream marker. If the query fails part way,
+    or a later value does not fit the schema, the error is re-raised so the
+    server aborts the response instead of closing it like a complete,
+    shorter result.
+    """
+    
+    schema = None
+    pending: List["pa.RecordBatch"] = []
+    pending_rows = 0
+    
+    def flush(final: bool) -> List[bytes]:
+        nonlocal schema
+        schema = _arrow_schema(pending, final)
+        frames = [schema.serialize().to_pybytes()]
+        for batch in pending:
+            if batch.schema != schema:
+                batch = pa.RecordBatch.from_arrays(
+                    [column.cast(field.type) for column, field in zip(batch.columns, schema)],
+                    schema=schema
+                )
+            frames.append(batch.serialize().to_pybytes())
+        pending.clear()
+        return frames
+    
+    def encode(rows: List[Any]) -> List[bytes]:
+        nonlocal pending_rows
+        if schema is not None:
+            return [_arrow_batch(state["columns"], rows, schema).serialize().to_pybytes()]
+        pending.append(_arrow_batch(state["columns"], rows))
+        pending_rows += len(rows)
+        if pending_rows >= ARROW_SCHEMA_LOOKAHEAD_ROWS:
+            return flush(final=False)
+        return []
+    
+    # aclosing releases the cursor immediately if this generator is cancelled
+    async with aclosing(batches):
+        try:
+            if first_batch is not None:
+                for frame in encode(first_batch):
+                    yield frame
+                async for rows in batches:
+                    for frame in encode(rows):
+                        yield frame
+            if pending:
+                for frame in flush(final=True):
+                    yield frame
+        except Exception as e:
+            logger.error(f"Streaming query failed after {state['row_count']} rows; aborting Arrow stream: {e}")
+            raise
+    
+    if schema is None:
+        yield pa.schema([(name, pa.null()) for name in state.get("columns", [])]).serialize().to_pybytes()
+    # End-of-stream marker: continuation token followed by a zero length
+    yield b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+def introspect_schema(sync_conn) -> Dict[str, Any]:
+    """Collect tables and views with the SQLAlchemy inspector (runs on a sync connection)"""
+    
+    inspector = inspect(sync_conn)
+    
+    # Get tables
+    tables = []
+    for table_name in inspector.get_table_names():
+        columns = []
+        for column in inspector.get_columns(table_name):
+            columns.append({
+                "name": column["name"],
+                "type": str(column["type"]),
+                "nullable": column["nullable"],
+                "default": column.get("default"),
+                "primary_key": column.get("primary_key", False)
+            })
+        
+        # Get primary keys
+        pk_constraint = inspector.get_pk_constraint(table_name)
+        primary_keys = pk_constraint.get("constrained_columns", [])
+        
+        # Get foreign keys
+        foreign_keys = []
+        for fk in inspector.get_foreign_keys(table_name):
+            foreign_keys.append({
+                "columns": fk["constrained_columns"],
+                "referred_table": fk["referred_table"],
+                "referred_columns": fk["referred_columns"]
+            })
+        
+        tables.append({
+            "name": table_name,
+            "columns": columns,
+            "primary_keys": primary_keys,
+            "foreign_keys": foreign_keys
+        })
+    
+    # Get views
+    views = []
+    try:
+        for view_name in inspector.get_view_names():
+            views.append({
+                "name": view_name,
+                "definition": inspector.get_view_definition(view_name)
+            })
+    except (AttributeError, NotImplementedError):
+        # Some databases don't support view introspection
+        pass
+    
+    return {"tables": tables, "views": views}
+
+
+async def get_schema_fingerprint(conn) -> Optional[str]:
+    """Catalog fingerprint that changes on DDL, or None when the dialect has none"""
+    
+    query = SCHEMA_FINGERPRINT_QUERIES.get(conn.dialect.name)
+    if query is None:
+        return None
+    try:
+        value = (await conn.execute(text(query))).scalar()
+        return None if value is None else str(value)
+    except Exception as e:
+        logger.warning(f"Schema fingerprint query failed: {e}")
+        return None
+
+
+def cached_schema(connection_name: str) -> Optional[Dict[str, Any]]:
+    """The cache entry if it is within both the TTL and the check interval"""
+    
+    entry = schema_cache.get(connection_name)
+    now = time.monotonic()
+    if entry and now - entry["loaded_at"] < SCHEMA_CACHE_TTL and now - entry["checked_at"] < SCHEMA_CHECK_INTERVAL:
+        return entry
+    return None
+
+
 @app.get("/schema/{connection_name}", response_model=SchemaResult)
-async def get_schema(connection_name: str):
-    """Get database schema information"""
+async def get_schema(connection_name: str, refresh: bool = False):
+    """Get database schema information
+    
+    Served from a per-connection cache. After SQLTOOL_SCHEMA_CHECK_INTERVAL
+    seconds a catalog fingerprint decides whether to re-introspect;
+    ``refresh`` forces it.
+    """
     
     try:
         engine = await get_database_engine(connection_name)
         
-        async with engine.begin() as conn:
-            # Use SQLAlchemy inspector for schema introspection
-            inspector = inspect(engine)
+        entry = None if refresh else cached_schema(connection_name)
+        if entry:
+            return entry["result"]
+        
+        async with schema_cache_locks.setdefault(connection_name, asyncio.Lock()):
+            entry = None if refresh else cached_schema(connection_name)
+            if entry:
+                return entry["result"]
             
-            # Get tables
-            tables = []
-            for table_name in inspector.get_table_names():
-                columns = []
-                for column in inspector.get_columns(table_name):
-                    columns.append({
-                        "name": column["name"],
-                        "type": str(column["type"]),
-                        "nullable": column["nullable"],
-                        "default": column.get("default"),
-                        "primary_key": column.get("primary_key", False)
-                    })
-                
-                # Get primary keys
-                pk_constraint = inspector.get_pk_constraint(table_name)
-                primary_keys = pk_constraint.get("constrained_columns", [])
+            async with engine.connect() as conn:
+                fingerprint = await get_schema_fingerprint(conn)
                 
-                # Get foreign keys
-                foreign_keys = []
-                for fk in inspector.get_foreign_keys(table_name):
-                    foreign_keys.append({
-                        "columns": fk["constrained_columns"],
-                        "referred_table": fk["referred_table"],
-                        "referred_columns": fk["referred_columns"]
-                    })
+                entry = schema_cache.get(connection_name)
+                if (
+                    entry and not refresh
+                    and time.monotonic() - entry["loaded_at"] < SCHEMA_CACHE_TTL
+                    # Without a fingerprint the TTL alone governs reloads
+                    and (fingerprint is None or fingerprint == entry["fingerprint"])
+                ):
+                    entry["checked_at"] = time.monotonic()
+                    return entry["result"]
                 
-                tables.append({
-                    "name": table_name,
-                    "columns": columns,
-                    "primary_keys": primary_keys,
-                    "foreign_keys": foreign_keys
-                })
+                schema = await conn.run_sync(introspect_schema)
             
-            # Get views
-            views = []
-            try:
-                for view_name in inspector.get_view_names():
-                    views.append({
-                        "name": view_name,
-                        "definition": inspector.get_view_definition(view_name)
-                    })
-            except (AttributeError, NotImplementedError):
-                # Some databases don't support view introspection
-                pass
-            
-            return SchemaResult(
+            result = SchemaResult(
                 success=True,
-                tables=tables,
-                views=views,
+                tables=schema["tables"],
+                views=schema["views"],
                 functions=[]  # Function introspection can be added later
             )
+            now = time.monotonic()
+            schema_cache[connection_name] = {
+                "result": result,
+                "fingerprint": fingerprint,
+                "loaded_at": now,
+                "checked_at": now
+            }
+            return result
             
     except Exception as e:
         logger.error(f"Schema introspection failed: {e}")
@@ -363,6 +747,14 @@ async def get_schema(connection_name: str):
         )
 
 
+@app.post("/schema/{connection_name}/invalidate")
+async def invalidate_schema(connection_name: str):
+    """Drop the cached schema for a connection"""
+    
+    schema_cache.pop(connection_name, None)
+    return {"message": f"Schema cache for '{connection_name}' invalidated"}
+
+
 @app.get("/tables/{connection_name}")
 async def list_tables(connection_name: str):
     """List all tables in database"""
@@ -0,0 +1,25 @@
+"""
+SQL statement classification
+Decides from a statement's first keyword whether it yields a result set, so
+row-returning queries can run on a server-side cursor.
+"""
+
+import re
+
+# Statements that produce a result set
+ROW_RETURNING_KEYWORDS = {"SELECT", "WITH", "VALUES", "TABLE", "SHOW", "EXPLAIN", "DESCRIBE", "PRAGMA"}
+
+_LEADING_NOISE = re.compile(r"^(\s+|--[^\n]*(\n|$)|/\*.*?\*/|\()+", re.DOTALL)
+# Letters only: "select*from t" and "SELECT(1)" still start with SELECT
+_FIRST_KEYWORD = re.compile(r"\s*([A-Za-z]+)")
+
+
+def first_keyword(query: str) -> str:
+    """Upper-cased first keyword after leading whitespace, comments and parentheses"""
+    match = _FIRST_KEYWORD.match(_LEADING_NOISE.sub("", query, count=1))
+    return match.group(1).upper() if match else ""
+
+
+def is_row_returning(query: str) -> bool:
+    """Whether a statement yields rows, judged by its first keyword"""
+    return first_keyword(query) in ROW_RETURNING_KEYWORDS
@@ -0,0 +1,44 @@
+"""
+Statement classification tests
+"""
+
+import pytest
+
+from app.sql_statements import first_keyword, is_row_returning
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT 1",
+    "select*from t",
+    "SELECT(1)",
+    "  (SELECT 1) UNION (SELECT 2)",
+    "-- leading comment\nSELECT 1",
+    "/* block */ WITH x AS (SELECT 1) SELECT * FROM x",
+    "/* a */ -- b\n ((select 1))",
+    "values (1), (2)",
+    "EXPLAIN ANALYZE SELECT 1",
+    "PRAGMA table_info(t)",
+])
+def test_row_returning(query):
+    assert is_row_returning(query)
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "   ",
+    "-- only a comment",
+    "INSERT INTO t VALUES (1)",
+    "update t set x=1",
+    "DELETE FROM t",
+    "CREATE TABLE t (x int)",
+    "SELECTED",
+    "123",
+])
+def test_not_row_returning(query):
+    assert not is_row_returning(query)
+
+
+def test_first_keyword_stops_at_non_letters():
+    assert first_keyword("select*from t") == "SELECT"
+    assert first_keyword("Insert(x)") == "INSERT"
+    assert first_keyword("") == ""
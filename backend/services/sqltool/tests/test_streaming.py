@@ -0,0 +1,148 @@
+"""
+Streaming endpoint tests against a SQLite file database
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("asyncpg")
+pytest.importorskip("aiomysql")
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app import main
+
+ROWS = 10
+# SQLite raises "integer overflow" for abs() of the smallest integer, so this
+# query fails only once the cursor reaches x > 6
+FAILS_MID_STREAM = "SELECT CASE WHEN x > 6 THEN abs(-9223372036854775808) ELSE x END AS v FROM t"
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / "stream.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(1, ROWS + 1)])
+
+    main.db_engines["test"] = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    try:
+        yield TestClient(main.app)
+    finally:
+        main.db_engines.pop("test", None)
+
+
+def _stream(client, query, fmt, **extra):
+    return client.post("/query/stream", json={
+        "connection_name": "test", "query": query, "format": fmt, "batch_size": 2, **extra
+    })
+
+
+def test_ndjson_stream_complete(client):
+    lines = [json.loads(line) for line in _stream(client, "SELECT x FROM t", "ndjson").text.splitlines()]
+    assert lines[0] == {"type": "header", "columns": ["x"]}
+    assert [row[0] for row in lines[1:-1]] == list(range(1, ROWS + 1))
+    assert lines[-1]["type"] == "footer" and lines[-1]["row_count"] == ROWS
+
+
+def test_ndjson_stream_ends_with_error_record(client):
+    lines = [json.loads(line) for line in _stream(client, FAILS_MID_STREAM, "ndjson").text.splitlines()]
+    assert lines[-1]["type"] == "error"
+    # Drivers may read ahead of the row that failed, so only the upper bound is fixed
+    assert lines[-1]["row_count"] < 6
+    assert not any(isinstance(line, dict) and line.get("type") == "footer" for line in lines)
+
+
+def test_non_row_returning_statement_rejected(client):
+    assert _stream(client, "DELETE FROM t", "ndjson").status_code == 400
+
+
+def test_arrow_stream_complete(client):
+    pa = pytest.importorskip("pyarrow")
+    response = _stream(client, "select*from t", "arrow")
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("x").to_pylist() == list(range(1, ROWS + 1))
+
+
+def test_arrow_query_error_is_an_http_error(client):
+    pytest.importorskip("pyarrow")
+    response = _stream(client, "SELECT missing_column FROM t", "arrow")
+    assert response.status_code == 400
+    assert "Query failed" in response.json()["detail"]
+
+
+def test_arrow_mid_stream_error_aborts_response(client):
+    pytest.importorskip("pyarrow")
+    # The server re-raises instead of ending the IPC stream as if it were complete
+    with pytest.raises(Exception):
+        response = _stream(client, FAILS_MID_STREAM, "arrow")
+        response.read()
+
+
+def test_query_data_modifying_cte_reports_rowcount(client):
+    body = client.post("/query", json={
+        "connection_name": "test",
+        "query": "WITH s AS (SELECT x + 100 AS y FROM t WHERE x <= 2) INSERT INTO t SELECT y FROM s"
+    }).json()
+    assert body["success"] is True
+    # sqlite3 reports rowcount -1 for statements that do not start with INSERT
+    assert body["data"] is None and body["columns"] is None
+    count = client.post("/query", json={"connection_name": "test", "query": "SELECT count(*) AS n FROM t"}).json()
+    assert count["data"] == [{"n": ROWS + 2}]
+
+
+def test_query_fetches_at_most_limit_rows(client):
+    body = client.post("/query", json={"connection_name": "test", "query": "SELECT x FROM t", "limit": 3}).json()
+    assert body["success"] is True
+    assert [row["x"] for row in body["data"]] == [1, 2, 3]
+
+
+def test_arrow_stream_null_only_first_batch(client, monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    # Fix the schema after the first two-row batch, which is NULL in both columns
+    monkeypatch.setattr(main, "ARROW_SCHEMA_LOOKAHEAD_ROWS", 2)
+    query = "SELECT CASE WHEN x > 2 THEN x END AS n, CASE WHEN x > 2 THEN x * 1.5 END AS f FROM t"
+    table = pa.ipc.open_stream(_stream(client, query, "arrow").content).read_all()
+    assert table.column("n").to_pylist() == [None, None] + [str(x) for x in range(3, ROWS + 1)]
+
+
+def test_arrow_stream_promotes_types_within_lookahead(client):
+    pa = pytest.importorskip("pyarrow")
+    query = "SELECT CASE WHEN x > 2 THEN x * 1.5 END AS f, CASE WHEN x > 4 THEN x / 2.0 ELSE x END AS m FROM t"
+    table = pa.ipc.open_stream(_stream(client, query, "arrow").content).read_all()
+    assert table.column("f").to_pylist() == [None, None] + [x * 1.5 for x in range(3, ROWS + 1)]
+    assert table.schema.field("m").type == pa.float64()
+    assert table.column("m").to_pylist() == [1, 2, 3, 4] + [x / 2.0 for x in range(5, ROWS + 1)]
+
+
+def test_arrow_stream_keeps_duplicate_column_names(client):
+    pa = pytest.importorskip("pyarrow")
+    response = _stream(client, "SELECT t.x, u.x FROM t JOIN t AS u ON u.x = t.x + 1", "arrow")
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == ["x", "x"]
+    assert table.column(0).to_pylist() == list(range(1, ROWS))
+    assert table.column(1).to_pylist() == list(range(2, ROWS + 1))
+
+
+def test_stream_runs_read_only(client):
+    # Passes the row-returning check by its leading WITH, but deletes
+    lines = [json.loads(line) for line in _stream(client, "WITH a AS (SELECT 1) DELETE FROM t RETURNING x", "ndjson").text.splitlines()]
+    assert lines[-1]["type"] == "error"
+    assert "readonly" in lines[-1]["error"]
+    count = client.post("/query", json={"connection_name": "test", "query": "SELECT count(*) AS n FROM t"}).json()
+    assert count["data"] == [{"n": ROWS}]
+    # The connection is usable for writes again afterwards
+    assert client.post("/query", json={"connection_name": "test", "query": "DELETE FROM t WHERE x = 1"}).json()["success"]
+
+
+def test_arrow_stream_runs_read_only(client):
+    pytest.importorskip("pyarrow")
+    response = _stream(client, "WITH a AS (SELECT 1) DELETE FROM t RETURNING x", "arrow")
+    assert response.status_code == 400
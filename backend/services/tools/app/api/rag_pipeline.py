@@ -4,7 +4,7 @@ Provides comprehensive RAG pipeline operations including document management,
 embedding model selection, and collection operations
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, Query, status, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
 from typing import List, Dict, Any, Optional
@@ -23,6 +23,8 @@ from ..schemas.tool_schemas import (
     DocumentIngestionRequest, DocumentIngestionResponse
 )
 from ..services.rag_service import EnhancedRAGService
+from ..services.embedding_cache import get_embedding_cache
+from ..core.config import get_settings
 
 router = APIRouter(prefix="/rag-pipelines", tags=["RAG Pipelines"])
 logger = logging.getLogger(__name__)
@@ -216,31 +218,41 @@ async def upload_documents(
     proc_options = json.loads(processing_options) if processing_options else {}
     
     # Process uploaded files
+    settings = get_settings()
     processed_files = []
     total_chunks = 0
     
     for file in files:
         try:
-            # Save file temporarily
+            # Save file temporarily, block by block so large uploads never sit in memory
+            file_size = 0
             with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as temp_file:
-                content = await file.read()
-                temp_file.write(content)
+                while True:
+                    block = await file.read(settings.UPLOAD_BLOCK_SIZE)
+                    if not block:
+                        break
+                    temp_file.write(block)
+                    file_size += len(block)
                 temp_file_path = temp_file.name
             
+            file_options = dict(proc_options)
+            if file_options.get("streaming") is None:
+                file_options["streaming"] = file_size > settings.STREAMING_INGEST_THRESHOLD_BYTES
+            
             # Process file with RAG service
             result = await rag_service.ingest_document(
                 pipeline_id=pipeline_id,
                 file_path=temp_file_path,
                 filename=file.filename,
                 metadata=doc_metadata,
-                processing_options=proc_options
+                processing_options=file_options
             )
             
             processed_files.append({
                 "filename": file.filename,
                 "status": result["status"],
                 "chunks_created": result.get("chunks_created", 0),
-                "file_size": len(content)
+                "file_size": file_size
             })
             
             total_chunks += result.get("chunks_created", 0)
@@ -299,6 +311,8 @@ async def search_pipeline(
     query: str,
     k: int = 5,
     filters: Optional[Dict[str, Any]] = None,
+    search_mode: str = Query("vector", pattern="^(vector|lexical|hybrid)$"),
+    hybrid_weight: float = Query(0.5, ge=0.0, le=1.0),
     db: AsyncSession = Depends(get_db)
 ):
     """Search documents in a RAG pipeline"""
@@ -320,7 +334,9 @@ async def search_pipeline(
         pipeline_id=pipeline_id,
         query=query,
         k=k,
-        filters=filters or {}
+        filters=filters or {},
+        search_mode=search_mode,
+        hybrid_weight=hybrid_weight
     )
     
     return results
@@ -590,6 +606,11 @@ async def list_pipeline_runs(
     
     return runs.scalars().all()
 
+@router.get("/embedding-cache/stats")
+async def get_embedding_cache_stats():
+    """Query embedding cache hit/miss counters"""
+    return get_embedding_cache().get_stats()
+
 @router.get("/health")
 async def health_check():
     """
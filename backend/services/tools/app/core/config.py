@@ -24,6 +24,49 @@ class Settings(BaseSettings):
     # Redis configuration for tool caching
     REDIS_URL: str = "redis://localhost:6379/3"
     
+    # Query embedding cache (in-process LRU, optionally backed by REDIS_URL)
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 10000
+    EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+    EMBEDDING_CACHE_USE_REDIS: bool = False
+    
+    # API integration GET response cache (in-process LRU, optionally backed by
+    # REDIS_URL); expired entries with an ETag/Last-Modified are kept for
+    # HTTP_CACHE_STALE_TTL_SECONDS so they can be revalidated
+    HTTP_CACHE_MAX_ENTRIES: int = 2000
+    HTTP_CACHE_STALE_TTL_SECONDS: int = 3600
+    HTTP_CACHE_USE_REDIS: bool = False
+    
+    # Shared provider clients (one HTTP connection pool for all OpenAI clients)
+    MODEL_CLIENT_MAX_CONNECTIONS: int = 100
+    MODEL_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    MODEL_CLIENT_KEEPALIVE_EXPIRY: float = 60.0
+    MODEL_CLIENT_CONNECT_TIMEOUT: float = 10.0
+    MODEL_CLIENT_REQUEST_TIMEOUT: float = 120.0
+    
+    # Document extraction worker pool (PDF/DOCX/Docling parsing)
+    EXTRACTION_MAX_WORKERS: int = 2
+    EXTRACTION_TIMEOUT_SECONDS: int = 300
+    # Per-worker address-space cap (RLIMIT_AS), 0 = no cap. Importing torch and
+    # Docling alone maps about 3.8 GB of virtual memory, before any models load
+    EXTRACTION_MEMORY_LIMIT_MB: int = 0
+    
+    # Web scraper HTML parsing pool (0 workers = run parsing in threads)
+    HTML_EXTRACTION_MAX_WORKERS: int = 2
+    HTML_EXTRACTION_TIMEOUT_SECONDS: int = 60
+    HTML_EXTRACTION_MEMORY_LIMIT_MB: int = 1024
+    
+    # Streaming ingestion: uploads are spooled in blocks and large files are
+    # chunked and embedded while they are still being extracted
+    UPLOAD_BLOCK_SIZE: int = 1024 * 1024
+    PDF_PAGE_WINDOW: int = 20
+    STREAMING_INGEST_THRESHOLD_BYTES: int = 20 * 1024 * 1024
+    STREAMING_EMBED_BATCH_SIZE: int = 64  # chunks per embedding call and bulk insert
+    
+    # Hybrid (full-text + vector) retrieval
+    TEXT_SEARCH_CONFIG: str = "english"
+    HYBRID_RRF_K: int = 60
+    HYBRID_CANDIDATE_MULTIPLIER: int = 4
+    
     # MCP Configuration
     MCP_SERVERS: Dict[str, str] = {
         "filesystem": "mcp-server-filesystem",
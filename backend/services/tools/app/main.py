@@ -13,6 +13,10 @@ from .api.sample_queries import router as sample_queries_router
 from .core.config import get_settings
 from .services.database_service import get_database_service
 from .models.database import init_db
+from .services.document_extraction import get_extraction_pool
+from .services.model_clients import get_model_client_registry
+from .services.html_extraction import get_html_extraction_pool
+from .services.http_response_cache import get_http_response_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -45,6 +49,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Tools service...")
+    get_extraction_pool().shutdown()
+    get_html_extraction_pool().shutdown()
+    await get_model_client_registry().close()
+    await get_http_response_cache().close()
 
 app = FastAPI(
     title="Tools Service",
@@ -96,16 +96,10 @@ class PhysicalToolLoader:
         """
         try:
             # Load the module
-            spec = importlib.util.spec_from_file_location(
-                f"{category}.{tool_file.stem}", 
-                tool_file
-            )
-            if not spec or not spec.loader:
+            module = self._load_module(tool_file, category)
+            if module is None:
                 return None
             
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
             # Find the main tool class
             tool_class = self._find_tool_class(module)
             if not tool_class:
@@ -138,6 +132,28 @@ class PhysicalToolLoader:
             logger.error(f"Error analyzing tool file {tool_file}: {e}")
             return None
     
+    def _load_module(self, tool_file: Path, category: str):
+        """
+        Execute a tool file as the standalone module ``<category>.<stem>``
+        
+        Tool files are not imported as part of the ``app`` package, so they
+        must reach service code with absolute ``app.`` imports.
+        
+        Args:
+            tool_file: Path to the tool file
+            category: Tool category
+            
+        Returns:
+            The loaded module, or None if no loader is available
+        """
+        spec = importlib.util.spec_from_file_location(f"{category}.{tool_file.stem}", tool_file)
+        if not spec or not spec.loader:
+            return None
+        
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    
     def _find_tool_class(self, module) -> Optional[Type]:
         """
         Find the main tool class in a module
@@ -228,16 +244,10 @@ class PhysicalToolLoader:
             
             # Load the module if not already loaded
             if tool_name not in self.loaded_tools:
-                spec = importlib.util.spec_from_file_location(
-                    f"{tool_info['category']}.{tool_name}", 
-                    tool_info["file_path"]
-                )
-                if not spec or not spec.loader:
+                module = self._load_module(Path(tool_info["file_path"]), tool_info["category"])
+                if module is None:
                     raise ImportError(f"Could not load tool module: {tool_info['file_path']}")
                 
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                
                 tool_class = self._find_tool_class(module)
                 if not tool_class:
                     raise ValueError(f"No tool class found in {tool_info['file_path']}")
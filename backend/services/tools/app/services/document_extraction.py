@@ -0,0 +1,297 @@
+"""
+Document Extraction Worker Pool
+Runs CPU-heavy document parsing (pypdf, python-docx, Docling) in worker
+processes with per-job timeouts and memory caps, so ingestion never blocks
+the event loop
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Dict, Any, AsyncIterator, List, Optional, Callable, Set
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionTimeoutError(Exception):
+    """Raised when a document extraction job exceeds its time budget"""
+    pass
+
+
+class ExtractionWorkerError(Exception):
+    """Raised when a worker process dies while running a job (e.g. killed by the OS)"""
+    pass
+
+
+# Worker-side functions. These run in child processes, so they must be
+# module-level and return plain picklable data.
+
+# Docling converters by table extraction setting
+_docling_converters: Dict[tuple, Any] = {}
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    """Cap the worker's address space so one pathological file cannot OOM the host"""
+    if memory_limit_mb and RESOURCE_AVAILABLE:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(conn: Connection, memory_limit_mb: int) -> None:
+    """Run jobs received over ``conn`` until the pipe closes or ``None`` arrives"""
+    _init_worker(memory_limit_mb)
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        fn, args = job
+        try:
+            result = (True, fn(*args))
+        except Exception as e:
+            result = (False, e)
+        try:
+            conn.send(result)
+        except Exception as e:
+            # Result or exception could not be pickled
+            conn.send((False, RuntimeError(f"{fn.__name__} returned an unpicklable result: {e}")))
+
+
+def extract_pdf_text(file_path: str) -> str:
+    """Extract text from a PDF file"""
+    import pypdf
+
+    reader = pypdf.PdfReader(file_path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages).strip()
+
+
+def count_pdf_pages(file_path: str) -> int:
+    """Number of pages in a PDF file"""
+    import pypdf
+
+    return len(pypdf.PdfReader(file_path).pages)
+
+
+def extract_pdf_pages(file_path: str, start: int, end: int) -> List[str]:
+    """Extract the text of pages [start, end) from a PDF file"""
+    import pypdf
+
+    reader = pypdf.PdfReader(file_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, min(end, len(reader.pages)))]
+
+
+def extract_docx_text(file_path: str) -> str:
+    """Extract text from a DOCX file"""
+    from docx import Document as DocxDocument
+
+    doc = DocxDocument(file_path)
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
+
+
+def _to_plain(value: Any) -> Any:
+    """Convert Docling pydantic objects (bboxes, table data) to plain dicts"""
+    if value is None:
+        return None
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return value
+
+
+def convert_with_docling(file_path: str, extract_tables: bool = True, extract_images: bool = True) -> Dict[str, Any]:
+    """Convert a document with Docling and return its text, tables and figures"""
+    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
+    from docling.document_converter import DocumentConverter, PdfFormatOption
+
+    # Model loading is expensive, so each worker keeps its converters;
+    # pipeline options are fixed per converter, not per convert() call
+    converter = _docling_converters.get(extract_tables)
+    if converter is None:
+        pipeline_options = PdfPipelineOptions()
+        pipeline_options.do_ocr = True
+        pipeline_options.do_table_structure = extract_tables
+        pipeline_options.table_structure_options.do_cell_matching = True
+        converter = _docling_converters[extract_tables] = DocumentConverter(
+            format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)}
+        )
+
+    result = converter.convert(file_path)
+
+    tables = []
+    if extract_tables:
+        for table in result.document.tables:
+            tables.append({
+                "content": table.export_to_text(),
+                "structured_data": _to_plain(getattr(table, "data", None)),
+                "bbox": _to_plain(table.prov[0].bbox) if table.prov else None
+            })
+
+    images = []
+    if extract_images:
+        for figure in result.document.pictures:
+            images.append({
+                "caption": figure.caption if hasattr(figure, "caption") else None,
+                "bbox": _to_plain(figure.prov[0].bbox) if figure.prov else None
+            })
+
+    return {
+        "main_text": result.document.export_to_text(),
+        "tables": tables,
+        "images": images
+    }
+
+
+class _WorkerUnavailable(Exception):
+    """The worker was already dead when a job was handed to it"""
+
+
+class _Worker:
+    """One worker process and the pipe used to hand it jobs"""
+
+    def __init__(self, context: multiprocessing.context.BaseContext, memory_limit_mb: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, memory_limit_mb), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def exchange(self, fn: Callable[..., Any], args: tuple) -> Any:
+        """Send one job and block until its result arrives (runs in a thread)"""
+        try:
+            self.conn.send((fn, args))
+        except (BrokenPipeError, ConnectionResetError, EOFError) as e:
+            raise _WorkerUnavailable(str(e)) from e
+        return self.conn.recv()
+
+    def kill(self) -> None:
+        # Also unblocks the thread waiting in exchange(): recv() raises EOFError
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.kill()
+
+
+class DocumentExtractionPool:
+    """Worker processes for document parsing with an async submit/await API.
+
+    At most ``max_workers`` jobs run at once, each on its own worker, and a
+    job's timeout only starts once a worker picks it up. A job that times out
+    or is cancelled kills just the worker running it; other jobs keep going.
+    """
+
+    def __init__(self, max_workers: int = 2, timeout_seconds: float = 300, memory_limit_mb: int = 0):
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+        # spawn avoids forking a process that holds an event loop and threads
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = asyncio.Semaphore(max(max_workers, 1))
+        self._idle: List[_Worker] = []
+        self._workers: Set[_Worker] = set()
+
+    def _checkout(self) -> _Worker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.process.is_alive():
+                return worker
+            self._discard(worker)
+        worker = _Worker(self._context, self.memory_limit_mb)
+        self._workers.add(worker)
+        return worker
+
+    def _discard(self, worker: _Worker) -> None:
+        worker.kill()
+        self._workers.discard(worker)
+
+    async def submit(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run ``fn(*args)`` in a worker process and await its result"""
+        timeout = timeout or self.timeout_seconds
+
+        for attempt in range(2):
+            async with self._slots:
+                worker = self._checkout()
+                healthy = False
+                try:
+                    # The clock starts here, when a worker is free to run the job
+                    ok, value = await asyncio.wait_for(asyncio.to_thread(worker.exchange, fn, args), timeout)
+                    healthy = True
+                except asyncio.TimeoutError:
+                    logger.error(f"Document extraction {fn.__name__} timed out after {timeout}s; killing its worker")
+                    raise ExtractionTimeoutError(f"Document extraction timed out after {timeout}s")
+                except _WorkerUnavailable:
+                    # The worker died while idle; the job never started, so retry it once
+                    if attempt:
+                        raise ExtractionWorkerError(f"No live worker for {fn.__name__}")
+                    logger.warning(f"Extraction worker was dead before {fn.__name__}; retrying on a new one")
+                    continue
+                except (EOFError, OSError) as e:
+                    raise ExtractionWorkerError(f"Extraction worker died while running {fn.__name__}") from e
+                finally:
+                    # A worker that timed out, crashed or whose caller was cancelled may
+                    # still be busy; only healthy ones go back to the idle list
+                    if healthy:
+                        self._idle.append(worker)
+                    else:
+                        self._discard(worker)
+
+            if ok:
+                return value
+            raise value
+
+    async def extract_pdf_text(self, file_path: str) -> str:
+        return await self.submit(extract_pdf_text, str(file_path))
+
+    async def iter_pdf_pages(self, file_path: str, window: int = 20) -> AsyncIterator[str]:
+        """Yield PDF page texts, extracting ``window`` pages per worker job"""
+        total = await self.submit(count_pdf_pages, str(file_path))
+        for start in range(0, total, window):
+            for page_text in await self.submit(extract_pdf_pages, str(file_path), start, start + window):
+                yield page_text
+
+    async def extract_docx_text(self, file_path: str) -> str:
+        return await self.submit(extract_docx_text, str(file_path))
+
+    async def convert_with_docling(self, file_path: str, extract_tables: bool = True, extract_images: bool = True) -> Dict[str, Any]:
+        return await self.submit(convert_with_docling, str(file_path), extract_tables, extract_images)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        for worker in list(self._workers):
+            worker.stop()
+        self._workers.clear()
+        self._idle.clear()
+
+
+# Global extraction pool instance
+_extraction_pool: Optional[DocumentExtractionPool] = None
+
+
+def get_extraction_pool() -> DocumentExtractionPool:
+    """Get the process-wide document extraction pool (singleton)"""
+    global _extraction_pool
+    if _extraction_pool is None:
+        settings = get_settings()
+        _extraction_pool = DocumentExtractionPool(
+            max_workers=settings.EXTRACTION_MAX_WORKERS,
+            timeout_seconds=settings.EXTRACTION_TIMEOUT_SECONDS,
+            memory_limit_mb=settings.EXTRACTION_MEMORY_LIMIT_MB
+        )
+    return _extraction_pool
@@ -0,0 +1,163 @@
+"""
+Query Embedding Cache
+Two-tier (in-process LRU + optional Redis) cache for text embeddings keyed by
+model and normalized text hash
+"""
+
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """LRU + TTL embedding cache with an optional shared Redis tier"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: int = 3600,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "embedding_cache:"
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self._entries: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._redis = None
+
+        if redis_url and REDIS_AVAILABLE:
+            # Embeddings are stored as packed float32 bytes, so keep responses raw
+            self._redis = redis.from_url(redis_url, decode_responses=False)
+        elif redis_url:
+            logger.warning("redis package not installed; embedding cache is in-process only")
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.redis_errors = 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize unicode and whitespace so trivially different queries share a key"""
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+    def make_key(self, model: str, text: str) -> str:
+        """Cache key for a (model, normalized text) pair"""
+        digest = hashlib.sha256(self.normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+
+    async def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Return a cached embedding or None"""
+        key = self.make_key(model, text)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, embedding = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return embedding
+            del self._entries[key]
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(self.key_prefix + key)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Embedding cache Redis read failed: {e}")
+                raw = None
+            if raw:
+                embedding = array("f", raw).tolist()
+                self._put_local(key, embedding)
+                self.redis_hits += 1
+                return embedding
+
+        self.misses += 1
+        return None
+
+    async def set(self, model: str, text: str, embedding: List[float]) -> None:
+        """Store an embedding in both tiers"""
+        key = self.make_key(model, text)
+        self._put_local(key, list(embedding))
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    self.key_prefix + key, array("f", embedding).tobytes(), ex=self.ttl_seconds
+                )
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Embedding cache Redis write failed: {e}")
+
+    async def get_or_compute(
+        self,
+        model: str,
+        text: str,
+        compute: Callable[[], Awaitable[List[float]]]
+    ) -> List[float]:
+        """Return the cached embedding, computing and caching it on a miss"""
+        embedding = await self.get(model, text)
+        if embedding is None:
+            embedding = await compute()
+            await self.set(model, text, embedding)
+        return embedding
+
+    def _put_local(self, key: str, embedding: List[float]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def clear(self) -> None:
+        """Drop all local entries (Redis entries expire on their own TTL)"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "redis_enabled": self._redis is not None,
+            "redis_errors": self.redis_errors,
+            "hit_rate": (self.hits + self.redis_hits) / lookups if lookups else 0.0
+        }
+
+
+# Global embedding cache instance
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache (singleton)"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        settings = get_settings()
+        _embedding_cache = EmbeddingCache(
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+            redis_url=settings.REDIS_URL if settings.EMBEDDING_CACHE_USE_REDIS else None
+        )
+    return _embedding_cache
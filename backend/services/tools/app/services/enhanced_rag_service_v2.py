@@ -20,9 +20,7 @@ from enum import Enum
 
 # Document processing with Docling
 try:
-    from docling.document_converter import DocumentConverter
     from docling.datamodel.base_models import InputFormat
-    from docling.datamodel.pipeline_options import PdfPipelineOptions
     from docling.parsers import DoclingParseOptions
     DOCLING_AVAILABLE = True
 except ImportError:
@@ -53,6 +51,8 @@ except ImportError:
     LANGGRAPH_AVAILABLE = False
     logging.warning("Langgraph not available. Install with: pip install langgraph")
 
+from .document_extraction import get_extraction_pool
+
 logger = logging.getLogger(__name__)
 
 class DocumentType(Enum):
@@ -119,11 +119,6 @@ class EnhancedRAGServiceV2:
         self.embedding_cache = {}
         self.vector_store_cache = {}
         self.logger = logger
-        
-        # Document converter for Docling
-        self.document_converter = None
-        if DOCLING_AVAILABLE:
-            self.document_converter = DocumentConverter()
     
     async def initialize(self, database_url: str = None):
         """Initialize the RAG service with database connection"""
@@ -196,39 +191,26 @@ class EnhancedRAGServiceV2:
         start_time = time.time()
         
         try:
-            # Configure Docling pipeline
-            pipeline_options = PdfPipelineOptions()
-            pipeline_options.do_ocr = True
-            pipeline_options.do_table_structure = config.extract_tables
-            pipeline_options.table_structure_options.do_cell_matching = True
-            
-            # Convert document
-            result = self.document_converter.convert(file_path, pipeline_options=pipeline_options)
+            # Convert document in the extraction worker pool
+            result = await get_extraction_pool().convert_with_docling(
+                file_path, config.extract_tables, config.extract_images
+            )
             
             # Extract content
-            main_text = result.document.export_to_text()
-            
-            # Extract tables if configured
-            tables = []
-            if config.extract_tables:
-                for table in result.document.tables:
-                    table_data = {
-                        'content': table.export_to_text(),
-                        'structured_data': table.data if hasattr(table, 'data') else None,
-                        'bbox': table.prov[0].bbox if table.prov else None
-                    }
-                    tables.append(table_data)
+            main_text = result['main_text']
+            
+            # Tables are only returned when configured
+            tables = result['tables']
             
-            # Extract images if configured
+            # Images are only returned when configured
             images = []
-            if config.extract_images:
-                for figure in result.document.pictures:
-                    image_data = {
-                        'caption': figure.caption if hasattr(figure, 'caption') else '',
-                        'bbox': figure.prov[0].bbox if figure.prov else None,
-                        'content': f"[Image: {figure.caption if hasattr(figure, 'caption') else 'No caption'}]"
-                    }
-                    images.append(image_data)
+            for figure in result['images']:
+                image_data = {
+                    'caption': figure['caption'] or '',
+                    'bbox': figure['bbox'],
+                    'content': f"[Image: {figure['caption'] or 'No caption'}]"
+                }
+                images.append(image_data)
             
             # Create chunks
             chunks = await self._create_chunks_from_content(
@@ -639,27 +621,16 @@ Response:"""
             raise ValueError(f"Unsupported file format: {file_ext}")
     
     async def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF"""
+        """Extract text from PDF in the extraction worker pool"""
         try:
-            import pypdf
-            with open(file_path, 'rb') as file:
-                reader = pypdf.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            return await get_extraction_pool().extract_pdf_text(file_path)
         except ImportError:
             raise RuntimeError("pypdf not available. Install with: pip install pypdf")
     
     async def _extract_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX"""
+        """Extract text from DOCX in the extraction worker pool"""
         try:
-            from docx import Document
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return await get_extraction_pool().extract_docx_text(file_path)
         except ImportError:
             raise RuntimeError("python-docx not available. Install with: pip install python-docx")
     
@@ -0,0 +1,269 @@
+"""
+HTML Extraction Worker Pool
+Parses scraped pages (BeautifulSoup, readability, pandas.read_html) in worker
+processes so large pages do not pin the event loop and stall concurrent
+fetches. The full extractor collects every requested field in one walk of the
+tree; the fast path skips BeautifulSoup and uses selectolax or lxml directly
+when only text and links are needed.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from typing import Dict, Any, List, Optional
+from urllib.parse import urljoin
+
+from .document_extraction import DocumentExtractionPool
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+REMOVED_TAGS = {"script", "style", "nav", "footer", "header"}
+
+
+# Worker-side functions. These run in child processes, so they must be
+# module-level and return plain picklable data.
+
+def _extract_main_content(html: str) -> str:
+    """Extract main content using readability"""
+    try:
+        from readability import Document
+        return Document(html).summary()
+    except Exception as e:
+        logger.warning(f"Readability extraction failed: {e}")
+        return ""
+
+
+def extract_page(html: str, base_url: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract title, text, meta description, headings and the optional fields in one tree walk.
+
+    ``options`` flags: links, images, main_content, structured_data. The
+    page itself is not echoed back; the caller already has it.
+    """
+    from bs4 import BeautifulSoup, Comment
+
+    soup = BeautifulSoup(html, "lxml")
+    want_links = options.get("links", False)
+    want_images = options.get("images", False)
+    want_structured = options.get("structured_data", False)
+
+    title = ""
+    meta_description = ""
+    headings = []
+    links = []
+    images = []
+    structured_data: List[Dict[str, Any]] = []
+    removed = []
+
+    for element in soup.find_all(True):
+        name = element.name
+        if name in REMOVED_TAGS:
+            # JSON-LD lives in <script>, so read it before the element is dropped
+            if want_structured and name == "script" and element.get("type") == "application/ld+json":
+                try:
+                    structured_data.append({"type": "json-ld", "data": json.loads(element.string or "")})
+                except json.JSONDecodeError:
+                    pass
+            removed.append(element)
+        elif name == "title" and not title:
+            title = element.get_text().strip()
+        elif name == "meta" and not meta_description and element.get("name") == "description":
+            meta_description = element.get("content", "").strip()
+        elif name in HEADING_TAGS:
+            headings.append(element)
+        elif name == "a" and want_links and element.get("href"):
+            links.append(element)
+        elif name == "img" and want_images and element.get("src"):
+            images.append(element)
+
+    for element in removed:
+        element.decompose()
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+
+    # Elements inside removed regions (nav, header, footer) are not page content
+    extracted = {
+        "title": title,
+        "text": soup.get_text(separator=" ", strip=True),
+        "meta_description": meta_description,
+        "headings": [
+            {"level": heading.name, "text": heading.get_text().strip()}
+            for heading in headings if not heading.decomposed
+        ],
+    }
+    if want_links:
+        extracted["links"] = [
+            {"text": link.get_text().strip(), "href": link["href"], "absolute_url": urljoin(base_url, link["href"])}
+            for link in links if not link.decomposed
+        ]
+    if want_images:
+        extracted["images"] = [
+            {
+                "src": img["src"],
+                "absolute_url": urljoin(base_url, img["src"]),
+                "alt": img.get("alt", ""),
+                "title": img.get("title", "")
+            }
+            for img in images if not img.decomposed
+        ]
+    if options.get("main_content", True):
+        extracted["main_content"] = _extract_main_content(html)
+    if want_structured:
+        extracted["structured_data"] = structured_data
+    return extracted
+
+
+def extract_page_fast(html: str, base_url: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Title, text and links only, parsed with selectolax (or lxml) instead of BeautifulSoup.
+
+    Text is every text node, stripped and joined with single spaces, the same
+    as ``extract_page``, so adjacent blocks never run together.
+    """
+    want_links = options.get("links", False)
+    links: List[Dict[str, str]] = []
+
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        title_node = tree.css_first("title")
+        title = title_node.text(strip=True) if title_node else ""
+        meta = tree.css_first('meta[name="description"]')
+        meta_description = (meta.attributes.get("content") or "").strip() if meta else ""
+        tree.strip_tags(list(REMOVED_TAGS))
+        if want_links:
+            for node in tree.css("a[href]"):
+                href = node.attributes.get("href") or ""
+                if href:
+                    links.append({"text": node.text(strip=True), "href": href, "absolute_url": urljoin(base_url, href)})
+        text = tree.root.text(separator=" ", strip=True) if tree.root else ""
+    else:
+        import lxml.html
+
+        root = lxml.html.document_fromstring(html)
+        title = (root.findtext(".//title") or "").strip()
+        meta = root.find('.//meta[@name="description"]')
+        meta_description = (meta.get("content") or "").strip() if meta is not None else ""
+        for node in root.xpath("|".join(f"//{tag}" for tag in REMOVED_TAGS) + "|//comment()"):
+            node.drop_tree()
+        if want_links:
+            for node in root.iter("a"):
+                href = node.get("href")
+                if href:
+                    links.append({"text": node.text_content().strip(), "href": href, "absolute_url": urljoin(base_url, href)})
+        text = " ".join(part.strip() for part in root.itertext() if part.strip())
+
+    extracted = {
+        "title": title,
+        "text": text,
+        "meta_description": meta_description,
+    }
+    if want_links:
+        extracted["links"] = links
+    return extracted
+
+
+def _field_value(soup: Any, field_config: Dict[str, Any]) -> Any:
+    """Extract one schema field from a parsed page"""
+    selector = field_config.get("selector")
+    attribute = field_config.get("attribute", "text")
+    data_type = field_config.get("type", "string")
+    multiple = field_config.get("multiple", False)
+
+    if not selector:
+        return None
+
+    if multiple:
+        elements = soup.select(selector)
+    else:
+        element = soup.select_one(selector)
+        elements = [element] if element else []
+
+    values = []
+    for element in elements:
+        if attribute == "text":
+            value = element.get_text().strip()
+        else:
+            value = element.get(attribute, "")
+
+        if data_type == "integer":
+            match = re.search(r"\d+", value or "")
+            value = int(match.group()) if match else None
+        elif data_type == "float":
+            match = re.search(r"\d+\.?\d*", value or "")
+            value = float(match.group()) if match else None
+
+        values.append(value)
+
+    return values if multiple else (values[0] if values else None)
+
+
+def select_fields(html: str, schema: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Extract every schema field from one parse of the page"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    extracted = {}
+    for field_name, field_config in schema.items():
+        try:
+            extracted[field_name] = _field_value(soup, field_config)
+        except Exception as e:
+            logger.warning(f"Failed to extract field {field_name}: {e}")
+            extracted[field_name] = None
+    return extracted
+
+
+def read_tables(html: str) -> List[Dict[str, Any]]:
+    """Parse HTML tables with pandas; raises ValueError when the page has none"""
+    from io import StringIO
+    import pandas as pd
+
+    return [
+        {
+            "table_index": i,
+            "columns": table.columns.tolist(),
+            "data": table.to_dict("records"),
+            "shape": table.shape
+        }
+        for i, table in enumerate(pd.read_html(StringIO(html)))
+    ]
+
+
+class HtmlExtractionPool(DocumentExtractionPool):
+    """Worker pool for HTML parsing; with ``max_workers=0`` jobs run in threads instead"""
+
+    async def submit(self, fn, *args, timeout: Optional[float] = None):
+        if self.max_workers <= 0:
+            return await asyncio.wait_for(asyncio.to_thread(fn, *args), timeout or self.timeout_seconds)
+        return await super().submit(fn, *args, timeout=timeout)
+
+    async def extract_page(self, html: str, base_url: str, options: Dict[str, Any], fast: bool = False) -> Dict[str, Any]:
+        return await self.submit(extract_page_fast if fast else extract_page, html, base_url, options)
+
+    async def select_fields(self, html: str, schema: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        return await self.submit(select_fields, html, schema)
+
+    async def read_tables(self, html: str) -> List[Dict[str, Any]]:
+        return await self.submit(read_tables, html)
+
+
+# Global HTML extraction pool instance
+_html_extraction_pool: Optional[HtmlExtractionPool] = None
+
+
+def get_html_extraction_pool() -> HtmlExtractionPool:
+    """Get the process-wide HTML extraction pool (singleton)"""
+    global _html_extraction_pool
+    if _html_extraction_pool is None:
+        settings = get_settings()
+        _html_extraction_pool = HtmlExtractionPool(
+            max_workers=settings.HTML_EXTRACTION_MAX_WORKERS,
+            timeout_seconds=settings.HTML_EXTRACTION_TIMEOUT_SECONDS,
+            memory_limit_mb=settings.HTML_EXTRACTION_MEMORY_LIMIT_MB
+        )
+    return _html_extraction_pool
@@ -0,0 +1,326 @@
+"""
+HTTP Response Cache
+Process-wide cache for GET responses made by API integration tools. Entries
+live in a size-bounded in-process LRU, optionally backed by Redis so replicas
+share them. Freshness follows the upstream ``Cache-Control`` header (falling
+back to the caller's TTL); expired entries that carry an ``ETag`` or
+``Last-Modified`` validator are kept for a while so the next request can
+revalidate with ``If-None-Match``/``If-Modified-Since`` instead of downloading
+the body again. Concurrent requests for the same key share one upstream call.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Fetches the response, sending the given conditional headers upstream
+ResponseFetcher = Callable[[Dict[str, str]], Awaitable[Dict[str, Any]]]
+
+CACHE_CONTROL_DIRECTIVE = re.compile(r"\s*([a-zA-Z\-]+)\s*(?:=\s*\"?([^\",]*)\"?)?\s*(?:,|$)")
+
+
+def header_value(headers: Dict[str, str], name: str) -> Optional[str]:
+    """Case-insensitive header lookup on a plain dict"""
+    lowered = name.lower()
+    for key, value in headers.items():
+        if key.lower() == lowered:
+            return value
+    return None
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a ``Cache-Control`` header into {directive: argument}"""
+    if not value:
+        return {}
+    return {
+        match.group(1).lower(): match.group(2)
+        for match in CACHE_CONTROL_DIRECTIVE.finditer(value)
+        if match.group(1)
+    }
+
+
+def make_key(url: str, params: Optional[Dict[str, Any]], headers: Dict[str, str]) -> str:
+    """Cache key for a GET request.
+
+    Request headers are part of the key so responses fetched with different
+    credentials are never served to each other.
+    """
+    payload = {
+        "url": url,
+        "params": sorted((str(k), str(v)) for k, v in (params or {}).items()),
+        "headers": sorted((k.lower(), str(v)) for k, v in headers.items()),
+    }
+    encoded = json.dumps(payload, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class HttpResponseCache:
+    """LRU + TTL response cache with revalidation, request coalescing and an optional Redis tier"""
+
+    def __init__(
+        self,
+        max_entries: int = 2000,
+        stale_ttl_seconds: int = 3600,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "http_response_cache:"
+    ):
+        self.max_entries = max_entries
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.key_prefix = key_prefix
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._redis = None
+
+        if redis_url and REDIS_AVAILABLE:
+            self._redis = redis.from_url(redis_url, decode_responses=True)
+        elif redis_url:
+            logger.warning("redis package not installed; HTTP response cache is in-process only")
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.coalesced = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self.redis_errors = 0
+
+    async def get_or_fetch(self, key: str, fetch: ResponseFetcher, default_ttl: int) -> Tuple[Dict[str, Any], str]:
+        """Return ``(response, cache_status)`` for a GET.
+
+        ``cache_status`` is one of ``hit``, ``coalesced``, ``revalidated`` or
+        ``miss``. The response is a shallow copy, so callers may replace keys.
+        """
+        entry = await self._lookup(key)
+        if entry is not None and entry["expires_at"] > time.time():
+            return self._response(entry), "hit"
+
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            try:
+                response, _ = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The request we were waiting on was cancelled; make our own
+                inflight = self._inflight.get(key)
+                continue
+            self.coalesced += 1
+            return dict(response), "coalesced"
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch(key, entry, fetch, default_ttl)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody else awaited is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            response, status = result
+            return dict(response), status
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch(
+        self,
+        key: str,
+        entry: Optional[Dict[str, Any]],
+        fetch: ResponseFetcher,
+        default_ttl: int
+    ) -> Tuple[Dict[str, Any], str]:
+        conditional_headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                conditional_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = await fetch(conditional_headers)
+        status_code = response.get("status_code")
+
+        if status_code == 304 and entry is not None:
+            # Not modified: keep the stored body, take freshness from the new headers
+            new_headers = response.get("headers", {})
+            replaced = {name.lower() for name in new_headers}
+            merged_headers = {
+                **{name: value for name, value in entry["response"]["headers"].items() if name.lower() not in replaced},
+                **new_headers
+            }
+            ttl = self._freshness(merged_headers, default_ttl)
+            entry["response"] = {**entry["response"], "headers": merged_headers}
+            if ttl is None:
+                # The validation response forbids storing: serve the body once, then forget it
+                await self._discard(key)
+            else:
+                entry["expires_at"] = time.time() + ttl
+                await self._store(key, entry)
+            self.revalidated += 1
+            return self._response(entry), "revalidated"
+
+        self.misses += 1
+        if status_code == 200:
+            headers = response.get("headers", {})
+            ttl = self._freshness(headers, default_ttl)
+            etag = header_value(headers, "ETag")
+            last_modified = header_value(headers, "Last-Modified")
+            # Store when fresh for a while, or when a validator allows cheap revalidation
+            if ttl is not None and (ttl > 0 or etag or last_modified):
+                await self._store(key, {
+                    "response": response,
+                    "expires_at": time.time() + ttl,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                })
+        return response, "miss"
+
+    @staticmethod
+    def _freshness(headers: Dict[str, str], default_ttl: int) -> Optional[int]:
+        """Seconds the response stays fresh; None when it must not be stored"""
+        directives = parse_cache_control(header_value(headers, "Cache-Control"))
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0
+        max_age = directives.get("max-age")
+        if max_age is not None:
+            try:
+                return max(int(max_age), 0)
+            except ValueError:
+                pass
+        return default_ttl
+
+    @staticmethod
+    def _response(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(entry["response"])
+
+    async def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry["expires_at"] + self.stale_ttl_seconds > time.time():
+                self._entries.move_to_end(key)
+                if entry["expires_at"] > time.time():
+                    self.hits += 1
+                return entry
+            del self._entries[key]
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(self.key_prefix + key)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"HTTP response cache Redis read failed: {e}")
+                raw = None
+            if raw:
+                try:
+                    entry = json.loads(raw)
+                    entry["expires_at"] = float(entry["expires_at"])
+                    if not isinstance(entry["response"], dict):
+                        raise ValueError("stored response is not an object")
+                except (ValueError, TypeError, KeyError) as e:
+                    # A corrupt value is a miss; the next store overwrites it
+                    self.redis_errors += 1
+                    logger.warning(f"HTTP response cache ignored an undecodable Redis entry: {e}")
+                    return None
+                self._put_local(key, entry)
+                if entry["expires_at"] > time.time():
+                    self.redis_hits += 1
+                return entry
+        return None
+
+    async def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        self._put_local(key, entry)
+
+        if self._redis is not None:
+            retain = max(int(entry["expires_at"] - time.time()), 0)
+            if entry.get("etag") or entry.get("last_modified"):
+                retain += self.stale_ttl_seconds
+            if retain <= 0:
+                return
+            try:
+                await self._redis.set(self.key_prefix + key, json.dumps(entry, default=str), ex=retain)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"HTTP response cache Redis write failed: {e}")
+
+    async def _discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+        if self._redis is not None:
+            try:
+                await self._redis.delete(self.key_prefix + key)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"HTTP response cache Redis delete failed: {e}")
+
+    def _put_local(self, key: str, entry: Dict[str, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def clear(self) -> None:
+        """Drop all local entries (Redis entries expire on their own TTL)"""
+        self._entries.clear()
+
+    async def close(self) -> None:
+        self._entries.clear()
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        served = self.hits + self.redis_hits + self.coalesced + self.revalidated
+        lookups = served + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "coalesced": self.coalesced,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "redis_enabled": self._redis is not None,
+            "redis_errors": self.redis_errors,
+            "hit_rate": served / lookups if lookups else 0.0
+        }
+
+
+# Global HTTP response cache instance
+_http_response_cache: Optional[HttpResponseCache] = None
+
+
+def get_http_response_cache() -> HttpResponseCache:
+    """Get the process-wide HTTP response cache (singleton)"""
+    global _http_response_cache
+    if _http_response_cache is None:
+        settings = get_settings()
+        _http_response_cache = HttpResponseCache(
+            max_entries=settings.HTTP_CACHE_MAX_ENTRIES,
+            stale_ttl_seconds=settings.HTTP_CACHE_STALE_TTL_SECONDS,
+            redis_url=settings.REDIS_URL if settings.HTTP_CACHE_USE_REDIS else None
+        )
+    return _http_response_cache
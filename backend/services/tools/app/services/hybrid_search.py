@@ -0,0 +1,58 @@
+"""
+Hybrid Retrieval Helpers
+Generated tsvector column DDL for full-text search and weighted
+reciprocal-rank fusion of lexical and vector result lists
+"""
+
+from typing import Dict, Any, List, Sequence
+
+import asyncpg
+
+from ..core.config import get_settings
+
+
+async def ensure_text_search_column(conn: asyncpg.Connection, table_name: str) -> None:
+    """Add a generated ``content_tsv`` column and GIN index to ``table_name``.
+
+    The column is maintained by Postgres itself, so existing insert paths need
+    no changes. Adding it rewrites the table once.
+    """
+    config = get_settings().TEXT_SEARCH_CONFIG.replace("'", "''")
+    await conn.execute(f"""
+        ALTER TABLE {table_name}
+        ADD COLUMN IF NOT EXISTS content_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('{config}'::regconfig, coalesce(content, ''))) STORED
+    """)
+    await conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_{table_name}_content_tsv
+        ON {table_name} USING gin (content_tsv)
+    """)
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[List[Dict[str, Any]]],
+    weights: Sequence[float],
+    limit: int,
+    key: str,
+    k: int = None
+) -> List[Dict[str, Any]]:
+    """Fuse ranked result lists with weighted reciprocal-rank fusion.
+
+    Each item scores ``sum(weight / (k + rank))`` over the lists it appears in;
+    fields from every list are merged and the score is stored as ``fusion_score``.
+    """
+    k = k or get_settings().HYBRID_RRF_K
+    fused: Dict[Any, Dict[str, Any]] = {}
+    for results, weight in zip(ranked_lists, weights):
+        if weight <= 0:
+            continue
+        for rank, item in enumerate(results, start=1):
+            entry = fused.get(item[key])
+            if entry is None:
+                entry = fused[item[key]] = {**item, "fusion_score": 0.0}
+            else:
+                for field, value in item.items():
+                    entry.setdefault(field, value)
+            entry["fusion_score"] += weight / (k + rank)
+
+    return sorted(fused.values(), key=lambda item: item["fusion_score"], reverse=True)[:limit]
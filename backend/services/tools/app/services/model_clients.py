@@ -0,0 +1,126 @@
+"""
+Model Client Registry
+Process-wide cache of provider SDK clients and local embedding models, keyed by
+the configuration that affects them. All OpenAI clients share one ``httpx``
+connection pool so keep-alive connections to the provider are reused instead of
+paying a TCP/TLS handshake per request.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Any, Optional
+
+import httpx
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def config_hash(**config: Any) -> str:
+    """Stable hash of a client configuration"""
+    encoded = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ModelClientRegistry:
+    """Shared provider clients and sentence-transformer models for the tools process"""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        connect_timeout: float = 10.0,
+        request_timeout: float = 120.0
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(request_timeout, connect=connect_timeout)
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._clients: Dict[str, Any] = {}
+        self._sentence_transformers: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+        return self._http_client
+
+    def get_openai_client(self, api_key: Optional[str] = None, base_url: Optional[str] = None) -> "openai.AsyncOpenAI":
+        """Return the shared AsyncOpenAI client for this key and endpoint.
+
+        Without an explicit key the SDK default (``OPENAI_API_KEY``) is used;
+        it is part of the cache key so a rotated key gets a new client.
+        """
+        if not OPENAI_AVAILABLE:
+            raise RuntimeError("openai package not installed")
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        key = config_hash(provider="openai", api_key=api_key, base_url=base_url)
+        client = self._clients.get(key)
+        if client is None:
+            self.misses += 1
+            client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self.http_client)
+            self._clients[key] = client
+        else:
+            self.hits += 1
+        return client
+
+    def get_sentence_transformer(self, model_name: str) -> Any:
+        """Load a sentence-transformers model once per process"""
+        model = self._sentence_transformers.get(model_name)
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(model_name)
+            self._sentence_transformers[model_name] = model
+            logger.info(f"Loaded sentence-transformers model {model_name}")
+        return model
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "clients": len(self._clients),
+            "sentence_transformers": len(self._sentence_transformers),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    async def close(self) -> None:
+        """Release clients and close the shared connection pool"""
+        self._clients.clear()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+
+# Global registry instance
+_model_client_registry: Optional[ModelClientRegistry] = None
+
+
+def get_model_client_registry() -> ModelClientRegistry:
+    """Get the process-wide model client registry (singleton)"""
+    global _model_client_registry
+    if _model_client_registry is None:
+        settings = get_settings()
+        _model_client_registry = ModelClientRegistry(
+            max_connections=settings.MODEL_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.MODEL_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.MODEL_CLIENT_KEEPALIVE_EXPIRY,
+            connect_timeout=settings.MODEL_CLIENT_CONNECT_TIMEOUT,
+            request_timeout=settings.MODEL_CLIENT_REQUEST_TIMEOUT
+        )
+    return _model_client_registry
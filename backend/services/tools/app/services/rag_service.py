@@ -5,10 +5,11 @@ Handles all RAG operations including document ingestion, search, and collection
 
 import asyncio
 import asyncpg
+import codecs
 import json
 import logging
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 from pathlib import Path
 import tempfile
 import aiofiles
@@ -16,13 +17,16 @@ import numpy as np
 from datetime import datetime
 
 # Document processing imports
-import pypdf
-from docx import Document as DocxDocument
 import chardet
 
 # Embedding and vector storage
-import openai
-from sentence_transformers import SentenceTransformer
+from pgvector.asyncpg import register_vector
+
+from .embedding_cache import get_embedding_cache
+from .model_clients import get_model_client_registry
+from .document_extraction import get_extraction_pool
+from .hybrid_search import reciprocal_rank_fusion
+from ..core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +39,12 @@ class EnhancedRAGService:
         self.logger = logger
     
     async def initialize(self, database_url: str):
-        """Initialize the RAG service with database connection"""
-        self.connection_pool = await asyncpg.create_pool(database_url)
+        """Initialize the RAG service with database connection
+        
+        Every pooled connection registers the pgvector codec, so embeddings are
+        passed to and read from ``vector`` columns as plain lists.
+        """
+        self.connection_pool = await asyncpg.create_pool(database_url, init=register_vector)
     
     async def ingest_document(
         self,
@@ -48,6 +56,11 @@ class EnhancedRAGService:
     ) -> Dict[str, Any]:
         """Ingest a document into the RAG pipeline"""
         
+        if (processing_options or {}).get("streaming"):
+            return await self.ingest_document_stream(
+                pipeline_id, file_path, filename, metadata, processing_options
+            )
+        
         try:
             # Extract text from document
             text_content = await self._extract_text_from_file(file_path, filename)
@@ -80,6 +93,112 @@ class EnhancedRAGService:
                 "message": str(e)
             }
     
+    async def ingest_document_stream(
+        self,
+        pipeline_id: str,
+        file_path: str,
+        filename: str,
+        metadata: Dict[str, Any] = None,
+        processing_options: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Ingest a document chunk-as-you-go.
+        
+        Text is extracted in page windows (PDF) or blocks (text files). Chunks
+        are collected into batches of ``STREAMING_EMBED_BATCH_SIZE``, each
+        embedded in one call and stored with one bulk insert, so memory stays
+        bounded by the window and batch instead of the document size. A batch
+        that fails is skipped and reported: the result is ``partial`` when some
+        chunks were stored and ``error`` when none were.
+        """
+        
+        options = processing_options or {}
+        batch_size = max(get_settings().STREAMING_EMBED_BATCH_SIZE, 1)
+        
+        try:
+            pipeline_config = await self._get_pipeline_config(pipeline_id)
+            chunking_config = pipeline_config.get("chunking_strategy", {})
+            embedding_config = pipeline_config.get("vectorization_config", {})
+            embedding_model = embedding_config.get("embedding_model", "text-embedding-3-small")
+            
+            base_metadata = {
+                **(metadata or {}),
+                "filename": filename,
+                "file_path": file_path,
+                "ingestion_date": datetime.utcnow().isoformat(),
+                "embedding_model": embedding_model
+            }
+            
+            content_length = 0
+            
+            async def preprocessed_blocks() -> AsyncIterator[str]:
+                nonlocal content_length
+                tail = ""
+                async for raw in self._iter_file_text(file_path, filename):
+                    content_length += len(raw)
+                    text, tail = self._split_partial_word(tail + raw)
+                    block = self._preprocess_text(text, options)
+                    if block:
+                        yield block
+                block = self._preprocess_text(tail, options)
+                if block:
+                    yield block
+            
+            chunk_index = 0
+            stored_chunks = 0
+            errors: List[str] = []
+            batch: List[str] = []
+            
+            async def flush() -> None:
+                nonlocal stored_chunks
+                first_index = chunk_index - len(batch)
+                try:
+                    embeddings = await self._generate_embeddings(batch, embedding_model)
+                    await self._store_chunks(pipeline_id, [
+                        (chunk, embedding, {**base_metadata, "chunk_index": first_index + i})
+                        for i, (chunk, embedding) in enumerate(zip(batch, embeddings))
+                    ])
+                    stored_chunks += len(batch)
+                except Exception as e:
+                    self.logger.error(f"Error processing chunks {first_index}-{chunk_index - 1}: {e}")
+                    errors.append(f"chunks {first_index}-{chunk_index - 1}: {e}")
+                batch.clear()
+            
+            async for chunk in self._iter_chunks(preprocessed_blocks(), chunking_config):
+                batch.append(chunk)
+                chunk_index += 1
+                if len(batch) >= batch_size:
+                    await flush()
+            if batch:
+                await flush()
+            
+            if chunk_index == 0:
+                return {
+                    "status": "error",
+                    "message": "No text content extracted from document"
+                }
+            
+            result = {
+                "status": "success",
+                "content_length": content_length,
+                "chunks_created": stored_chunks,
+                "chunks_failed": chunk_index - stored_chunks,
+                "embedding_model": embedding_model,
+                "pipeline_id": pipeline_id,
+                "streamed": True
+            }
+            if errors:
+                result["status"] = "partial" if stored_chunks else "error"
+                result["message"] = f"{chunk_index - stored_chunks} of {chunk_index} chunks failed"
+                result["errors"] = errors
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Error streaming document {filename}: {e}")
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+    
     async def ingest_text(
         self,
         pipeline_id: str,
@@ -152,33 +271,58 @@ class EnhancedRAGService:
         pipeline_id: str,
         query: str,
         k: int = 5,
-        filters: Dict[str, Any] = None
+        filters: Dict[str, Any] = None,
+        search_mode: str = "vector",
+        hybrid_weight: float = 0.5
     ) -> Dict[str, Any]:
-        """Search for relevant documents in the pipeline"""
+        """Search for relevant documents in the pipeline.
+        
+        ``search_mode`` is "vector", "lexical" (full-text) or "hybrid", which runs
+        both concurrently and fuses them with reciprocal-rank fusion;
+        ``hybrid_weight`` is the vector share of the fused score.
+        """
         
         try:
             # Get pipeline configuration
             pipeline_config = await self._get_pipeline_config(pipeline_id)
-            
-            # Generate query embedding
             embedding_config = pipeline_config.get("vectorization_config", {})
             embedding_model = embedding_config.get("embedding_model", "text-embedding-3-small")
-            query_embedding = await self._generate_embedding(query, embedding_model)
             
-            # Perform vector search
-            results = await self._vector_search(
-                pipeline_id=pipeline_id,
-                query_embedding=query_embedding,
-                k=k,
-                filters=filters or {}
-            )
+            async def vector_results(limit: int) -> List[Dict[str, Any]]:
+                query_embedding = await get_embedding_cache().get_or_compute(
+                    embedding_model, query, lambda: self._generate_embedding(query, embedding_model)
+                )
+                return await self._vector_search(
+                    pipeline_id=pipeline_id,
+                    query_embedding=query_embedding,
+                    k=limit,
+                    filters=filters or {}
+                )
+            
+            if search_mode == "lexical":
+                results = await self._lexical_search(pipeline_id, query, k)
+            elif search_mode == "hybrid":
+                candidates = k * get_settings().HYBRID_CANDIDATE_MULTIPLIER
+                vector_rows, lexical_rows = await asyncio.gather(
+                    vector_results(candidates),
+                    self._lexical_search(pipeline_id, query, candidates)
+                )
+                results = reciprocal_rank_fusion(
+                    [vector_rows, lexical_rows],
+                    [hybrid_weight, 1.0 - hybrid_weight],
+                    limit=k,
+                    key="id"
+                )
+            else:
+                results = await vector_results(k)
             
             return {
                 "status": "success",
                 "query": query,
                 "results": results,
                 "total_results": len(results),
-                "embedding_model": embedding_model
+                "embedding_model": embedding_model,
+                "search_mode": search_mode
             }
             
         except Exception as e:
@@ -536,26 +680,14 @@ class EnhancedRAGService:
             raise
     
     async def _extract_pdf_text(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        
-        reader = pypdf.PdfReader(file_path)
-        text = ""
+        """Extract text from PDF file in the extraction worker pool"""
         
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        
-        return text.strip()
+        return await get_extraction_pool().extract_pdf_text(file_path)
     
     async def _extract_docx_text(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
-        
-        doc = DocxDocument(file_path)
-        text = ""
+        """Extract text from DOCX file in the extraction worker pool"""
         
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        
-        return text.strip()
+        return await get_extraction_pool().extract_docx_text(file_path)
     
     async def _extract_txt_text(self, file_path: str) -> str:
         """Extract text from text file with encoding detection"""
@@ -570,6 +702,82 @@ class EnhancedRAGService:
         async with aiofiles.open(file_path, 'r', encoding=encoding) as f:
             return await f.read()
     
+    async def _iter_file_text(self, file_path: str, filename: str) -> AsyncIterator[str]:
+        """Yield a file's text incrementally: PDFs in page windows, text in blocks"""
+        
+        file_ext = Path(filename).suffix.lower()
+        settings = get_settings()
+        
+        if file_ext == ".pdf":
+            async for page_text in get_extraction_pool().iter_pdf_pages(file_path, window=settings.PDF_PAGE_WINDOW):
+                yield page_text + "\n"
+        elif file_ext in [".docx", ".doc"]:
+            # python-docx always loads the whole package; only chunking streams
+            yield await self._extract_docx_text(file_path)
+        else:
+            decoder = None
+            async with aiofiles.open(file_path, 'rb') as f:
+                while True:
+                    block = await f.read(settings.UPLOAD_BLOCK_SIZE)
+                    if not block:
+                        break
+                    if decoder is None:
+                        # Detect the encoding from the first block only
+                        encoding = chardet.detect(block)['encoding'] or 'utf-8'
+                        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                    yield decoder.decode(block)
+            if decoder is not None:
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    yield tail
+    
+    async def _iter_chunks(self, blocks: AsyncIterator[str], chunking_config: Dict[str, Any]) -> AsyncIterator[str]:
+        """Streaming counterpart of ``_create_chunks``.
+        
+        Text is buffered until several chunks' worth is available; all chunks but
+        the last are emitted and the last is carried over, so chunk boundaries
+        follow the configured method just as in whole-text chunking. Blocks
+        must end between words; they are joined with a space unless one side
+        already has whitespace at the seam.
+        """
+        
+        chunk_size = chunking_config.get("chunk_size", 1000)
+        flush_size = chunk_size * 8
+        buffer = ""
+        
+        async for block in blocks:
+            if not buffer or buffer[-1].isspace() or block[0].isspace():
+                buffer += block
+            else:
+                buffer = f"{buffer} {block}"
+            if len(buffer) < flush_size:
+                continue
+            chunks = self._create_chunks(buffer, chunking_config)
+            if len(chunks) < 2:
+                continue
+            for chunk in chunks[:-1]:
+                yield chunk
+            buffer = chunks[-1]
+        
+        if buffer:
+            for chunk in self._create_chunks(buffer, chunking_config):
+                yield chunk
+    
+    def _split_partial_word(self, text: str) -> tuple:
+        """Split raw text before its trailing partial word.
+        
+        Extraction blocks end at arbitrary byte offsets, so the last word may
+        continue in the next block and is carried over. Text without any
+        whitespace is only held back up to ``UPLOAD_BLOCK_SIZE`` characters.
+        """
+        
+        cut = len(text)
+        while cut and not text[cut - 1].isspace():
+            cut -= 1
+        if cut == 0 and len(text) > get_settings().UPLOAD_BLOCK_SIZE:
+            return text, ""
+        return text[:cut], text[cut:]
+    
     def _preprocess_text(self, content: str, options: Dict[str, Any]) -> str:
         """Preprocess text content"""
         
@@ -684,8 +892,8 @@ class EnhancedRAGService:
         """Generate embedding for text using specified model"""
         
         if model_name.startswith("text-embedding"):
-            # OpenAI models
-            client = openai.AsyncOpenAI()
+            # OpenAI models, through the shared client and connection pool
+            client = get_model_client_registry().get_openai_client()
             response = await client.embeddings.create(
                 model=model_name,
                 input=text
@@ -693,9 +901,9 @@ class EnhancedRAGService:
             return response.data[0].embedding
         
         elif model_name.startswith("sentence-transformers"):
-            # Sentence Transformers models
+            # Sentence Transformers models, loaded once per process
             if model_name not in self.embedding_models:
-                self.embedding_models[model_name] = SentenceTransformer(model_name)
+                self.embedding_models[model_name] = get_model_client_registry().get_sentence_transformer(model_name)
             
             model = self.embedding_models[model_name]
             embedding = model.encode(text)
@@ -704,6 +912,57 @@ class EnhancedRAGService:
         else:
             raise ValueError(f"Unsupported embedding model: {model_name}")
     
+    async def _generate_embeddings(self, texts: List[str], model_name: str) -> List[List[float]]:
+        """Embed several texts with one provider call"""
+        
+        if model_name.startswith("text-embedding"):
+            client = get_model_client_registry().get_openai_client()
+            response = await client.embeddings.create(
+                model=model_name,
+                input=texts
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        
+        elif model_name.startswith("sentence-transformers"):
+            if model_name not in self.embedding_models:
+                self.embedding_models[model_name] = get_model_client_registry().get_sentence_transformer(model_name)
+            
+            return self.embedding_models[model_name].encode(texts).tolist()
+        
+        else:
+            raise ValueError(f"Unsupported embedding model: {model_name}")
+    
+    async def _store_chunks(
+        self,
+        pipeline_id: str,
+        chunks: List[tuple],
+        collection_name: str = "default"
+    ):
+        """Store ``(content, embedding, metadata)`` rows in one transaction with a single executemany"""
+        
+        namespace = f"{pipeline_id}_{collection_name}"
+        now = datetime.utcnow()
+        batch_id = int(time.time() * 1000)
+        
+        async with self.connection_pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany("""
+                    INSERT INTO document_embeddings 
+                    (document_id, content, embedding, metadata, namespace, created_at, updated_at)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7)
+                """, [
+                    (
+                        f"{pipeline_id}_{batch_id}_{metadata.get('chunk_index', i)}",
+                        content,
+                        embedding,
+                        json.dumps(metadata),
+                        namespace,
+                        now,
+                        now
+                    )
+                    for i, (content, embedding, metadata) in enumerate(chunks)
+                ])
+    
     async def _store_chunk(
         self,
         pipeline_id: str,
@@ -746,6 +1005,7 @@ class EnhancedRAGService:
             # Use cosine similarity for search
             results = await conn.fetch("""
                 SELECT 
+                    id,
                     document_id,
                     content,
                     metadata,
@@ -759,6 +1019,7 @@ class EnhancedRAGService:
         search_results = []
         for row in results:
             result = {
+                "id": row["id"],
                 "document_id": row["document_id"],
                 "content": row["content"],
                 "similarity": float(row["similarity"]),
@@ -768,6 +1029,36 @@ class EnhancedRAGService:
         
         return search_results
     
+    async def _lexical_search(self, pipeline_id: str, query: str, k: int) -> List[Dict[str, Any]]:
+        """Full-text search over the GIN-indexed content_tsv column"""
+        
+        namespace_pattern = f"{pipeline_id}_%"
+        
+        async with self.connection_pool.acquire() as conn:
+            results = await conn.fetch("""
+                SELECT 
+                    id,
+                    document_id,
+                    content,
+                    metadata,
+                    ts_rank_cd(content_tsv, q) as lexical_rank
+                FROM document_embeddings, websearch_to_tsquery($1::regconfig, $2) q
+                WHERE namespace LIKE $3 AND content_tsv @@ q
+                ORDER BY lexical_rank DESC
+                LIMIT $4
+            """, get_settings().TEXT_SEARCH_CONFIG, query, namespace_pattern, k)
+        
+        return [
+            {
+                "id": row["id"],
+                "document_id": row["document_id"],
+                "content": row["content"],
+                "lexical_rank": float(row["lexical_rank"]),
+                "metadata": json.loads(row["metadata"]) if row["metadata"] else {}
+            }
+            for row in results
+        ]
+    
     async def _get_pipeline_config(self, pipeline_id: str) -> Dict[str, Any]:
         """Get pipeline configuration from database"""
         
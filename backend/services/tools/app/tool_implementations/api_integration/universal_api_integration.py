@@ -8,13 +8,13 @@ import aiohttp
 import json
 import logging
 import time
-from typing import Dict, Any, List, Optional, Union, Callable
+from typing import Dict, Any, AsyncIterator, List, Optional, Union, Callable
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 import hashlib
 import hmac
 import base64
-from urllib.parse import urlencode, urlparse
+from urllib.parse import urlparse
 import jwt
 
 # Data transformation
@@ -24,6 +24,8 @@ import jsonpath_ng
 # OAuth and authentication
 import requests_oauthlib
 
+from app.services.http_response_cache import get_http_response_cache, make_key
+
 logger = logging.getLogger(__name__)
 
 class UniversalAPIIntegration:
@@ -52,12 +54,15 @@ class UniversalAPIIntegration:
         # Session for connection pooling
         self.session = None
         
-        # Rate limiting tracking
+        # Rate limiting tracking (the lock serializes slot reservations across concurrent requests)
         self.request_times = []
+        self._rate_limit_lock = asyncio.Lock()
         
-        # Cache for responses
-        self.response_cache = {}
+        # GET responses go through the process-wide HTTP cache; cache_ttl is the
+        # freshness used when the API sends no Cache-Control max-age (0 disables caching)
+        self.response_cache = get_http_response_cache()
         self.cache_ttl = config.get("cache_ttl", 300)  # 5 minutes
+        self.cache_stats = {"hit": 0, "coalesced": 0, "revalidated": 0, "miss": 0}
         
         logger.info(f"Initialized API Integration for {self.base_url}")
     
@@ -90,7 +95,8 @@ class UniversalAPIIntegration:
                           data: Dict[str, Any] = None,
                           params: Dict[str, Any] = None,
                           headers: Dict[str, str] = None,
-                          transform_config: Dict[str, Any] = None) -> Dict[str, Any]:
+                          transform_config: Dict[str, Any] = None,
+                          use_cache: bool = True) -> Dict[str, Any]:
         """
         Make an API request with authentication, retries, and transformation
         
@@ -101,6 +107,7 @@ class UniversalAPIIntegration:
             params: Query parameters
             headers: Additional headers
             transform_config: Data transformation configuration
+            use_cache: Serve GETs from the shared response cache
             
         Returns:
             Dictionary with response data and metadata
@@ -109,35 +116,35 @@ class UniversalAPIIntegration:
             # Construct full URL
             url = self._build_url(endpoint)
             
-            # Apply rate limiting
-            await self._apply_rate_limiting()
-            
             # Prepare headers with authentication
             request_headers = await self._prepare_headers(headers or {})
             
-            # Check cache for GET requests
-            if method.upper() == "GET":
-                cache_key = self._generate_cache_key(url, params)
-                cached_response = self._get_cached_response(cache_key)
-                if cached_response:
-                    return cached_response
+            async def fetch(conditional_headers: Dict[str, str]) -> Dict[str, Any]:
+                # Only upstream calls count against the rate limit, not cache hits
+                await self._apply_rate_limiting()
+                return await self._make_request_with_retries(
+                    method, url, data, params, {**request_headers, **conditional_headers}
+                )
             
-            # Make request with retries
-            response_data = await self._make_request_with_retries(
-                method, url, data, params, request_headers
-            )
+            # GET responses are served from the shared cache; concurrent identical
+            # GETs wait on one upstream call
+            if use_cache and method.upper() == "GET" and data is None and self.cache_ttl > 0:
+                cache_key = self._generate_cache_key(url, params, request_headers)
+                response_data, cache_status = await self.response_cache.get_or_fetch(
+                    cache_key, fetch, self.cache_ttl
+                )
+            else:
+                response_data, cache_status = await fetch({}), None
             
-            # Transform response if configured
+            if cache_status:
+                self.cache_stats[cache_status] += 1
+            
+            # Transform response if configured (cached entries hold the raw body)
             if transform_config:
                 response_data["data"] = await self._transform_response(
                     response_data["data"], transform_config
                 )
             
-            # Cache successful GET responses
-            if method.upper() == "GET" and response_data["status_code"] == 200:
-                cache_key = self._generate_cache_key(url, params)
-                self._cache_response(cache_key, response_data)
-            
             return {
                 "status": "success",
                 "method": method,
@@ -146,7 +153,8 @@ class UniversalAPIIntegration:
                 "metadata": {
                     "request_time": datetime.now().isoformat(),
                     "response_time": response_data.get("response_time"),
-                    "cached": False
+                    "cached": cache_status in ("hit", "coalesced", "revalidated"),
+                    "cache_status": cache_status
                 }
             }
             
@@ -219,65 +227,22 @@ class UniversalAPIIntegration:
         """
         try:
             all_data = []
-            pagination_type = pagination_config.get("type", "page")
-            max_pages = pagination_config.get("max_pages", 10)
-            page_param = pagination_config.get("page_param", "page")
-            size_param = pagination_config.get("size_param", "limit")
-            page_size = pagination_config.get("page_size", 100)
+            total_pages = 0
             
-            current_page = pagination_config.get("start_page", 1)
-            
-            while current_page <= max_pages:
-                # Prepare pagination parameters
-                params = kwargs.get("params", {}).copy()
-                
-                if pagination_type == "page":
-                    params[page_param] = current_page
-                    params[size_param] = page_size
-                elif pagination_type == "offset":
-                    params["offset"] = (current_page - 1) * page_size
-                    params["limit"] = page_size
-                
-                # Make request
-                response = await self.make_request(
-                    method, endpoint, params=params, **{k: v for k, v in kwargs.items() if k != "params"}
-                )
-                
-                if response["status"] != "success":
-                    break
-                
-                response_data = response["response"]["data"]
-                
-                # Extract data based on configuration
-                data_path = pagination_config.get("data_path", "data")
-                if data_path:
-                    page_data = self._extract_nested_value(response_data, data_path)
-                else:
-                    page_data = response_data
-                
+            async for page_data in self._iter_pages(method, endpoint, pagination_config, **kwargs):
+                total_pages += 1
                 if isinstance(page_data, list):
                     all_data.extend(page_data)
-                    
-                    # Check if we have more pages
-                    if len(page_data) < page_size:
-                        break
                 else:
                     all_data.append(page_data)
-                
-                # Check for next page indicators
-                has_next = self._check_has_next_page(response_data, pagination_config)
-                if not has_next:
-                    break
-                
-                current_page += 1
             
             return {
                 "status": "success",
                 "data": all_data,
                 "metadata": {
-                    "total_pages": current_page - 1,
+                    "total_pages": total_pages,
                     "total_items": len(all_data),
-                    "pagination_type": pagination_type
+                    "pagination_type": pagination_config.get("type", "page")
                 }
             }
             
@@ -288,6 +253,34 @@ class UniversalAPIIntegration:
                 "error": str(e)
             }
     
+    async def paginated_stream(self, 
+                               method: str, 
+                               endpoint: str,
+                               pagination_config: Dict[str, Any],
+                               **kwargs) -> AsyncIterator[Any]:
+        """
+        Stream items from a paginated API as pages arrive
+        
+        Takes the same configuration as ``paginated_request`` but yields items
+        one at a time instead of collecting them, so callers can start work
+        before the last page is fetched and never hold the full result.
+        
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            pagination_config: Pagination configuration
+            **kwargs: Additional request parameters
+            
+        Yields:
+            Items from each page, in page order
+        """
+        async for page_data in self._iter_pages(method, endpoint, pagination_config, **kwargs):
+            if isinstance(page_data, list):
+                for item in page_data:
+                    yield item
+            else:
+                yield page_data
+    
     async def webhook_handler(self, webhook_config: Dict[str, Any]) -> Callable:
         """
         Create a webhook handler for receiving API callbacks
@@ -342,7 +335,7 @@ class UniversalAPIIntegration:
             health_endpoint = self.config.get("health_endpoint", "/health")
             
             start_time = time.time()
-            response = await self.make_request("GET", health_endpoint)
+            response = await self.make_request("GET", health_endpoint, use_cache=False)
             response_time = time.time() - start_time
             
             is_healthy = response["status"] == "success" and response["response"]["status_code"] == 200
@@ -360,6 +353,7 @@ class UniversalAPIIntegration:
                     "api_status": response.get("response", {}).get("status_code"),
                     "rate_limit_usage": rate_limit_usage,
                     "cache_hit_rate": self._calculate_cache_hit_rate(),
+                    "cache": self.response_cache.get_stats(),
                     "last_check": datetime.now().isoformat()
                 }
             }
@@ -420,6 +414,9 @@ class UniversalAPIIntegration:
         
         for attempt in range(self.max_retries + 1):
             try:
+                # The first attempt was admitted by the caller; retries take their own slot
+                if attempt:
+                    await self._apply_rate_limiting()
                 start_time = time.time()
                 
                 # Prepare request data
@@ -438,9 +435,6 @@ class UniversalAPIIntegration:
                 async with self.session.request(method, url, **request_kwargs) as response:
                     response_time = time.time() - start_time
                     
-                    # Track request time for rate limiting
-                    self.request_times.append(time.time())
-                    
                     # Read response content
                     content_type = response.headers.get("Content-Type", "")
                     
@@ -536,39 +530,24 @@ class UniversalAPIIntegration:
         return transformed
     
     async def _apply_rate_limiting(self):
-        """Apply rate limiting to requests"""
-        current_time = time.time()
-        
-        # Remove old request times
-        self.request_times = [t for t in self.request_times if current_time - t < self.rate_limit_window]
-        
-        # Check if we're at the rate limit
-        if len(self.request_times) >= self.rate_limit:
-            sleep_time = self.rate_limit_window - (current_time - self.request_times[0])
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
-    
-    def _generate_cache_key(self, url: str, params: Dict[str, Any] = None) -> str:
-        """Generate cache key for request"""
-        cache_string = url
-        if params:
-            cache_string += "?" + urlencode(sorted(params.items()))
-        return hashlib.md5(cache_string.encode()).hexdigest()
-    
-    def _get_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Get cached response if available and not expired"""
-        if cache_key in self.response_cache:
-            cached_data, timestamp = self.response_cache[cache_key]
-            if time.time() - timestamp < self.cache_ttl:
-                cached_data["metadata"]["cached"] = True
-                return cached_data
-            else:
-                del self.response_cache[cache_key]
-        return None
+        """Wait for a free slot in the rate limit window and reserve it"""
+        async with self._rate_limit_lock:
+            while True:
+                current_time = time.time()
+                
+                # Remove old request times
+                self.request_times = [t for t in self.request_times if current_time - t < self.rate_limit_window]
+                
+                # Check if we're at the rate limit
+                if len(self.request_times) < self.rate_limit:
+                    break
+                await asyncio.sleep(self.rate_limit_window - (current_time - self.request_times[0]))
+            
+            self.request_times.append(current_time)
     
-    def _cache_response(self, cache_key: str, response_data: Dict[str, Any]):
-        """Cache response data"""
-        self.response_cache[cache_key] = (response_data, time.time())
+    def _generate_cache_key(self, url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> str:
+        """Generate cache key for request (headers included so credentials never share entries)"""
+        return make_key(url, params, headers or {})
     
     def _extract_nested_value(self, data: Any, path: str) -> Any:
         """Extract nested value using dot notation"""
@@ -589,6 +568,152 @@ class UniversalAPIIntegration:
         
         return current
     
+    async def _iter_pages(self,
+                          method: str,
+                          endpoint: str,
+                          pagination_config: Dict[str, Any],
+                          **kwargs) -> AsyncIterator[Any]:
+        """
+        Yield each page's data in order.
+        
+        Page and offset pagination fetch up to ``prefetch_pages`` pages ahead
+        once the last page is known, either from ``total_pages``/``total_items``
+        in the config or from ``total_pages_path``/``total_items_path`` in the
+        first response. Without a known total, and for cursor pagination, the
+        next page is fetched while the caller handles the current one. Every
+        request still passes through the rate limiter.
+        """
+        pagination_type = pagination_config.get("type", "page")
+        max_pages = pagination_config.get("max_pages", 10)
+        page_size = pagination_config.get("page_size", 100)
+        prefetch_pages = max(pagination_config.get("prefetch_pages", 4), 0)
+        request_kwargs = {k: v for k, v in kwargs.items() if k != "params"}
+        base_params = kwargs.get("params") or {}
+        
+        if pagination_type == "cursor":
+            cursor_param = pagination_config.get("cursor_param", "cursor")
+            cursor_path = pagination_config.get("cursor_path", "next_cursor")
+            size_param = pagination_config.get("size_param", "limit")
+            
+            def fetch_cursor(cursor: Optional[str]) -> asyncio.Task:
+                params = {**base_params, size_param: page_size}
+                if cursor:
+                    params[cursor_param] = cursor
+                return asyncio.ensure_future(
+                    self.make_request(method, endpoint, params=params, **request_kwargs)
+                )
+            
+            pending = fetch_cursor(pagination_config.get("start_cursor"))
+            try:
+                for page_number in range(1, max_pages + 1):
+                    response = await pending
+                    pending = None
+                    if response["status"] != "success":
+                        logger.warning(f"Stopping pagination at page {page_number}: {response.get('error')}")
+                        return
+                    
+                    response_data = response["response"]["data"]
+                    cursor = self._extract_nested_value(response_data, cursor_path)
+                    has_next = (
+                        bool(cursor)
+                        and page_number < max_pages
+                        and self._check_has_next_page(response_data, pagination_config)
+                    )
+                    if has_next:
+                        pending = fetch_cursor(cursor)
+                    
+                    yield self._extract_page_data(response_data, pagination_config)
+                    if not has_next:
+                        return
+            finally:
+                if pending is not None:
+                    pending.cancel()
+            return
+        
+        page_param = pagination_config.get("page_param", "page")
+        offset_param = pagination_config.get("offset_param", "offset")
+        size_param = pagination_config.get("size_param", "limit")
+        
+        def fetch_page(page: int) -> asyncio.Task:
+            params = dict(base_params)
+            if pagination_type == "page":
+                params[page_param] = page
+            elif pagination_type == "offset":
+                params[offset_param] = (page - 1) * page_size
+            params[size_param] = page_size
+            return asyncio.ensure_future(
+                self.make_request(method, endpoint, params=params, **request_kwargs)
+            )
+        
+        current_page = pagination_config.get("start_page", 1)
+        last_page = max_pages
+        known_last_page = self._last_page(
+            pagination_config.get("total_pages"), pagination_config.get("total_items"), page_size
+        )
+        if known_last_page is not None:
+            last_page = min(last_page, known_last_page)
+        pending: Dict[int, asyncio.Task] = {}
+        
+        def schedule(through_page: int) -> None:
+            for page in range(current_page, min(through_page, last_page) + 1):
+                if page not in pending:
+                    pending[page] = fetch_page(page)
+        
+        try:
+            schedule(current_page)
+            while current_page <= last_page:
+                response = await pending.pop(current_page)
+                if response["status"] != "success":
+                    logger.warning(f"Stopping pagination at page {current_page}: {response.get('error')}")
+                    return
+                
+                response_data = response["response"]["data"]
+                page_data = self._extract_page_data(response_data, pagination_config)
+                
+                if known_last_page is None:
+                    total_pages_path = pagination_config.get("total_pages_path")
+                    total_items_path = pagination_config.get("total_items_path")
+                    known_last_page = self._last_page(
+                        self._extract_nested_value(response_data, total_pages_path) if total_pages_path else None,
+                        self._extract_nested_value(response_data, total_items_path) if total_items_path else None,
+                        page_size
+                    )
+                    if known_last_page is not None:
+                        last_page = min(last_page, known_last_page)
+                
+                has_next = (
+                    current_page < last_page
+                    and not (isinstance(page_data, list) and len(page_data) < page_size)
+                    and self._check_has_next_page(response_data, pagination_config)
+                )
+                if not has_next:
+                    yield page_data
+                    return
+                
+                current_page += 1
+                # Only run ahead once the end is known, so no request is wasted past it
+                schedule(current_page + (prefetch_pages if known_last_page is not None else 0))
+                yield page_data
+        finally:
+            for task in pending.values():
+                task.cancel()
+    
+    def _last_page(self, total_pages: Any, total_items: Any, page_size: int) -> Optional[int]:
+        """Last page number from a total page or item count, if either is usable"""
+        for total, per_page in ((total_pages, 1), (total_items, page_size)):
+            try:
+                return -(-int(total) // per_page)
+            except (TypeError, ValueError):
+                continue
+        return None
+    
+    def _extract_page_data(self, response_data: Any, pagination_config: Dict[str, Any]) -> Any:
+        """Items of one page, found at ``data_path`` in the response"""
+        data_path = pagination_config.get("data_path", "data")
+        if data_path:
+            return self._extract_nested_value(response_data, data_path)
+        return response_data
+    
     def _check_has_next_page(self, response_data: Dict[str, Any], pagination_config: Dict[str, Any]) -> bool:
         """Check if there are more pages available"""
         next_page_indicator = pagination_config.get("next_page_indicator")
@@ -648,7 +773,7 @@ class UniversalAPIIntegration:
         """Test authentication configuration"""
         test_endpoint = self.auth_config.get("test_endpoint", "/")
         try:
-            response = await self.make_request("GET", test_endpoint)
+            response = await self.make_request("GET", test_endpoint, use_cache=False)
             if response["status"] != "success":
                 raise Exception(f"Authentication test failed: {response.get('error')}")
             logger.info("Authentication test passed")
@@ -688,9 +813,11 @@ class UniversalAPIIntegration:
         }
     
     def _calculate_cache_hit_rate(self) -> float:
-        """Calculate cache hit rate"""
-        # This would track cache hits/misses for statistics
-        return 0.0  # Placeholder
+        """Share of this integration's cacheable GETs served without downloading a body"""
+        lookups = sum(self.cache_stats.values())
+        if not lookups:
+            return 0.0
+        return (lookups - self.cache_stats["miss"]) / lookups
     
     async def cleanup(self):
         """Cleanup resources"""
@@ -755,7 +882,7 @@ TOOL_CONFIG_SCHEMA = {
             "minimum": 0,
             "maximum": 3600,
             "default": 300,
-            "description": "Cache TTL in seconds"
+            "description": "Cache TTL in seconds when the API sends no Cache-Control max-age (0 disables caching)"
         }
     },
     "required": ["base_url"]
@@ -801,7 +928,7 @@ INPUT_SCHEMA = {
         },
         "pagination_config": {
             "type": "object",
-            "description": "Pagination configuration"
+            "description": "Pagination configuration: type (page, offset or cursor), page_size, max_pages, data_path, next_page_indicator, prefetch_pages, total_pages/total_items or their *_path lookups, cursor_param/cursor_path"
         }
     },
     "required": ["operation"]
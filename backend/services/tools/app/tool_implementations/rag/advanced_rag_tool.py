@@ -10,8 +10,6 @@ import logging
 from datetime import datetime
 
 # Document processing
-import pypdf
-from docx import Document as DocxDocument
 import chardet
 
 # Vector storage and embeddings
@@ -24,6 +22,8 @@ import re
 import unicodedata
 from pathlib import Path
 
+from app.services.document_extraction import get_extraction_pool
+
 logger = logging.getLogger(__name__)
 
 class AdvancedRAGTool:
@@ -235,35 +235,15 @@ class AdvancedRAGTool:
         file_ext = Path(file_path).suffix.lower()
         
         if file_ext == ".pdf":
-            return self._extract_pdf_text(file_path)
+            return await get_extraction_pool().extract_pdf_text(file_path)
         elif file_ext in [".docx", ".doc"]:
-            return self._extract_docx_text(file_path)
+            return await get_extraction_pool().extract_docx_text(file_path)
         elif file_ext == ".txt":
             return self._extract_txt_text(file_path)
         else:
             # Try to read as text
             return self._extract_txt_text(file_path)
     
-    def _extract_pdf_text(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        reader = pypdf.PdfReader(file_path)
-        text = ""
-        
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        
-        return text.strip()
-    
-    def _extract_docx_text(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
-        doc = DocxDocument(file_path)
-        text = ""
-        
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        
-        return text.strip()
-    
     def _extract_txt_text(self, file_path: str) -> str:
         """Extract text from text file with encoding detection"""
         # Detect encoding
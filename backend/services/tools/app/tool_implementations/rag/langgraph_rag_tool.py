@@ -26,7 +26,7 @@ try:
 except ImportError:
     LANGGRAPH_AVAILABLE = False
     
-from ...services.enhanced_rag_service_v2 import EnhancedRAGServiceV2
+from app.services.enhanced_rag_service_v2 import EnhancedRAGServiceV2
 
 logger = logging.getLogger(__name__)
 
@@ -5,6 +5,7 @@ Advanced RAG system with PostgreSQL vector database integration using pgvector
 
 import asyncio
 import asyncpg
+import importlib.util
 import json
 import logging
 import time
@@ -16,13 +17,8 @@ import hashlib
 import aiofiles
 import tempfile
 
-# Document processing
-try:
-    from docling.document_converter import DocumentConverter
-    from docling.datamodel.pipeline_options import PdfPipelineOptions
-    DOCLING_AVAILABLE = True
-except ImportError:
-    DOCLING_AVAILABLE = False
+# Document processing (Docling itself is imported by the extraction pool workers)
+DOCLING_AVAILABLE = importlib.util.find_spec("docling") is not None
 
 # Vector and embedding support
 import numpy as np
@@ -38,6 +34,11 @@ from langchain.text_splitter import (
 )
 from langchain.embeddings import OpenAIEmbeddings, HuggingFaceEmbeddings
 
+from app.services.embedding_cache import get_embedding_cache
+from app.services.document_extraction import get_extraction_pool
+from app.services.hybrid_search import ensure_text_search_column, reciprocal_rank_fusion
+from app.core.config import get_settings
+
 logger = logging.getLogger(__name__)
 
 class PostgresEnhancedRAGTool:
@@ -70,23 +71,16 @@ class PostgresEnhancedRAGTool:
         # Initialize components
         self.connection_pool = None
         self.embedding_model_instance = None
-        self.document_converter = None
         self.text_splitter = None
         
-        if DOCLING_AVAILABLE and self.use_docling:
-            self.document_converter = DocumentConverter()
-        
         logger.info(f"Initialized PostgreSQL RAG tool with embedding model: {self.embedding_model}")
     
     async def initialize(self):
         """Initialize database connection and embedding model"""
         try:
-            # Create connection pool
-            self.connection_pool = await asyncpg.create_pool(self.database_url)
-            
-            # Register pgvector types
-            async with self.connection_pool.acquire() as conn:
-                await register_vector(conn)
+            # Create connection pool; pgvector types are registered on every
+            # connection since searches may run on several at once
+            self.connection_pool = await asyncpg.create_pool(self.database_url, init=register_vector)
             
             # Initialize embedding model
             await self._initialize_embedding_model()
@@ -190,6 +184,9 @@ class PostgresEnhancedRAGTool:
                 ON {self.table_name} USING gin (metadata)
             """)
             
+            # Full-text column and GIN index for hybrid retrieval
+            await ensure_text_search_column(conn, self.table_name)
+            
             # Create table for document metadata
             await conn.execute(f"""
                 CREATE TABLE IF NOT EXISTS {self.table_name}_metadata (
@@ -277,17 +274,13 @@ class PostgresEnhancedRAGTool:
     async def _process_with_docling(self, file_path: str, document_id: str) -> Dict[str, Any]:
         """Process document using Docling for advanced extraction"""
         try:
-            # Configure Docling pipeline
-            pipeline_options = PdfPipelineOptions()
-            pipeline_options.do_ocr = True
-            pipeline_options.do_table_structure = self.extract_tables
-            pipeline_options.table_structure_options.do_cell_matching = True
-            
-            # Convert document
-            result = self.document_converter.convert(file_path, pipeline_options=pipeline_options)
+            # Convert document in the extraction worker pool
+            result = await get_extraction_pool().convert_with_docling(
+                file_path, self.extract_tables, self.extract_images
+            )
             
             # Extract main content
-            main_text = result.document.export_to_text()
+            main_text = result["main_text"]
             chunks_created = 0
             tables_extracted = 0
             images_extracted = 0
@@ -307,8 +300,8 @@ class PostgresEnhancedRAGTool:
             
             # Process tables if enabled
             if self.extract_tables:
-                for table_idx, table in enumerate(result.document.tables):
-                    table_content = table.export_to_text()
+                for table_idx, table in enumerate(result["tables"]):
+                    table_content = table["content"]
                     if table_content.strip():
                         await self._store_chunk(
                             document_id=document_id,
@@ -318,7 +311,7 @@ class PostgresEnhancedRAGTool:
                             metadata={
                                 "source": "table_extraction",
                                 "table_index": table_idx,
-                                "bbox": table.prov[0].bbox if table.prov else None
+                                "bbox": table["bbox"]
                             }
                         )
                         tables_extracted += 1
@@ -326,8 +319,8 @@ class PostgresEnhancedRAGTool:
             
             # Process images if enabled
             if self.extract_images:
-                for img_idx, figure in enumerate(result.document.pictures):
-                    caption = figure.caption if hasattr(figure, 'caption') else f"Image {img_idx + 1}"
+                for img_idx, figure in enumerate(result["images"]):
+                    caption = figure["caption"] or f"Image {img_idx + 1}"
                     image_description = f"[Image: {caption}]"
                     
                     await self._store_chunk(
@@ -339,7 +332,7 @@ class PostgresEnhancedRAGTool:
                             "source": "image_extraction",
                             "image_index": img_idx,
                             "caption": caption,
-                            "bbox": figure.prov[0].bbox if figure.prov else None
+                            "bbox": figure["bbox"]
                         }
                     )
                     images_extracted += 1
@@ -415,15 +408,20 @@ class PostgresEnhancedRAGTool:
     
     async def search(self, query: str, top_k: int = 5, 
                     content_types: List[str] = None, 
-                    filters: Dict[str, Any] = None) -> Dict[str, Any]:
+                    filters: Dict[str, Any] = None,
+                    search_mode: str = "vector",
+                    hybrid_weight: float = 0.5) -> Dict[str, Any]:
         """
-        Semantic search with advanced filtering
+        Semantic, full-text or hybrid search with advanced filtering
         
         Args:
             query: Search query
             top_k: Number of results to return
             content_types: Filter by content types (text, table, image)
             filters: Additional metadata filters
+            search_mode: "vector", "lexical" or "hybrid" (both legs fused with
+                reciprocal-rank fusion)
+            hybrid_weight: Share of the fused score given to the vector ranking
             
         Returns:
             Dictionary with search results
@@ -431,63 +429,23 @@ class PostgresEnhancedRAGTool:
         try:
             start_time = time.time()
             
-            # Generate query embedding
-            if self.embedding_provider == "openai":
-                query_embedding = await self.embedding_model_instance.aembed_query(query)
+            if search_mode == "lexical":
+                results = await self._lexical_search(query, top_k, content_types, filters)
+            elif search_mode == "hybrid":
+                # Both legs over-fetch and run concurrently on separate connections
+                candidates = top_k * get_settings().HYBRID_CANDIDATE_MULTIPLIER
+                vector_results, lexical_results = await asyncio.gather(
+                    self._vector_search(query, candidates, content_types, filters),
+                    self._lexical_search(query, candidates, content_types, filters)
+                )
+                results = reciprocal_rank_fusion(
+                    [vector_results, lexical_results],
+                    [hybrid_weight, 1.0 - hybrid_weight],
+                    limit=top_k,
+                    key="chunk_id"
+                )
             else:
-                query_embedding = await self.embedding_model_instance.aembed_query(query)
-            
-            # Build query conditions
-            conditions = []
-            params = [query_embedding, top_k]
-            param_idx = 3
-            
-            if content_types:
-                conditions.append(f"content_type = ANY(${param_idx})")
-                params.append(content_types)
-                param_idx += 1
-            
-            if filters:
-                for key, value in filters.items():
-                    conditions.append(f"metadata->>${param_idx} = ${param_idx + 1}")
-                    params.extend([key, json.dumps(value) if not isinstance(value, str) else value])
-                    param_idx += 2
-            
-            where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-            
-            # Execute search query
-            async with self.connection_pool.acquire() as conn:
-                query_sql = f"""
-                    SELECT 
-                        id, document_id, chunk_index, content, content_type, metadata,
-                        1 - (embedding <=> $1) as similarity_score,
-                        dm.original_filename, dm.created_at as document_created_at
-                    FROM {self.table_name} d
-                    LEFT JOIN {self.table_name}_metadata dm ON d.document_id = dm.document_id
-                    {where_clause}
-                    ORDER BY embedding <=> $1
-                    LIMIT $2
-                """
-                
-                rows = await conn.fetch(query_sql, *params)
-                
-                # Format results
-                results = []
-                for row in rows:
-                    result = {
-                        "chunk_id": str(row["id"]),
-                        "document_id": row["document_id"],
-                        "chunk_index": row["chunk_index"],
-                        "content": row["content"],
-                        "content_type": row["content_type"],
-                        "similarity_score": float(row["similarity_score"]),
-                        "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
-                        "source_info": {
-                            "filename": row["original_filename"],
-                            "document_created_at": row["document_created_at"].isoformat() if row["document_created_at"] else None
-                        }
-                    }
-                    results.append(result)
+                results = await self._vector_search(query, top_k, content_types, filters)
             
             search_time = time.time() - start_time
             
@@ -500,7 +458,8 @@ class PostgresEnhancedRAGTool:
                 "search_metadata": {
                     "embedding_model": self.embedding_model,
                     "content_types": content_types,
-                    "filters": filters
+                    "filters": filters,
+                    "search_mode": search_mode
                 }
             }
             
@@ -511,6 +470,94 @@ class PostgresEnhancedRAGTool:
                 "error": str(e)
             }
     
+    def _build_filter_conditions(self, params: List[Any], content_types: List[str] = None,
+                                 filters: Dict[str, Any] = None) -> str:
+        """Append filter parameters to ``params`` and return the WHERE conditions"""
+        conditions = []
+        
+        if content_types:
+            params.append(content_types)
+            conditions.append(f"d.content_type = ANY(${len(params)})")
+        
+        if filters:
+            for key, value in filters.items():
+                params.extend([key, json.dumps(value) if not isinstance(value, str) else value])
+                conditions.append(f"d.metadata->>${len(params) - 1} = ${len(params)}")
+        
+        return " AND ".join(conditions)
+    
+    def _format_search_row(self, row: asyncpg.Record) -> Dict[str, Any]:
+        return {
+            "chunk_id": str(row["id"]),
+            "document_id": row["document_id"],
+            "chunk_index": row["chunk_index"],
+            "content": row["content"],
+            "content_type": row["content_type"],
+            "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
+            "source_info": {
+                "filename": row["original_filename"],
+                "document_created_at": row["document_created_at"].isoformat() if row["document_created_at"] else None
+            }
+        }
+    
+    async def _vector_search(self, query: str, limit: int, content_types: List[str] = None,
+                             filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """Nearest-neighbour search by cosine distance"""
+        # Generate query embedding (repeated queries are served from the cache)
+        query_embedding = await get_embedding_cache().get_or_compute(
+            f"{self.embedding_provider}/{self.embedding_model}",
+            query,
+            lambda: self.embedding_model_instance.aembed_query(query)
+        )
+        
+        params: List[Any] = [query_embedding, limit]
+        conditions = self._build_filter_conditions(params, content_types, filters)
+        where_clause = f"WHERE {conditions}" if conditions else ""
+        
+        async with self.connection_pool.acquire() as conn:
+            rows = await conn.fetch(f"""
+                SELECT 
+                    d.id, d.document_id, d.chunk_index, d.content, d.content_type, d.metadata,
+                    1 - (embedding <=> $1) as similarity_score,
+                    dm.original_filename, dm.created_at as document_created_at
+                FROM {self.table_name} d
+                LEFT JOIN {self.table_name}_metadata dm ON d.document_id = dm.document_id
+                {where_clause}
+                ORDER BY embedding <=> $1
+                LIMIT $2
+            """, *params)
+        
+        return [
+            {**self._format_search_row(row), "similarity_score": float(row["similarity_score"])}
+            for row in rows
+        ]
+    
+    async def _lexical_search(self, query: str, limit: int, content_types: List[str] = None,
+                              filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """Full-text search over the GIN-indexed content_tsv column"""
+        params: List[Any] = [get_settings().TEXT_SEARCH_CONFIG, query, limit]
+        conditions = self._build_filter_conditions(params, content_types, filters)
+        extra_conditions = f"AND {conditions}" if conditions else ""
+        
+        async with self.connection_pool.acquire() as conn:
+            rows = await conn.fetch(f"""
+                SELECT 
+                    d.id, d.document_id, d.chunk_index, d.content, d.content_type, d.metadata,
+                    ts_rank_cd(content_tsv, q) as lexical_rank,
+                    dm.original_filename, dm.created_at as document_created_at
+                FROM {self.table_name} d
+                CROSS JOIN websearch_to_tsquery($1::regconfig, $2) q
+                LEFT JOIN {self.table_name}_metadata dm ON d.document_id = dm.document_id
+                WHERE content_tsv @@ q {extra_conditions}
+                ORDER BY lexical_rank DESC
+                LIMIT $3
+            """, *params)
+        
+        return [
+            {**self._format_search_row(row), "lexical_rank": float(row["lexical_rank"])}
+            for row in rows
+        ]
+    
     async def get_document_statistics(self, document_id: str = None) -> Dict[str, Any]:
         """Get statistics for documents in the RAG system"""
         try:
@@ -646,27 +693,16 @@ class PostgresEnhancedRAGTool:
             raise ValueError(f"Unsupported file format: {file_ext}")
     
     async def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF"""
+        """Extract text from PDF in the extraction worker pool"""
         try:
-            import pypdf
-            with open(file_path, 'rb') as file:
-                reader = pypdf.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            return await get_extraction_pool().extract_pdf_text(file_path)
         except ImportError:
             raise RuntimeError("pypdf not available. Install with: pip install pypdf")
     
     async def _extract_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX"""
+        """Extract text from DOCX in the extraction worker pool"""
         try:
-            from docx import Document
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return await get_extraction_pool().extract_docx_text(file_path)
         except ImportError:
             raise RuntimeError("python-docx not available. Install with: pip install python-docx")
     
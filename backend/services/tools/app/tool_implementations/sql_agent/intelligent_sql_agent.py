@@ -4,8 +4,13 @@ Natural language to SQL with safety controls and query optimization
 """
 
 import asyncio
+import importlib.util
+import os
 import re
-from typing import Dict, Any, List, Optional, Union
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union, Tuple
 import logging
 from datetime import datetime
 import json
@@ -13,14 +18,345 @@ import json
 # Database connectivity
 import asyncpg
 import psycopg2
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
 
 # AI/NLP for query generation
 import openai
 
+from app.services.sql_statements import is_row_returning
+
 logger = logging.getLogger(__name__)
 
+# Async drivers are optional; engines without one run on a dedicated thread pool
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "sqlite": "aiosqlite",
+}
+
+# Execution backends. The class names are underscore-prefixed so the physical tool
+# loader, which picks the first tool-like class in the module, never selects them.
+
+class _AsyncpgBackend:
+    """PostgreSQL via an asyncpg pool; the timeout is a per-connection server setting"""
+
+    def __init__(self, database_url: str, timeout_seconds: int, min_size: int, max_size: int):
+        self.database_url = database_url
+        self.timeout_seconds = timeout_seconds
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool: Optional[asyncpg.Pool] = None
+
+    async def open(self) -> None:
+        # Sent in the startup packet of every pooled connection, so no per-query SET round trip
+        self.pool = await asyncpg.create_pool(
+            self.database_url,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            server_settings={"statement_timeout": str(self.timeout_seconds * 1000)}
+        )
+
+    async def fetch(self, sql_query: str, parameters: Dict[str, Any], max_rows: Optional[int]) -> Tuple[List[str], List[list], bool]:
+        args = list(parameters.values())
+        async with self.pool.acquire() as conn:
+            statement = await conn.prepare(sql_query)
+            columns = [attribute.name for attribute in statement.get_attributes()]
+            if not columns or max_rows is None:
+                rows = await statement.fetch(*args)
+                return columns, [list(row) for row in rows], False
+            # A portal-backed cursor fetches only max_rows + 1 rows from the server
+            async with conn.transaction():
+                cursor = await statement.cursor(*args)
+                rows = await cursor.fetch(max_rows + 1)
+            return columns, [list(row) for row in rows[:max_rows]], len(rows) > max_rows
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+
+
+class _AsyncEngineBackend:
+    """MySQL/SQLite through SQLAlchemy's asyncio engine on aiomysql/aiosqlite"""
+
+    def __init__(self, database_url: str, database_type: str, timeout_seconds: int, pool_size: int):
+        url = make_url(database_url)
+        self.url = url.set(drivername=f"{url.get_backend_name()}+{ASYNC_DRIVERS[database_type]}")
+        self.database_type = database_type
+        self.timeout_seconds = timeout_seconds
+        self.pool_size = pool_size
+        self.engine = None
+
+    async def open(self) -> None:
+        pool_options = {} if self.database_type == "sqlite" else {"pool_size": self.pool_size, "max_overflow": 0}
+        self.engine = create_async_engine(self.url, pool_pre_ping=True, **pool_options)
+
+        if self.database_type == "mysql":
+            timeout_ms = self.timeout_seconds * 1000
+
+            @event.listens_for(self.engine.sync_engine, "connect")
+            def set_timeout(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {timeout_ms}")
+                cursor.close()
+
+    async def fetch(self, sql_query: str, parameters: Dict[str, Any], max_rows: Optional[int]) -> Tuple[List[str], List[list], bool]:
+        async with self.engine.connect() as conn:
+            if not is_row_returning(sql_query):
+                result = await conn.execute(text(sql_query), parameters)
+                columns, rows = [], []
+                if result.returns_rows:
+                    columns = list(result.keys())
+                    rows = result.fetchall() if max_rows is None else result.fetchmany(max_rows + 1)
+                await conn.commit()
+                truncated = max_rows is not None and len(rows) > max_rows
+                return columns, [list(row) for row in rows[:max_rows]], truncated
+
+            result = await conn.stream(text(sql_query), parameters)
+            try:
+                columns = list(result.keys())
+                rows = await (result.fetchall() if max_rows is None else result.fetchmany(max_rows + 1))
+            finally:
+                await result.close()
+            truncated = max_rows is not None and len(rows) > max_rows
+            return columns, [list(row) for row in rows[:max_rows]], truncated
+
+    async def close(self) -> None:
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+class _ThreadPoolBackend:
+    """Synchronous SQLAlchemy engine confined to its own thread pool.
+
+    Used for MSSQL and for MySQL/SQLite when the async driver is not installed;
+    a slow query occupies one of this engine's threads, never the event loop.
+    """
+
+    def __init__(self, database_url: str, database_type: str, timeout_seconds: int, pool_size: int):
+        self.database_url = database_url
+        self.database_type = database_type
+        self.timeout_seconds = timeout_seconds
+        self.pool_size = pool_size
+        self.engine = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    async def open(self) -> None:
+        pool_options = {} if self.database_type == "sqlite" else {"pool_size": self.pool_size, "max_overflow": 0}
+        self.engine = create_engine(self.database_url, pool_pre_ping=True, **pool_options)
+        self.executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix=f"sql-{self.database_type}")
+        timeout_seconds = self.timeout_seconds
+
+        @event.listens_for(self.engine, "connect")
+        def set_timeout(dbapi_connection, connection_record):
+            if self.database_type == "mssql" and hasattr(dbapi_connection, "timeout"):
+                dbapi_connection.timeout = timeout_seconds  # pyodbc query timeout
+            elif self.database_type == "mysql":
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {timeout_seconds * 1000}")
+                cursor.close()
+
+    def _fetch_sync(self, sql_query: str, parameters: Dict[str, Any], max_rows: Optional[int]) -> Tuple[List[str], List[list], bool]:
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(text(sql_query), parameters)
+            if not result.returns_rows:
+                conn.commit()
+                return [], [], False
+            columns = list(result.keys())
+            rows = result.fetchall() if max_rows is None else result.fetchmany(max_rows + 1)
+            result.close()
+            conn.commit()
+            truncated = max_rows is not None and len(rows) > max_rows
+            return columns, [list(row) for row in rows[:max_rows]], truncated
+
+    async def fetch(self, sql_query: str, parameters: Dict[str, Any], max_rows: Optional[int]) -> Tuple[List[str], List[list], bool]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._fetch_sync, sql_query, parameters, max_rows)
+
+    async def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.engine is not None:
+            self.engine.dispose()
+
+
+# Changes whenever a table, column or constraint in the public schema is created,
+# altered, rewritten or dropped: each DDL writes new catalog row versions (xmin)
+# and table rewrites assign a new relfilenode.
+POSTGRES_SCHEMA_FINGERPRINT_QUERY = """
+SELECT md5(
+    coalesce((SELECT string_agg(c.oid::text || ':' || c.xmin::text || ':' || c.relfilenode::text, ',' ORDER BY c.oid)
+              FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+              WHERE n.nspname = 'public' AND c.relkind IN ('r', 'v', 'm', 'p', 'f')), '')
+    || '|' ||
+    coalesce((SELECT string_agg(a.attrelid::text || '.' || a.attnum::text || ':' || a.xmin::text, ',' ORDER BY a.attrelid, a.attnum)
+              FROM pg_attribute a
+              JOIN pg_class c ON c.oid = a.attrelid
+              JOIN pg_namespace n ON n.oid = c.relnamespace
+              WHERE n.nspname = 'public' AND c.relkind IN ('r', 'v', 'm', 'p', 'f') AND a.attnum > 0), '')
+    || '|' ||
+    coalesce((SELECT string_agg(co.oid::text || ':' || co.xmin::text, ',' ORDER BY co.oid)
+              FROM pg_constraint co JOIN pg_namespace n ON n.oid = co.connamespace
+              WHERE n.nspname = 'public'), '')
+)
+"""
+
+_IDENTIFIER_PARTS = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+# Question words that say nothing about which tables are relevant
+_QUESTION_STOPWORDS = {
+    "a", "all", "an", "and", "are", "by", "each", "for", "from", "get", "give", "how", "in", "is",
+    "list", "many", "me", "much", "of", "on", "or", "per", "show", "the", "to", "what", "which", "with"
+}
+
+
+def _terms(text: str) -> set:
+    """Lower-cased word parts of identifiers or prose, with a naive singular form"""
+    terms = set()
+    for part in _IDENTIFIER_PARTS.findall(text):
+        part = part.lower()
+        terms.add(part)
+        if len(part) > 3 and part.endswith("s"):
+            terms.add(part[:-1])
+    return terms
+
+
+class _SchemaTableEntry:
+    """Pre-rendered prompt text for one table plus the terms used to rank it"""
+
+    __slots__ = ("name", "text", "tokens", "name_terms", "column_terms")
+
+    def __init__(self, name: str, table_info: Dict[str, Any]):
+        columns = []
+        for col in table_info.get("columns", []):
+            col_def = f"{col['name']} {col['type']}"
+            if not col['nullable']:
+                col_def += " NOT NULL"
+            columns.append(col_def)
+        self.name = name
+        self.text = f"Table: {name}\nColumns: {', '.join(columns)}\n"
+        self.tokens = len(self.text) // 4 + 1  # ~4 characters per token
+        self.name_terms = _terms(name)
+        self.column_terms = set().union(*(_terms(col["name"]) for col in table_info.get("columns", [])))
+
+    def score(self, question_terms: set) -> int:
+        return 3 * len(self.name_terms & question_terms) + len(self.column_terms & question_terms)
+
+
+class _SchemaCache:
+    """Introspected schema, its catalog fingerprint and the pre-rendered prompt entries"""
+
+    def __init__(self, ttl_seconds: float, check_interval_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.schema_info: Optional[Dict[str, Any]] = None
+        self.fingerprint: Optional[str] = None
+        self.entries: List[_SchemaTableEntry] = []
+        self.loaded_at = 0.0
+        self.checked_at = 0.0
+        self.lock = asyncio.Lock()
+        self.stats = {"hits": 0, "reloads": 0, "fingerprint_checks": 0, "invalidations": 0}
+
+    def is_fresh(self) -> bool:
+        now = time.monotonic()
+        return (
+            self.schema_info is not None
+            and now - self.loaded_at < self.ttl_seconds
+            and now - self.checked_at < self.check_interval_seconds
+        )
+
+    def store(self, schema_info: Dict[str, Any], fingerprint: Optional[str]) -> None:
+        self.schema_info = schema_info
+        self.fingerprint = fingerprint
+        self.entries = [
+            _SchemaTableEntry(name, info)
+            for name, info in sorted(schema_info.get("tables", {}).items())
+        ]
+        self.loaded_at = self.checked_at = time.monotonic()
+        self.stats["reloads"] += 1
+
+    @property
+    def version(self) -> str:
+        """Identifies the schema the cached SQL was generated against"""
+        return self.fingerprint or f"load-{self.stats['reloads']}"
+
+    def invalidate(self) -> None:
+        self.schema_info = None
+        self.fingerprint = None
+        self.entries = []
+        self.stats["invalidations"] += 1
+
+
+class _TTLCache:
+    """Bounded LRU mapping whose entries expire ``ttl_seconds`` after being stored"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any:
+        item = self._entries.get(key)
+        if item is None or time.monotonic() - item[0] >= self.ttl_seconds:
+            if item is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Any, value: Any) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> int:
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+_WRITE_KEYWORDS = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE|DROP|ALTER|CREATE|GRANT|REVOKE)\b", re.IGNORECASE)
+
+
+def _normalize_question(question: str) -> str:
+    return " ".join(question.lower().split()).rstrip("?.! ")
+
+
+def _normalize_sql(sql_query: str) -> str:
+    return " ".join(sql_query.split()).rstrip(";")
+
+
+def _create_backend(database_type: str, database_url: str, config: Dict[str, Any]):
+    timeout_seconds = int(config.get("query_timeout", 30))
+    pool_size = int(config.get("pool_max_size", 10))
+    if database_type == "postgresql":
+        return _AsyncpgBackend(database_url, timeout_seconds, int(config.get("pool_min_size", 1)), pool_size)
+    driver = ASYNC_DRIVERS.get(database_type)
+    if driver and importlib.util.find_spec(driver) is not None:
+        return _AsyncEngineBackend(database_url, database_type, timeout_seconds, pool_size)
+    return _ThreadPoolBackend(database_url, database_type, timeout_seconds, pool_size)
+
+
 class IntelligentSQLAgent:
     """
     Intelligent SQL Agent with natural language processing,
@@ -41,9 +377,25 @@ class IntelligentSQLAgent:
         self.llm_model = config.get("llm_model", "gpt-4")
         self.openai_client = None
         
-        # Database connection
-        self.connection_pool = None
-        self.engine = None
+        # Database execution backend (pooled, never blocks the event loop)
+        self.backend = None
+        
+        # Schema introspection cache and prompt budget
+        self.schema_cache = _SchemaCache(
+            config.get("schema_cache_ttl", 3600),
+            config.get("schema_check_interval", 30)
+        )
+        self.schema_prompt_tokens = config.get("schema_prompt_tokens", 3000)
+        
+        # Tier 1: (question, schema version) -> generated SQL; tier 2: (SQL, params) -> rows
+        self.sql_cache = _TTLCache(config.get("sql_cache_size", 512), config.get("sql_cache_ttl", 86400))
+        self.result_cache = _TTLCache(config.get("result_cache_size", 128), config.get("result_cache_ttl", 60))
+        self.result_cache_max_rows = config.get("result_cache_max_rows", 5000)
+        volatile_tables = config.get("volatile_tables", [])
+        self._volatile_pattern = (
+            re.compile(r"\b(" + "|".join(re.escape(t) for t in volatile_tables) + r")\b", re.IGNORECASE)
+            if volatile_tables else None
+        )
         
         logger.info(f"Initialized SQL Agent for {self.database_type}")
     
@@ -56,10 +408,9 @@ class IntelligentSQLAgent:
             )
             
             # Initialize database connection
-            if self.database_type == "postgresql":
-                self.connection_pool = await asyncpg.create_pool(self.database_url)
-            else:
-                self.engine = create_engine(self.database_url)
+            self.backend = _create_backend(self.database_type, self.database_url, self.config)
+            await self.backend.open()
+            logger.info(f"SQL Agent using {type(self.backend).__name__.lstrip('_')} for {self.database_type}")
             
             logger.info("SQL Agent initialized successfully")
             
@@ -67,13 +418,20 @@ class IntelligentSQLAgent:
             logger.error(f"Failed to initialize SQL Agent: {e}")
             raise
     
-    async def natural_language_query(self, question: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def cleanup(self):
+        """Close the database pool"""
+        if self.backend is not None:
+            await self.backend.close()
+            self.backend = None
+    
+    async def natural_language_query(self, question: str, context: Dict[str, Any] = None, use_cache: bool = True) -> Dict[str, Any]:
         """
         Convert natural language question to SQL and execute
         
         Args:
             question: Natural language question
             context: Additional context for query generation
+            use_cache: Reuse previously generated SQL and cached results
             
         Returns:
             Dictionary with query results
@@ -82,8 +440,13 @@ class IntelligentSQLAgent:
             # Get database schema
             schema_info = await self._get_schema_info()
             
-            # Generate SQL query from natural language
-            sql_query = await self._generate_sql_query(question, schema_info, context or {})
+            # Generate SQL query from natural language, unless this question was seen for this schema
+            question_key = _normalize_question(question)
+            sql_key = (question_key, json.dumps(context or {}, sort_keys=True, default=str), self.schema_cache.version)
+            sql_query = self.sql_cache.get(sql_key) if use_cache else None
+            sql_cache_status = "hit" if sql_query else ("miss" if use_cache else "bypass")
+            if sql_query is None:
+                sql_query = await self._generate_sql_query(question, schema_info, context or {})
             
             # Validate and sanitize query
             validation_result = await self._validate_query(sql_query)
@@ -94,11 +457,20 @@ class IntelligentSQLAgent:
                     "suggested_query": validation_result.get("suggested_query")
                 }
             
-            # Execute query
-            result = await self._execute_query(sql_query)
+            # Execute query; only SQL that ran is kept for this question, and SQL that failed is dropped
+            try:
+                result, cache_entry, result_cache_status = await self._execute_cached(sql_query, {}, use_cache)
+            except Exception:
+                self.sql_cache.delete(sql_key)
+                raise
+            self.sql_cache.set(sql_key, sql_query)
             
-            # Format results
-            formatted_result = await self._format_results(result, question)
+            # Format results; the summary for this question is kept with the cached rows
+            formatted_result = cache_entry["summaries"].get(question_key) if cache_entry else None
+            if formatted_result is None:
+                formatted_result = await self._format_results(result, question)
+                if cache_entry is not None:
+                    cache_entry["summaries"][question_key] = formatted_result
             
             return {
                 "status": "success",
@@ -108,7 +480,8 @@ class IntelligentSQLAgent:
                 "metadata": {
                     "execution_time": result.get("execution_time"),
                     "row_count": len(result.get("data", [])),
-                    "columns": result.get("columns", [])
+                    "columns": result.get("columns", []),
+                    "cache": {"sql": sql_cache_status, "result": result_cache_status}
                 }
             }
             
@@ -120,13 +493,14 @@ class IntelligentSQLAgent:
                 "question": question
             }
     
-    async def execute_sql(self, sql_query: str, parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def execute_sql(self, sql_query: str, parameters: Dict[str, Any] = None, use_cache: bool = True) -> Dict[str, Any]:
         """
         Execute a SQL query directly with safety checks
         
         Args:
             sql_query: SQL query to execute
             parameters: Query parameters
+            use_cache: Serve read-only queries from the result cache
             
         Returns:
             Dictionary with execution results
@@ -141,7 +515,7 @@ class IntelligentSQLAgent:
                 }
             
             # Execute query
-            result = await self._execute_query(sql_query, parameters or {})
+            result, _, result_cache_status = await self._execute_cached(sql_query, parameters or {}, use_cache)
             
             return {
                 "status": "success",
@@ -149,7 +523,8 @@ class IntelligentSQLAgent:
                 "results": result,
                 "metadata": {
                     "execution_time": result.get("execution_time"),
-                    "row_count": len(result.get("data", []))
+                    "row_count": len(result.get("data", [])),
+                    "cache": {"result": result_cache_status}
                 }
             }
             
@@ -161,6 +536,26 @@ class IntelligentSQLAgent:
                 "sql_query": sql_query
             }
     
+    async def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit rates and sizes of the SQL, result and schema caches"""
+        return {
+            "status": "success",
+            "sql_cache": self.sql_cache.stats(),
+            "result_cache": {**self.result_cache.stats(), "max_rows": self.result_cache_max_rows},
+            "schema_cache": {**self.schema_cache.stats, "version": self.schema_cache.version}
+        }
+    
+    async def invalidate_cache(self, tier: str = "all") -> Dict[str, Any]:
+        """Clear cached SQL (``sql``), cached results (``results``) or both (``all``)"""
+        if tier not in ("sql", "results", "all"):
+            return {"status": "error", "error": f"Unknown cache tier '{tier}'"}
+        cleared = {}
+        if tier in ("sql", "all"):
+            cleared["sql"] = self.sql_cache.clear()
+        if tier in ("results", "all"):
+            cleared["results"] = self.result_cache.clear()
+        return {"status": "success", "cleared": cleared}
+    
     async def explain_query(self, sql_query: str) -> Dict[str, Any]:
         """
         Explain a SQL query execution plan
@@ -232,7 +627,11 @@ class IntelligentSQLAgent:
             schema_info = await self._get_schema_info()
             return {
                 "status": "success",
-                "schema": schema_info
+                "schema": schema_info,
+                "cache": {
+                    **self.schema_cache.stats,
+                    "fingerprint": self.schema_cache.fingerprint
+                }
             }
         except Exception as e:
             logger.error(f"Error getting schema info: {e}")
@@ -241,9 +640,56 @@ class IntelligentSQLAgent:
                 "error": str(e)
             }
     
+    async def invalidate_schema_cache(self) -> Dict[str, Any]:
+        """Drop the cached schema so the next question re-introspects the database"""
+        self.schema_cache.invalidate()
+        return {"status": "success", "message": "Schema cache invalidated"}
+    
     # Private methods
     
     async def _get_schema_info(self) -> Dict[str, Any]:
+        """Get schema information from the cache, re-introspecting only when it changed
+        
+        The cache is trusted for ``schema_check_interval`` seconds; after that a
+        cheap catalog fingerprint (PostgreSQL) decides whether the full crawl
+        must run again. ``schema_cache_ttl`` bounds the age regardless.
+        """
+        cache = self.schema_cache
+        if cache.is_fresh():
+            cache.stats["hits"] += 1
+            return cache.schema_info
+        
+        async with cache.lock:
+            if cache.is_fresh():
+                cache.stats["hits"] += 1
+                return cache.schema_info
+            
+            fingerprint = await self._get_schema_fingerprint()
+            if cache.schema_info is not None and time.monotonic() - cache.loaded_at < cache.ttl_seconds:
+                # Without a fingerprint (non-PostgreSQL) the TTL alone governs reloads
+                if fingerprint is None or fingerprint == cache.fingerprint:
+                    cache.checked_at = time.monotonic()
+                    cache.stats["hits"] += 1
+                    return cache.schema_info
+            
+            schema_info = await self._load_schema_info()
+            if schema_info.get("tables"):
+                cache.store(schema_info, fingerprint)
+            return schema_info
+    
+    async def _get_schema_fingerprint(self) -> Optional[str]:
+        """Catalog fingerprint that changes on DDL; None where unsupported"""
+        if self.database_type != "postgresql":
+            return None
+        self.schema_cache.stats["fingerprint_checks"] += 1
+        try:
+            result = await self._execute_query(POSTGRES_SCHEMA_FINGERPRINT_QUERY, limit_rows=False)
+            return result["data"][0][0]
+        except Exception as e:
+            logger.warning(f"Schema fingerprint check failed: {e}")
+            return None
+    
+    async def _load_schema_info(self) -> Dict[str, Any]:
         """Get comprehensive database schema information"""
         try:
             if self.database_type == "postgresql":
@@ -278,7 +724,7 @@ class IntelligentSQLAgent:
         ORDER BY t.table_name, c.ordinal_position;
         """
         
-        result = await self._execute_query(schema_query)
+        result = await self._execute_query(schema_query, limit_rows=False)
         
         # Organize schema data
         tables = {}
@@ -319,7 +765,7 @@ class IntelligentSQLAgent:
         """Generate SQL query from natural language using AI"""
         try:
             # Prepare schema context for the AI model
-            schema_context = self._format_schema_for_ai(schema_info)
+            schema_context = self._format_schema_for_ai(schema_info, question)
             
             # Create prompt for SQL generation
             prompt = f"""
@@ -366,20 +812,44 @@ class IntelligentSQLAgent:
             logger.error(f"Error generating SQL query: {e}")
             raise
     
-    def _format_schema_for_ai(self, schema_info: Dict[str, Any]) -> str:
-        """Format schema information for AI prompt"""
+    def _format_schema_for_ai(self, schema_info: Dict[str, Any], question: str = "") -> str:
+        """Format schema information for AI prompt within ``schema_prompt_tokens``
+        
+        Tables are ranked by how many of the question's terms appear in their
+        table name (weighted) and column names; the best matches are included
+        in full and the remaining budget lists the names of the others.
+        """
+        if schema_info is self.schema_cache.schema_info:
+            entries = self.schema_cache.entries
+        else:
+            entries = [_SchemaTableEntry(name, info) for name, info in sorted(schema_info.get("tables", {}).items())]
+        
+        question_terms = _terms(question) - _QUESTION_STOPWORDS
+        scored = [(entry.score(question_terms), entry) for entry in entries]
+        if any(score for score, _ in scored):
+            ranked = [entry for score, entry in sorted(scored, key=lambda item: -item[0]) if score > 0]
+        else:
+            ranked = entries
+        
+        budget = self.schema_prompt_tokens
         formatted_schema = []
+        included = set()
+        for entry in ranked:
+            if entry.tokens > budget:
+                continue
+            formatted_schema.append(entry.text)
+            included.add(entry.name)
+            budget -= entry.tokens
         
-        for table_name, table_info in schema_info.get("tables", {}).items():
-            columns = []
-            for col in table_info.get("columns", []):
-                col_def = f"{col['name']} {col['type']}"
-                if not col['nullable']:
-                    col_def += " NOT NULL"
-                columns.append(col_def)
-            
-            table_def = f"Table: {table_name}\nColumns: {', '.join(columns)}\n"
-            formatted_schema.append(table_def)
+        omitted = [entry.name for entry in entries if entry.name not in included]
+        if omitted and budget > 10:
+            names = []
+            for name in omitted:
+                budget -= len(name) // 4 + 1
+                if budget < 0:
+                    break
+                names.append(name)
+            formatted_schema.append(f"Other tables (columns not shown): {', '.join(names)}\n")
         
         return "\n".join(formatted_schema)
     
@@ -438,47 +908,62 @@ class IntelligentSQLAgent:
                 "reason": f"Validation error: {str(e)}"
             }
     
-    async def _execute_query(self, sql_query: str, parameters: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Execute SQL query with timeout and error handling"""
+    def _is_result_cacheable(self, sql_query: str) -> bool:
+        """Only read-only statements that touch no volatile table are cached"""
+        if not is_row_returning(sql_query) or _WRITE_KEYWORDS.search(sql_query):
+            return False
+        return self._volatile_pattern is None or not self._volatile_pattern.search(sql_query)
+    
+    async def _execute_cached(
+        self,
+        sql_query: str,
+        parameters: Dict[str, Any],
+        use_cache: bool
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], str]:
+        """Execute through the result cache
+        
+        Returns the result, the cache entry holding it (None if not cached)
+        and the cache status: hit, miss or bypass. A cache hit reports no
+        ``execution_time`` and sets ``cached``.
+        """
+        if not use_cache or not self._is_result_cacheable(sql_query):
+            return await self._execute_query(sql_query, parameters), None, "bypass"
+        
+        key = (_normalize_sql(sql_query), json.dumps(parameters, sort_keys=True, default=str))
+        entry = self.result_cache.get(key)
+        if entry is not None:
+            return {**entry["result"], "execution_time": None, "cached": True}, entry, "hit"
+        
+        result = await self._execute_query(sql_query, parameters)
+        if result["row_count"] > self.result_cache_max_rows:
+            return result, None, "miss"
+        entry = {"result": result, "summaries": {}}
+        self.result_cache.set(key, entry)
+        return result, entry, "miss"
+    
+    async def _execute_query(self, sql_query: str, parameters: Dict[str, Any] = None, limit_rows: bool = True) -> Dict[str, Any]:
+        """Execute SQL query with timeout and error handling
+        
+        At most ``max_rows`` rows are fetched from the server (unless
+        ``limit_rows`` is False, for internal catalog queries); ``truncated``
+        reports whether more were available.
+        """
         start_time = datetime.now()
         
         try:
-            if self.database_type == "postgresql" and self.connection_pool:
-                async with self.connection_pool.acquire() as conn:
-                    # Set query timeout
-                    await conn.execute(f"SET statement_timeout = '{self.query_timeout}s'")
-                    
-                    # Execute query
-                    result = await conn.fetch(sql_query, *(parameters.values() if parameters else []))
-                    
-                    # Format result
-                    data = [list(row) for row in result]
-                    columns = list(result[0].keys()) if result else []
-                    
-                    execution_time = (datetime.now() - start_time).total_seconds()
-                    
-                    return {
-                        "data": data,
-                        "columns": columns,
-                        "row_count": len(data),
-                        "execution_time": execution_time
-                    }
-            else:
-                # Use SQLAlchemy for other databases
-                with self.engine.connect() as conn:
-                    result = conn.execute(text(sql_query), parameters or {})
-                    
-                    data = [list(row) for row in result.fetchall()]
-                    columns = list(result.keys())
-                    
-                    execution_time = (datetime.now() - start_time).total_seconds()
-                    
-                    return {
-                        "data": data,
-                        "columns": columns,
-                        "row_count": len(data),
-                        "execution_time": execution_time
-                    }
+            columns, data, truncated = await self.backend.fetch(
+                sql_query, parameters or {}, self.max_rows if limit_rows else None
+            )
+            
+            execution_time = (datetime.now() - start_time).total_seconds()
+            
+            return {
+                "data": data,
+                "columns": columns,
+                "row_count": len(data),
+                "truncated": truncated,
+                "execution_time": execution_time
+            }
                     
         except Exception as e:
             execution_time = (datetime.now() - start_time).total_seconds()
@@ -635,6 +1120,74 @@ TOOL_CONFIG_SCHEMA = {
             "default": 30,
             "description": "Query timeout in seconds"
         },
+        "schema_cache_ttl": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 3600,
+            "description": "Maximum age of the cached schema in seconds"
+        },
+        "schema_check_interval": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 30,
+            "description": "Seconds the cached schema is trusted before its catalog fingerprint is re-checked"
+        },
+        "schema_prompt_tokens": {
+            "type": "integer",
+            "minimum": 200,
+            "default": 3000,
+            "description": "Approximate token budget for the schema section of the SQL generation prompt"
+        },
+        "sql_cache_size": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 512,
+            "description": "Generated SQL entries kept per (question, schema version); 0 disables"
+        },
+        "sql_cache_ttl": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 86400,
+            "description": "Seconds generated SQL is reused"
+        },
+        "result_cache_size": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 128,
+            "description": "Result sets kept per (SQL, parameters); 0 disables"
+        },
+        "result_cache_ttl": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 60,
+            "description": "Seconds a result set is served from cache for this connection; 0 disables"
+        },
+        "result_cache_max_rows": {
+            "type": "integer",
+            "minimum": 0,
+            "default": 5000,
+            "description": "Results with more rows than this are not cached"
+        },
+        "volatile_tables": {
+            "type": "array",
+            "items": {"type": "string"},
+            "default": [],
+            "description": "Tables whose query results are never cached"
+        },
+        "pool_min_size": {
+            "type": "integer",
+            "minimum": 0,
+            "maximum": 50,
+            "default": 1,
+            "description": "Minimum pooled connections (PostgreSQL)"
+        },
+        "pool_max_size": {
+            "type": "integer",
+            "minimum": 1,
+            "maximum": 50,
+            "default": 10,
+            "description": "Maximum pooled connections, and worker threads for engines without an async driver"
+        },
         "llm_model": {
             "type": "string",
             "enum": ["gpt-4", "gpt-3.5-turbo", "gpt-4-turbo"],
@@ -660,7 +1213,10 @@ INPUT_SCHEMA = {
     "properties": {
         "operation": {
             "type": "string",
-            "enum": ["natural_query", "execute_sql", "explain_query", "optimize_query", "get_schema"],
+            "enum": [
+                "natural_query", "execute_sql", "explain_query", "optimize_query", "get_schema",
+                "invalidate_schema_cache", "get_cache_stats", "invalidate_cache"
+            ],
             "description": "Operation to perform"
         },
         "question": {
@@ -678,6 +1234,17 @@ INPUT_SCHEMA = {
         "context": {
             "type": "object",
             "description": "Additional context for query generation"
+        },
+        "use_cache": {
+            "type": "boolean",
+            "default": True,
+            "description": "Reuse cached SQL and results (for natural_query, execute_sql)"
+        },
+        "tier": {
+            "type": "string",
+            "enum": ["sql", "results", "all"],
+            "default": "all",
+            "description": "Cache tier to clear (for invalidate_cache)"
         }
     },
     "required": ["operation"]
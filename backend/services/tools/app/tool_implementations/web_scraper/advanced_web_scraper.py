@@ -5,19 +5,19 @@ Intelligent web scraping with JavaScript rendering, rate limiting, and content e
 
 import asyncio
 import aiohttp
-import json
 import logging
 import re
 import time
-from typing import Dict, Any, List, Optional, Union
-from urllib.parse import urljoin, urlparse, parse_qs
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, Deque, List, Optional, Set, Tuple, Union
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, parse_qsl, urlencode
+from urllib.robotparser import RobotFileParser
 from datetime import datetime, timedelta
 import hashlib
 
 # Web scraping libraries
 import requests
-from bs4 import BeautifulSoup, Comment
-import lxml
 
 # Browser automation
 from selenium import webdriver
@@ -26,14 +26,183 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-# Content processing
-from readability import Document
-
-# Data extraction
-import pandas as pd
+# Content processing: HTML parsing runs in the extraction worker pool
+from app.services.html_extraction import get_html_extraction_pool
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# RFC 9309: crawlers must parse at least the first 500 KiB of robots.txt
+ROBOTS_MAX_BYTES = 500 * 1024
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """Canonical form used to deduplicate crawl URLs, or None for non-HTTP links.
+
+    Lowercases scheme and host, drops default ports and fragments, collapses an
+    empty path to "/" and sorts query parameters.
+    """
+    try:
+        parsed = urlparse(url.strip())
+        if parsed.scheme not in DEFAULT_PORTS or not parsed.hostname:
+            return None
+        netloc = parsed.hostname.lower()
+        if parsed.port and parsed.port != DEFAULT_PORTS[parsed.scheme]:
+            netloc = f"{netloc}:{parsed.port}"
+    except ValueError:
+        return None
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((parsed.scheme, netloc, parsed.path or "/", "", query, ""))
+
+
+class _HostLimiter:
+    """Per-host concurrency cap plus a minimum interval between request starts to the same host"""
+
+    def __init__(self, max_per_host: int, delay: float):
+        self.max_per_host = max(1, max_per_host)
+        self.default_delay = max(0.0, delay)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self._delays: Dict[str, float] = {}
+
+    def set_delay(self, host: str, delay: float) -> None:
+        """Override the politeness delay for one host"""
+        self._delays[host] = max(0.0, delay)
+
+    def delay_for(self, host: str) -> float:
+        return self._delays.get(host, self.default_delay)
+
+    async def wait_turn(self, host: str) -> None:
+        """Reserve the host's next start time and sleep until it.
+
+        The reservation happens before the first await, so concurrent callers
+        queue up one delay apart instead of all reading the same timestamp.
+        """
+        now = time.monotonic()
+        start = max(now, self._next_start.get(host, now))
+        self._next_start[host] = start + self.delay_for(host)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one of the host's connection slots for the duration of a fetch"""
+        host = urlparse(url).netloc.lower()
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        async with semaphore:
+            await self.wait_turn(host)
+            yield
+
+
+class _RobotsPolicy:
+    """Parsed robots.txt rules for one host; ``parser`` is None when everything is allowed"""
+
+    __slots__ = ("parser", "expires_at", "status")
+
+    def __init__(self, parser: Optional[RobotFileParser], expires_at: float, status: str):
+        self.parser = parser
+        self.expires_at = expires_at
+        self.status = status
+
+
+class _RobotsCache:
+    """robots.txt policies keyed by scheme and host, fetched once per TTL.
+
+    A missing robots.txt (4xx) allows everything and is cached like a real
+    one; fetch errors and timeouts also allow, but are retried sooner.
+    Concurrent lookups for the same host share one fetch.
+    """
+
+    def __init__(self, user_agent: str, ttl: float, error_ttl: float, timeout: float):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self._policies: Dict[str, _RobotsPolicy] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.fetches = 0
+        self.hits = 0
+
+    async def get(self, session: aiohttp.ClientSession, url: str) -> _RobotsPolicy:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc.lower()}"
+        while True:
+            policy = self._policies.get(origin)
+            if policy is not None and policy.expires_at > time.monotonic():
+                self.hits += 1
+                return policy
+
+            pending = self._pending.get(origin)
+            if pending is None:
+                break
+            try:
+                policy = await asyncio.shield(pending)
+                self.hits += 1
+                return policy
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The fetching task was cancelled; take over the fetch
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[origin] = future
+        try:
+            policy = await self._fetch(session, origin)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        finally:
+            del self._pending[origin]
+        self._policies[origin] = policy
+        future.set_result(policy)
+        return policy
+
+    async def _fetch(self, session: aiohttp.ClientSession, origin: str) -> _RobotsPolicy:
+        self.fetches += 1
+        now = time.monotonic()
+        try:
+            async with session.get(
+                f"{origin}/robots.txt",
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                allow_redirects=True
+            ) as response:
+                if response.status >= 500:
+                    return _RobotsPolicy(None, now + self.error_ttl, f"http_{response.status}")
+                if response.status >= 400:
+                    return _RobotsPolicy(None, now + self.ttl, f"http_{response.status}")
+                body = await response.content.read(ROBOTS_MAX_BYTES)
+        except Exception as e:
+            logger.debug(f"robots.txt fetch failed for {origin}: {e}")
+            return _RobotsPolicy(None, now + self.error_ttl, "error")
+
+        parser = RobotFileParser()
+        parser.parse(body.decode("utf-8", errors="replace").splitlines())
+        return _RobotsPolicy(parser, now + self.ttl, "ok")
+
+    def can_fetch(self, policy: _RobotsPolicy, url: str) -> bool:
+        return policy.parser is None or policy.parser.can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, policy: _RobotsPolicy) -> Optional[float]:
+        if policy.parser is None:
+            return None
+        delay = policy.parser.crawl_delay(self.user_agent)
+        if delay is None:
+            rate = policy.parser.request_rate(self.user_agent)
+            if rate and rate.requests:
+                delay = rate.seconds / rate.requests
+        return float(delay) if delay is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "hosts": len(self._policies),
+            "fetches": self.fetches,
+            "hits": self.hits
+        }
+
+
 class AdvancedWebScraper:
     """
     Advanced web scraper with intelligent content extraction,
@@ -54,9 +223,19 @@ class AdvancedWebScraper:
         self.follow_redirects = config.get("follow_redirects", True)
         self.max_pages = config.get("max_pages", 10)
         
-        # Rate limiting
-        self.request_history = {}
-        self.domain_delays = {}
+        # Rate limiting: politeness delay and connection cap per host, shared by every operation
+        self.host_limiter = _HostLimiter(
+            config.get("max_concurrent_per_host", 2),
+            self.delay_between_requests
+        )
+        
+        # robots.txt policies per host, shared by every operation
+        self.robots_cache = _RobotsCache(
+            user_agent=config.get("robots_user_agent", self.user_agent),
+            ttl=config.get("robots_cache_ttl", 3600),
+            error_ttl=config.get("robots_error_ttl", 300),
+            timeout=min(self.timeout, 10)
+        )
         
         # Browser driver for JavaScript rendering
         self.driver = None
@@ -119,14 +298,12 @@ class AdvancedWebScraper:
                     "url": url
                 }
             
-            # Apply rate limiting
-            await self._apply_rate_limiting(url)
-            
-            # Fetch content
-            if self.javascript_enabled:
-                content_data = await self._fetch_with_browser(url)
-            else:
-                content_data = await self._fetch_with_http(url)
+            # Fetch content within the host's concurrency and politeness limits
+            async with self.host_limiter.slot(url):
+                if self.javascript_enabled:
+                    content_data = await self._fetch_with_browser(url)
+                else:
+                    content_data = await self._fetch_with_http(url)
             
             # Extract structured data
             extracted_data = await self._extract_content(content_data, extraction_config or {})
@@ -200,6 +377,10 @@ class AdvancedWebScraper:
         """
         Crawl a website starting from a URL
         
+        Pages are fetched breadth-first by a pool of workers sharing one
+        frontier. URLs are normalized, filtered and deduplicated when they are
+        discovered, and each host is limited by ``host_limiter``.
+        
         Args:
             start_url: Starting URL for crawling
             crawl_config: Configuration for crawling behavior
@@ -210,47 +391,70 @@ class AdvancedWebScraper:
         try:
             config = crawl_config or {}
             max_depth = config.get("max_depth", 2)
+            max_pages = config.get("max_pages", self.max_pages)
             same_domain_only = config.get("same_domain_only", True)
-            url_patterns = config.get("url_patterns", [])
-            exclude_patterns = config.get("exclude_patterns", [])
-            
-            # Initialize crawling state
-            visited_urls = set()
-            to_visit = [(start_url, 0)]  # (url, depth)
-            crawl_results = []
-            
-            start_domain = urlparse(start_url).netloc
-            
-            while to_visit and len(visited_urls) < self.max_pages:
-                current_url, depth = to_visit.pop(0)
-                
-                if current_url in visited_urls or depth > max_depth:
-                    continue
-                
-                # Check domain restriction
-                if same_domain_only and urlparse(current_url).netloc != start_domain:
-                    continue
-                
-                # Check URL patterns
-                if url_patterns and not any(re.search(pattern, current_url) for pattern in url_patterns):
-                    continue
-                
-                if exclude_patterns and any(re.search(pattern, current_url) for pattern in exclude_patterns):
-                    continue
-                
-                visited_urls.add(current_url)
-                
-                # Scrape current URL
-                result = await self.scrape_url(current_url, config.get("extraction_config"))
-                crawl_results.append(result)
-                
-                # Extract links for next level
-                if result["status"] == "success" and depth < max_depth:
-                    links = result["content"].get("links", [])
-                    for link in links:
-                        absolute_url = urljoin(current_url, link.get("href", ""))
-                        if absolute_url not in visited_urls:
-                            to_visit.append((absolute_url, depth + 1))
+            url_patterns = [re.compile(pattern) for pattern in config.get("url_patterns", [])]
+            exclude_patterns = [re.compile(pattern) for pattern in config.get("exclude_patterns", [])]
+            worker_count = max(1, config.get("concurrency", self.config.get("max_concurrent_requests", 5)))
+            # Links are what drive the crawl, so always extract them
+            extraction_config = {**(config.get("extraction_config") or {}), "extract_links": True}
+            
+            start = normalize_url(start_url)
+            if start is None or not self._is_valid_url(start_url):
+                return {
+                    "status": "error",
+                    "error": "Invalid URL format",
+                    "start_url": start_url
+                }
+            start_domain = urlparse(start).netloc
+            
+            def accept(url: str) -> bool:
+                if same_domain_only and urlparse(url).netloc != start_domain:
+                    return False
+                if url_patterns and not any(pattern.search(url) for pattern in url_patterns):
+                    return False
+                return not any(pattern.search(url) for pattern in exclude_patterns)
+            
+            # Crawling state: FIFO frontier, every URL ever enqueued, and finished pages
+            frontier: Deque[Tuple[str, int]] = deque([(start, 0)])
+            seen: Set[str] = {start}
+            crawl_results: List[Dict[str, Any]] = []
+            in_flight = 0
+            dispatched = 0
+            wake = asyncio.Event()
+            started = time.perf_counter()
+            
+            async def worker():
+                nonlocal in_flight, dispatched
+                while True:
+                    if not frontier or dispatched >= max_pages:
+                        # Done once nothing is queued or running; otherwise wait for new links
+                        if in_flight == 0 or dispatched >= max_pages:
+                            wake.set()
+                            return
+                        wake.clear()
+                        await wake.wait()
+                        continue
+                    
+                    url, depth = frontier.popleft()
+                    dispatched += 1
+                    in_flight += 1
+                    try:
+                        result = await self.scrape_url(url, extraction_config)
+                        result["depth"] = depth
+                        crawl_results.append(result)
+                        
+                        if result["status"] == "success" and depth < max_depth:
+                            for link in result["content"].get("links", []):
+                                normalized = normalize_url(link.get("absolute_url") or urljoin(url, link.get("href", "")))
+                                if normalized and normalized not in seen and accept(normalized):
+                                    seen.add(normalized)
+                                    frontier.append((normalized, depth + 1))
+                    finally:
+                        in_flight -= 1
+                        wake.set()
+            
+            await asyncio.gather(*(worker() for _ in range(worker_count)))
             
             return {
                 "status": "success",
@@ -258,7 +462,10 @@ class AdvancedWebScraper:
                 "crawl_results": crawl_results,
                 "metadata": {
                     "pages_crawled": len(crawl_results),
-                    "urls_discovered": len(visited_urls),
+                    "urls_discovered": len(seen),
+                    "urls_pending": len(frontier),
+                    "workers": worker_count,
+                    "elapsed_seconds": round(time.perf_counter() - started, 3),
                     "crawl_time": datetime.now().isoformat()
                 }
             }
@@ -290,18 +497,9 @@ class AdvancedWebScraper:
                 return scrape_result
             
             html_content = scrape_result["content"].get("raw_html", "")
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # Extract data based on schema
-            extracted_data = {}
             
-            for field_name, field_config in schema.items():
-                try:
-                    value = await self._extract_field_value(soup, field_config)
-                    extracted_data[field_name] = value
-                except Exception as e:
-                    logger.warning(f"Failed to extract field {field_name}: {e}")
-                    extracted_data[field_name] = None
+            # Extract data based on schema, parsing the page once off the event loop
+            extracted_data = await get_html_extraction_pool().select_fields(html_content, schema)
             
             return {
                 "status": "success",
@@ -338,20 +536,9 @@ class AdvancedWebScraper:
             
             html_content = scrape_result["content"].get("raw_html", "")
             
-            # Extract tables using pandas
+            # Extract tables using pandas in the extraction worker pool
             try:
-                tables = pd.read_html(html_content)
-                
-                # Convert tables to list of dictionaries
-                table_data = []
-                for i, table in enumerate(tables):
-                    table_dict = {
-                        "table_index": i,
-                        "columns": table.columns.tolist(),
-                        "data": table.to_dict('records'),
-                        "shape": table.shape
-                    }
-                    table_data.append(table_dict)
+                table_data = await get_html_extraction_pool().read_tables(html_content)
                 
                 return {
                     "status": "success",
@@ -424,170 +611,33 @@ class AdvancedWebScraper:
             raise
     
     async def _extract_content(self, content_data: Dict[str, Any], extraction_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract structured content from HTML"""
+        """Extract structured content from HTML
+        
+        Parsing runs in the HTML extraction pool. ``extraction_config.fast``
+        selects the selectolax/lxml path, which returns only title, text,
+        meta description and links.
+        """
         try:
-            html_content = content_data["html"]
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # Remove unwanted elements
-            for element in soup(["script", "style", "nav", "footer", "header"]):
-                element.decompose()
-            
-            # Remove comments
-            for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-                comment.extract()
-            
-            extracted_data = {
-                "raw_html": html_content,
-                "title": self._extract_title(soup),
-                "text": self._extract_text(soup),
-                "meta_description": self._extract_meta_description(soup),
-                "headings": self._extract_headings(soup),
+            options = {
+                "links": self.extract_links or extraction_config.get("extract_links", False),
+                "images": self.extract_images or extraction_config.get("extract_images", False),
+                "main_content": extraction_config.get("extract_main_content", True),
+                "structured_data": extraction_config.get("extract_structured_data", False),
             }
-            
-            # Optional extractions based on config
-            if self.extract_links or extraction_config.get("extract_links", False):
-                extracted_data["links"] = self._extract_links(soup, content_data.get("url", ""))
-            
-            if self.extract_images or extraction_config.get("extract_images", False):
-                extracted_data["images"] = self._extract_images(soup, content_data.get("url", ""))
-            
-            # Extract main content using readability
-            if extraction_config.get("extract_main_content", True):
-                extracted_data["main_content"] = self._extract_main_content(html_content)
-            
-            # Extract structured data (JSON-LD, microdata)
-            if extraction_config.get("extract_structured_data", False):
-                extracted_data["structured_data"] = self._extract_structured_data(soup)
-            
-            return extracted_data
+            extracted = await get_html_extraction_pool().extract_page(
+                content_data["html"],
+                content_data.get("url", ""),
+                options,
+                fast=extraction_config.get("fast", False)
+            )
+            # Added here rather than in the worker so the page is not pickled back across processes
+            extracted["raw_html"] = content_data["html"]
+            return extracted
             
         except Exception as e:
             logger.error(f"Content extraction failed: {e}")
             raise
     
-    def _extract_title(self, soup: BeautifulSoup) -> str:
-        """Extract page title"""
-        title_tag = soup.find('title')
-        return title_tag.get_text().strip() if title_tag else ""
-    
-    def _extract_text(self, soup: BeautifulSoup) -> str:
-        """Extract clean text content"""
-        return soup.get_text(separator=' ', strip=True)
-    
-    def _extract_meta_description(self, soup: BeautifulSoup) -> str:
-        """Extract meta description"""
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        return meta_desc.get('content', '').strip() if meta_desc else ""
-    
-    def _extract_headings(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
-        """Extract all headings"""
-        headings = []
-        for heading in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            headings.append({
-                "level": heading.name,
-                "text": heading.get_text().strip()
-            })
-        return headings
-    
-    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
-        """Extract all links"""
-        links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            absolute_url = urljoin(base_url, href)
-            links.append({
-                "text": link.get_text().strip(),
-                "href": href,
-                "absolute_url": absolute_url
-            })
-        return links
-    
-    def _extract_images(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
-        """Extract all images"""
-        images = []
-        for img in soup.find_all('img'):
-            src = img.get('src', '')
-            if src:
-                absolute_url = urljoin(base_url, src)
-                images.append({
-                    "src": src,
-                    "absolute_url": absolute_url,
-                    "alt": img.get('alt', ''),
-                    "title": img.get('title', '')
-                })
-        return images
-    
-    def _extract_main_content(self, html_content: str) -> str:
-        """Extract main content using readability"""
-        try:
-            doc = Document(html_content)
-            return doc.summary()
-        except Exception as e:
-            logger.warning(f"Readability extraction failed: {e}")
-            return ""
-    
-    def _extract_structured_data(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
-        """Extract JSON-LD and microdata"""
-        structured_data = []
-        
-        # Extract JSON-LD
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-                structured_data.append({
-                    "type": "json-ld",
-                    "data": data
-                })
-            except json.JSONDecodeError:
-                continue
-        
-        return structured_data
-    
-    async def _extract_field_value(self, soup: BeautifulSoup, field_config: Dict[str, Any]) -> Any:
-        """Extract field value based on configuration"""
-        selector = field_config.get("selector")
-        attribute = field_config.get("attribute", "text")
-        data_type = field_config.get("type", "string")
-        multiple = field_config.get("multiple", False)
-        
-        if not selector:
-            return None
-        
-        # Find elements
-        if multiple:
-            elements = soup.select(selector)
-        else:
-            element = soup.select_one(selector)
-            elements = [element] if element else []
-        
-        # Extract values
-        values = []
-        for element in elements:
-            if not element:
-                continue
-                
-            if attribute == "text":
-                value = element.get_text().strip()
-            else:
-                value = element.get(attribute, "")
-            
-            # Type conversion
-            if data_type == "integer":
-                try:
-                    value = int(re.search(r'\d+', value).group())
-                except:
-                    value = None
-            elif data_type == "float":
-                try:
-                    value = float(re.search(r'\d+\.?\d*', value).group())
-                except:
-                    value = None
-            
-            values.append(value)
-        
-        return values if multiple else (values[0] if values else None)
-    
     def _is_valid_url(self, url: str) -> bool:
         """Validate URL format"""
         try:
@@ -597,36 +647,23 @@ class AdvancedWebScraper:
             return False
     
     async def _can_fetch(self, url: str) -> bool:
-        """Check robots.txt permissions"""
+        """Check robots.txt permissions and apply the host's Crawl-delay"""
         try:
-            parsed_url = urlparse(url)
-            robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-            
-            async with self.session.get(robots_url) as response:
-                if response.status == 200:
-                    robots_content = await response.text()
-                    # Simplified robots.txt parsing
-                    return "Disallow: /" not in robots_content
-                
-            return True  # Allow if robots.txt not found
-            
+            policy = await self.robots_cache.get(self.session, url)
         except Exception:
             return True  # Allow on error
+        
+        delay = self.robots_cache.crawl_delay(policy)
+        if delay is not None:
+            host = urlparse(url).netloc.lower()
+            delay = min(delay, self.config.get("max_crawl_delay", 30.0))
+            self.host_limiter.set_delay(host, max(self.delay_between_requests, delay))
+        
+        return self.robots_cache.can_fetch(policy, url)
     
     async def _apply_rate_limiting(self, url: str):
         """Apply rate limiting based on domain"""
-        domain = urlparse(url).netloc
-        current_time = time.time()
-        
-        if domain in self.request_history:
-            last_request_time = self.request_history[domain]
-            time_since_last = current_time - last_request_time
-            
-            if time_since_last < self.delay_between_requests:
-                sleep_time = self.delay_between_requests - time_since_last
-                await asyncio.sleep(sleep_time)
-        
-        self.request_history[domain] = current_time
+        await self.host_limiter.wait_turn(urlparse(url).netloc.lower())
     
     async def cleanup(self):
         """Cleanup resources"""
@@ -705,6 +742,35 @@ TOOL_CONFIG_SCHEMA = {
             "maximum": 20,
             "default": 5,
             "description": "Maximum concurrent requests"
+        },
+        "max_concurrent_per_host": {
+            "type": "integer",
+            "minimum": 1,
+            "maximum": 20,
+            "default": 2,
+            "description": "Maximum concurrent requests to a single host"
+        },
+        "robots_user_agent": {
+            "type": "string",
+            "description": "User agent matched against robots.txt groups (defaults to user_agent)"
+        },
+        "robots_cache_ttl": {
+            "type": "integer",
+            "minimum": 60,
+            "default": 3600,
+            "description": "Seconds to reuse a host's robots.txt rules"
+        },
+        "robots_error_ttl": {
+            "type": "integer",
+            "minimum": 10,
+            "default": 300,
+            "description": "Seconds before retrying a robots.txt that failed to load"
+        },
+        "max_crawl_delay": {
+            "type": "number",
+            "minimum": 0,
+            "default": 30.0,
+            "description": "Upper bound applied to a host's robots.txt Crawl-delay"
         }
     }
 }
@@ -0,0 +1,161 @@
+"""
+Pagination tests: ``_iter_pages`` stops at the last page and never requests past it
+"""
+
+import asyncio
+
+import pytest
+
+for module in ("aiohttp", "jwt", "jmespath", "jsonpath_ng", "requests_oauthlib", "pydantic_settings"):
+    pytest.importorskip(module)
+
+from app.tool_implementations.api_integration.universal_api_integration import UniversalAPIIntegration
+
+
+class _PagedApi:
+    """Serves ``items`` by page/offset or cursor and records every request's params"""
+
+    def __init__(self, items, totals=False, delay=0.0, fail_on_page=None):
+        self.items = items
+        self.totals = totals
+        self.delay = delay
+        self.fail_on_page = fail_on_page
+        self.requests = []
+        self.completed = 0
+
+    async def __call__(self, method, endpoint, params=None, **kwargs):
+        self.requests.append(dict(params))
+        await asyncio.sleep(self.delay)
+        self.completed += 1
+        size = params["limit"]
+        if "cursor" in params or "page" not in params and "offset" not in params:
+            start = int(params.get("cursor") or 0)
+        elif "offset" in params:
+            start = params["offset"]
+        else:
+            start = (params["page"] - 1) * size
+        if self.fail_on_page is not None and start // size + 1 == self.fail_on_page:
+            return {"status": "error", "error": "HTTP 500"}
+        body = {"data": self.items[start:start + size]}
+        if start + size < len(self.items):
+            body["next_cursor"] = str(start + size)
+        if self.totals:
+            body["total"] = len(self.items)
+        return {"status": "success", "response": {"data": body}}
+
+
+def _collect(api, config, stop_after=None):
+    tool = UniversalAPIIntegration({"base_url": "https://api.example.com"})
+    tool.make_request = api
+
+    async def run():
+        pages = []
+        iterator = tool._iter_pages("GET", "/items", config)
+        try:
+            async for page in iterator:
+                pages.append(page)
+                if stop_after is not None and len(pages) == stop_after:
+                    break
+        finally:
+            await iterator.aclose()
+        # Long enough for any request that was not cancelled to complete
+        await asyncio.sleep(api.delay * 5)
+        return pages
+
+    return asyncio.run(run())
+
+
+def _requested_pages(api):
+    return [params["page"] for params in api.requests]
+
+
+def test_short_page_ends_pagination():
+    api = _PagedApi(list(range(250)))
+    pages = _collect(api, {"type": "page", "page_size": 100, "max_pages": 10})
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert _requested_pages(api) == [1, 2, 3]
+
+
+def test_empty_page_ends_pagination_on_exact_multiple():
+    api = _PagedApi(list(range(200)))
+    pages = _collect(api, {"type": "page", "page_size": 100, "max_pages": 10})
+    assert [len(page) for page in pages] == [100, 100, 0]
+    assert _requested_pages(api) == [1, 2, 3]
+
+
+def test_known_total_prefetches_but_stops_at_last_page():
+    api = _PagedApi(list(range(300)), totals=True)
+    pages = _collect(api, {
+        "type": "page", "page_size": 100, "max_pages": 10,
+        "total_items_path": "total", "prefetch_pages": 4
+    })
+    assert [len(page) for page in pages] == [100, 100, 100]
+    assert sorted(_requested_pages(api)) == [1, 2, 3]
+
+
+def test_configured_total_pages_caps_requests():
+    api = _PagedApi(list(range(1000)))
+    pages = _collect(api, {"type": "page", "page_size": 100, "total_pages": 2})
+    assert len(pages) == 2
+    assert sorted(_requested_pages(api)) == [1, 2]
+
+
+def test_max_pages_caps_requests():
+    api = _PagedApi(list(range(1000)))
+    pages = _collect(api, {"type": "page", "page_size": 100, "max_pages": 3})
+    assert len(pages) == 3
+    assert _requested_pages(api) == [1, 2, 3]
+
+
+def test_next_page_indicator_ends_pagination():
+    api = _PagedApi(list(range(1000)))
+    pages = _collect(api, {
+        "type": "page", "page_size": 100, "max_pages": 10, "next_page_indicator": "next_cursor"
+    })
+    assert len(pages) == 10
+
+    api = _PagedApi(list(range(150)))
+    pages = _collect(api, {
+        "type": "page", "page_size": 100, "max_pages": 10, "next_page_indicator": "missing"
+    })
+    assert len(pages) == 1
+    assert _requested_pages(api) == [1]
+
+
+def test_offset_pagination():
+    api = _PagedApi(list(range(250)))
+    pages = _collect(api, {"type": "offset", "page_size": 100})
+    assert [page[0] for page in pages] == [0, 100, 200]
+    assert [params["offset"] for params in api.requests] == [0, 100, 200]
+
+
+def test_failed_page_ends_pagination():
+    api = _PagedApi(list(range(1000)), fail_on_page=2)
+    pages = _collect(api, {"type": "page", "page_size": 100, "max_pages": 10})
+    assert len(pages) == 1
+    assert _requested_pages(api) == [1, 2]
+
+
+def test_cursor_pagination_stops_without_next_cursor():
+    api = _PagedApi(list(range(250)))
+    pages = _collect(api, {"type": "cursor", "page_size": 100, "max_pages": 10})
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert [params.get("cursor") for params in api.requests] == [None, "100", "200"]
+
+
+def test_cursor_pagination_respects_max_pages():
+    api = _PagedApi(list(range(1000)))
+    pages = _collect(api, {"type": "cursor", "page_size": 100, "max_pages": 2})
+    assert len(pages) == 2
+    assert len(api.requests) == 2
+
+
+@pytest.mark.parametrize("config", [
+    {"type": "page", "page_size": 100, "total_pages": 10, "prefetch_pages": 4},
+    {"type": "cursor", "page_size": 100, "max_pages": 10},
+])
+def test_consumer_break_cancels_prefetched_requests(config):
+    api = _PagedApi(list(range(1000)), delay=0.01)
+    pages = _collect(api, config, stop_after=1)
+    assert len(pages) == 1
+    assert api.completed == 1
@@ -0,0 +1,37 @@
+"""
+Crawl frontier tests: URL normalization used to deduplicate crawl URLs
+"""
+
+import pytest
+
+for module in ("aiohttp", "requests", "selenium", "pydantic_settings", "bs4"):
+    pytest.importorskip(module)
+
+from app.tool_implementations.web_scraper.advanced_web_scraper import normalize_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTP://Example.COM", "http://example.com/"),
+    ("http://example.com:80/a", "http://example.com/a"),
+    ("https://example.com:443/a", "https://example.com/a"),
+    ("https://example.com:8443/a", "https://example.com:8443/a"),
+    ("http://example.com/a#section", "http://example.com/a"),
+    ("http://example.com/a?b=2&a=1", "http://example.com/a?a=1&b=2"),
+    ("http://example.com/a?flag=", "http://example.com/a?flag="),
+    ("  http://example.com/a  ", "http://example.com/a"),
+    ("mailto:someone@example.com", None),
+    ("javascript:void(0)", None),
+    ("/relative/path", None),
+    ("http://example.com:99999/", None),
+])
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_normalize_url_dedupes_equivalent_forms():
+    forms = [
+        "http://Example.com",
+        "http://example.com:80/",
+        "http://example.com/#top",
+    ]
+    assert len({normalize_url(url) for url in forms}) == 1
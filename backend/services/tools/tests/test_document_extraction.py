@@ -0,0 +1,137 @@
+"""
+Document extraction pool tests
+Jobs use builtins (``time.sleep``, ``os.getpid``) so they unpickle in the
+spawned workers without importing test code.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from app.core.config import get_settings
+from app.services.document_extraction import DocumentExtractionPool, ExtractionTimeoutError
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_result_and_errors_come_back_from_worker():
+    async def scenario():
+        pool = DocumentExtractionPool(max_workers=1, timeout_seconds=30, memory_limit_mb=0)
+        try:
+            assert await pool.submit(len, "abc") == 3
+            with pytest.raises(ValueError):
+                await pool.submit(int, "not a number")
+            # The worker survives a job that raised
+            assert await pool.submit(len, "ab") == 2
+        finally:
+            pool.shutdown()
+
+    _run(scenario())
+
+
+def test_timeout_starts_when_a_worker_picks_the_job_up():
+    async def scenario():
+        pool = DocumentExtractionPool(max_workers=1, timeout_seconds=30, memory_limit_mb=0)
+        try:
+            await pool.submit(len, "")  # start the worker outside the timed section
+            # Each job fits its budget, but the second waits behind the first
+            results = await asyncio.gather(
+                pool.submit(time.sleep, 0.8, timeout=1.5),
+                pool.submit(time.sleep, 0.8, timeout=1.5),
+            )
+            assert results == [None, None]
+        finally:
+            pool.shutdown()
+
+    _run(scenario())
+
+
+def test_timeout_kills_only_the_offending_worker():
+    async def scenario():
+        pool = DocumentExtractionPool(max_workers=2, timeout_seconds=30, memory_limit_mb=0)
+        try:
+            pids = set(await asyncio.gather(pool.submit(os.getpid), pool.submit(os.getpid)))
+            slow = pool.submit(time.sleep, 30, timeout=0.5)
+            healthy = pool.submit(time.sleep, 1.5, timeout=10)
+            slow_result, healthy_result = await asyncio.gather(slow, healthy, return_exceptions=True)
+
+            assert isinstance(slow_result, ExtractionTimeoutError)
+            assert healthy_result is None
+
+            # One of the original workers is still serving jobs
+            surviving = set(await asyncio.gather(pool.submit(os.getpid), pool.submit(os.getpid)))
+            assert len(pids & surviving) == 1
+        finally:
+            pool.shutdown()
+
+    _run(scenario())
+
+
+def _minimal_pdf(text):
+    """A one-page PDF showing ``text`` in Helvetica"""
+    content = f"BT /F1 18 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+def _default_pool():
+    settings = get_settings()
+    return DocumentExtractionPool(
+        max_workers=1, timeout_seconds=600, memory_limit_mb=settings.EXTRACTION_MEMORY_LIMIT_MB
+    )
+
+
+def test_docling_loads_under_the_default_memory_limit():
+    pytest.importorskip("docling")
+
+    async def scenario():
+        pool = _default_pool()
+        try:
+            # torch alone maps several GB of address space when it is imported
+            await pool.submit(exec, "import torch\nimport docling.document_converter")
+        finally:
+            pool.shutdown()
+
+    _run(scenario())
+
+
+def test_docling_conversion_under_the_default_memory_limit(tmp_path):
+    pytest.importorskip("docling")
+    path = tmp_path / "report.pdf"
+    path.write_bytes(_minimal_pdf("Quarterly revenue grew strongly"))
+
+    async def scenario():
+        pool = _default_pool()
+        try:
+            return await pool.convert_with_docling(str(path))
+        finally:
+            pool.shutdown()
+
+    try:
+        result = _run(scenario())
+    except OSError as e:
+        # Docling fetches its layout and OCR models from the Hugging Face Hub on first use
+        pytest.skip(f"Docling models are not available: {e}")
+    assert "Quarterly revenue grew strongly" in result["main_text"]
@@ -0,0 +1,76 @@
+"""
+HTML extraction parity tests
+The fast path (selectolax or lxml) must produce the same title, text, meta
+description and links as the BeautifulSoup extractor.
+"""
+
+import sys
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("bs4")
+pytest.importorskip("lxml")
+
+from app.services.html_extraction import extract_page, extract_page_fast
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <title> Parity Page </title>
+  <meta name="description" content=" A test page ">
+  <style>p { color: red; }</style>
+  <script>var hidden = 1;</script>
+</head>
+<body>
+  <header><a href="/home">Home</a></header>
+  <nav><a href="/nav">Nav link</a></nav>
+  <!-- a comment -->
+  <h1>T</h1><p>Real</p><p>content <b>with</b> inline <a href="docs/a">markup</a></p>
+  <ul><li>one</li><li>two</li></ul>
+  <div>cell<div>nested</div>tail</div>
+  <footer>Footer text</footer>
+</body>
+</html>"""
+
+OPTIONS = {"links": True, "main_content": False}
+BASE_URL = "https://example.com/section/"
+
+
+@pytest.fixture(params=["selectolax", "lxml"])
+def fast_extract(request, monkeypatch):
+    if request.param == "selectolax":
+        pytest.importorskip("selectolax")
+    else:
+        # A None entry makes "from selectolax.parser import ..." raise ImportError
+        monkeypatch.setitem(sys.modules, "selectolax.parser", None)
+    return extract_page_fast
+
+
+def test_fast_path_matches_full_extractor(fast_extract):
+    full = extract_page(PAGE, BASE_URL, OPTIONS)
+    fast = fast_extract(PAGE, BASE_URL, OPTIONS)
+
+    for field in ("title", "text", "meta_description", "links"):
+        assert fast[field] == full[field], field
+
+
+def test_blocks_are_separated(fast_extract):
+    text = fast_extract(PAGE, BASE_URL, OPTIONS)["text"]
+    assert "T Real content" in text
+    assert "one two" in text
+    assert "cell nested tail" in text
+    assert "TReal" not in text
+
+
+def test_removed_regions_and_comments_are_dropped(fast_extract):
+    result = fast_extract(PAGE, BASE_URL, OPTIONS)
+    for fragment in ("Footer text", "Nav link", "hidden", "a comment", "color: red"):
+        assert fragment not in result["text"]
+    assert [link["href"] for link in result["links"]] == ["docs/a"]
+    assert result["links"][0]["absolute_url"] == "https://example.com/section/docs/a"
+
+
+def test_page_is_not_echoed_back():
+    assert "raw_html" not in extract_page(PAGE, BASE_URL, OPTIONS)
+    assert "raw_html" not in extract_page_fast(PAGE, BASE_URL, OPTIONS)
@@ -0,0 +1,201 @@
+"""
+HTTP response cache tests: freshness, 304 revalidation and request coalescing
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from app.services import http_response_cache
+from app.services.http_response_cache import HttpResponseCache, make_key, parse_cache_control
+
+KEY = make_key("https://api.example.com/items", {"page": 1}, {"Authorization": "Bearer a"})
+
+
+class _Upstream:
+    """Returns the queued responses in order and records the conditional headers sent"""
+
+    def __init__(self, *responses, delay=0.0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.sent = []
+
+    async def __call__(self, conditional_headers):
+        self.sent.append(conditional_headers)
+        await asyncio.sleep(self.delay)
+        return self.responses.pop(0)
+
+
+def _ok(body, headers):
+    return {"status_code": 200, "headers": headers, "data": body}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(http_response_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_parse_cache_control():
+    assert parse_cache_control('max-age=60, no-cache, private="x"') == {
+        "max-age": "60", "no-cache": None, "private": "x"
+    }
+    assert parse_cache_control(None) == {}
+
+
+def test_make_key_separates_credentials():
+    other = make_key("https://api.example.com/items", {"page": 1}, {"authorization": "Bearer b"})
+    assert KEY != other
+    assert KEY == make_key("https://api.example.com/items", {"page": "1"}, {"authorization": "Bearer a"})
+
+
+def test_fresh_entry_is_served_without_upstream_call(clock):
+    cache = HttpResponseCache()
+    upstream = _Upstream(_ok({"v": 1}, {"Cache-Control": "max-age=60"}))
+
+    async def run():
+        first = await cache.get_or_fetch(KEY, upstream, default_ttl=300)
+        clock[0] += 59
+        second = await cache.get_or_fetch(KEY, upstream, default_ttl=300)
+        return first, second
+
+    (first, first_status), (second, second_status) = asyncio.run(run())
+    assert (first_status, second_status) == ("miss", "hit")
+    assert second["data"] == {"v": 1}
+    assert len(upstream.sent) == 1
+
+
+def test_expired_entry_revalidates_with_validators(clock):
+    cache = HttpResponseCache()
+    upstream = _Upstream(
+        _ok({"v": 1}, {
+            "Cache-Control": "max-age=60",
+            "ETag": '"abc"',
+            "Last-Modified": "Wed, 14 Oct 2026 10:00:00 GMT",
+            "Content-Type": "application/json",
+        }),
+        {"status_code": 304, "headers": {"cache-control": "max-age=120", "etag": '"abc"'}, "data": None},
+    )
+
+    async def run():
+        await cache.get_or_fetch(KEY, upstream, default_ttl=300)
+        clock[0] += 61
+        revalidated = await cache.get_or_fetch(KEY, upstream, default_ttl=300)
+        clock[0] += 119
+        again = await cache.get_or_fetch(KEY, upstream, default_ttl=300)
+        return revalidated, again
+
+    (response, status), (_, again_status) = asyncio.run(run())
+    assert upstream.sent[1] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 14 Oct 2026 10:00:00 GMT",
+    }
+    assert status == "revalidated"
+    assert response["status_code"] == 200
+    assert response["data"] == {"v": 1}
+    # The 304's headers replace the stored ones case-insensitively
+    headers = {name.lower(): value for name, value in response["headers"].items()}
+    assert len(headers) == len(response["headers"])
+    assert headers["cache-control"] == "max-age=120"
+    assert headers["content-type"] == "application/json"
+    # Freshness comes from the 304's Cache-Control
+    assert again_status == "hit"
+    assert len(upstream.sent) == 2
+    assert cache.get_stats()["revalidated"] == 1
+
+
+def test_changed_resource_replaces_entry(clock):
+    cache = HttpResponseCache()
+    upstream = _Upstream(
+        _ok({"v": 1}, {"Cache-Control": "no-cache", "ETag": '"v1"'}),
+        _ok({"v": 2}, {"Cache-Control": "no-cache", "ETag": '"v2"'}),
+        {"status_code": 304, "headers": {}, "data": None},
+    )
+
+    async def run():
+        results = []
+        for _ in range(3):
+            results.append(await cache.get_or_fetch(KEY, upstream, default_ttl=300))
+            clock[0] += 1
+        return results
+
+    results = asyncio.run(run())
+    assert [status for _, status in results] == ["miss", "miss", "revalidated"]
+    assert upstream.sent[1] == {"If-None-Match": '"v1"'}
+    assert upstream.sent[2] == {"If-None-Match": '"v2"'}
+    assert results[2][0]["data"] == {"v": 2}
+
+
+def test_no_store_is_never_cached():
+    cache = HttpResponseCache()
+    upstream = _Upstream(
+        _ok({"v": 1}, {"Cache-Control": "no-store", "ETag": '"abc"'}),
+        _ok({"v": 2}, {"Cache-Control": "no-store"}),
+    )
+
+    async def run():
+        return [await cache.get_or_fetch(KEY, upstream, default_ttl=300) for _ in range(2)]
+
+    results = asyncio.run(run())
+    assert [status for _, status in results] == ["miss", "miss"]
+    assert upstream.sent == [{}, {}]
+
+
+def test_concurrent_requests_share_one_fetch():
+    cache = HttpResponseCache()
+    upstream = _Upstream(_ok({"v": 1}, {"Cache-Control": "max-age=60"}), delay=0.05)
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_fetch(KEY, upstream, default_ttl=300) for _ in range(4)))
+
+    results = asyncio.run(run())
+    assert sorted(status for _, status in results) == ["coalesced"] * 3 + ["miss"]
+    assert len(upstream.sent) == 1
+
+
+def test_no_store_on_revalidation_drops_entry(clock):
+    cache = HttpResponseCache()
+    upstream = _Upstream(
+        _ok({"v": 1}, {"Cache-Control": "no-cache", "ETag": '"v1"'}),
+        {"status_code": 304, "headers": {"Cache-Control": "no-store"}, "data": None},
+        _ok({"v": 2}, {"Cache-Control": "no-store"}),
+    )
+
+    async def run():
+        return [await cache.get_or_fetch(KEY, upstream, default_ttl=300) for _ in range(3)]
+
+    results = asyncio.run(run())
+    assert [status for _, status in results] == ["miss", "revalidated", "miss"]
+    assert results[1][0]["data"] == {"v": 1}
+    # Nothing left to revalidate against
+    assert upstream.sent[2] == {}
+    assert cache.get_stats()["entries"] == 0
+
+
+class _Redis:
+    def __init__(self, values):
+        self.values = values
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+@pytest.mark.parametrize("raw", ["{not json", "[]", '{"expires_at": "soon", "response": {}}', '{"expires_at": 1}'])
+def test_corrupt_redis_entry_is_a_miss(clock, raw):
+    cache = HttpResponseCache()
+    cache._redis = _Redis({cache.key_prefix + KEY: raw})
+    upstream = _Upstream(_ok({"v": 1}, {"Cache-Control": "max-age=60"}))
+
+    async def run():
+        return [await cache.get_or_fetch(KEY, upstream, default_ttl=300) for _ in range(2)]
+
+    results = asyncio.run(run())
+    assert [status for _, status in results] == ["miss", "hit"]
+    assert cache.get_stats()["redis_errors"] == 1
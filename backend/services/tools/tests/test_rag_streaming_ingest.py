@@ -0,0 +1,152 @@
+"""
+Streaming ingestion tests: chunk boundaries and batched embedding/storage
+"""
+
+import asyncio
+
+import pytest
+
+for module in ("asyncpg", "aiofiles", "chardet", "numpy", "openai", "sentence_transformers", "pydantic_settings"):
+    pytest.importorskip(module)
+
+from app.services.rag_service import EnhancedRAGService
+
+WORDS = [f"word{i:04d}" for i in range(3000)]
+TEXT = " ".join(WORDS)
+RECURSIVE = {"method": "recursive", "chunk_size": 200, "chunk_overlap": 0}
+
+
+async def _blocks(words, sizes):
+    """Yield the words as blocks of varying size, the way page windows arrive"""
+    start = 0
+    i = 0
+    while start < len(words):
+        size = sizes[i % len(sizes)]
+        yield " ".join(words[start:start + size])
+        start += size
+        i += 1
+
+
+def _stream_chunks(service, words, sizes, config):
+    async def collect():
+        return [chunk async for chunk in service._iter_chunks(_blocks(words, sizes), config)]
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("sizes", [[1], [7], [500], [3, 250, 41], [5000]])
+def test_streamed_chunks_match_whole_text_chunking(sizes):
+    service = EnhancedRAGService()
+    streamed = _stream_chunks(service, WORDS, sizes, RECURSIVE)
+    assert streamed == service._create_chunks(TEXT, RECURSIVE)
+
+
+def test_chunks_respect_size_and_keep_every_word():
+    service = EnhancedRAGService()
+    streamed = _stream_chunks(service, WORDS, [13, 400], RECURSIVE)
+    assert all(len(chunk) <= RECURSIVE["chunk_size"] for chunk in streamed)
+    assert " ".join(streamed).split() == WORDS
+
+
+def test_empty_and_tiny_inputs():
+    service = EnhancedRAGService()
+    assert _stream_chunks(service, [], [10], RECURSIVE) == []
+    assert _stream_chunks(service, ["only"], [10], RECURSIVE) == ["only"]
+
+
+class _FakeIngestService(EnhancedRAGService):
+    """Replaces extraction, embedding and storage with in-memory fakes"""
+
+    def __init__(self, fail_batches=(), block_size=997):
+        super().__init__()
+        self.fail_batches = set(fail_batches)
+        self.block_size = block_size
+        self.embed_calls = []
+        self.stored = []
+
+    async def _get_pipeline_config(self, pipeline_id):
+        return {"chunking_strategy": RECURSIVE, "vectorization_config": {"embedding_model": "text-embedding-3-small"}}
+
+    async def _iter_file_text(self, file_path, filename):
+        # Raw file blocks end at arbitrary offsets, usually in the middle of a word
+        for start in range(0, len(TEXT), self.block_size):
+            yield TEXT[start:start + self.block_size]
+
+    async def _generate_embeddings(self, texts, model_name):
+        self.embed_calls.append(len(texts))
+        if len(self.embed_calls) - 1 in self.fail_batches:
+            raise RuntimeError("provider unavailable")
+        return [[float(len(text))] for text in texts]
+
+    async def _store_chunks(self, pipeline_id, chunks, collection_name="default"):
+        self.stored.extend(chunks)
+
+
+def _ingest(service):
+    return asyncio.run(service.ingest_document_stream("p1", "/tmp/doc.txt", "doc.txt"))
+
+
+def test_chunks_are_embedded_and_stored_in_batches(monkeypatch):
+    from app.services import rag_service
+    monkeypatch.setattr(rag_service.get_settings(), "STREAMING_EMBED_BATCH_SIZE", 16)
+
+    service = _FakeIngestService()
+    result = _ingest(service)
+
+    total = len(service._create_chunks(TEXT, RECURSIVE))
+    assert result["status"] == "success"
+    assert result["chunks_created"] == total
+    assert max(service.embed_calls) == 16
+    assert sum(service.embed_calls) == total
+    assert [metadata["chunk_index"] for _, _, metadata in service.stored] == list(range(total))
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 997, 4096])
+def test_words_split_across_blocks_are_rejoined(block_size):
+    service = _FakeIngestService(block_size=block_size)
+    result = _ingest(service)
+    assert result["status"] == "success"
+    assert [chunk for chunk, _, _ in service.stored] == service._create_chunks(TEXT, RECURSIVE)
+
+
+def test_failed_batches_are_reported(monkeypatch):
+    from app.services import rag_service
+    monkeypatch.setattr(rag_service.get_settings(), "STREAMING_EMBED_BATCH_SIZE", 16)
+
+    partial = _ingest(_FakeIngestService(fail_batches={1}))
+    assert partial["status"] == "partial"
+    assert partial["chunks_failed"] == 16
+    assert partial["errors"]
+
+    failed = _ingest(_FakeIngestService(fail_batches=set(range(1000))))
+    assert failed["status"] == "error"
+    assert failed["chunks_created"] == 0
+
+
+class _CodecRecorder:
+    """Stands in for an asyncpg connection during pool ``init``"""
+
+    def __init__(self):
+        self.codecs = {}
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.codecs[typename] = kwargs
+
+
+def test_pool_connections_encode_embedding_lists_as_vectors(monkeypatch):
+    from app.services import rag_service
+    pool_kwargs = {}
+
+    async def create_pool(dsn, **kwargs):
+        pool_kwargs.update(kwargs)
+        return object()
+
+    monkeypatch.setattr(rag_service.asyncpg, "create_pool", create_pool)
+    asyncio.run(EnhancedRAGService().initialize("postgresql://localhost/rag"))
+
+    conn = _CodecRecorder()
+    asyncio.run(pool_kwargs["init"](conn))
+    codec = conn.codecs["vector"]
+    # The same list shape _store_chunks passes as the embedding parameter
+    embedding = [0.25, -1.5, 3.0]
+    assert codec["format"] == "binary"
+    assert codec["decoder"](codec["encoder"](embedding)).to_list() == embedding
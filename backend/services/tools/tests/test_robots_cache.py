@@ -0,0 +1,155 @@
+"""
+robots.txt tests: per-host policy caching, shared fetches and error TTLs
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+for module in ("aiohttp", "requests", "selenium", "pydantic_settings", "bs4"):
+    pytest.importorskip(module)
+
+from app.tool_implementations.web_scraper import advanced_web_scraper
+from app.tool_implementations.web_scraper.advanced_web_scraper import _RobotsCache
+
+ROBOTS_TXT = b"""User-agent: *
+Disallow: /private
+Crawl-delay: 2
+"""
+
+
+class _Response:
+    def __init__(self, status, body=b""):
+        self.status = status
+        self.content = self
+        self._body = body
+
+    async def read(self, limit=-1):
+        return self._body if limit < 0 else self._body[:limit]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Session:
+    """Serves robots.txt per origin and counts requests"""
+
+    def __init__(self, responses, delay=0.0):
+        self.responses = responses
+        self.delay = delay
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append(url)
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        session = self
+
+        class _Pending:
+            async def __aenter__(self):
+                await asyncio.sleep(session.delay)
+                return response
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Pending()
+
+
+def _cache():
+    return _RobotsCache(user_agent="TestBot", ttl=3600, error_ttl=60, timeout=5)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(advanced_web_scraper, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_robots_fetched_once_per_host():
+    session = _Session({"https://example.com/robots.txt": _Response(200, ROBOTS_TXT)})
+    cache = _cache()
+
+    async def run():
+        return [await cache.get(session, f"https://Example.com/page{i}") for i in range(3)]
+
+    policies = asyncio.run(run())
+    assert session.requests == ["https://example.com/robots.txt"]
+    assert policies[0] is policies[1] is policies[2]
+    assert cache.can_fetch(policies[0], "https://example.com/public")
+    assert not cache.can_fetch(policies[0], "https://example.com/private/x")
+    assert cache.crawl_delay(policies[0]) == 2.0
+    assert cache.get_stats() == {"hosts": 1, "fetches": 1, "hits": 2}
+
+
+def test_concurrent_lookups_share_one_fetch():
+    session = _Session({"https://example.com/robots.txt": _Response(200, ROBOTS_TXT)}, delay=0.05)
+    cache = _cache()
+
+    async def run():
+        return await asyncio.gather(*(cache.get(session, f"https://example.com/{i}") for i in range(5)))
+
+    policies = asyncio.run(run())
+    assert len(session.requests) == 1
+    assert all(policy is policies[0] for policy in policies)
+
+
+def test_origins_are_cached_separately():
+    session = _Session({
+        "https://example.com/robots.txt": _Response(200, ROBOTS_TXT),
+        "http://example.com/robots.txt": _Response(404),
+        "https://other.example/robots.txt": _Response(404),
+    })
+    cache = _cache()
+
+    async def run():
+        for url in ("https://example.com/a", "http://example.com/a", "https://other.example/a"):
+            await cache.get(session, url)
+
+    asyncio.run(run())
+    assert len(session.requests) == 3
+
+
+def test_missing_robots_allows_everything_for_full_ttl(clock):
+    session = _Session({"https://example.com/robots.txt": _Response(404)})
+    cache = _cache()
+
+    policy = asyncio.run(cache.get(session, "https://example.com/private"))
+    assert policy.status == "http_404"
+    assert cache.can_fetch(policy, "https://example.com/private")
+    assert cache.crawl_delay(policy) is None
+
+    clock[0] += 3599
+    asyncio.run(cache.get(session, "https://example.com/a"))
+    assert len(session.requests) == 1
+
+    clock[0] += 2
+    asyncio.run(cache.get(session, "https://example.com/a"))
+    assert len(session.requests) == 2
+
+
+@pytest.mark.parametrize("response, status", [
+    (_Response(503), "http_503"),
+    (ConnectionError("refused"), "error"),
+])
+def test_failed_robots_fetch_is_retried_after_error_ttl(clock, response, status):
+    session = _Session({"https://example.com/robots.txt": response})
+    cache = _cache()
+
+    policy = asyncio.run(cache.get(session, "https://example.com/a"))
+    assert policy.status == status
+    assert cache.can_fetch(policy, "https://example.com/private")
+
+    clock[0] += 59
+    asyncio.run(cache.get(session, "https://example.com/a"))
+    assert len(session.requests) == 1
+
+    clock[0] += 2
+    asyncio.run(cache.get(session, "https://example.com/a"))
+    assert len(session.requests) == 2
@@ -0,0 +1,89 @@
+"""
+IntelligentSQLAgent cache tests: generated SQL is cached only once it ran
+"""
+
+import asyncio
+
+import pytest
+
+for module in ("asyncpg", "psycopg2", "sqlalchemy", "openai"):
+    pytest.importorskip(module)
+
+from app.tool_implementations.sql_agent.intelligent_sql_agent import IntelligentSQLAgent
+
+
+class _FakeBackend:
+    def __init__(self):
+        self.failing = set()
+        self.calls = []
+
+    async def fetch(self, sql_query, parameters, max_rows):
+        self.calls.append(sql_query)
+        if sql_query in self.failing:
+            raise RuntimeError("column does not exist")
+        return ["n"], [{"n": 1}], False
+
+
+class _FakeAgent(IntelligentSQLAgent):
+    """Replaces the schema, the LLM and result formatting with fakes"""
+
+    def __init__(self, generated):
+        super().__init__({"database_type": "postgresql"})
+        self.backend = _FakeBackend()
+        self.generated = list(generated)
+
+    async def _get_schema_info(self):
+        return {"tables": {"t": {}}}
+
+    async def _generate_sql_query(self, question, schema_info, context):
+        return self.generated.pop(0)
+
+    async def _format_results(self, result, question):
+        return {"data": result["data"], "summary": ""}
+
+
+def _ask(agent, use_cache=True):
+    return asyncio.run(agent.natural_language_query("How many rows?", use_cache=use_cache))
+
+
+def test_sql_that_fails_to_run_is_not_replayed():
+    agent = _FakeAgent(["SELECT bad FROM t", "SELECT n FROM t"])
+    agent.backend.failing.add("SELECT bad FROM t")
+
+    assert _ask(agent)["status"] == "error"
+    second = _ask(agent)
+    assert second["status"] == "success"
+    assert second["sql_query"] == "SELECT n FROM t"
+    assert second["metadata"]["cache"]["sql"] == "miss"
+
+
+def test_failure_drops_previously_cached_sql():
+    agent = _FakeAgent(["SELECT n FROM t", "SELECT n + 1 FROM t"])
+    assert _ask(agent)["status"] == "success"
+
+    # The cached SQL stops working (e.g. a dropped column); clear the rows so it runs again
+    agent.backend.failing.add("SELECT n FROM t")
+    agent.result_cache.clear()
+    assert _ask(agent)["status"] == "error"
+
+    third = _ask(agent)
+    assert third["sql_query"] == "SELECT n + 1 FROM t"
+    assert third["metadata"]["cache"]["sql"] == "miss"
+
+
+def test_uncached_call_replaces_cached_sql():
+    agent = _FakeAgent(["SELECT n FROM t", "SELECT n AS total FROM t"])
+    _ask(agent)
+    assert _ask(agent, use_cache=False)["metadata"]["cache"]["sql"] == "bypass"
+    assert _ask(agent)["sql_query"] == "SELECT n AS total FROM t"
+
+
+def test_cached_results_are_marked_as_cached():
+    agent = _FakeAgent(["SELECT n FROM t"])
+    first = _ask(agent)
+    second = _ask(agent)
+
+    assert first["metadata"]["execution_time"] is not None
+    assert second["metadata"]["cache"] == {"sql": "hit", "result": "hit"}
+    assert second["metadata"]["execution_time"] is None
+    assert agent.backend.calls == ["SELECT n FROM t"]
@@ -89,6 +89,9 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down Default Workflow Service")
+    if workflow_agent is not None:
+        # Persist buffered short-term memory before exiting
+        await workflow_agent.close()
 
 @app.get("/")
 async def root():
@@ -326,6 +329,14 @@ async def stream_a2a_message(request: A2ARequest):
         }
     )
 
+@app.get("/memory/write-behind/stats")
+async def get_memory_write_behind_stats():
+    """Backlog and throughput of the short-term memory write-behind buffer"""
+    if workflow_agent is None or workflow_agent.memory_manager.write_buffer is None:
+        raise HTTPException(status_code=503, detail="Workflow agent not initialized")
+    
+    return workflow_agent.memory_manager.write_buffer.get_stats()
+
 @app.get("/memory/sessions/{session_id}/stats")
 async def get_session_memory_stats(session_id: str):
     """Get memory statistics for a session"""
@@ -5,6 +5,7 @@ Implements intelligent workflow/agent/tool selection based on user queries
 
 import asyncio
 import json
+import time
 import uuid
 from typing import Dict, List, Any, Optional, TypedDict, Annotated
 from datetime import datetime, timedelta
@@ -20,7 +21,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableConfig
 
 # Database and storage
-import redis
+import redis.asyncio as redis
 import asyncpg
 from pgvector.asyncpg import register_vector
 
@@ -43,6 +44,12 @@ class WorkflowConfig:
     default_llm_provider: str = "openai"
     memory_ttl_hours: int = 24
     max_execution_steps: int = 10
+    # Write-behind persistence of short-term memory to Postgres
+    memory_batch_size: int = 200
+    memory_flush_interval_seconds: float = 0.5
+    memory_max_pending: int = 10000
+    # Reuse the gateway metadata catalog for this long before revalidating it with its ETag
+    metadata_revalidate_seconds: float = 30.0
 
 class AgentState(TypedDict):
     """State maintained throughout workflow execution"""
@@ -63,6 +70,114 @@ class AgentState(TypedDict):
     is_complete: bool
     final_response: str
 
+class MemoryWriteBehindBuffer:
+    """Buffers short-term memory rows and persists them to Postgres in batches
+    
+    Rows are flushed with COPY once ``batch_size`` rows are queued or
+    ``flush_interval`` seconds have passed since the first one. When
+    ``max_pending`` rows are waiting, producers block until the flusher catches
+    up; those waits are counted as backpressure.
+    """
+    
+    COLUMNS = ["session_id", "execution_id", "memory_type", "content", "metadata", "created_at", "expires_at"]
+    
+    def __init__(self, pool: asyncpg.Pool, batch_size: int = 200,
+                 flush_interval: float = 0.5, max_pending: int = 10000):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._flusher: Optional[asyncio.Task] = None
+        
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.batches_written = 0
+        self.backpressure_waits = 0
+        self.backpressure_seconds = 0.0
+        self.last_flush_seconds = 0.0
+    
+    def start(self):
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+    
+    async def submit(self, row: tuple):
+        """Queue a row for persistence; only waits when the buffer is full"""
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.backpressure_waits += 1
+            started = time.perf_counter()
+            await self.queue.put(row)
+            self.backpressure_seconds += time.perf_counter() - started
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            row = await self.queue.get()
+            if row is None:
+                return
+            batch = [row]
+            deadline = loop.time() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    stop = True
+                    break
+                batch.append(row)
+            await self._write(batch)
+            if stop:
+                return
+    
+    async def _write(self, batch: List[tuple]):
+        started = time.perf_counter()
+        for attempt in range(2):
+            try:
+                async with self.pool.acquire() as conn:
+                    await conn.copy_records_to_table(
+                        "workflow_short_memory", records=batch, columns=self.COLUMNS
+                    )
+                self.rows_written += len(batch)
+                self.batches_written += 1
+                self.last_flush_seconds = time.perf_counter() - started
+                return
+            except Exception as e:
+                if attempt:
+                    self.rows_failed += len(batch)
+                    logger.error(f"Failed to persist {len(batch)} short-term memory rows: {e}")
+                else:
+                    await asyncio.sleep(0.5)
+    
+    async def close(self, timeout: float = 10.0):
+        """Flush everything still buffered and stop the flusher"""
+        if self._flusher is None:
+            return
+        await self.queue.put(None)
+        try:
+            await asyncio.wait_for(self._flusher, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Short-term memory flush timed out with {self.queue.qsize()} rows pending")
+            self._flusher.cancel()
+        self._flusher = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.queue.qsize(),
+            "max_pending": self.queue.maxsize,
+            "rows_written": self.rows_written,
+            "rows_failed": self.rows_failed,
+            "batches_written": self.batches_written,
+            "backpressure_waits": self.backpressure_waits,
+            "backpressure_seconds": round(self.backpressure_seconds, 3),
+            "last_flush_seconds": round(self.last_flush_seconds, 4)
+        }
+
 class MemoryManager:
     """Manages short and long-term memory using Redis and PGVector"""
     
@@ -70,6 +185,7 @@ class MemoryManager:
         self.config = config
         self.redis_client = None
         self.postgres_pool = None
+        self.write_buffer: Optional[MemoryWriteBehindBuffer] = None
     
     async def initialize(self):
         """Initialize Redis and PostgreSQL connections"""
@@ -91,6 +207,14 @@ class MemoryManager:
                 # Create memory tables if not exist
                 await self._create_memory_tables(conn)
             
+            self.write_buffer = MemoryWriteBehindBuffer(
+                self.postgres_pool,
+                batch_size=self.config.memory_batch_size,
+                flush_interval=self.config.memory_flush_interval_seconds,
+                max_pending=self.config.memory_max_pending
+            )
+            self.write_buffer.start()
+            
             logger.info("Memory manager initialized successfully")
             
         except Exception as e:
@@ -149,35 +273,33 @@ class MemoryManager:
         metadata: Dict = None,
         ttl_hours: int = None
     ):
-        """Store short-term memory with TTL"""
+        """Store short-term memory with TTL
+        
+        The Redis write happens inline (one pipelined round trip); Postgres
+        persistence is handed to the write-behind buffer.
+        """
         try:
             # Store in Redis for fast access
             redis_key = f"short_memory:{session_id}:{execution_id}"
+            now = datetime.now()
+            ttl_hours = ttl_hours or self.config.memory_ttl_hours
             memory_item = {
                 "type": memory_type,
                 "content": content,
                 "metadata": metadata or {},
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
             
-            await self.redis_client.lpush(redis_key, json.dumps(memory_item))
-            await self.redis_client.expire(
-                redis_key, 
-                (ttl_hours or self.config.memory_ttl_hours) * 3600
-            )
-            
-            # Also store in PostgreSQL for persistence
-            expires_at = datetime.now() + timedelta(
-                hours=ttl_hours or self.config.memory_ttl_hours
-            )
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.lpush(redis_key, json.dumps(memory_item))
+                pipe.expire(redis_key, ttl_hours * 3600)
+                await pipe.execute()
             
-            async with self.postgres_pool.acquire() as conn:
-                await conn.execute("""
-                    INSERT INTO workflow_short_memory 
-                    (session_id, execution_id, memory_type, content, metadata, expires_at)
-                    VALUES ($1, $2, $3, $4, $5, $6)
-                """, session_id, execution_id, memory_type, content, 
-                    json.dumps(metadata or {}), expires_at)
+            # Also store in PostgreSQL for persistence (batched in the background)
+            await self.write_buffer.submit((
+                session_id, execution_id, memory_type, content,
+                json.dumps(metadata or {}), now, now + timedelta(hours=ttl_hours)
+            ))
             
             logger.debug(f"Stored short-term memory: {memory_type}")
             
@@ -256,6 +378,15 @@ class MemoryManager:
         except Exception as e:
             logger.error(f"Failed to store long-term memory: {e}")
     
+    async def close(self):
+        """Flush buffered memory writes and release connections"""
+        if self.write_buffer:
+            await self.write_buffer.close()
+        if self.redis_client:
+            await self.redis_client.aclose()
+        if self.postgres_pool:
+            await self.postgres_pool.close()
+    
     async def cleanup_expired_memory(self):
         """Clean up expired short-term memory"""
         try:
@@ -275,6 +406,10 @@ class MetadataFetcher:
     def __init__(self, config: WorkflowConfig):
         self.config = config
         self.http_client = httpx.AsyncClient(timeout=30.0)
+        self._metadata: Optional[Dict[str, List[Dict]]] = None
+        self._metadata_etag: Optional[str] = None
+        self._metadata_checked_at = 0.0
+        self._metadata_lock = asyncio.Lock()
     
     async def get_default_llm_model(self) -> Dict[str, Any]:
         """Get default LLM model from gateway"""
@@ -306,18 +441,40 @@ class MetadataFetcher:
             return {"name": "fallback", "provider": "openai", "model_name": "gpt-3.5-turbo"}
     
     async def get_metadata_options(self) -> Dict[str, List[Dict]]:
-        """Get available workflows, agents, and tools"""
-        try:
-            response = await self.http_client.get(f"{self.config.gateway_url}/api/v1/metadata/chat-options")
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.warning("Failed to fetch metadata options")
+        """Get available workflows, agents, and tools
+
+        The catalog is cached locally and revalidated with If-None-Match every
+        ``metadata_revalidate_seconds``; an unchanged catalog costs a 304.
+        The result is shared between callers and must not be mutated.
+        """
+        if self._metadata is not None and time.monotonic() - self._metadata_checked_at < self.config.metadata_revalidate_seconds:
+            return self._metadata
+
+        async with self._metadata_lock:
+            if self._metadata is not None and time.monotonic() - self._metadata_checked_at < self.config.metadata_revalidate_seconds:
+                return self._metadata
+
+            headers = {"If-None-Match": self._metadata_etag} if self._metadata is not None and self._metadata_etag else {}
+            try:
+                response = await self.http_client.get(
+                    f"{self.config.gateway_url}/api/v1/metadata/chat-options",
+                    headers=headers
+                )
+                if response.status_code == 304:
+                    self._metadata_checked_at = time.monotonic()
+                elif response.status_code == 200:
+                    self._metadata = response.json()
+                    self._metadata_etag = response.headers.get("etag")
+                    self._metadata_checked_at = time.monotonic()
+                else:
+                    logger.warning(f"Failed to fetch metadata options: HTTP {response.status_code}")
+            except Exception as e:
+                logger.error(f"Failed to fetch metadata options: {e}")
+
+            if self._metadata is None:
                 return {"workflows": [], "agents": [], "tools": []}
-                
-        except Exception as e:
-            logger.error(f"Failed to fetch metadata options: {e}")
-            return {"workflows": [], "agents": [], "tools": []}
+            # On failure the last known catalog is served until the gateway recovers
+            return self._metadata
 
 class DefaultWorkflowAgent:
     """Main workflow agent implementing Plan and Execute pattern"""
@@ -342,6 +499,11 @@ class DefaultWorkflowAgent:
         
         # Build the LangGraph
         self.graph = self._build_plan_execute_graph()
+    
+    async def close(self):
+        """Flush pending memory writes and close clients"""
+        await self.memory_manager.close()
+        await self.metadata_fetcher.http_client.aclose()
         
     def _build_plan_execute_graph(self) -> StateGraph:
         """Build the Plan and Execute LangGraph"""
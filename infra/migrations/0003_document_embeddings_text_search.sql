@@ -0,0 +1,28 @@
+-- Migration: Full-text search column for hybrid retrieval on document_embeddings
+--
+-- Problem: Search over document_embeddings is vector-only, so exact identifiers,
+-- SKUs and error codes are often missed.
+--
+-- Solution: Add a generated tsvector column (kept up to date by Postgres on every
+-- insert/update) with a GIN index. The RAG and tools services run full-text and
+-- ANN queries against it concurrently and fuse them with reciprocal-rank fusion.
+--
+-- Note: adding a stored generated column rewrites the table under an exclusive
+-- lock; run during a maintenance window on large tables. The config ('english')
+-- must match TEXT_SEARCH_CONFIG in the services.
+
+\echo 'Starting migration: document_embeddings full-text search column'
+
+ALTER TABLE document_embeddings
+    ADD COLUMN IF NOT EXISTS content_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('english'::regconfig, coalesce(content, ''))) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_embeddings_content_tsv
+    ON document_embeddings USING gin (content_tsv);
+
+\echo 'Verifying:'
+SELECT column_name, data_type, is_generated
+FROM information_schema.columns
+WHERE table_name = 'document_embeddings' AND column_name = 'content_tsv';
+
+\echo 'Migration completed successfully!'
@@ -0,0 +1,75 @@
+-- Migration: Change notifications for the chat metadata catalog
+--
+-- Problem: /api/v1/metadata/chat-options re-ran three catalog SELECTs on every
+-- request although the registries change only a few times a day.
+--
+-- Solution: The gateway now serves the catalog from memory and reloads it when
+-- notified. These statement-level triggers send a NOTIFY on the
+-- 'metadata_catalog_changed' channel (payload: table name) whenever
+-- workflow_definitions, agents or tool_templates change, regardless of which
+-- service made the write. The channel must match METADATA_CATALOG_CHANNEL.
+--
+-- UPDATE triggers are limited to the columns that define a catalog entry.
+-- Execution statistics (execution_count, success_rate, last_executed, ...)
+-- are written after every run and do not send a notification; the catalog
+-- picks them up on its METADATA_CATALOG_TTL_SECONDS reload.
+
+\echo 'Starting migration: metadata catalog change notifications'
+
+CREATE OR REPLACE FUNCTION notify_metadata_catalog_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('metadata_catalog_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_workflow_definitions_metadata_catalog ON workflow_definitions;
+CREATE TRIGGER trg_workflow_definitions_metadata_catalog
+    AFTER INSERT OR DELETE OR TRUNCATE ON workflow_definitions
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_metadata_catalog_changed();
+
+DROP TRIGGER IF EXISTS trg_workflow_definitions_metadata_catalog_update ON workflow_definitions;
+CREATE TRIGGER trg_workflow_definitions_metadata_catalog_update
+    AFTER UPDATE OF
+        name, display_name, description, category, version, status,
+        dns_name, health_url, url, capabilities, tags, project_tags, is_public,
+        timeout_seconds, default_input_modes, default_output_modes
+    ON workflow_definitions
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_metadata_catalog_changed();
+
+DROP TRIGGER IF EXISTS trg_agents_metadata_catalog ON agents;
+CREATE TRIGGER trg_agents_metadata_catalog
+    AFTER INSERT OR DELETE OR TRUNCATE ON agents
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_metadata_catalog_changed();
+
+DROP TRIGGER IF EXISTS trg_agents_metadata_catalog_update ON agents;
+CREATE TRIGGER trg_agents_metadata_catalog_update
+    AFTER UPDATE OF
+        name, display_name, description, category, status,
+        dns_name, health_url, url, a2a_enabled, a2a_address, ai_provider,
+        model_name, capabilities, tags, project_tags, default_input_modes,
+        default_output_modes
+    ON agents
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_metadata_catalog_changed();
+
+DROP TRIGGER IF EXISTS trg_tool_templates_metadata_catalog ON tool_templates;
+CREATE TRIGGER trg_tool_templates_metadata_catalog
+    AFTER INSERT OR DELETE OR TRUNCATE ON tool_templates
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_metadata_catalog_changed();
+
+DROP TRIGGER IF EXISTS trg_tool_templates_metadata_catalog_update ON tool_templates;
+CREATE TRIGGER trg_tool_templates_metadata_catalog_update
+    AFTER UPDATE OF
+        name, display_name, description, category, type, version,
+        status, is_active, dns_name, health_url, tags, capabilities,
+        default_input_modes, default_output_modes
+    ON tool_templates
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_metadata_catalog_changed();
+
+\echo 'Verifying:'
+SELECT event_object_table, trigger_name
+FROM information_schema.triggers
+WHERE trigger_name LIKE 'trg_%_metadata_catalog%'
+GROUP BY event_object_table, trigger_name;
+
+\echo 'Migration completed successfully!'
@@ -0,0 +1,49 @@
+-- Migration: Change notifications for unified_models
+--
+-- Problem: The gateway re-read unified_models and rebuilt LLM/embedding
+-- clients on almost every request.
+--
+-- Solution: The gateway now caches model rows and client instances in a
+-- process-wide registry. This trigger reuses the metadata catalog channel
+-- (payload: table name) so every gateway replica drops its cached model rows
+-- when a model is added, changed or removed. Requires migration 0004.
+--
+-- As in 0004, UPDATE only notifies for the columns that select or configure a
+-- model. Pricing and performance metrics do not; cached rows pick them up
+-- after MODEL_REGISTRY_RECORD_TTL_SECONDS.
+
+\echo 'Starting migration: unified_models change notifications'
+
+-- No earlier migration creates unified_models, so a fresh database running
+-- this from docker-entrypoint-initdb.d may not have it. Skip the triggers
+-- there; re-run this migration once the table exists.
+DO $$
+BEGIN
+    IF to_regclass('unified_models') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS trg_unified_models_metadata_catalog ON unified_models;
+        CREATE TRIGGER trg_unified_models_metadata_catalog
+            AFTER INSERT OR DELETE OR TRUNCATE ON unified_models
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_metadata_catalog_changed();
+
+        DROP TRIGGER IF EXISTS trg_unified_models_metadata_catalog_update ON unified_models;
+        CREATE TRIGGER trg_unified_models_metadata_catalog_update
+            AFTER UPDATE OF
+                name, display_name, provider, model_type, api_endpoint, api_key_encrypted,
+                status, capabilities, model_config, health_url, dns_name, is_default,
+                priority, max_tokens, supports_streaming, dimensions, max_input_tokens,
+                is_active
+            ON unified_models
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_metadata_catalog_changed();
+    ELSE
+        RAISE NOTICE 'unified_models does not exist yet; skipping triggers';
+    END IF;
+END
+$$;
+
+\echo 'Verifying:'
+SELECT event_object_table, trigger_name
+FROM information_schema.triggers
+WHERE trigger_name LIKE 'trg_unified_models_metadata_catalog%'
+GROUP BY event_object_table, trigger_name;
+
+\echo 'Migration completed successfully!'
@@ -0,0 +1,74 @@
+-- Migration: Append-only agent session history
+--
+-- Problem: Every agent turn loaded agent_sessions.conversation_history,
+-- appended two entries and wrote the whole JSON array back, so long sessions
+-- rewrote megabytes per turn and concurrent turns could lose each other's
+-- messages.
+--
+-- Solution: Turns are inserted into agent_session_messages keyed by
+-- (session_id, seq); agent_sessions only keeps the seq counter and a cached
+-- running summary of older messages. New databases get these objects from the
+-- agents service's create_all; this migration upgrades existing ones and
+-- copies the legacy arrays over.
+
+\echo 'Starting migration: agent session messages'
+
+-- agent_sessions is created by the agents service, not by 0001, so a fresh
+-- database running this from docker-entrypoint-initdb.d does not have it yet
+-- and create_all will build the new schema later. Only upgrade when it exists.
+DO $$
+BEGIN
+    IF to_regclass('agent_sessions') IS NOT NULL THEN
+        ALTER TABLE agent_sessions ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0;
+        ALTER TABLE agent_sessions ADD COLUMN IF NOT EXISTS summary TEXT;
+        ALTER TABLE agent_sessions ADD COLUMN IF NOT EXISTS summary_through_seq INTEGER NOT NULL DEFAULT 0;
+        ALTER TABLE agent_sessions ADD COLUMN IF NOT EXISTS summary_token_count INTEGER NOT NULL DEFAULT 0;
+
+        CREATE TABLE IF NOT EXISTS agent_session_messages (
+            session_id VARCHAR NOT NULL REFERENCES agent_sessions(id) ON DELETE CASCADE,
+            seq INTEGER NOT NULL,
+            role VARCHAR(50) NOT NULL,
+            content TEXT NOT NULL,
+            token_count INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (session_id, seq)
+        );
+
+        -- Backfill sessions that have not been migrated yet (token counts use the service's length/4 estimate)
+        INSERT INTO agent_session_messages (session_id, seq, role, content, token_count, created_at)
+        SELECT s.id,
+               m.ordinality,
+               COALESCE(m.value->>'role', 'user'),
+               COALESCE(m.value->>'content', ''),
+               length(COALESCE(m.value->>'content', '')) / 4 + 4,
+               COALESCE((m.value->>'timestamp')::timestamp, s.updated_at)
+        FROM agent_sessions s
+        CROSS JOIN LATERAL json_array_elements(s.conversation_history::json) WITH ORDINALITY AS m(value, ordinality)
+        WHERE s.message_count = 0
+          AND s.conversation_history IS NOT NULL
+        ON CONFLICT (session_id, seq) DO NOTHING;
+
+        UPDATE agent_sessions s
+        SET message_count = c.max_seq,
+            conversation_history = '[]'
+        FROM (
+            SELECT session_id, MAX(seq) AS max_seq
+            FROM agent_session_messages
+            GROUP BY session_id
+        ) c
+        WHERE s.id = c.session_id
+          AND s.message_count = 0;
+    ELSE
+        RAISE NOTICE 'agent_sessions does not exist yet; nothing to migrate';
+    END IF;
+END
+$$;
+
+\echo 'Verifying:'
+SELECT table_name, column_name
+FROM information_schema.columns
+WHERE table_name IN ('agent_sessions', 'agent_session_messages')
+  AND column_name IN ('message_count', 'summary', 'seq')
+ORDER BY table_name, column_name;
+
+\echo 'Migration completed successfully!'